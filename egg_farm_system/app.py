@@ -15,21 +15,14 @@ import egg_farm_system.database.models
 
 from PySide6.QtWidgets import QApplication, QDialog
 from egg_farm_system.database.db import DatabaseManager
-from egg_farm_system.ui.main_window import MainWindow
 from egg_farm_system.ui.forms.login_dialog import LoginDialog
-from egg_farm_system.config import APP_NAME, APP_VERSION, LOGS_DIR, LOG_LEVEL, LOG_FORMAT
+from egg_farm_system.config import APP_NAME, APP_VERSION
 from egg_farm_system.ui.ui_helpers import apply_theme
 from egg_farm_system import config as _config
+from egg_farm_system.utils.log_setup import configure_logging
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format=LOG_FORMAT,
-    handlers=[
-        logging.FileHandler(LOGS_DIR / "app.log"),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +31,10 @@ def main():
     try:
         logger.info(f"Starting {APP_NAME} v{APP_VERSION}")
         
+        if _config.SQL_PROFILING:
+            from egg_farm_system.utils.performance_monitoring import query_profiler
+            query_profiler.enable()
+        
         # Create Qt application
         app = QApplication(sys.argv)
         app.setApplicationName(APP_NAME)
@@ -51,18 +48,13 @@ def main():
         # Load language preference
         try:
             from egg_farm_system.modules.settings import SettingsManager
+            from egg_farm_system.ui.i18n_signals import language_notifier
             from egg_farm_system.utils.i18n import get_i18n
-            from PySide6.QtCore import Qt
             
+            # Installed first so it sets the layout direction of the saved language
+            language_notifier()
             saved_lang = SettingsManager.get_setting('language', 'en')
-            i18n = get_i18n()
-            i18n.set_language(saved_lang)
-            
-            # Set layout direction
-            if saved_lang == 'ps':
-                app.setLayoutDirection(Qt.RightToLeft)
-            else:
-                app.setLayoutDirection(Qt.LeftToRight)
+            get_i18n().set_language(saved_lang)
             
             logger.info(f"Language set to: {saved_lang}")
         except Exception as e:
@@ -80,14 +72,30 @@ def main():
 
         current_user = getattr(login, 'user', None)
 
+        # Import the main window only after login so the login dialog appears
+        # without waiting on every page module
+        from egg_farm_system.ui.main_window import MainWindow
+
         # Create and show main window with authenticated user
         window = MainWindow(current_user=current_user)
         window.show()
         
         logger.info("Application started successfully")
         
+        from egg_farm_system.utils.metrics import MetricsSnapshotter, metrics
+        snapshotter = MetricsSnapshotter(metrics, _config.METRICS_SNAPSHOT_PATH,
+                                         _config.METRICS_SNAPSHOT_INTERVAL)
+        snapshotter.start()
+        
         # Run application
-        sys.exit(app.exec())
+        exit_code = app.exec()
+        snapshotter.stop()
+        from egg_farm_system.database.maintenance import database_maintenance
+        database_maintenance.stop()
+        DatabaseManager.log_open_sessions()
+        if _config.SQL_PROFILING:
+            query_profiler.log_report()
+        sys.exit(exit_code)
     
     except Exception as e:
         logger.critical(f"Application failed to start: {e}", exc_info=True)
@@ -0,0 +1,236 @@
+"""Command line runner for reports, imports, backups, alerts and maintenance.
+
+Runs without the GUI, so cron (or Task Scheduler) can do the nightly heavy
+work outside office hours and outside the GUI process:
+
+    python -m egg_farm_system.cli report daily_production --farm-id 1 -o daily.pdf
+    python -m egg_farm_system.cli report feed_usage --farm-id 1 --start 2024-01-01 --end 2024-01-31 -o feed.xlsx
+    python -m egg_farm_system.cli import parties parties.csv
+    python -m egg_farm_system.cli backup --keep 14
+    python -m egg_farm_system.cli alerts
+    python -m egg_farm_system.cli maintenance --step checkpoint --step statistics
+    python -m egg_farm_system.cli serve --host 0.0.0.0
+    python -m egg_farm_system.cli sync export to_hq.json.gz --peer <hq node id>
+    python -m egg_farm_system.cli sync import from_hq.json.gz
+"""
+import logging
+import re
+from datetime import date
+from pathlib import Path
+
+import click
+
+from egg_farm_system.config import HTTP_API_HOST, HTTP_API_PORT, LOG_FORMAT
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.maintenance import MAINTENANCE_STEPS
+from egg_farm_system.modules.report_builders import REPORT_TYPES
+from egg_farm_system.utils.streaming_export import EXPORT_FORMATS
+
+DATE = click.DateTime(formats=["%Y-%m-%d"])
+
+IMPORTERS = {
+    "parties": "import_parties",
+    "raw-materials": "import_raw_materials",
+    "expenses": "import_expenses",
+    "employees": "import_employees",
+}
+
+# Options each report cannot do without
+_REQUIRED_OPTIONS = {
+    "daily_production": ("farm_id",),
+    "monthly_production": ("farm_id",),
+    "feed_usage": ("farm_id", "start_date", "end_date"),
+    "party_statement": ("party_id",),
+}
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _plain(value):
+    """Report cell or info text without the HTML markup used by the viewer"""
+    return _TAG.sub("", str(value).replace("<br>", " | "))
+
+
+@click.group()
+@click.option("--database", type=click.Path(dir_okay=False, path_type=Path),
+              help="SQLite file to use instead of the configured database.")
+@click.option("-v", "--verbose", is_flag=True, help="Log progress to stderr.")
+def cli(database, verbose):
+    """Egg Farm Management System without the GUI."""
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING, format=LOG_FORMAT)
+    DatabaseManager.initialize(f"sqlite:///{database.resolve()}" if database else None)
+
+
+@cli.command()
+@click.argument("report_type", type=click.Choice(REPORT_TYPES))
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), required=True,
+              help="File to write; the format follows the extension unless --format is given.")
+@click.option("--format", "fmt", type=click.Choice(EXPORT_FORMATS))
+@click.option("--farm-id", type=int)
+@click.option("--party-id", type=int)
+@click.option("--date", "report_date", type=DATE, help="Day (or month) of production reports; default today.")
+@click.option("--start", "start_date", type=DATE)
+@click.option("--end", "end_date", type=DATE)
+def report(report_type, output, fmt, farm_id, party_id, report_date, start_date, end_date):
+    """Generate a report to CSV, XLSX or PDF."""
+    from egg_farm_system.modules.report_builders import ReportRequest, build_report
+    from egg_farm_system.utils.streaming_export import export_rows
+
+    fmt = fmt or output.suffix.lstrip(".").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise click.BadParameter(f"cannot tell the format of {output.name}; use --format", param_hint="--output")
+    given = {"farm_id": farm_id, "party_id": party_id, "start_date": start_date, "end_date": end_date}
+    missing = [name for name in _REQUIRED_OPTIONS[report_type] if given[name] is None]
+    if missing:
+        raise click.UsageError(f"{report_type} needs " + ", ".join(
+            "--" + name.replace("_date", "").replace("_", "-") for name in missing))
+
+    request = ReportRequest(
+        report_type=report_type,
+        farm_id=farm_id,
+        report_date=report_date.date() if report_date else date.today(),
+        start_date=start_date.date() if start_date else None,
+        end_date=end_date.date() if end_date else None,
+        party_id=party_id,
+    )
+    with DatabaseManager.session_scope(read_only=True) as session:
+        result = build_report(request, session)
+    if not result:
+        raise click.ClickException(f"No data for the {report_type} report")
+
+    options = {}
+    if fmt == "pdf":
+        options = {"title": report_type.replace("_", " ").title(), "subtitle": _plain(result["info"])}
+    rows = ([_plain(cell) for cell in row] for row in result["rows"])
+    count = export_rows(fmt, result["headers"], rows, output, **options)
+    click.echo(f"Wrote {count} rows to {output}")
+
+
+@cli.command("import")
+@click.argument("entity", type=click.Choice(list(IMPORTERS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user-id", type=int, default=1, show_default=True)
+def import_file(entity, path, user_id):
+    """Bulk import an Excel or CSV file."""
+    from egg_farm_system.utils.data_importer import DataImporter
+
+    with DataImporter() as importer:
+        result = getattr(importer, IMPORTERS[entity])(path, user_id=user_id)
+    click.echo(result["message"])
+    for error in result.get("errors", []):
+        click.echo(f"  {error}", err=True)
+    if result["status"] == "error":
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option("--output-dir", type=click.Path(file_okay=False, path_type=Path),
+              help="Backup directory; default data/backups.")
+@click.option("--include-logs", is_flag=True)
+@click.option("--comment", default="Command line backup", show_default=True)
+@click.option("--keep", type=int, help="Then delete all but the newest KEEP backups.")
+def backup(output_dir, include_logs, comment, keep):
+    """Back up the live database without stopping the GUI."""
+    from egg_farm_system.utils.backup_manager import BackupManager
+
+    manager = BackupManager(output_dir)
+    path = manager.create_backup(include_logs=include_logs, comment=comment, online=True)
+    click.echo(f"Backup written to {path}")
+    if keep:
+        click.echo(f"Removed {manager.cleanup_old_backups(keep)} old backup(s)")
+
+
+@cli.command()
+@click.option("--notify/--no-notify", default=True, show_default=True,
+              help="Also record the alerts in the notification centre.")
+def alerts(notify):
+    """Evaluate the alert rules."""
+    from egg_farm_system.modules.alert_rules import AlertEngine
+
+    engine = AlertEngine()
+    found = engine.trigger_alerts() if notify else engine.check_all_rules()
+    for alert in found:
+        click.echo(f"[{alert['severity']}] {alert['title']}: {alert['message']}")
+    click.echo(f"{len(found)} alert(s)")
+
+
+@cli.command()
+@click.option("--step", "steps", multiple=True, type=click.Choice(list(MAINTENANCE_STEPS)),
+              help="Run only this step; repeatable. Default: all of them.")
+def maintenance(steps):
+    """Refresh statistics, checkpoint the WAL, vacuum and check integrity."""
+    from egg_farm_system.database.maintenance import DatabaseMaintenance
+
+    result = DatabaseMaintenance().run(list(steps) or list(MAINTENANCE_STEPS))
+    for step in result.steps:
+        click.echo(f"{step.name}: {step.detail} ({step.seconds:.2f}s)")
+    click.echo(f"Reclaimed {result.reclaimed_bytes} bytes in {result.total_seconds:.2f}s")
+    if not result.ok:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option("--host", default=HTTP_API_HOST, show_default=True,
+              help="Address to listen on; 0.0.0.0 serves the whole office network.")
+@click.option("--port", type=int, default=HTTP_API_PORT, show_default=True)
+def serve(host, port):
+    """Serve read-only dashboard JSON to other machines."""
+    from egg_farm_system.http_api import ApiServer
+
+    server = ApiServer(host, port)
+    click.echo(f"Serving http://{host}:{server.port}/api/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@cli.group()
+def sync():
+    """Exchange changes with other farm offices through bundle files."""
+
+
+@sync.command("export")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--peer", help="Node id of the receiving office; only changes it has not confirmed are included. "
+                             "Without it the bundle holds the whole change log.")
+def sync_export(output, peer):
+    """Write a bundle of changes for another office."""
+    from egg_farm_system.database.sync import SyncManager
+
+    count = SyncManager.export_bundle(output, peer)
+    click.echo(f"Wrote {count} change(s) from node {SyncManager.status()['node']} to {output}")
+
+
+@sync.command("import")
+@click.argument("bundle", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def sync_import(bundle):
+    """Apply a bundle from another office."""
+    from egg_farm_system.database.sync import SyncManager
+
+    try:
+        result = SyncManager.import_bundle(bundle)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Node {result.node}: {result.applied} applied, {result.skipped} skipped, "
+               f"{len(result.conflicts)} conflict(s)")
+    for conflict in result.conflicts:
+        click.echo(f"  {conflict}", err=True)
+
+
+@sync.command("status")
+def sync_status():
+    """Show this database's node id and its sync points."""
+    from egg_farm_system.database.sync import SyncManager
+
+    status = SyncManager.status()
+    click.echo(f"Node {status['node']}, change log at {status['last_seq']}")
+    for peer in status["peers"]:
+        click.echo(f"  {peer['node']}: sent through {peer['sent_seq']}, received through {peer['received_seq']}, "
+                   f"last sync {peer['last_sync_at']:%Y-%m-%d %H:%M}")
+
+
+if __name__ == "__main__":
+    cli(prog_name="python -m egg_farm_system.cli")
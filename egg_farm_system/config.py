@@ -1,8 +1,6 @@
 """
 Configuration file for Egg Farm Management System
 """
-from egg_farm_system.utils.i18n import tr
-
 import os
 import sys
 from pathlib import Path
@@ -31,6 +29,15 @@ LOGS_DIR.mkdir(exist_ok=True)
 
 # Database
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+# SQLite tuning profile: "low_memory", "balanced" or "performance"
+DB_TUNING_PROFILE = os.environ.get("EGG_FARM_DB_PROFILE", "balanced")
+# Database maintenance only runs after this many seconds without writes
+DB_MAINTENANCE_IDLE_SECONDS = 300
+# Analytics read from a copy of the database refreshed after this many seconds
+ANALYTICS_SNAPSHOT_MAX_AGE = 900
+# Read-only JSON API for dashboards on other office machines (cli.py serve)
+HTTP_API_HOST = os.environ.get("EGG_FARM_API_HOST", "127.0.0.1")
+HTTP_API_PORT = int(os.environ.get("EGG_FARM_API_PORT", "8765"))
 
 # Currency settings
 BASE_CURRENCY = "AFG"
@@ -67,6 +74,25 @@ EGG_GRADES = ["Small", "Medium", "Large", "Broken"]
 # Logging
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_JSON = os.environ.get("EGG_FARM_LOG_JSON", "").lower() in ("1", "true", "yes")
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# INFO/DEBUG records let through per call site and window, for loggers on hot paths
+LOG_RATE_LIMIT_WINDOW = 60
+LOG_RATE_LIMITS = {
+    "egg_farm_system.utils.performance_monitoring": 20,
+    "egg_farm_system.modules.ledger": 20,
+    "egg_farm_system.modules.financial_reports": 20,
+    "egg_farm_system.modules.sales": 20,
+    "egg_farm_system.modules.purchases": 20,
+}
+
+# Record SQL statements per measure_time scope and report N+1 patterns on exit
+SQL_PROFILING = os.environ.get("EGG_FARM_SQL_PROFILE", "").lower() in ("1", "true", "yes")
+
+# Latency metrics snapshot, rewritten periodically while the app runs
+METRICS_SNAPSHOT_PATH = LOGS_DIR / "metrics.json"
+METRICS_SNAPSHOT_INTERVAL = 300  # seconds
 
 # Company/Farm Information for PDF exports
 COMPANY_NAME = "Egg Farm Management System"  # Can be customized
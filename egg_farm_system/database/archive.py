@@ -0,0 +1,344 @@
+"""
+Per-year archive databases for closed years.
+
+``ArchiveManager.archive_year(year)`` moves one closed calendar year of
+transactional history (ledger, sales, purchases, payments, expenses, egg
+production, feed issues and audit logs) out of the main database into
+``archive/egg_farm_<year>.db`` next to it, so the working tables and their
+indexes only hold the open years. Every party/farm ledger gets one
+``Opening Balance`` entry dated 1 January of the following year carrying the
+archived history forward, so balances computed from the main database stay
+correct without opening any archive.
+
+``ArchiveManager.subquery`` selects rows of an archived table for a date
+range and unions in (ATTACHing on demand) only the archives the range reaches.
+SQLite attaches at most ``MAX_ATTACHED_ARCHIVES`` of them to a connection,
+so a range reaching more years copies the older ones, a batch at a time,
+into temporary tables of that connection first.
+``ArchiveManager.entity`` wraps it for ORM queries: it returns the model
+itself while the range stays in open years, and otherwise an alias of the
+model over that union, so every date-ranged read of an archived table goes
+through it and sees closed years too. Undated list queries pass
+``include_archived=False`` and stay on the main database.
+"""
+import logging
+import sqlite3
+import threading
+import weakref
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import (
+    Column, Index, MetaData, Table, create_engine, delete, func, insert, or_, select, union_all,
+)
+from sqlalchemy.orm import aliased
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import (
+    ArchivedYear, EggProduction, Expense, FeedIssue, Ledger, Payment, Purchase, Sale,
+)
+from egg_farm_system.utils.audit_trail import AuditLog
+from egg_farm_system.utils.query_optimizer import AggregationHelper
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR_NAME = "archive"
+# reference_type of the ledger entries carrying archived balances forward
+OPENING_BALANCE = "Opening Balance"
+# SQLite attaches at most 10 databases to one connection by default
+MAX_ATTACHED_ARCHIVES = 8
+
+# Archived tables and the column deciding which year a row belongs to
+ARCHIVED_TABLES = (
+    (Ledger.__table__, "date"),
+    (Sale.__table__, "date"),
+    (Purchase.__table__, "date"),
+    (Payment.__table__, "date"),
+    (Expense.__table__, "date"),
+    (EggProduction.__table__, "date"),
+    (FeedIssue.__table__, "date"),
+    (AuditLog.__table__, "timestamp"),
+)
+_DATE_COLUMNS = {table.name: column for table, column in ARCHIVED_TABLES}
+
+_archive_tables = {}
+_batch_tables = {}
+# Archived years per engine; only archive_year() changes them
+_archived_years = weakref.WeakKeyDictionary()
+_archived_years_lock = threading.Lock()
+
+
+def _schema(year):
+    return f"archive_{year}"
+
+
+def _archive_table(table, metadata, schema=None):
+    """Copy of ``table`` without foreign keys; the parent rows stay in the main database"""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in table.columns]
+    date_column = _DATE_COLUMNS[table.name]
+    return Table(table.name, metadata, *columns, Index(f"idx_{table.name}_{date_column}", date_column),
+                 schema=schema)
+
+
+def _attached_table(table, year):
+    """``table`` as seen in the attached archive of ``year``"""
+    key = (table.name, year)
+    if key not in _archive_tables:
+        _archive_tables[key] = _archive_table(table, MetaData(), schema=_schema(year))
+    return _archive_tables[key]
+
+
+def _batch_table(table, years):
+    """``table`` as copied from the archives of ``years`` into a temporary table"""
+    key = (table.name, years[0], years[-1])
+    if key not in _batch_tables:
+        columns = [Column(c.name, c.type) for c in table.columns]
+        _batch_tables[key] = Table(f"archive_{table.name}_{years[0]}_{years[-1]}", MetaData(), *columns,
+                                   schema="temp")
+    return _batch_tables[key]
+
+
+def _in_year(table, year):
+    column = table.c[_DATE_COLUMNS[table.name]]
+    return [column >= datetime(year, 1, 1), column < datetime(year + 1, 1, 1)]
+
+
+class ArchiveManager:
+    """Moves closed years to per-year archive databases and queries across them"""
+
+    @staticmethod
+    def archive_dir():
+        path = DatabaseManager.database_path()
+        if not path or path == ":memory:":
+            raise ValueError("Archives need a file database")
+        return Path(path).resolve().parent / ARCHIVE_DIR_NAME
+
+    @classmethod
+    def archive_path(cls, year):
+        return cls.archive_dir() / f"egg_farm_{year}.db"
+
+    @staticmethod
+    def archived_years(session):
+        """Archived years, oldest first"""
+        engine = session.get_bind()
+        with _archived_years_lock:
+            years = _archived_years.get(engine)
+        if years is None:
+            years = list(session.execute(select(ArchivedYear.year).order_by(ArchivedYear.year)).scalars())
+            with _archived_years_lock:
+                _archived_years[engine] = years
+        return list(years)
+
+    @classmethod
+    def years_in_range(cls, session, start_date=None, end_date=None):
+        """Archived years a ``start_date``..``end_date`` range reaches (None is open-ended)"""
+        return [
+            year for year in cls.archived_years(session)
+            if (start_date is None or year >= start_date.year) and (end_date is None or year <= end_date.year)
+        ]
+
+    @classmethod
+    def archive_year(cls, year, today=None):
+        """Move ``year`` into its archive database; return the number of rows moved
+
+        Years are archived oldest first and only once closed. The copy is
+        committed to the archive before anything is deleted from the main
+        database, and re-running after an interruption replaces the copied
+        rows, so no history is lost if the process stops in between.
+        """
+        today = today or date.today()
+        if year >= today.year:
+            raise ValueError(f"{year} is not closed yet")
+
+        session = DatabaseManager.get_session()
+        try:
+            archived = cls.archived_years(session)
+            if archived and year <= archived[-1]:
+                raise ValueError(f"Years up to {archived[-1]} are already archived")
+
+            path = cls.archive_path(year)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            cls._create_archive(path)
+
+            conn = session.connection()
+            cls._attach(conn, [year])
+            for table, _ in ARCHIVED_TABLES:
+                target = _attached_table(table, year)
+                conn.execute(
+                    insert(target).prefix_with("OR REPLACE").from_select(
+                        list(table.c.keys()), select(table).where(*_in_year(table, year)))
+                )
+            session.commit()
+
+            conn = session.connection()
+            cls._carry_forward_balances(conn, datetime(year + 1, 1, 1))
+            moved = 0
+            for table, _ in ARCHIVED_TABLES:
+                target = _attached_table(table, year)
+                copied = conn.execute(
+                    select(func.count()).select_from(target).where(*_in_year(target, year))).scalar()
+                deleted = conn.execute(delete(table).where(*_in_year(table, year))).rowcount
+                if deleted != copied:
+                    raise RuntimeError(f"{table.name}: {deleted} rows in {year} but {copied} archived")
+                moved += deleted
+            session.add(ArchivedYear(year=year, path=str(path), row_count=moved))
+            session.info["_wrote_data"] = True
+            session.commit()
+            with _archived_years_lock:
+                _archived_years.clear()  # the read and snapshot engines cache them too
+            logger.info(f"Archived {moved} rows of {year} to {path}")
+            return moved
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error archiving {year}: {e}")
+            raise
+        finally:
+            session.close()
+
+    @classmethod
+    def subquery(cls, session, table, start_date=None, end_date=None):
+        """Rows of an archived table dated within ``start_date``..``end_date``
+
+        Returns a subquery with the columns of ``table`` (a table or model)
+        to filter and order further in ``session``. Archives are attached to
+        the session's connection and unioned in only for years the range
+        reaches. Carried-forward opening entries are dropped whenever the
+        archived entries they summarise are part of the result.
+        """
+        table = getattr(table, "__table__", table)
+        if start_date is not None and not isinstance(start_date, datetime):
+            start_date = datetime.combine(start_date, datetime.min.time())
+        years = cls.years_in_range(session, start_date, end_date)
+        sources = [table]
+        if years:
+            conn = session.connection()
+            batches = [years[i:i + MAX_ATTACHED_ARCHIVES] for i in range(0, len(years), MAX_ATTACHED_ARCHIVES)]
+            for batch in batches[:-1]:
+                sources.append(cls._copy_batch(conn, table, batch))
+            cls._attach(conn, batches[-1])
+            sources += [_attached_table(table, year) for year in batches[-1]]
+
+        parts = []
+        for source in sources:
+            column = source.c[_DATE_COLUMNS[table.name]]
+            filters = AggregationHelper.date_range_filters(column, start_date, end_date)
+            if table.name == Ledger.__tablename__:
+                keep = [source.c.reference_type.is_(None), source.c.reference_type != OPENING_BALANCE]
+                if start_date is not None:
+                    keep.append(column <= start_date)
+                filters.append(or_(*keep))
+            parts.append(select(*source.c).where(*filters))
+        statement = parts[0] if len(parts) == 1 else union_all(*parts)
+        return statement.subquery(table.name)
+
+    @classmethod
+    def entity(cls, session, model, start_date=None, end_date=None, include_archived=True):
+        """``model`` for a query over ``start_date``..``end_date``, including archived years
+
+        Returns ``model`` itself when the range reaches no archived year, or
+        when neither date is given and ``include_archived`` is false, else an
+        alias of it over ``subquery``. Use the result in place of the model
+        in the query, including in its date filters:
+
+            sales = ArchiveManager.entity(session, Sale, start, end)
+            session.query(func.sum(sales.total_afg)).filter(sales.date >= start)
+
+        Rows loaded through the alias are plain instances of ``model``;
+        archived rows are read-only history.
+        """
+        if start_date is None and end_date is None and not include_archived:
+            return model
+        if not cls.years_in_range(session, start_date, end_date):
+            return model
+        return aliased(model, cls.subquery(session, model, start_date, end_date))
+
+    @staticmethod
+    def _create_archive(path):
+        engine = create_engine(f"sqlite:///{path}")
+        try:
+            metadata = MetaData()
+            for table, _ in ARCHIVED_TABLES:
+                _archive_table(table, metadata)
+            metadata.create_all(engine)
+        finally:
+            engine.dispose()
+
+    @classmethod
+    def _attach(cls, conn, years):
+        """ATTACH the archives of ``years`` to ``conn`` unless already attached"""
+        if len(years) > MAX_ATTACHED_ARCHIVES:
+            raise ValueError(f"A query can span at most {MAX_ATTACHED_ARCHIVES} archived years")
+        wanted = {_schema(year) for year in years}
+        attached = {row[1] for row in conn.exec_driver_sql("PRAGMA database_list")}
+        archives = {name for name in attached if name.startswith("archive_")}
+        surplus = len(archives | wanted) - MAX_ATTACHED_ARCHIVES
+        for name in sorted(archives - wanted)[:max(surplus, 0)]:
+            conn.exec_driver_sql(f"DETACH DATABASE {name}")
+        for year in years:
+            if _schema(year) not in attached:
+                conn.exec_driver_sql(f"ATTACH DATABASE ? AS {_schema(year)}", (str(cls.archive_path(year)),))
+
+    @classmethod
+    def _copy_batch(cls, conn, table, years):
+        """Temporary table on ``conn`` with all rows of ``table`` archived in ``years``
+
+        The rows are read through separate read-only connections to the
+        archive files, as archives attached to ``conn`` cannot be detached
+        again while its transaction lasts. Archived years never change, so the
+        copy is kept for the life of the connection and reused by later
+        queries reaching the same batch.
+        """
+        target = _batch_table(table, years)
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_temp_master WHERE type = 'table' AND name = ?", (target.name,)).first()
+        if exists is not None:
+            return target
+        columns = ", ".join(table.c.keys())
+        # Reader connections are query_only, which refuses temporary tables
+        # too; the copy never touches the database files.
+        query_only = conn.exec_driver_sql("PRAGMA query_only").scalar()
+        conn.exec_driver_sql("PRAGMA query_only=OFF")
+        try:
+            conn.exec_driver_sql(f"CREATE TEMP TABLE {target.name} AS SELECT {columns} FROM main.{table.name} WHERE 0")
+            for year in years:
+                archive = sqlite3.connect(f"{cls.archive_path(year).as_uri()}?mode=ro", uri=True)
+                try:
+                    rows = archive.execute(f"SELECT {columns} FROM {table.name}").fetchall()
+                finally:
+                    archive.close()
+                if rows:
+                    placeholders = ", ".join("?" * len(table.c))
+                    conn.exec_driver_sql(f"INSERT INTO temp.{target.name} VALUES ({placeholders})", rows)
+        finally:
+            conn.exec_driver_sql(f"PRAGMA query_only={query_only}")
+        return target
+
+    @staticmethod
+    def _carry_forward_balances(conn, opening_date):
+        """Add one opening entry per party and farm for the ledger history before ``opening_date``"""
+        ledger = Ledger.__table__
+        net_afg = func.sum(func.coalesce(ledger.c.debit_afg, 0) - func.coalesce(ledger.c.credit_afg, 0))
+        net_usd = func.sum(func.coalesce(ledger.c.debit_usd, 0) - func.coalesce(ledger.c.credit_usd, 0))
+        balances = conn.execute(
+            select(ledger.c.party_id, ledger.c.farm_id, net_afg, net_usd, func.avg(ledger.c.exchange_rate_used))
+            .where(ledger.c.date < opening_date)
+            .group_by(ledger.c.party_id, ledger.c.farm_id)
+        ).all()
+        entries = [
+            {
+                "party_id": party_id,
+                "farm_id": farm_id,
+                "date": opening_date,
+                "description": f"Opening balance carried forward from {opening_date.year - 1}",
+                "debit_afg": max(afg, 0),
+                "credit_afg": max(-afg, 0),
+                "debit_usd": max(usd, 0),
+                "credit_usd": max(-usd, 0),
+                "exchange_rate_used": rate,
+                "reference_type": OPENING_BALANCE,
+            }
+            for party_id, farm_id, afg, usd, rate in balances
+            if round(afg, 6) or round(usd, 6)
+        ]
+        if entries:
+            conn.execute(insert(ledger), entries)
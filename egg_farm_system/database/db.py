@@ -1,8 +1,14 @@
+from contextlib import contextmanager
 from sqlalchemy import create_engine, event
-from sqlalchemy.pool import NullPool, StaticPool
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from pathlib import Path
 import logging
+import os
+import sys
+import threading
+import time
+import weakref
 
 from egg_farm_system.config import DATABASE_URL
 
@@ -10,54 +16,204 @@ logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Per-thread write connections kept before those of finished threads are closed
+WRITER_POOL_SIZE = 16
+# Read-only connections shared by background readers (analytics, reports)
+READER_POOL_SIZE = 4
+# Sessions open longer than this are reported by log_open_sessions()
+SESSION_WARN_SECONDS = 60
+
+_open_sessions = {}
+_open_sessions_lock = threading.Lock()
+_THIS_FILE = os.path.abspath(__file__)
+
+# Bumped after every commit that wrote data in this process
+_data_version = 0
+_data_version_lock = threading.Lock()
+# time.monotonic() of the last such commit
+_last_write_at = time.monotonic()
+
+
+def _session_origin():
+    """Return ``file:line`` of the first caller outside SQLAlchemy and this module."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if os.path.abspath(filename) != _THIS_FILE and "sqlalchemy" not in filename \
+                and "contextlib" not in filename:
+            return f"{os.path.basename(filename)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _report_unclosed(session_id, origin, thread_name):
+    with _open_sessions_lock:
+        _open_sessions.pop(session_id, None)
+    logger.warning(f"Session opened at {origin} in thread {thread_name} was garbage collected without close()")
+
+
+class TrackedSession(Session):
+    """Session that registers itself until closed, for open-session diagnostics"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        origin = _session_origin()
+        thread_name = threading.current_thread().name
+        with _open_sessions_lock:
+            _open_sessions[id(self)] = (origin, thread_name, time.monotonic())
+        self._finalizer = weakref.finalize(self, _report_unclosed, id(self), origin, thread_name)
+
+    def close(self):
+        finalizer = getattr(self, "_finalizer", None)
+        if finalizer is not None and finalizer.detach() is not None:
+            with _open_sessions_lock:
+                _open_sessions.pop(id(self), None)
+        super().close()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session, flush_context):
+    session.info["_wrote_data"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["_wrote_data"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_data_version(session):
+    global _data_version, _last_write_at
+    if session.info.pop("_wrote_data", False):
+        with _data_version_lock:
+            _data_version += 1
+            _last_write_at = time.monotonic()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write_mark(session):
+    session.info.pop("_wrote_data", None)
+
+
+def _set_sqlite_pragma(dbapi_conn, connection_record):
+    """Apply per-connection PRAGMAs for performance"""
+    from egg_farm_system.database.maintenance import tuning_profile
+    profile = tuning_profile()
+    cursor = dbapi_conn.cursor()
+    # Enable foreign keys
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # Page size of the tuning profile. It only applies to a database that has
+    # not been written yet, so it must come before switching a new file to
+    # WAL; existing files get it from the VACUUM in migrate_auto_vacuum.
+    cursor.execute(f"PRAGMA page_size={profile.page_size}")
+    # Journal mode for better concurrent access (readers never block the writer)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Synchronous mode for better performance
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # Page cache and memory mapping from the configured tuning profile
+    cursor.execute(f"PRAGMA cache_size={profile.cache_size}")
+    cursor.execute(f"PRAGMA mmap_size={profile.mmap_size}")
+    # Temp store in memory for better performance
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+class ThreadConnectionPool(SingletonThreadPool):
+    """One connection per thread, closed only after its thread has finished
+
+    SingletonThreadPool closes arbitrary connections, including ones other
+    threads are in the middle of a transaction on, once more than
+    ``pool_size`` threads have connected. This pool instead closes the
+    connections of threads that are no longer alive and otherwise grows.
+    """
+
+    def __init__(self, creator, pool_size=5, **kw):
+        super().__init__(creator, pool_size=pool_size, **kw)
+        self._all_conns_lock = threading.Lock()
+
+    def _do_get(self):
+        try:
+            record = self._conn.current()
+            if record:
+                return record
+        except AttributeError:
+            pass
+        record = self._create_connection()
+        record.info["owner_thread"] = threading.current_thread()
+        self._conn.current = weakref.ref(record)
+        with self._all_conns_lock:
+            if len(self._all_conns) >= self.size:
+                self._cleanup()
+            self._all_conns.add(record)
+        return record
+
+    def _cleanup(self):
+        finished = [record for record in self._all_conns
+                    if not record.info.get("owner_thread", threading.current_thread()).is_alive()]
+        for record in finished:
+            self._all_conns.discard(record)
+            record.close()
+
+
+def _set_reader_pragma(dbapi_conn, connection_record):
+    """Reader connections refuse writes so they can never take the write lock"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
 class DatabaseManager:
-    """Manages database connection and sessions with performance optimizations"""
+    """Manages database connection and sessions with performance optimizations
+
+    The file database is opened in WAL mode through two engines:
+
+    * the main engine keeps one connection per thread (``ThreadConnectionPool``),
+      so the UI thread keeps a single connection and background threads never
+      share it; SQLite serializes writers across them (20 second busy timeout);
+    * a read-only engine with ``READER_POOL_SIZE`` ``query_only`` connections
+      used by ``get_read_session`` so analytics and reports read concurrently
+      with UI writes.
+    """
     
     _engine = None
     _SessionLocal = None
+    _read_engine = None
+    _ReadSessionLocal = None
     
     @classmethod
-    def initialize(cls):
-        """Initialize database connection and create tables with performance optimizations"""
+    def initialize(cls, database_url=None):
+        """Initialize database connection and create tables with performance optimizations
+
+        ``database_url`` overrides the configured DATABASE_URL, e.g. to point
+        benchmarks or tools at a scratch database.
+        """
         try:
             if cls._engine is not None and cls._SessionLocal is not None:
                 return
 
-            # SQLite configuration optimizations
-            # Use StaticPool for better performance with SQLite file databases
-            # NullPool would be used for in-memory databases
-            pool_class = StaticPool if 'memory' not in DATABASE_URL else NullPool
-            
-            cls._engine = create_engine(
-                DATABASE_URL,
-                echo=False,
-                connect_args={
-                    "check_same_thread": False,
-                    "timeout": 20  # 20 second timeout for locked database
-                },
-                poolclass=pool_class
-            )
-            
-            # Enable performance optimizations for SQLite
-            @event.listens_for(cls._engine, "connect")
-            def set_sqlite_pragma(dbapi_conn, connection_record):
-                cursor = dbapi_conn.cursor()
-                # Enable foreign keys
-                cursor.execute("PRAGMA foreign_keys=ON")
-                # Journal mode for better concurrent access
-                cursor.execute("PRAGMA journal_mode=WAL")
-                # Synchronous mode for better performance
-                cursor.execute("PRAGMA synchronous=NORMAL")
-                # Cache size for better query performance
-                cursor.execute("PRAGMA cache_size=10000")
-                # Temp store in memory for better performance
-                cursor.execute("PRAGMA temp_store=MEMORY")
-                cursor.close()
+            url = database_url or DATABASE_URL
+
+            connect_args = {
+                "check_same_thread": False,
+                "timeout": 20  # 20 second timeout for locked database
+            }
+            in_memory = 'memory' in url
+            if in_memory:
+                # An in-memory database only exists on its one connection
+                cls._engine = create_engine(url, echo=False, connect_args=connect_args,
+                                            poolclass=StaticPool)
+            else:
+                cls._engine = create_engine(url, echo=False, connect_args=connect_args,
+                                            poolclass=ThreadConnectionPool, pool_size=WRITER_POOL_SIZE)
+            event.listen(cls._engine, "connect", _set_sqlite_pragma)
             
             # Create all tables
             # Ensure all model modules are imported so their tables are registered
             try:
                 import egg_farm_system.database.models as _models  # noqa: F401
+                import egg_farm_system.utils.audit_trail as _audit  # noqa: F401
+                import egg_farm_system.database.sync as _sync  # noqa: F401  (captures changes)
             except Exception:
                 # If models fail to import, let create_all run; errors will surface
                 logger.exception("Failed to import models before creating tables")
@@ -67,10 +223,25 @@ class DatabaseManager:
                 autocommit=False,
                 autoflush=False,
                 bind=cls._engine,
+                class_=TrackedSession,
                 expire_on_commit=False  # Prevent re-fetching on commit
             )
 
             cls._run_migrations()
+
+            if not in_memory:
+                cls._read_engine = create_engine(url, echo=False, connect_args=connect_args,
+                                                 poolclass=QueuePool, pool_size=READER_POOL_SIZE,
+                                                 max_overflow=0, pool_timeout=30)
+                event.listen(cls._read_engine, "connect", _set_sqlite_pragma)
+                event.listen(cls._read_engine, "connect", _set_reader_pragma)
+                cls._ReadSessionLocal = sessionmaker(
+                    autocommit=False,
+                    autoflush=False,
+                    bind=cls._read_engine,
+                    class_=TrackedSession,
+                    expire_on_commit=False
+                )
             
             logger.info("Database initialized successfully with performance optimizations")
             
@@ -80,54 +251,119 @@ class DatabaseManager:
 
     @classmethod
     def _run_migrations(cls):
-        """Run all database migrations from a single centralized path."""
-        migrations = []
+        """Run pending database migrations from the versioned registry."""
+        from egg_farm_system.database.migrations import run_migrations
+        run_migrations(cls._engine)
+
+    @classmethod
+    def get_session(cls):
+        """Get a new database session"""
+        if cls._SessionLocal is None:
+            cls.initialize()
+        return cls._SessionLocal()
+
+    @classmethod
+    def get_read_session(cls):
+        """Get a session on a read-only connection for background/report queries
 
-        from egg_farm_system.database.migrate_sales_table import migrate_sales_table
-        migrations.append(("migrate_sales_table", migrate_sales_table))
+        Falls back to a regular session for in-memory databases or when the
+        main engine was swapped out (tests).
+        """
+        if cls._SessionLocal is None:
+            cls.initialize()
+        if cls._ReadSessionLocal is None or cls._read_engine.url != cls._engine.url:
+            return cls._SessionLocal()
+        return cls._ReadSessionLocal()
 
-        from egg_farm_system.database.migrate_payment_method import migrate_payment_method
-        migrations.append(("migrate_payment_method", migrate_payment_method))
+    @classmethod
+    @contextmanager
+    def session_scope(cls, read_only=False):
+        """Provide a session that commits on success, rolls back on error and always closes
 
-        from egg_farm_system.database.migrate_raw_materials_avg_cost import migrate_raw_materials_avg_cost
-        migrations.append(("migrate_raw_materials_avg_cost", migrate_raw_materials_avg_cost))
+        with DatabaseManager.session_scope() as session:
+            session.add(obj)
+        """
+        session = cls.get_read_session() if read_only else cls.get_session()
+        try:
+            yield session
+            if not read_only:
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
 
-        from egg_farm_system.database.migrate_add_farm_id import migrate_add_farm_id
-        migrations.append(("migrate_add_farm_id", migrate_add_farm_id))
+    @classmethod
+    @contextmanager
+    def read_transaction(cls):
+        """Read-only session whose queries all see one consistent snapshot
 
-        from egg_farm_system.database.migrate_farm_scope_inventory_accounting import migrate_farm_scope_inventory_accounting
-        migrations.append(("migrate_farm_scope_inventory_accounting", migrate_farm_scope_inventory_accounting))
+        pysqlite only opens a transaction before writes, so each SELECT would
+        see the latest commit; an explicit BEGIN pins one WAL snapshot until
+        the session closes.
+        """
+        with cls.session_scope(read_only=True) as session:
+            dbapi_connection = session.connection().connection.dbapi_connection
+            if not dbapi_connection.in_transaction:
+                dbapi_connection.execute("BEGIN")
+            yield session
 
-        from egg_farm_system.database.migrate_raw_material_farm_scope_consistency import migrate_raw_material_farm_scope_consistency
-        migrations.append(("migrate_raw_material_farm_scope_consistency", migrate_raw_material_farm_scope_consistency))
+    @classmethod
+    def data_version(cls):
+        """Counter bumped by every session commit that wrote data in this process
 
-        from egg_farm_system.database.migrate_feed_material_template_backfill import migrate_feed_material_template_backfill
-        migrations.append(("migrate_feed_material_template_backfill", migrate_feed_material_template_backfill))
+        Cheap to read; caches of derived data store it and recompute when it
+        has moved. Writes by other processes are not seen.
+        """
+        return _data_version
 
-        from egg_farm_system.database.migrate_egg_inventory import migrate_egg_inventory
-        migrations.append(("migrate_egg_inventory", migrate_egg_inventory))
+    @classmethod
+    def idle_seconds(cls):
+        """Seconds since this process last committed a write"""
+        return time.monotonic() - _last_write_at
 
-        from egg_farm_system.database.migrate_egg_production_packaging import migrate_egg_production_packaging
-        migrations.append(("migrate_egg_production_packaging", migrate_egg_production_packaging))
+    @classmethod
+    def open_sessions(cls):
+        """Return diagnostics for sessions that are currently open, oldest first"""
+        now = time.monotonic()
+        with _open_sessions_lock:
+            entries = list(_open_sessions.values())
+        return sorted(
+            (
+                {"origin": origin, "thread": thread_name, "age_seconds": now - opened_at}
+                for origin, thread_name, opened_at in entries
+            ),
+            key=lambda entry: entry["age_seconds"],
+            reverse=True,
+        )
 
-        for migration_name, migration_func in migrations:
-            logger.info("Running migration: %s", migration_name)
-            migration_func()
-        logger.info("All database migrations completed")
+    @classmethod
+    def log_open_sessions(cls, min_age_seconds=SESSION_WARN_SECONDS):
+        """Log sessions held open longer than ``min_age_seconds``; return how many"""
+        stale = [s for s in cls.open_sessions() if s["age_seconds"] >= min_age_seconds]
+        for entry in stale:
+            logger.warning(
+                f"Session open for {entry['age_seconds']:.0f}s, opened at {entry['origin']} "
+                f"in thread {entry['thread']}"
+            )
+        return len(stale)
     
     @classmethod
-    def get_session(cls):
-        """Get a new database session"""
-        if cls._SessionLocal is None:
+    def database_path(cls):
+        """Filesystem path of the active SQLite database (for raw sqlite3 migrations)"""
+        if cls._engine is None:
             cls.initialize()
-        return cls._SessionLocal()
-    
+        return cls._engine.url.database
+
     @classmethod
     def close(cls):
         """Close database connection"""
+        if cls._read_engine:
+            cls._read_engine.dispose()
         if cls._engine:
             cls._engine.dispose()
             logger.info("Database connection closed")
 
 # Export Base for use in models
-__all__ = ['Base', 'DatabaseManager']
+__all__ = ['Base', 'DatabaseManager', 'TrackedSession']
@@ -0,0 +1,243 @@
+"""
+SQLite maintenance: statistics, WAL checkpoints, incremental vacuum and
+integrity checks, plus the connection tuning profiles.
+
+``database_maintenance`` is registered with ``WorkflowAutomation``. It only
+works once the process has gone ``DB_MAINTENANCE_IDLE_SECONDS`` without
+committing a write. Each step has its own interval, and the runs happen on
+one long-lived background thread. Every run produces a ``MaintenanceReport`` with the time per step
+and the bytes reclaimed.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from egg_farm_system import config
+from egg_farm_system.database.db import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TuningProfile:
+    """Per-connection SQLite settings"""
+    name: str
+    cache_size: int  # PRAGMA cache_size: pages, or KiB when negative
+    mmap_size: int  # bytes of the database file memory-mapped
+    page_size: int  # applied to new databases and by migrate_auto_vacuum
+
+
+TUNING_PROFILES = {
+    "low_memory": TuningProfile("low_memory", cache_size=-8_000, mmap_size=0, page_size=4096),
+    "balanced": TuningProfile("balanced", cache_size=10_000, mmap_size=64 * 1024 * 1024, page_size=4096),
+    "performance": TuningProfile("performance", cache_size=-64_000, mmap_size=256 * 1024 * 1024, page_size=8192),
+}
+
+# Minimum seconds between two runs of each step
+MAINTENANCE_INTERVALS = {
+    "statistics": 24 * 3600,
+    "checkpoint": 3600,
+    "incremental_vacuum": 24 * 3600,
+    "integrity_check": 7 * 24 * 3600,
+}
+
+
+def tuning_profile(name=None):
+    """The named tuning profile, or the configured ``DB_TUNING_PROFILE``"""
+    name = name or config.DB_TUNING_PROFILE
+    try:
+        return TUNING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown tuning profile {name!r}; expected one of {', '.join(TUNING_PROFILES)}")
+
+
+@dataclass
+class MaintenanceStep:
+    name: str
+    seconds: float
+    detail: str
+    ok: bool = True
+
+
+@dataclass
+class MaintenanceReport:
+    """What one maintenance run did, how long it took and what it reclaimed"""
+    started_at: datetime
+    steps: list = field(default_factory=list)
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    @property
+    def total_seconds(self):
+        return sum(step.seconds for step in self.steps)
+
+    @property
+    def reclaimed_bytes(self):
+        """Shrinkage of the database file plus its WAL"""
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def ok(self):
+        return all(step.ok for step in self.steps)
+
+    def summary(self):
+        steps = ", ".join(f"{step.name} {step.seconds:.2f}s ({step.detail})" for step in self.steps)
+        return f"Database maintenance in {self.total_seconds:.2f}s, reclaimed {self.reclaimed_bytes} bytes: {steps}"
+
+
+def _database_bytes():
+    """Size of the database file and its WAL; 0 for in-memory databases"""
+    path = DatabaseManager.database_path()
+    if not path or path == ":memory:":
+        return 0
+    return sum(os.path.getsize(name) for name in (path, f"{path}-wal") if os.path.exists(name))
+
+
+def refresh_statistics(conn):
+    """ANALYZE once, then let ``PRAGMA optimize`` refresh what has drifted"""
+    has_stats = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'").first()
+    if not has_stats:
+        conn.exec_driver_sql("ANALYZE")
+        return "analyzed"
+    conn.exec_driver_sql("PRAGMA analysis_limit=400")
+    conn.exec_driver_sql("PRAGMA optimize")
+    return "optimized"
+
+
+def checkpoint_wal(conn):
+    """Copy the WAL into the database and truncate it"""
+    busy, frames, copied = conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+    if frames < 0:
+        return "not in WAL mode"
+    if busy:
+        return f"busy, {copied} of {frames} frames copied"
+    return f"{frames} frames"
+
+
+def incremental_vacuum(conn):
+    """Release free pages back to the filesystem"""
+    if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+        return "skipped, auto_vacuum is not INCREMENTAL"
+    free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    # The pragma frees one page per step and sqlite3's execute() steps once;
+    # executescript() steps the statement to completion
+    conn.connection.dbapi_connection.executescript("PRAGMA incremental_vacuum")
+    return f"{free_pages - conn.exec_driver_sql('PRAGMA freelist_count').scalar()} pages freed"
+
+
+def integrity_check(conn):
+    """``PRAGMA quick_check``; raises if the database reports problems"""
+    problems = [row[0] for row in conn.exec_driver_sql("PRAGMA quick_check")]
+    if problems != ["ok"]:
+        raise RuntimeError("; ".join(problems[:5]))
+    return "ok"
+
+
+MAINTENANCE_STEPS = {
+    "statistics": refresh_statistics,
+    "checkpoint": checkpoint_wal,
+    "incremental_vacuum": incremental_vacuum,
+    "integrity_check": integrity_check,
+}
+
+
+class DatabaseMaintenance:
+    """Runs the maintenance steps that are due, one run at a time"""
+
+    def __init__(self, intervals=None, idle_seconds=None):
+        self.intervals = dict(MAINTENANCE_INTERVALS if intervals is None else intervals)
+        self.idle_seconds = config.DB_MAINTENANCE_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.last_report = None
+        self._last_run = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def due_steps(self):
+        now = time.monotonic()
+        return [name for name, interval in self.intervals.items()
+                if name not in self._last_run or now - self._last_run[name] >= interval]
+
+    def run(self, steps=None):
+        """Run ``steps`` (default: the due ones) now and return the report
+
+        Returns None if another run is in progress. A failing step is
+        recorded in the report and does not stop the others.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            report = MaintenanceReport(started_at=datetime.now(), bytes_before=_database_bytes())
+            if DatabaseManager._engine is None:
+                DatabaseManager.initialize()
+            # VACUUM and checkpoints cannot run inside a transaction
+            with DatabaseManager._engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for name in self.due_steps() if steps is None else steps:
+                    started = time.perf_counter()
+                    try:
+                        step = MaintenanceStep(name, 0.0, MAINTENANCE_STEPS[name](conn))
+                    except Exception as e:
+                        logger.error(f"Database maintenance step {name} failed: {e}")
+                        step = MaintenanceStep(name, 0.0, str(e), ok=False)
+                    step.seconds = time.perf_counter() - started
+                    report.steps.append(step)
+                    self._last_run[name] = time.monotonic()
+            report.bytes_after = _database_bytes()
+            self.last_report = report
+            logger.info(report.summary())
+            return report
+        finally:
+            self._lock.release()
+
+    def run_when_idle(self):
+        """Run the due steps if no write was committed for ``idle_seconds``"""
+        if DatabaseManager.idle_seconds() < self.idle_seconds or not self.due_steps():
+            return None
+        return self.run()
+
+    def start_when_idle(self):
+        """``run_when_idle`` on the maintenance thread; False if nothing is due yet
+
+        The thread is started on first use and then sleeps until woken again,
+        so every scheduled run reuses it.
+        """
+        if DatabaseManager.idle_seconds() < self.idle_seconds or not self.due_steps():
+            return False
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._work, name="db-maintenance", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return True
+
+    def _work(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.run_when_idle()
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}")
+
+    def stop(self):
+        """Stop the maintenance thread once the run in progress has finished"""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout=30)
+
+
+# Shared instance used by the scheduled task
+database_maintenance = DatabaseMaintenance()
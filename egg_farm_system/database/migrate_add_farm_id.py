@@ -9,8 +9,9 @@ logger = logging.getLogger(__name__)
 
 def migrate_add_farm_id():
     """Add farm_id column to sales and purchases tables"""
-    # Database path
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'egg_farm.db')
+    from egg_farm_system.database.db import DatabaseManager
+
+    db_path = DatabaseManager.database_path()
     
     if not os.path.exists(db_path):
         logger.info("Database not found, migration not needed")
@@ -0,0 +1,50 @@
+"""
+Migration to switch the database to ``auto_vacuum=INCREMENTAL``.
+
+With incremental auto-vacuum the scheduled maintenance can hand pages freed by
+deletions back to the filesystem with ``PRAGMA incremental_vacuum``. The mode
+of an existing database only changes with a full VACUUM, which also applies
+the page size of the tuning profile. SQLite cannot change the page size of a
+database in WAL mode, so the VACUUM runs with the rollback journal and WAL is
+switched back on afterwards. It runs outside any transaction.
+``schema_fingerprint()`` adds the profile's page size to this migration's
+checksum, so switching to a profile with another page size re-runs it.
+"""
+import logging
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.maintenance import tuning_profile
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL = 2
+
+
+def schema_fingerprint():
+    return f"page_size={tuning_profile().page_size}"
+
+
+def migrate_auto_vacuum():
+    if DatabaseManager._engine is None:
+        DatabaseManager.initialize()
+    page_size = tuning_profile().page_size
+    with DatabaseManager._engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == INCREMENTAL \
+                and conn.exec_driver_sql("PRAGMA page_size").scalar() == page_size:
+            logger.info("auto_vacuum already INCREMENTAL")
+            return
+        try:
+            conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+            conn.exec_driver_sql(f"PRAGMA page_size={page_size}")
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+            logger.info(f"Database switched to auto_vacuum=INCREMENTAL with {page_size} byte pages")
+        except Exception as e:
+            logger.error(f"Error switching database to incremental auto-vacuum: {e}")
+            raise
+        finally:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+
+if __name__ == '__main__':
+    migrate_auto_vacuum()
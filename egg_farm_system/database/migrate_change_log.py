@@ -0,0 +1,38 @@
+"""
+Migration to seed the sync change log with the rows that predate it.
+
+Only flushes made after ``change_log`` existed are captured, so the first
+bundle exported from an existing database would miss every older row. Each
+synced row without a change log entry gets an ``insert`` entry.
+"""
+import logging
+
+from sqlalchemy import text
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.sync import SYNCED_TABLES
+from egg_farm_system.utils.time_utils import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_change_log():
+    if DatabaseManager._engine is None:
+        DatabaseManager.initialize()
+    try:
+        seeded = 0
+        with DatabaseManager._engine.begin() as conn:
+            for table in SYNCED_TABLES:
+                seeded += conn.execute(text(
+                    f"INSERT INTO change_log (table_name, row_id, operation, changed_at) "
+                    f"SELECT :table, id, 'insert', :now FROM {table} "
+                    f"WHERE id NOT IN (SELECT row_id FROM change_log WHERE table_name = :table) ORDER BY id"
+                ), {"table": table, "now": utcnow_naive()}).rowcount
+        logger.info(f"Seeded the change log with {seeded} existing rows")
+    except Exception as e:
+        logger.error(f"Error seeding the change log: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    migrate_change_log()
@@ -11,22 +11,22 @@ Tables covered:
 import logging
 import sqlite3
 
-from egg_farm_system.config import DATABASE_URL
+from egg_farm_system.database.db import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
 
-def _db_path_from_url(db_url: str) -> str:
-    if db_url.startswith("sqlite:///"):
-        return db_url.replace("sqlite:///", "", 1)
-    return db_url
-
-
 def _column_exists(cursor, table_name: str, column_name: str) -> bool:
     cursor.execute(f"PRAGMA table_info({table_name})")
     return column_name in {row[1] for row in cursor.fetchall()}
 
 
+def _table_has_constraint(cursor, table_name: str, constraint_name: str) -> bool:
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    row = cursor.fetchone()
+    return bool(row and row[0] and constraint_name in row[0])
+
+
 def _get_or_create_default_farm_id(cursor) -> int:
     cursor.execute("SELECT id FROM farms ORDER BY id LIMIT 1")
     row = cursor.fetchone()
@@ -113,7 +113,7 @@ def _rebuild_egg_inventory_for_farm_scoping(cursor):
 
 
 def migrate_farm_scope_inventory_accounting():
-    db_path = _db_path_from_url(DATABASE_URL)
+    db_path = DatabaseManager.database_path()
     conn = sqlite3.connect(db_path)
 
     try:
@@ -162,10 +162,13 @@ def migrate_farm_scope_inventory_accounting():
         )
         cursor.execute("UPDATE ledgers SET farm_id = ? WHERE farm_id IS NULL", (default_farm_id,))
 
-        # Rebuild constrained tables for farm-scoped uniqueness.
+        # Rebuild constrained tables for farm-scoped uniqueness (only once;
+        # rebuilding drops triggers attached to these tables).
         cursor.execute("PRAGMA foreign_keys=OFF")
-        _rebuild_raw_materials_for_farm_scoping(cursor)
-        _rebuild_egg_inventory_for_farm_scoping(cursor)
+        if not _table_has_constraint(cursor, "raw_materials", "uq_raw_material_farm_name"):
+            _rebuild_raw_materials_for_farm_scoping(cursor)
+        if not _table_has_constraint(cursor, "egg_inventory", "uq_egg_inventory_farm_grade"):
+            _rebuild_egg_inventory_for_farm_scoping(cursor)
         cursor.execute("PRAGMA foreign_keys=ON")
 
         # Helpful indexes for filtered queries.
@@ -29,6 +29,35 @@ def _pick_template_materials(session):
     return [template_by_name[name] for name in sorted(template_by_name.keys())]
 
 
+def backfill_farm_feed_materials(session, farm_id, template_materials=None):
+    """Create any template feed materials missing for ``farm_id``; return the number created."""
+    if template_materials is None:
+        template_materials = _pick_template_materials(session)
+
+    created_count = 0
+    for template in template_materials:
+        exists = session.query(RawMaterial).filter(
+            RawMaterial.farm_id == farm_id,
+            RawMaterial.name == template.name,
+        ).first()
+        if exists:
+            continue
+
+        row = RawMaterial(
+            farm_id=farm_id,
+            name=template.name,
+            unit=template.unit,
+            current_stock=0.0,
+            total_quantity_purchased=0.0,
+            total_cost_purchased_afg=0.0,
+            total_cost_purchased_usd=0.0,
+            low_stock_alert=template.low_stock_alert,
+        )
+        session.add(row)
+        created_count += 1
+    return created_count
+
+
 def migrate_feed_material_template_backfill():
     session = DatabaseManager.get_session()
     try:
@@ -41,26 +70,7 @@ def migrate_feed_material_template_backfill():
         farms = session.query(Farm).all()
         created_count = 0
         for farm in farms:
-            for template in template_materials:
-                exists = session.query(RawMaterial).filter(
-                    RawMaterial.farm_id == farm.id,
-                    RawMaterial.name == template.name,
-                ).first()
-                if exists:
-                    continue
-
-                row = RawMaterial(
-                    farm_id=farm.id,
-                    name=template.name,
-                    unit=template.unit,
-                    current_stock=0.0,
-                    total_quantity_purchased=0.0,
-                    total_cost_purchased_afg=0.0,
-                    total_cost_purchased_usd=0.0,
-                    low_stock_alert=template.low_stock_alert,
-                )
-                session.add(row)
-                created_count += 1
+            created_count += backfill_farm_feed_materials(session, farm.id, template_materials)
 
         session.commit()
         logger.info("Feed material template backfill completed, created %s rows", created_count)
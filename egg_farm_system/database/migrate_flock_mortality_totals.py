@@ -0,0 +1,47 @@
+"""
+Migration to add the cumulative mortality columns to `flocks` and backfill them.
+
+``Flock.get_live_count`` answers from ``mortality_series`` with a binary search
+instead of loading every mortality row. Flocks whose series is still NULL are
+rebuilt from the `mortalities` table.
+"""
+import logging
+
+from sqlalchemy import text
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import Flock
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = {
+    "total_mortality": "INTEGER NOT NULL DEFAULT 0",
+    "mortality_series": "TEXT",
+}
+
+
+def migrate_flock_mortality_totals():
+    session = DatabaseManager.get_session()
+    try:
+        conn = session.connection()
+        existing = {row[1] for row in conn.execute(text("PRAGMA table_info('flocks')"))}
+        for name, definition in _COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE flocks ADD COLUMN {name} {definition}"))
+                logger.info(f"Added column {name} to flocks")
+
+        flock_ids = [row[0] for row in conn.execute(text("SELECT id FROM flocks WHERE mortality_series IS NULL"))]
+        if flock_ids:
+            Flock.rebuild_mortality_totals(session, flock_ids)
+        session.commit()
+        logger.info(f"Flock mortality totals migration applied ({len(flock_ids)} flocks backfilled)")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error applying flock mortality totals migration: {e}")
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    migrate_flock_mortality_totals()
@@ -0,0 +1,81 @@
+"""
+Migration to bring indexes in line with the reviewed set declared in models.
+
+``create_all`` only builds indexes together with new tables, so existing
+databases get the composite indexes (``(shed_id, date)``, ``(farm_id, date)``,
+the covering ledger index) here. Indexes that are no longer declared and whose
+columns are a leading prefix of another index on the same table are dropped:
+the ``index=True`` duplicates of explicit ``Index(...)`` entries, the
+single-column indexes superseded by composites and the copies created by
+older migrations.
+"""
+import logging
+
+from sqlalchemy import text
+
+from egg_farm_system.database.db import Base, DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def _table_indexes(conn, table):
+    """Return ``{name: (unique, origin, columns)}`` for every index on ``table``."""
+    indexes = {}
+    for row in conn.execute(text(f"PRAGMA index_list('{table}')")).fetchall():
+        name, unique, origin = row[1], bool(row[2]), row[3]
+        columns = tuple(
+            info[2] for info in conn.execute(text(f"PRAGMA index_info('{name}')")).fetchall()
+        )
+        indexes[name] = (unique, origin, columns)
+    return indexes
+
+
+def redundant_indexes(conn):
+    """Yield ``(table, index name)`` for undeclared indexes covered by another index."""
+    declared = {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+    for table in Base.metadata.tables:
+        indexes = _table_indexes(conn, table)
+        for name, (unique, origin, columns) in indexes.items():
+            # Only plain CREATE INDEX entries are candidates; never constraint indexes
+            if name in declared or unique or origin != "c" or not columns:
+                continue
+            for other, (_, _, other_columns) in indexes.items():
+                if other != name and other_columns[:len(columns)] == columns:
+                    yield table, name
+                    break
+
+
+def migrate_index_review():
+    """Create declared indexes that are missing and drop redundant ones."""
+    session = DatabaseManager.get_session()
+    try:
+        conn = session.connection()
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+        dropped = []
+        # Re-evaluate after each drop so one of two identical indexes survives
+        while True:
+            candidate = next(redundant_indexes(conn), None)
+            if candidate is None:
+                break
+            table, name = candidate
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+            dropped.append(name)
+
+        conn.execute(text("ANALYZE"))
+        session.commit()
+        if dropped:
+            logger.info(f"Dropped redundant indexes: {', '.join(dropped)}")
+        logger.info("Index review migration applied")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error applying index review migration: {e}")
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    migrate_index_review()
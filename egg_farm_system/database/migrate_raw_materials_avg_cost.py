@@ -15,9 +15,9 @@ def migrate_raw_materials_avg_cost():
     conn = None
     try:
         # Import here to avoid circular imports
-        from egg_farm_system.config import DB_PATH
+        from egg_farm_system.database.db import DatabaseManager
         
-        conn = sqlite3.connect(str(DB_PATH))
+        conn = sqlite3.connect(DatabaseManager.database_path())
         cursor = conn.cursor()
         
         # Check if columns exist and add them if they don't
@@ -0,0 +1,35 @@
+"""
+Migration to create the FTS5 full-text search index and its sync triggers.
+
+The DDL lives in ``search_index.py``; ``schema_fingerprint()`` adds it to this
+migration's checksum so changing the table or a trigger re-runs the migration.
+"""
+import logging
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.search_index import ensure_search_index, schema_ddl
+
+logger = logging.getLogger(__name__)
+
+
+def schema_fingerprint():
+    return schema_ddl()
+
+
+def migrate_search_index():
+    """Create the global search index, or reinstall its triggers and repopulate it."""
+    session = DatabaseManager.get_session()
+    try:
+        ensure_search_index(session.connection(), rebuild=True)
+        session.commit()
+        logger.info("Search index migration applied")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error applying search index migration: {e}")
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    migrate_search_index()
@@ -0,0 +1,47 @@
+"""
+Migration to add the settings version counter used to invalidate settings caches.
+
+``settings_version`` holds a single row whose ``version`` is bumped by triggers
+on every insert, update or delete of ``settings``, whichever process or code
+path makes the change.
+"""
+import logging
+
+from sqlalchemy import text
+
+from egg_farm_system.database.db import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_VERSION_TABLE = "settings_version"
+
+_BUMP = f"UPDATE {SETTINGS_VERSION_TABLE} SET version = version + 1 WHERE id = 1;"
+
+
+def migrate_settings_version():
+    """Create the settings version table and the triggers that bump it."""
+    session = DatabaseManager.get_session()
+    try:
+        conn = session.connection()
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SETTINGS_VERSION_TABLE} ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), "
+            "version INTEGER NOT NULL DEFAULT 0)"
+        ))
+        conn.execute(text(f"INSERT OR IGNORE INTO {SETTINGS_VERSION_TABLE} (id, version) VALUES (1, 0)"))
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            name = f"trg_settings_version_{event.lower()}"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            conn.execute(text(f"CREATE TRIGGER {name} AFTER {event} ON settings BEGIN {_BUMP} END"))
+        session.commit()
+        logger.info("Settings version migration applied")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error applying settings version migration: {e}")
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    migrate_settings_version()
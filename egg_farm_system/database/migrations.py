@@ -0,0 +1,167 @@
+"""
+Versioned migration registry and runner.
+
+Applied migrations are recorded in the ``schema_migrations`` table together
+with a checksum of the migration module's source, so startup only runs
+migrations that are new or whose code changed since they were applied.
+Every migration in the registry must stay idempotent: a changed checksum
+re-runs it against a database where an older version already ran.
+
+A migration that applies DDL defined in another module exposes it through a
+module-level ``schema_fingerprint()`` returning that text, which is hashed
+together with the source.
+"""
+import hashlib
+import importlib
+import inspect
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# Ordered registry; the position is the schema version. Append new migrations
+# at the end and never reorder or remove existing entries.
+MIGRATIONS = [
+    "migrate_sales_table",
+    "migrate_payment_method",
+    "migrate_raw_materials_avg_cost",
+    "migrate_add_farm_id",
+    "migrate_farm_scope_inventory_accounting",
+    "migrate_raw_material_farm_scope_consistency",
+    "migrate_feed_material_template_backfill",
+    "migrate_egg_inventory",
+    "migrate_egg_production_packaging",
+    "migrate_search_index",
+    "migrate_settings_version",
+    "migrate_index_review",
+    "migrate_flock_mortality_totals",
+    "migrate_auto_vacuum",
+    "migrate_change_log",
+]
+
+
+class Migration:
+    """A registered migration: ``egg_farm_system.database.<name>.<name>()``"""
+
+    def __init__(self, version, name):
+        self.version = version
+        self.name = name
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(f"egg_farm_system.database.{self.name}")
+        return self._module
+
+    @property
+    def checksum(self) -> str:
+        digest = hashlib.sha256(inspect.getsource(self.module).encode("utf-8"))
+        fingerprint = getattr(self.module, "schema_fingerprint", None)
+        if fingerprint is not None:
+            digest.update(fingerprint().encode("utf-8"))
+        return digest.hexdigest()
+
+    def run(self):
+        getattr(self.module, self.name)()
+
+    def __repr__(self):
+        return f"<Migration {self.version}: {self.name}>"
+
+
+def registered_migrations():
+    """Return the registry as ``Migration`` objects in version order."""
+    return [Migration(version, name) for version, name in enumerate(MIGRATIONS, start=1)]
+
+
+def ensure_migrations_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+            "version INTEGER PRIMARY KEY, "
+            "name TEXT NOT NULL UNIQUE, "
+            "checksum TEXT NOT NULL, "
+            "applied_at TEXT NOT NULL, "
+            "duration_ms REAL NOT NULL)"
+        ))
+
+
+def applied_migrations(engine) -> dict:
+    """Return ``{name: checksum}`` for every recorded migration."""
+    ensure_migrations_table(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT name, checksum FROM {MIGRATIONS_TABLE}")).fetchall()
+    return {name: checksum for name, checksum in rows}
+
+
+def pending_migrations(engine):
+    """Return registered migrations that were never applied or whose source changed."""
+    applied = applied_migrations(engine)
+    pending = []
+    for migration in registered_migrations():
+        recorded = applied.get(migration.name)
+        if recorded is None:
+            pending.append(migration)
+        elif recorded != migration.checksum:
+            logger.info("Migration %s changed since it was applied; re-running", migration.name)
+            pending.append(migration)
+    return pending
+
+
+def _record(engine, migration, checksum, duration_ms):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"INSERT OR REPLACE INTO {MIGRATIONS_TABLE} "
+                "(version, name, checksum, applied_at, duration_ms) "
+                "VALUES (:version, :name, :checksum, :applied_at, :duration_ms)"
+            ),
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "checksum": checksum,
+                "applied_at": datetime.now().isoformat(timespec="seconds"),
+                "duration_ms": duration_ms,
+            },
+        )
+
+
+def run_migrations(engine):
+    """Apply pending migrations in order and return the names that ran.
+
+    A failing migration is not recorded and its exception propagates, so it
+    is retried on the next start.
+    """
+    started = time.perf_counter()
+    pending = pending_migrations(engine)
+    for migration in pending:
+        checksum = migration.checksum
+        migration_start = time.perf_counter()
+        logger.info("Running migration %s: %s", migration.version, migration.name)
+        migration.run()
+        duration_ms = (time.perf_counter() - migration_start) * 1000
+        _record(engine, migration, checksum, duration_ms)
+        logger.info("Migration %s completed in %.1f ms", migration.name, duration_ms)
+
+    total_ms = (time.perf_counter() - started) * 1000
+    if pending:
+        logger.info("Applied %s migration(s) in %.1f ms", len(pending), total_ms)
+    else:
+        logger.info("Database schema up to date (version %s, checked in %.1f ms)", len(MIGRATIONS), total_ms)
+    return [migration.name for migration in pending]
+
+
+__all__ = [
+    'MIGRATIONS',
+    'MIGRATIONS_TABLE',
+    'Migration',
+    'applied_migrations',
+    'pending_migrations',
+    'registered_migrations',
+    'run_migrations',
+]
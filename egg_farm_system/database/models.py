@@ -1,14 +1,24 @@
 """
 SQLAlchemy models for Egg Farm Management System
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Enum, Index, UniqueConstraint
+from sqlalchemy import (
+    Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Enum, Index, UniqueConstraint, func, select,
+)
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from itertools import accumulate
 import enum
+import json
 
 from egg_farm_system.database.db import Base
 from egg_farm_system.utils.time_utils import utcnow_naive
 
+def _day_ordinal(value):
+    """Proleptic ordinal of the day of a date or datetime"""
+    return value.toordinal() if isinstance(value, date) else date.fromisoformat(str(value)[:10]).toordinal()
+
+
 # Enums
 class SalaryPeriod(enum.Enum):
     MONTHLY = "Monthly"
@@ -59,7 +69,7 @@ class Shed(Base):
     __tablename__ = "sheds"
     
     id = Column(Integer, primary_key=True)
-    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=False, index=True)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=False)
     name = Column(String(100), nullable=False)
     capacity = Column(Integer, nullable=False)  # Maximum bird capacity
     created_at = Column(DateTime, default=utcnow_naive)
@@ -84,13 +94,19 @@ class Flock(Base):
     __tablename__ = "flocks"
     
     id = Column(Integer, primary_key=True)
-    shed_id = Column(Integer, ForeignKey("sheds.id"), nullable=False, index=True)
+    shed_id = Column(Integer, ForeignKey("sheds.id"), nullable=False)
     name = Column(String(100), nullable=False)
     start_date = Column(DateTime, nullable=False)
     initial_count = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=utcnow_naive)
     updated_at = Column(DateTime, default=utcnow_naive, onupdate=utcnow_naive)
     
+    # Cumulative mortality, maintained by FlockManager so live counts need no
+    # mortality rows. mortality_series is JSON [[day ordinal, deaths through
+    # that day], ...] sorted by day; NULL means not maintained yet.
+    total_mortality = Column(Integer, default=0, nullable=False)
+    mortality_series = Column(Text)
+    
     # Relationships
     shed = relationship("Shed", back_populates="flocks")
     mortalities = relationship("Mortality", back_populates="flock", cascade="all, delete-orphan")
@@ -100,22 +116,78 @@ class Flock(Base):
         Index('idx_flock_shed_id', 'shed_id'),
     )
     
+    def _cumulative_mortality(self):
+        """Return (day ordinals, cumulative deaths) parsed from mortality_series"""
+        raw = self.mortality_series
+        cached = getattr(self, '_mortality_cache', None)
+        if cached is None or cached[0] is not raw:
+            pairs = json.loads(raw) if raw else []
+            cached = (raw, [day for day, _ in pairs], [total for _, total in pairs])
+            self._mortality_cache = cached
+        return cached[1], cached[2]
+    
+    def _store_cumulative_mortality(self, days, cumulative):
+        self.mortality_series = json.dumps([[day, total] for day, total in zip(days, cumulative)])
+        self.total_mortality = cumulative[-1] if cumulative else 0
+    
+    def set_mortality_totals(self, daily_deaths):
+        """Rebuild the cumulative totals from ``(date, count)`` pairs"""
+        per_day = {}
+        for day, count in daily_deaths:
+            per_day[_day_ordinal(day)] = per_day.get(_day_ordinal(day), 0) + count
+        days = sorted(per_day)
+        cumulative = list(accumulate(per_day[day] for day in days))
+        self._store_cumulative_mortality(days, cumulative)
+    
+    @classmethod
+    def rebuild_mortality_totals(cls, session, flock_ids=None):
+        """Recompute the cumulative totals of ``flock_ids`` (all flocks if None) from mortality rows"""
+        day = func.date(Mortality.date)
+        query = select(Mortality.flock_id, day, func.sum(Mortality.count)).group_by(Mortality.flock_id, day)
+        flocks = session.query(cls)
+        if flock_ids is not None:
+            query = query.where(Mortality.flock_id.in_(flock_ids))
+            flocks = flocks.filter(cls.id.in_(flock_ids))
+        daily = {}
+        for flock_id, mortality_day, count in session.execute(query):
+            daily.setdefault(flock_id, []).append((mortality_day, count))
+        for flock in flocks:
+            flock.set_mortality_totals(daily.get(flock.id, ()))
+    
+    def record_mortality(self, day, count):
+        """Add ``count`` deaths on ``day`` to the totals; a negative count removes them"""
+        if self.mortality_series is None:
+            raise ValueError(f"Mortality totals of flock {self.id} are not maintained yet")
+        days, cumulative = (list(values) for values in self._cumulative_mortality())
+        ordinal = _day_ordinal(day)
+        i = bisect_left(days, ordinal)
+        if i == len(days) or days[i] != ordinal:
+            days.insert(i, ordinal)
+            cumulative.insert(i, cumulative[i - 1] if i else 0)
+        for j in range(i, len(days)):
+            cumulative[j] += count
+        if cumulative[i] == (cumulative[i - 1] if i else 0):
+            # No deaths left on that day
+            del days[i], cumulative[i]
+        self._store_cumulative_mortality(days, cumulative)
+    
     def get_live_count(self, as_of_date=None):
-        """Calculate live bird count"""
+        """Calculate live bird count
+        
+        Deaths are counted per day, so every mortality recorded on the day of
+        ``as_of_date`` is included. Uses a binary search over the maintained
+        cumulative totals; flocks without them fall back to the mortality rows.
+        """
         if as_of_date is None:
             as_of_date = utcnow_naive()
         
-        # Ensure as_of_date is a datetime for comparison
-        if hasattr(as_of_date, 'year') and not hasattr(as_of_date, 'hour'):
-             # Convert date to datetime at end of day to include all events of that day
-             as_of_date = datetime(as_of_date.year, as_of_date.month, as_of_date.day, 23, 59, 59)
-
-        total_deaths = 0
-        for mortality in self.mortalities:
-            if mortality.date <= as_of_date:
-                total_deaths += mortality.count
+        if self.mortality_series is None:
+            end_of_day = datetime(as_of_date.year, as_of_date.month, as_of_date.day, 23, 59, 59, 999999)
+            return self.initial_count - sum(m.count for m in self.mortalities if m.date <= end_of_day)
         
-        return self.initial_count - total_deaths
+        days, cumulative = self._cumulative_mortality()
+        i = bisect_right(days, _day_ordinal(as_of_date))
+        return self.initial_count - (cumulative[i - 1] if i else 0)
     
     def get_age_days(self, as_of_date=None):
         """Get flock age in days"""
@@ -140,8 +212,8 @@ class Mortality(Base):
     __tablename__ = "mortalities"
     
     id = Column(Integer, primary_key=True)
-    flock_id = Column(Integer, ForeignKey("flocks.id"), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    flock_id = Column(Integer, ForeignKey("flocks.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
     count = Column(Integer, nullable=False)
     notes = Column(Text)
     created_at = Column(DateTime, default=utcnow_naive)
@@ -163,8 +235,8 @@ class Medication(Base):
     __tablename__ = "medications"
 
     id = Column(Integer, primary_key=True)
-    flock_id = Column(Integer, ForeignKey("flocks.id"), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    flock_id = Column(Integer, ForeignKey("flocks.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
     medication_name = Column(String(200), nullable=False)
     dose = Column(Float, nullable=False)
     dose_unit = Column(String(50), default="ml")
@@ -189,8 +261,8 @@ class EggProduction(Base):
     __tablename__ = "egg_productions"
     
     id = Column(Integer, primary_key=True)
-    shed_id = Column(Integer, ForeignKey("sheds.id"), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    shed_id = Column(Integer, ForeignKey("sheds.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
     small_count = Column(Integer, default=0)
     medium_count = Column(Integer, default=0)
     large_count = Column(Integer, default=0)
@@ -205,7 +277,7 @@ class EggProduction(Base):
     shed = relationship("Shed", back_populates="egg_productions")
     
     __table_args__ = (
-        Index('idx_egg_prod_shed_id', 'shed_id'),
+        Index('idx_egg_prod_shed_date', 'shed_id', 'date'),
         Index('idx_egg_prod_date', 'date'),
     )
     
@@ -261,8 +333,8 @@ class FeedFormulation(Base):
     __tablename__ = "feed_formulations"
     
     id = Column(Integer, primary_key=True)
-    formula_id = Column(Integer, ForeignKey("feed_formulas.id"), nullable=False, index=True)
-    material_id = Column(Integer, ForeignKey("raw_materials.id"), nullable=False, index=True)
+    formula_id = Column(Integer, ForeignKey("feed_formulas.id"), nullable=False)
+    material_id = Column(Integer, ForeignKey("raw_materials.id"), nullable=False)
     percentage = Column(Float, nullable=False)  # Percentage by weight
     created_at = Column(DateTime, default=utcnow_naive)
     
@@ -284,8 +356,8 @@ class FeedBatch(Base):
     __tablename__ = "feed_batches"
     
     id = Column(Integer, primary_key=True)
-    formula_id = Column(Integer, ForeignKey("feed_formulas.id"), nullable=False, index=True)
-    batch_date = Column(DateTime, nullable=False, index=True)
+    formula_id = Column(Integer, ForeignKey("feed_formulas.id"), nullable=False)
+    batch_date = Column(DateTime, nullable=False)
     quantity_kg = Column(Float, nullable=False)
     cost_afg = Column(Float, nullable=False)
     cost_usd = Column(Float, nullable=False)
@@ -337,7 +409,7 @@ class EggInventory(Base):
     __tablename__ = "egg_inventory"
 
     id = Column(Integer, primary_key=True)
-    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True, index=True)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True)
     grade = Column(Enum(EggGrade), nullable=False)
     current_stock = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime, default=utcnow_naive)
@@ -347,7 +419,6 @@ class EggInventory(Base):
 
     __table_args__ = (
         UniqueConstraint('farm_id', 'grade', name='uq_egg_inventory_farm_grade'),
-        Index('idx_egg_inventory_farm_id', 'farm_id'),
     )
 
     def __repr__(self):
@@ -359,9 +430,9 @@ class FeedIssue(Base):
     __tablename__ = "feed_issues"
     
     id = Column(Integer, primary_key=True)
-    shed_id = Column(Integer, ForeignKey("sheds.id"), nullable=False, index=True)
-    feed_id = Column(Integer, ForeignKey("finished_feeds.id"), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    shed_id = Column(Integer, ForeignKey("sheds.id"), nullable=False)
+    feed_id = Column(Integer, ForeignKey("finished_feeds.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
     quantity_kg = Column(Float, nullable=False)
     cost_afg = Column(Float, nullable=False)
     cost_usd = Column(Float, nullable=False)
@@ -373,7 +444,7 @@ class FeedIssue(Base):
     feed = relationship("FinishedFeed", back_populates="feed_issues")
     
     __table_args__ = (
-        Index('idx_feed_issue_shed_id', 'shed_id'),
+        Index('idx_feed_issue_shed_date', 'shed_id', 'date'),
         Index('idx_feed_issue_feed_id', 'feed_id'),
         Index('idx_feed_issue_date', 'date'),
     )
@@ -422,9 +493,9 @@ class Ledger(Base):
     __tablename__ = "ledgers"
     
     id = Column(Integer, primary_key=True)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False, index=True)
+    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False)
     farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    date = Column(DateTime, nullable=False)
     description = Column(String(255), nullable=False)
     debit_afg = Column(Float, default=0)
     credit_afg = Column(Float, default=0)
@@ -440,7 +511,9 @@ class Ledger(Base):
     farm = relationship("Farm", back_populates="ledger_entries")
     
     __table_args__ = (
-        Index('idx_ledger_party_id', 'party_id'),
+        # Covers the party ledger listing (ordered by date) and balance sums
+        Index('idx_ledger_party_farm_date', 'party_id', 'farm_id', 'date',
+              'debit_afg', 'credit_afg', 'debit_usd', 'credit_usd'),
         Index('idx_ledger_date', 'date'),
         Index('idx_ledger_reference', 'reference_type', 'reference_id'),
     )
@@ -454,9 +527,9 @@ class Sale(Base):
     __tablename__ = "sales"
     
     id = Column(Integer, primary_key=True)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False, index=True)
-    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True, index=True)  # Farm producing the eggs
-    date = Column(DateTime, nullable=False, index=True)
+    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True)  # Farm producing the eggs
+    date = Column(DateTime, nullable=False)
     quantity = Column(Integer, nullable=False)  # Number of eggs
     rate_afg = Column(Float, nullable=False)  # Price per egg in AFG
     rate_usd = Column(Float, nullable=False)  # Price per egg in USD
@@ -480,7 +553,7 @@ class Sale(Base):
     
     __table_args__ = (
         Index('idx_sale_party_id', 'party_id'),
-        Index('idx_sale_farm_id', 'farm_id'),
+        Index('idx_sale_farm_date', 'farm_id', 'date'),
         Index('idx_sale_date', 'date'),
         {'extend_existing': True}
     )
@@ -494,9 +567,9 @@ class RawMaterialSale(Base):
     __tablename__ = "raw_material_sales"
     
     id = Column(Integer, primary_key=True)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False, index=True)
-    material_id = Column(Integer, ForeignKey("raw_materials.id"), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False)
+    material_id = Column(Integer, ForeignKey("raw_materials.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
     quantity = Column(Float, nullable=False)  # Quantity sold
     rate_afg = Column(Float, nullable=False)  # Sale price per unit in AFG
     rate_usd = Column(Float, nullable=False)  # Sale price per unit in USD
@@ -526,10 +599,10 @@ class Purchase(Base):
     __tablename__ = "purchases"
     
     id = Column(Integer, primary_key=True)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False, index=True)
-    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True, index=True)  # Farm making the purchase
-    material_id = Column(Integer, ForeignKey("raw_materials.id"), index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True)  # Farm making the purchase
+    material_id = Column(Integer, ForeignKey("raw_materials.id"))
+    date = Column(DateTime, nullable=False)
     quantity = Column(Float, nullable=False)  # in kg
     rate_afg = Column(Float, nullable=False)  # Price per unit in AFG
     rate_usd = Column(Float, nullable=False)  # Price per unit in USD
@@ -547,7 +620,7 @@ class Purchase(Base):
     
     __table_args__ = (
         Index('idx_purchase_party_id', 'party_id'),
-        Index('idx_purchase_farm_id', 'farm_id'),
+        Index('idx_purchase_farm_date', 'farm_id', 'date'),
         Index('idx_purchase_material_id', 'material_id'),
         Index('idx_purchase_date', 'date'),
     )
@@ -561,8 +634,8 @@ class Payment(Base):
     __tablename__ = "payments"
     
     id = Column(Integer, primary_key=True)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    party_id = Column(Integer, ForeignKey("parties.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
     amount_afg = Column(Float, nullable=False)
     amount_usd = Column(Float, nullable=False)
     payment_type = Column(String(50))  # Received, Paid
@@ -589,7 +662,7 @@ class RawMaterial(Base):
     __tablename__ = "raw_materials"
     
     id = Column(Integer, primary_key=True)
-    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True, index=True)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=True)
     name = Column(String(100), nullable=False)
     unit = Column(String(50), default="kg")
     current_stock = Column(Float, default=0.0)
@@ -612,7 +685,6 @@ class RawMaterial(Base):
 
     __table_args__ = (
         UniqueConstraint('farm_id', 'name', name='uq_raw_material_farm_name'),
-        Index('idx_raw_material_farm_id', 'farm_id'),
     )
 
     @property
@@ -635,9 +707,9 @@ class Expense(Base):
     __tablename__ = "expenses"
     
     id = Column(Integer, primary_key=True)
-    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=False, index=True)
-    party_id = Column(Integer, ForeignKey("parties.id"), index=True)  # Optional
-    date = Column(DateTime, nullable=False, index=True)
+    farm_id = Column(Integer, ForeignKey("farms.id"), nullable=False)
+    party_id = Column(Integer, ForeignKey("parties.id"))  # Optional
+    date = Column(DateTime, nullable=False)
     category = Column(String(50), nullable=False)
     description = Column(Text)
     amount_afg = Column(Float, nullable=False)
@@ -651,7 +723,7 @@ class Expense(Base):
     party = relationship("Party", back_populates="expenses")
     
     __table_args__ = (
-        Index('idx_expense_farm_id', 'farm_id'),
+        Index('idx_expense_farm_date', 'farm_id', 'date'),
         Index('idx_expense_party_id', 'party_id'),
         Index('idx_expense_date', 'date'),
     )
@@ -757,3 +829,69 @@ class Setting(Base):
     def __repr__(self):
         return f"<Setting {self.key}>"
 
+
+
+class ArchivedYear(Base):
+    """Closed year whose history was moved to a per-year archive database"""
+    __tablename__ = "archived_years"
+
+    year = Column(Integer, primary_key=True, autoincrement=False)
+    path = Column(String(500), nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime, default=utcnow_naive)
+
+    def __repr__(self):
+        return f"<ArchivedYear {self.year}>"
+
+
+class ChangeLogEntry(Base):
+    """One captured row change; ``seq`` orders all changes of this database"""
+    __tablename__ = "change_log"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # insert, update or delete
+    origin = Column(String(32))  # node id of the office that made it; NULL for this database
+    changed_at = Column(DateTime, nullable=False, default=utcnow_naive)
+    deltas = Column(Text)  # JSON {column: increment} of stock counter columns
+
+    __table_args__ = (
+        Index('idx_change_log_row', 'table_name', 'row_id'),
+        {'sqlite_autoincrement': True},  # sequence numbers are never reused
+    )
+
+    def __repr__(self):
+        return f"<ChangeLogEntry {self.seq} {self.operation} {self.table_name}:{self.row_id}>"
+
+
+class SyncRow(Base):
+    """Global id of a synced row, shared by every office holding a copy
+
+    A row matched by natural key can have several uids; the first one
+    mapped is the one exported.
+    """
+    __tablename__ = "sync_rows"
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    uid = Column(String(80), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('table_name', 'uid', name='uq_sync_rows_table_uid'),
+        Index('idx_sync_rows_row', 'table_name', 'row_id'),
+    )
+
+
+class SyncPeer(Base):
+    """Sync point with another office's database"""
+    __tablename__ = "sync_peers"
+
+    node_id = Column(String(32), primary_key=True)
+    sent_seq = Column(Integer, nullable=False, default=0)  # our changes the peer confirmed applying
+    received_seq = Column(Integer, nullable=False, default=0)  # peer changes applied here
+    last_sync_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<SyncPeer {self.node_id}>"
@@ -0,0 +1,271 @@
+"""
+SQLite FTS5 full-text index backing global search.
+
+The ``search_index`` virtual table holds one row per searchable entity
+(farm, shed, flock, party, sale, purchase, expense, production, material,
+feed). Rows are maintained by SQL triggers on the source tables so every
+write path (ORM, raw SQL, migrations, imports) keeps the index in sync.
+
+Each row's rowid is derived from the source primary key and a per-type code
+(``id * 16 + code``) so trigger updates and deletes hit the index by rowid
+instead of scanning it.
+"""
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "search_index"
+ROWID_STRIDE = 16
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    "title, body, subtitle UNINDEXED, entity_type UNINDEXED, entity_id UNINDEXED, sort_key UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+
+class _Source:
+    """Describe how one entity type is projected into the search index."""
+
+    def __init__(self, code, entity_type, table, from_clause, title, subtitle, body, sort_key="''"):
+        self.code = code
+        self.entity_type = entity_type
+        self.table = table
+        self.from_clause = from_clause
+        self.title = title
+        self.subtitle = subtitle
+        self.body = body
+        self.sort_key = sort_key
+
+    def rowid_expr(self, id_expr):
+        return f"({id_expr}) * {ROWID_STRIDE} + {self.code}"
+
+    def insert_sql(self, where):
+        return (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, entity_type, entity_id, title, subtitle, body, sort_key) "
+            f"SELECT {self.rowid_expr('src.id')}, '{self.entity_type}', src.id, "
+            f"{self.title}, {self.subtitle}, {self.body}, {self.sort_key} "
+            f"FROM {self.from_clause} WHERE {where}"
+        )
+
+    def delete_sql(self, where):
+        return (
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+            f"(SELECT {self.rowid_expr('src.id')} FROM {self.from_clause} WHERE {where})"
+        )
+
+
+def _day(column):
+    return f"substr({column}, 1, 10)"
+
+
+SOURCES = [
+    _Source(
+        1, "farm", "farms", "farms src",
+        title="src.name",
+        subtitle="coalesce(src.location, '')",
+        body="src.name || ' ' || coalesce(src.location, '')",
+    ),
+    _Source(
+        2, "shed", "sheds", "sheds src JOIN farms fa ON fa.id = src.farm_id",
+        title="src.name",
+        subtitle="'Farm: ' || fa.name",
+        body="src.name || ' ' || fa.name",
+    ),
+    _Source(
+        3, "flock", "flocks",
+        "flocks src JOIN sheds sh ON sh.id = src.shed_id JOIN farms fa ON fa.id = sh.farm_id",
+        title="src.name",
+        subtitle="'Shed: ' || sh.name || ', Farm: ' || fa.name",
+        body="src.name",
+    ),
+    _Source(
+        4, "party", "parties", "parties src",
+        title="src.name",
+        subtitle="coalesce(nullif(src.phone, ''), nullif(src.address, ''), '')",
+        body="src.name || ' ' || coalesce(src.phone, '')",
+    ),
+    _Source(
+        5, "sale", "sales", "sales src JOIN parties pa ON pa.id = src.party_id",
+        title="'Sale to ' || pa.name",
+        subtitle=f"src.quantity || ' eggs on ' || {_day('src.date')}",
+        body="pa.name || ' ' || coalesce(src.notes, '')",
+        sort_key="src.date",
+    ),
+    _Source(
+        6, "purchase", "purchases",
+        "purchases src JOIN parties pa ON pa.id = src.party_id "
+        "LEFT JOIN raw_materials rm ON rm.id = src.material_id",
+        title="'Purchase: ' || coalesce(rm.name, 'Unknown')",
+        subtitle=f"'From ' || pa.name || ' on ' || {_day('src.date')}",
+        body="pa.name || ' ' || coalesce(rm.name, '') || ' ' || coalesce(src.notes, '')",
+        sort_key="src.date",
+    ),
+    _Source(
+        7, "expense", "expenses", "expenses src",
+        title="src.category || ': ' || printf('%.0f', src.amount_afg) || ' AFG'",
+        subtitle=f"'Date: ' || {_day('src.date')}",
+        body="src.category || ' ' || coalesce(src.description, '')",
+        sort_key="src.date",
+    ),
+    _Source(
+        8, "production", "egg_productions",
+        "egg_productions src JOIN sheds sh ON sh.id = src.shed_id JOIN farms fa ON fa.id = sh.farm_id",
+        title="'Production: ' || sh.name",
+        subtitle=(
+            "(coalesce(src.small_count, 0) + coalesce(src.medium_count, 0) + coalesce(src.large_count, 0))"
+            f" || ' eggs on ' || {_day('src.date')}"
+        ),
+        body="sh.name || ' ' || fa.name",
+        sort_key="src.date",
+    ),
+    _Source(
+        9, "material", "raw_materials", "raw_materials src",
+        title="src.name",
+        subtitle="'Stock: ' || printf('%.2f', coalesce(src.current_stock, 0)) || ' ' || coalesce(src.unit, '')",
+        body="src.name",
+    ),
+    _Source(
+        10, "feed", "finished_feeds", "finished_feeds src",
+        title="upper(substr(src.feed_type, 1, 1)) || lower(substr(src.feed_type, 2))",
+        subtitle="'Stock: ' || printf('%.2f', coalesce(src.current_stock, 0)) || ' kg'",
+        body="src.feed_type",
+    ),
+]
+
+SOURCES_BY_TYPE = {source.entity_type: source for source in SOURCES}
+
+# Parent columns shown in child rows: (parent table, watched columns, child type, child filter on NEW.id)
+DEPENDENCIES = [
+    ("farms", "name", "shed", "src.farm_id = NEW.id"),
+    ("farms", "name", "flock", "sh.farm_id = NEW.id"),
+    ("farms", "name", "production", "sh.farm_id = NEW.id"),
+    ("sheds", "name, farm_id", "flock", "src.shed_id = NEW.id"),
+    ("sheds", "name, farm_id", "production", "src.shed_id = NEW.id"),
+    ("parties", "name", "sale", "src.party_id = NEW.id"),
+    ("parties", "name", "purchase", "src.party_id = NEW.id"),
+    ("raw_materials", "name", "purchase", "src.material_id = NEW.id"),
+]
+
+
+def _trigger_statements():
+    """Yield (name, CREATE TRIGGER statement) pairs keeping the index in sync."""
+    for source in SOURCES:
+        prefix = f"trg_search_{source.table}"
+        delete_old = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {source.rowid_expr('OLD.id')};"
+        insert_new = source.insert_sql("src.id = NEW.id") + ";"
+        yield (
+            f"{prefix}_ai",
+            f"CREATE TRIGGER {prefix}_ai AFTER INSERT ON {source.table} BEGIN {insert_new} END",
+        )
+        yield (
+            f"{prefix}_au",
+            f"CREATE TRIGGER {prefix}_au AFTER UPDATE ON {source.table} BEGIN {delete_old} {insert_new} END",
+        )
+        yield (
+            f"{prefix}_ad",
+            f"CREATE TRIGGER {prefix}_ad AFTER DELETE ON {source.table} BEGIN {delete_old} END",
+        )
+
+    for parent, columns, child_type, where in DEPENDENCIES:
+        child = SOURCES_BY_TYPE[child_type]
+        name = f"trg_search_{parent}_{child.table}_au"
+        yield (
+            name,
+            f"CREATE TRIGGER {name} AFTER UPDATE OF {columns} ON {parent} BEGIN "
+            f"{child.delete_sql(where)}; {child.insert_sql(where)}; END",
+        )
+
+
+def fts5_available(connection) -> bool:
+    """Return True when the SQLite build backing ``connection`` ships FTS5."""
+    try:
+        rows = connection.execute(text("PRAGMA compile_options")).fetchall()
+        return any(str(row[0]).upper() == "ENABLE_FTS5" for row in rows)
+    except Exception:
+        return False
+
+
+def schema_ddl() -> str:
+    """The table and trigger statements defining the index, in install order."""
+    return ";\n".join([CREATE_TABLE_SQL, *(statement for _, statement in _trigger_statements())])
+
+
+def _table_sql(connection):
+    row = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SEARCH_TABLE},
+    ).first()
+    return None if row is None else row[0]
+
+
+def search_index_exists(connection) -> bool:
+    return _table_sql(connection) is not None
+
+
+def rebuild_search_index(connection):
+    """Repopulate the index from the source tables."""
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    for source in SOURCES:
+        connection.execute(text(source.insert_sql("1 = 1")))
+    connection.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"))
+
+
+def install_search_triggers(connection):
+    """(Re)create the triggers that keep the index in sync with source tables."""
+    for name, statement in _trigger_statements():
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        connection.execute(text(statement))
+
+
+def ensure_search_index(connection, rebuild=False) -> bool:
+    """Create the FTS5 table if missing and make sure its triggers are installed.
+
+    A table created with different options than ``CREATE_TABLE_SQL`` is
+    recreated. ``rebuild`` repopulates an existing index, for when the
+    projections in ``SOURCES`` changed. Returns True when the index is
+    available and False when this SQLite build has no FTS5 support.
+    """
+    existing = _table_sql(connection)
+    if existing is not None and existing != CREATE_TABLE_SQL:
+        logger.info("Full-text search index definition changed; recreating it")
+        connection.execute(text(f"DROP TABLE {SEARCH_TABLE}"))
+        existing = None
+
+    created = False
+    if existing is None:
+        if not fts5_available(connection):
+            logger.warning("SQLite FTS5 is not available; global search falls back to LIKE queries")
+            return False
+        connection.execute(text(CREATE_TABLE_SQL))
+        created = True
+
+    # Table rebuilds in older migrations drop attached triggers, so always reinstall them.
+    install_search_triggers(connection)
+    if created or rebuild:
+        rebuild_search_index(connection)
+        logger.info("Created full-text search index" if created else "Rebuilt full-text search index")
+    return True
+
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 prefix query matching every term."""
+    terms = []
+    for term in query.split():
+        term = term.replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*')
+    return " ".join(terms)
+
+
+__all__ = [
+    'SEARCH_TABLE',
+    'SOURCES',
+    'build_match_query',
+    'ensure_search_index',
+    'fts5_available',
+    'install_search_triggers',
+    'rebuild_search_index',
+    'search_index_exists',
+]
@@ -0,0 +1,215 @@
+"""
+Read snapshot of the database for analytics.
+
+Forecasts, inventory optimization and budgets run long read queries. On the
+live file such a query pins a WAL read transaction, and no checkpoint can
+finish while it is open, so the WAL grows under data entry. ``read_snapshot``
+keeps a copy of the database in ``snapshots/`` next to it, made with the SQLite
+backup API, and hands out read-only sessions on the copy. Heavy analysis then
+never touches the live file.
+
+The copy is refreshed when it is older than ``ANALYTICS_SNAPSHOT_MAX_AGE``,
+by the scheduled task, or on demand. Each refresh writes a new file, so
+sessions still reading an earlier copy are not disturbed; a replaced copy is
+deleted once no session has it open any more.
+``describe()`` tells the user how current the figures are.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from egg_farm_system import config
+from egg_farm_system.database.db import READER_POOL_SIZE, DatabaseManager, TrackedSession
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR_NAME = "snapshots"
+SNAPSHOT_PREFIX = "analytics_"
+
+
+def _set_snapshot_pragma(dbapi_conn, connection_record):
+    from egg_farm_system.database.maintenance import tuning_profile
+    profile = tuning_profile()
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute(f"PRAGMA cache_size={profile.cache_size}")
+    cursor.execute(f"PRAGMA mmap_size={profile.mmap_size}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+class ReadSnapshot:
+    """Periodically refreshed copy of the database serving analytics sessions"""
+
+    def __init__(self, max_age=None):
+        self.max_age = config.ANALYTICS_SNAPSHOT_MAX_AGE if max_age is None else max_age
+        self.refreshed_at = None  # datetime the current copy was taken
+        self.source = None  # live database the copy was taken from
+        self._taken_at = None  # time.monotonic() of the copy
+        self._data_version = None
+        self._path = None
+        self._engine = None
+        self._SessionLocal = None
+        self._retired = []  # (engine, path) of replaced copies still being read
+        self._lock = threading.Lock()  # one refresh at a time
+        self._swap_lock = threading.Lock()  # replacing the copy vs. handing out sessions
+
+    @staticmethod
+    def available():
+        """Whether there is a database file to copy (not for in-memory databases)"""
+        path = DatabaseManager.database_path()
+        return bool(path) and path != ":memory:"
+
+    @staticmethod
+    def directory():
+        return Path(DatabaseManager.database_path()).parent / SNAPSHOT_DIR_NAME
+
+    @property
+    def age_seconds(self):
+        """Seconds since the copy was taken; None before the first refresh"""
+        return None if self._taken_at is None else time.monotonic() - self._taken_at
+
+    @property
+    def is_stale(self):
+        """True once data was written in this process after the copy was taken"""
+        return self._data_version is None or self._data_version != DatabaseManager.data_version()
+
+    def needs_refresh(self):
+        if self._engine is None or self.source != DatabaseManager.database_path():
+            return True
+        return self.age_seconds >= self.max_age and self.is_stale
+
+    def refresh(self):
+        """Copy the live database into the snapshot now; returns the seconds it took"""
+        with self._lock:
+            started = time.perf_counter()
+            source_path = DatabaseManager.database_path()
+            directory = self.directory()
+            directory.mkdir(exist_ok=True)
+            if self._engine is None:
+                self._remove_leftovers(directory)
+            target_path = directory / f"{SNAPSHOT_PREFIX}{time.time_ns()}.db"
+            data_version = DatabaseManager.data_version()
+
+            source = sqlite3.connect(source_path)
+            try:
+                target = sqlite3.connect(target_path)
+                try:
+                    source.backup(target)
+                    # A read-only connection cannot open a WAL database without its -shm file
+                    target.execute("PRAGMA journal_mode=DELETE")
+                finally:
+                    target.close()
+            finally:
+                source.close()
+
+            engine = create_engine(f"sqlite:///file:{target_path}?mode=ro&uri=true", echo=False,
+                                   connect_args={"check_same_thread": False}, poolclass=QueuePool,
+                                   pool_size=READER_POOL_SIZE, max_overflow=0, pool_timeout=30)
+            event.listen(engine, "connect", _set_snapshot_pragma)
+            with self._swap_lock:
+                if self._engine is not None:
+                    self._retired.append((self._engine, self._path))
+                self._engine, self._path = engine, target_path
+                self._SessionLocal = sessionmaker(bind=engine, autoflush=False, class_=TrackedSession,
+                                                  expire_on_commit=False)
+                self.source = source_path
+                self._data_version = data_version
+                self._taken_at = time.monotonic()
+                self.refreshed_at = datetime.now()
+                self._remove_retired()
+            seconds = time.perf_counter() - started
+        logger.info(f"Analytics snapshot refreshed in {seconds:.2f}s")
+        return seconds
+
+    def _remove_retired(self, force=False):
+        """Delete replaced copies no session is reading any more (all if ``force``)"""
+        in_use = []
+        for engine, path in self._retired:
+            if not force and engine.pool.checkedout():
+                in_use.append((engine, path))
+                continue
+            engine.dispose()
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not remove analytics snapshot {path}: {e}")
+        self._retired = in_use
+
+    @staticmethod
+    def _remove_leftovers(directory):
+        """Delete copies left behind by an earlier run"""
+        for path in directory.glob(f"{SNAPSHOT_PREFIX}*.db"):
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove analytics snapshot {path}: {e}")
+
+    def refresh_if_needed(self):
+        """Refresh if ``needs_refresh()``; True if it did"""
+        if not self.available() or not self.needs_refresh():
+            return False
+        self.refresh()
+        return True
+
+    def start_refresh(self):
+        """``refresh_if_needed`` on a background thread; False if the copy is current"""
+        if not self.available() or not self.needs_refresh():
+            return False
+        threading.Thread(target=self.refresh_if_needed, name="analytics-snapshot", daemon=True).start()
+        return True
+
+    @contextmanager
+    def session(self, refresh=False):
+        """Read-only session on the snapshot, refreshed first if ``refresh`` or due
+
+        Falls back to a live read session for in-memory databases.
+        """
+        if not self.available():
+            with DatabaseManager.session_scope(read_only=True) as session:
+                yield session
+            return
+        if refresh:
+            self.refresh()
+        else:
+            self.refresh_if_needed()
+        with self._swap_lock:
+            session = self._SessionLocal()
+            # Check the connection out now, so a refresh sees the copy is in use
+            session.connection()
+        try:
+            yield session
+        finally:
+            session.close()
+            if self._retired:
+                with self._swap_lock:
+                    self._remove_retired()
+
+    def describe(self):
+        """How current the snapshot is, for showing next to analytics results"""
+        if self.refreshed_at is None:
+            return "Live data"
+        minutes = int(self.age_seconds // 60)
+        age = "just now" if minutes == 0 else f"{minutes} min ago"
+        note = ", newer changes not included" if self.is_stale else ""
+        return f"Data as of {self.refreshed_at:%H:%M} ({age}{note})"
+
+    def close(self):
+        with self._lock, self._swap_lock:
+            if self._engine is not None:
+                self._retired.append((self._engine, self._path))
+            self._remove_retired(force=True)
+            self._engine = self._SessionLocal = self._path = None
+        self.refreshed_at = self._taken_at = self._data_version = self.source = None
+
+
+# Shared snapshot used by the analytics screens and the scheduled refresh
+read_snapshot = ReadSnapshot()
@@ -0,0 +1,493 @@
+"""
+Change data capture and delta sync between farm offices.
+
+Every ORM flush that inserts, updates or deletes rows of ``SYNCED_TABLES``
+appends one ``change_log`` entry per row with a monotonic sequence number.
+``SyncManager.export_bundle`` writes the changes a peer office has not
+confirmed yet to a gzipped JSON bundle file, and
+``SyncManager.import_bundle`` applies a bundle from another office. Each
+bundle also confirms the changes received from the office it is addressed
+to, so the next export to that office only carries newer changes.
+
+Rows are identified across databases by a uid, ``<node id>:<id>`` of the
+office that created them, kept in ``sync_rows``. Foreign keys travel as uids.
+Rows both offices may have created on their own (farms, parties, sheds,
+materials, feed and egg stock) are matched by their natural key first.
+
+Conflict rules:
+
+* stock counters (``COUNTER_COLUMNS``) merge additively, so stock moved at
+  both offices since the last sync all counts;
+* ledger entries are history: both offices' entries are always kept, and
+  deleting an entry wins over an edit made at the other office;
+* anything else goes to the last writer by change time.
+
+Columns derived from other synced rows (``DERIVED_COLUMNS``) are not synced;
+each office rebuilds them from its own rows after an import.
+
+Bulk SQL statements (archiving, migrations) are not captured.
+"""
+import enum
+import gzip
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, and_, delete, event, func, insert, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from egg_farm_system.database.db import Base, DatabaseManager
+from egg_farm_system.database.models import ChangeLogEntry, Flock, Setting, SyncPeer, SyncRow
+from egg_farm_system.utils.time_utils import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+NODE_SETTING = "sync_node_id"
+
+# Parents before children; bundles are replayed in this order
+SYNCED_TABLES = (
+    "farms", "sheds", "flocks", "mortalities", "medications", "parties", "raw_materials",
+    "feed_formulas", "feed_formulations", "feed_batches", "finished_feeds", "egg_inventory",
+    "egg_productions", "feed_issues", "ledgers", "sales", "raw_material_sales", "purchases",
+    "payments", "expenses", "employees", "salary_payments", "equipments",
+)
+# Columns identifying rows both offices may have created independently
+NATURAL_KEYS = {
+    "farms": ("name",),
+    "parties": ("name",),
+    "sheds": ("farm_id", "name"),
+    "raw_materials": ("farm_id", "name"),
+    "finished_feeds": ("farm_id", "feed_type"),
+    "egg_inventory": ("farm_id", "grade"),
+}
+# Running totals merged by adding each office's increments
+COUNTER_COLUMNS = {
+    "raw_materials": ("current_stock", "total_quantity_purchased", "total_cost_purchased_afg",
+                      "total_cost_purchased_usd"),
+    "finished_feeds": ("current_stock",),
+    "egg_inventory": ("current_stock",),
+}
+# Tables where a deletion beats a concurrent edit
+DELETE_WINS_TABLES = frozenset({"ledgers"})
+# Totals each office derives from its own rows (the flock's mortalities)
+DERIVED_COLUMNS = {
+    "flocks": ("total_mortality", "mortality_series"),
+}
+
+_change_log = ChangeLogEntry.__table__
+# Timestamps that differ between offices without being a conflicting edit
+_BOOKKEEPING_COLUMNS = frozenset({"created_at", "updated_at"})
+_TABLE_ORDER = {name: position for position, name in enumerate(SYNCED_TABLES, start=1)}
+
+
+def _table(name):
+    return Base.metadata.tables[name]
+
+
+def _foreign_keys(table):
+    """``{column: referenced table name}`` of a synced table"""
+    return {column.name: fk.column.table.name for column in table.columns for fk in column.foreign_keys}
+
+
+def _counter_deltas(state, table_name):
+    """Increments of the counter columns in one flush; None where the old value is unknown"""
+    deltas = {}
+    for column in COUNTER_COLUMNS.get(table_name, ()):
+        history = state.attrs[column].history
+        if not history.added:
+            continue
+        new = history.added[0]
+        old = history.deleted[0] if history.deleted else None
+        # No deleted value means the old one was never loaded
+        known = bool(history.deleted) and (old is None or isinstance(old, (int, float)))
+        deltas[column] = new - (old or 0) if known and isinstance(new, (int, float)) else None
+    return deltas or None
+
+
+def _changes_synced_columns(state, table_name):
+    """Whether an update changed anything besides the table's derived columns"""
+    derived = DERIVED_COLUMNS.get(table_name, ())
+    return any(state.attrs[prop.key].history.has_changes()
+               for prop in state.mapper.column_attrs if prop.key not in derived)
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_changes(session, flush_context):
+    now = utcnow_naive()
+    entries = []
+    for operation, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            table_name = getattr(obj, "__tablename__", None)
+            if table_name not in SYNCED_TABLES:
+                continue
+            if operation == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            if operation == "update" and table_name in DERIVED_COLUMNS \
+                    and not _changes_synced_columns(inspect(obj), table_name):
+                continue  # only totals the peer rebuilds itself
+            deltas = _counter_deltas(inspect(obj), table_name) if operation == "update" else None
+            entries.append({"table_name": table_name, "row_id": obj.id, "operation": operation,
+                            "origin": None, "changed_at": now, "deltas": json.dumps(deltas) if deltas else None})
+    if entries:
+        session.connection().execute(insert(_change_log), entries)
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def _decode(column, value):
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+@dataclass
+class SyncResult:
+    """What importing one bundle did"""
+    node: str
+    applied: int = 0
+    skipped: int = 0
+    conflicts: list = field(default_factory=list)
+
+
+class SyncManager:
+    """Export and import change bundles between office databases"""
+
+    @staticmethod
+    def node_id(session):
+        """Id of this database, created on first use"""
+        value = session.scalar(select(Setting.value).where(Setting.key == NODE_SETTING))
+        if value is None:
+            value = uuid.uuid4().hex
+            session.add(Setting(key=NODE_SETTING, value=value, description="Id of this database for office sync"))
+            session.flush()
+        return value
+
+    @staticmethod
+    def status():
+        """This database's node id, last sequence number and sync point per peer"""
+        with DatabaseManager.session_scope() as session:
+            return {
+                "node": SyncManager.node_id(session),
+                "last_seq": session.scalar(select(func.max(_change_log.c.seq))) or 0,
+                "peers": [
+                    {"node": peer.node_id, "sent_seq": peer.sent_seq, "received_seq": peer.received_seq,
+                     "last_sync_at": peer.last_sync_at}
+                    for peer in session.scalars(select(SyncPeer).order_by(SyncPeer.node_id))
+                ],
+            }
+
+    @classmethod
+    def export_bundle(cls, path, peer=None):
+        """Write the changes ``peer`` has not confirmed (all without a peer) to ``path``
+
+        Returns the number of rows in the bundle.
+        """
+        with DatabaseManager.session_scope() as session:
+            node = cls.node_id(session)
+            sent_seq = acked_seq = 0
+            state = session.get(SyncPeer, peer) if peer else None
+            if state is not None:
+                sent_seq, acked_seq = state.sent_seq, state.received_seq
+            last_seq = session.scalar(select(func.max(_change_log.c.seq))) or 0
+
+            query = select(_change_log).where(_change_log.c.seq > sent_seq, _change_log.c.seq <= last_seq)
+            if peer:
+                # The peer already has the changes it made itself
+                query = query.where(or_(_change_log.c.origin.is_(None), _change_log.c.origin != peer))
+            rows = {}
+            for entry in session.execute(query.order_by(_change_log.c.seq)):
+                key = (entry.table_name, entry.row_id)
+                if key not in rows:
+                    rows[key] = {"first": entry.operation, "deltas": []}
+                change = rows[key]
+                change.update(op=entry.operation, seq=entry.seq, origin=entry.origin or node,
+                              changed_at=entry.changed_at.isoformat())
+                if entry.deltas:
+                    change["deltas"].append([entry.seq, json.loads(entry.deltas)])
+
+            exporter = _Exporter(session, node)
+            changes = []
+            for (table_name, row_id), change in rows.items():
+                created_since = change.pop("first") == "insert"
+                if change["op"] == "delete":
+                    if created_since:
+                        continue  # the peer never saw it
+                    change.pop("deltas")
+                else:
+                    change["row"] = exporter.row(table_name, row_id)
+                    if change["row"] is None:
+                        continue  # since deleted by the peer itself, or archived
+                    if created_since:
+                        change["op"] = "insert"
+                        change.pop("deltas")  # already part of the row
+                change.update(table=table_name, uid=exporter.uid(table_name, row_id))
+                changes.append(change)
+            # Parents before children, and children deleted before their parents
+            changes.sort(key=lambda change: _TABLE_ORDER[change["table"]] * (-1 if change["op"] == "delete" else 1))
+
+        bundle = {"format": BUNDLE_FORMAT, "node": node, "peer": peer, "created_at": utcnow_naive().isoformat(),
+                  "last_seq": last_seq, "acked_seq": acked_seq, "changes": changes}
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            json.dump(bundle, handle, separators=(",", ":"))
+        logger.info(f"Exported {len(changes)} changes (sequence {sent_seq + 1}-{last_seq}) to {path}")
+        return len(changes)
+
+    @classmethod
+    def import_bundle(cls, path):
+        """Apply a bundle exported by another office and return a ``SyncResult``"""
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            bundle = json.load(handle)
+        if bundle.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported sync bundle format {bundle.get('format')!r}")
+
+        result = SyncResult(node=bundle["node"])
+        with DatabaseManager.session_scope() as session:
+            node = cls.node_id(session)
+            if bundle["node"] == node:
+                raise ValueError("The bundle was exported from this database")
+            peer = session.get(SyncPeer, bundle["node"])
+            if peer is None:
+                peer = SyncPeer(node_id=bundle["node"], sent_seq=0, received_seq=0)
+                session.add(peer)
+                session.flush()
+
+            importer = _Importer(session, node, peer.received_seq, result)
+            for change in bundle["changes"]:
+                importer.apply(change)
+            if importer.flock_ids:
+                Flock.rebuild_mortality_totals(session, importer.flock_ids)
+
+            peer.received_seq = max(peer.received_seq, bundle["last_seq"])
+            if bundle["peer"] == node:
+                peer.sent_seq = max(peer.sent_seq, bundle["acked_seq"])
+            peer.last_sync_at = utcnow_naive()
+        logger.info(f"Imported {path}: {result.applied} applied, {result.skipped} skipped, "
+                    f"{len(result.conflicts)} conflicts")
+        return result
+
+
+class _Exporter:
+    """Row state with foreign keys as uids, for one export"""
+
+    def __init__(self, session, node):
+        self.session = session
+        self.node = node
+        self._uids = {}
+
+    def uid(self, table_name, row_id):
+        key = (table_name, row_id)
+        if key not in self._uids:
+            # The first uid mapped to a row is its canonical one
+            mapped = self.session.scalar(
+                select(SyncRow.uid).where(SyncRow.table_name == table_name, SyncRow.row_id == row_id)
+                .order_by(SyncRow.id).limit(1))
+            self._uids[key] = mapped or f"{self.node}:{row_id}"
+        return self._uids[key]
+
+    def row(self, table_name, row_id):
+        table = _table(table_name)
+        values = self.session.execute(select(table).where(table.c.id == row_id)).mappings().first()
+        if values is None:
+            return None
+        foreign_keys = _foreign_keys(table)
+        derived = DERIVED_COLUMNS.get(table_name, ())
+        row = {}
+        for column in table.columns:
+            value = values[column.name]
+            if column.name == "id" or column.name in derived:
+                continue
+            if column.name in foreign_keys and value is not None:
+                row[column.name] = self.uid(foreign_keys[column.name], value)
+            else:
+                row[column.name] = _encode(value)
+        return row
+
+
+class _Importer:
+    """Applies the changes of one bundle in the importing session"""
+
+    def __init__(self, session, node, received_seq, result):
+        self.session = session
+        self.node = node
+        self.received_seq = received_seq
+        self.result = result
+        # Flocks whose mortality totals are rebuilt once the bundle is applied
+        self.flock_ids = set()
+
+    def apply(self, change):
+        if change["seq"] <= self.received_seq:
+            self.result.skipped += 1  # applied with an earlier bundle
+            return
+        table = _table(change["table"])
+        if table.name not in ("flocks", "mortalities"):
+            self._apply(table, change)
+            return
+        # The flock before and after: a mortality may be deleted or moved
+        self._note_flock(table, change["uid"])
+        self._apply(table, change)
+        self._note_flock(table, change["uid"])
+
+    def _note_flock(self, table, uid):
+        local_id = self._lookup(table.name, uid)
+        if local_id is not None and table.name == "mortalities":
+            local_id = self.session.scalar(select(table.c.flock_id).where(table.c.id == local_id))
+        if local_id is not None:
+            self.flock_ids.add(local_id)
+
+    def _apply(self, table, change):
+        uid = change["uid"]
+        changed_at = datetime.fromisoformat(change["changed_at"])
+        local_id = self._lookup(table.name, uid)
+        if local_id is not None and not self._exists(table, local_id):
+            # Deleted here; an older edit or any ledger edit leaves it deleted
+            if change["op"] != "delete" and table.name not in DELETE_WINS_TABLES \
+                    and self._is_newer(table.name, local_id, changed_at, change["origin"]):
+                self._insert(table, self._values(table, change["row"]), change, changed_at)
+            elif change["op"] != "delete":
+                self.result.conflicts.append(f"{table.name} {uid}: stays deleted, it was deleted here later")
+            else:
+                self.result.skipped += 1
+            return
+
+        values = self._values(table, change["row"]) if "row" in change else None
+        if local_id is None and values is not None:
+            local_id = self._match(table, uid, values)
+        newer = self._is_newer(table.name, local_id, changed_at, change["origin"])
+        if change["op"] == "delete":
+            self._delete(table, local_id, change, newer)
+        elif local_id is None:
+            self._insert(table, values, change, changed_at)
+        else:
+            self._update(table, local_id, values, change, changed_at, newer)
+
+    def _values(self, table, row):
+        values = {}
+        foreign_keys = _foreign_keys(table)
+        derived = DERIVED_COLUMNS.get(table.name, ())
+        for name, value in row.items():
+            if name in derived:
+                continue  # sent by older versions; rebuilt after the import
+            if name in foreign_keys and value is not None:
+                parent = _table(foreign_keys[name])
+                local_id = self._lookup(parent.name, value)
+                if local_id is None or not self._exists(parent, local_id):
+                    raise ValueError(f"{table.name}.{name} refers to {value}, which this database does not have")
+                values[name] = local_id
+            else:
+                values[name] = _decode(table.c[name], value)
+        return values
+
+    def _exists(self, table, row_id):
+        return self.session.scalar(select(table.c.id).where(table.c.id == row_id)) is not None
+
+    def _lookup(self, table_name, uid):
+        """Local id ``uid`` was mapped to, or the id itself for rows created here"""
+        local_id = self.session.scalar(
+            select(SyncRow.row_id).where(SyncRow.table_name == table_name, SyncRow.uid == uid))
+        if local_id is not None:
+            return local_id
+        node, _, row_id = uid.partition(":")
+        return int(row_id) if node == self.node else None
+
+    def _match(self, table, uid, values):
+        """Map ``uid`` to the local row with the same natural key, if any"""
+        if table.name not in NATURAL_KEYS:
+            return None
+        conditions = [table.c[name].is_(None) if values.get(name) is None else table.c[name] == values[name]
+                      for name in NATURAL_KEYS[table.name]]
+        local_id = self.session.scalar(select(table.c.id).where(and_(*conditions)))
+        if local_id is not None:
+            self._map(table.name, uid, local_id, existing=True)
+        return local_id
+
+    def _map(self, table_name, uid, row_id, existing=False):
+        """Map ``uid`` to ``row_id``; an ``existing`` row keeps the uid it already had first"""
+        self.session.execute(delete(SyncRow).where(SyncRow.table_name == table_name, SyncRow.uid == uid))
+        mappings = [{"table_name": table_name, "row_id": row_id, "uid": uid}]
+        if existing and self.session.scalar(
+                select(SyncRow.id).where(SyncRow.table_name == table_name, SyncRow.row_id == row_id).limit(1)) is None:
+            mappings.insert(0, {"table_name": table_name, "row_id": row_id, "uid": f"{self.node}:{row_id}"})
+        self.session.execute(insert(SyncRow), mappings)
+
+    def _is_newer(self, table_name, local_id, changed_at, origin):
+        """Whether the incoming change is later than the last local change of the row"""
+        if local_id is None:
+            return True
+        last = self.session.execute(
+            select(_change_log.c.changed_at, _change_log.c.origin)
+            .where(_change_log.c.table_name == table_name, _change_log.c.row_id == local_id)
+            .order_by(_change_log.c.seq.desc()).limit(1)
+        ).first()
+        return last is None or (changed_at, origin) >= (last.changed_at, last.origin or self.node)
+
+    def _log(self, table_name, row_id, operation, change, changed_at, deltas=None):
+        self.session.execute(insert(_change_log).values(
+            table_name=table_name, row_id=row_id, operation=operation, origin=change["origin"],
+            changed_at=changed_at, deltas=json.dumps(deltas) if deltas else None))
+        self.result.applied += 1
+
+    def _delete(self, table, local_id, change, newer):
+        if local_id is None:
+            self.result.skipped += 1
+            return
+        if not newer:
+            if table.name not in DELETE_WINS_TABLES:
+                self.result.conflicts.append(f"{table.name} {change['uid']}: kept, edited here after it was deleted")
+                return
+            self.result.conflicts.append(f"{table.name} {change['uid']}: deleted, discarding a later edit made here")
+        try:
+            self.session.execute(delete(table).where(table.c.id == local_id))
+        except IntegrityError:
+            self.result.conflicts.append(f"{table.name} {change['uid']}: kept, still referenced here")
+            return
+        self._log(table.name, local_id, "delete", change, datetime.fromisoformat(change["changed_at"]))
+
+    def _insert(self, table, values, change, changed_at):
+        local_id = self.session.execute(insert(table).values(**values)).inserted_primary_key[0]
+        self._map(table.name, change["uid"], local_id)
+        self._log(table.name, local_id, "insert", change, changed_at)
+
+    def _update(self, table, local_id, values, change, changed_at, newer):
+        counters = COUNTER_COLUMNS.get(table.name, ())
+        increments = {}
+        if change["op"] == "insert":
+            # Matched by natural key: the other office's totals started from zero
+            increments = {name: values[name] or 0 for name in counters}
+        else:
+            for seq, deltas in change["deltas"]:
+                if seq <= self.received_seq:
+                    continue
+                for name, delta in deltas.items():
+                    if delta is not None and increments.get(name, 0) is not None:
+                        increments[name] = increments.get(name, 0) + delta
+                    else:
+                        increments[name] = None  # old value unknown; last writer wins
+        assignments = {name: table.c[name] + delta for name, delta in increments.items() if delta}
+        if newer:
+            assignments.update((name, value) for name, value in values.items()
+                               if name not in counters or increments.get(name, 0) is None)
+        else:
+            local = self.session.execute(select(table).where(table.c.id == local_id)).mappings().one()
+            if any(_encode(local[name]) != _encode(value) for name, value in values.items()
+                   if name not in counters and name not in _BOOKKEEPING_COLUMNS):
+                self.result.conflicts.append(f"{table.name} {change['uid']}: kept the later edit made here")
+        if not assignments:
+            self.result.skipped += 1
+            return
+        self.session.execute(update(table).where(table.c.id == local_id).values(**assignments))
+        applied = {name: delta for name, delta in increments.items() if delta is not None}
+        self._log(table.name, local_id, "update", change, changed_at, applied)
@@ -0,0 +1,277 @@
+"""
+Synthetic data generator for load testing and benchmarks.
+
+Builds a coherent dataset (farms, sheds, flocks, daily production, feed
+issues, mortality, parties, sales, purchases, payments, expenses and the
+matching ledger postings) at a chosen scale so queries can be measured at
+realistic volumes. Rows are written with bulk inserts and explicit primary
+keys so ledger entries can reference their source rows without a flush per
+record.
+
+    from egg_farm_system.database.synthetic_data import generate_dataset
+    with DatabaseManager.session_scope() as session:
+        generate_dataset(session, scale="medium")
+"""
+import logging
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert
+
+from egg_farm_system.config import MAX_FARMS
+from egg_farm_system.database.models import (
+    EggProduction,
+    Expense,
+    Farm,
+    FeedIssue,
+    FeedType,
+    FinishedFeed,
+    Flock,
+    Ledger,
+    Mortality,
+    Party,
+    Payment,
+    Purchase,
+    RawMaterial,
+    Sale,
+    Shed,
+)
+
+logger = logging.getLogger(__name__)
+
+EXCHANGE_RATE = 78.0
+CHUNK_SIZE = 10000
+
+# sales/payments/purchases/expenses are per day across all farms
+SCALES = {
+    "tiny": dict(farms=1, sheds_per_farm=2, flocks_per_shed=1, days=30, parties=20,
+                 sales_per_day=5, payments_per_day=2, purchases_per_day=1, expenses_per_day=1),
+    "small": dict(farms=2, sheds_per_farm=4, flocks_per_shed=1, days=180, parties=200,
+                  sales_per_day=20, payments_per_day=8, purchases_per_day=3, expenses_per_day=2),
+    "medium": dict(farms=MAX_FARMS, sheds_per_farm=6, flocks_per_shed=2, days=365, parties=1000,
+                   sales_per_day=60, payments_per_day=25, purchases_per_day=8, expenses_per_day=4),
+    "large": dict(farms=MAX_FARMS, sheds_per_farm=10, flocks_per_shed=2, days=3 * 365, parties=5000,
+                  sales_per_day=150, payments_per_day=60, purchases_per_day=20, expenses_per_day=8),
+}
+
+MATERIALS = [("Corn", "kg"), ("Soybean Meal", "kg"), ("Wheat Bran", "kg"), ("Limestone", "kg"),
+             ("Fish Meal", "kg"), ("Premix", "kg"), ("Carton", "pcs"), ("Tray", "pcs")]
+EXPENSE_CATEGORIES = ["Labor", "Electricity", "Medicine", "Transport", "Maintenance", "Other"]
+
+
+def scale_parameters(scale="small", **overrides):
+    """Return generator parameters for a named scale with optional overrides."""
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'. Choose from: {', '.join(SCALES)}")
+    params = dict(SCALES[scale])
+    params.update(overrides)
+    if params["farms"] > MAX_FARMS:
+        raise ValueError(f"farms cannot exceed MAX_FARMS ({MAX_FARMS})")
+    return params
+
+
+class _Ids:
+    """Hand out explicit primary keys continuing from each table's current maximum"""
+
+    def __init__(self, session):
+        self.session = session
+        self._next = {}
+
+    def take(self, model):
+        if model not in self._next:
+            current = self.session.query(func.max(model.id)).scalar() or 0
+            self._next[model] = current + 1
+        value = self._next[model]
+        self._next[model] = value + 1
+        return value
+
+
+def _bulk_insert(session, model, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        session.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+
+def _ledger(ids, party_id, farm_id, date, description, reference_type, reference_id,
+            debit_afg=0.0, credit_afg=0.0):
+    return {
+        "id": ids.take(Ledger),
+        "party_id": party_id,
+        "farm_id": farm_id,
+        "date": date,
+        "description": description,
+        "debit_afg": debit_afg,
+        "credit_afg": credit_afg,
+        "debit_usd": debit_afg / EXCHANGE_RATE,
+        "credit_usd": credit_afg / EXCHANGE_RATE,
+        "exchange_rate_used": EXCHANGE_RATE,
+        "reference_type": reference_type,
+        "reference_id": reference_id,
+    }
+
+
+def generate_dataset(session, scale="small", seed=0, end_date=None, **overrides):
+    """Populate ``session``'s database with synthetic data and commit.
+
+    Returns a summary dict with the parameters used, row counts per table and
+    the ids of the generated farms, customers and suppliers.
+    """
+    params = scale_parameters(scale, **overrides)
+    rng = random.Random(seed)
+    ids = _Ids(session)
+    end = datetime.combine((end_date or datetime.now().date()), datetime.min.time())
+    start = end - timedelta(days=params["days"] - 1)
+    days = [start + timedelta(days=offset) for offset in range(params["days"])]
+    # Farm and party names are unique; tag them so repeated runs do not collide
+    tag = f"{seed}-{(session.query(func.max(Farm.id)).scalar() or 0) + 1}"
+    counts = {}
+
+    farms, sheds, flocks, feeds, materials = [], [], [], [], {}
+    for f in range(params["farms"]):
+        farm_id = ids.take(Farm)
+        farms.append({"id": farm_id, "name": f"Synthetic Farm {tag}-{f + 1}", "location": f"District {f + 1}"})
+        feeds.append({"id": ids.take(FinishedFeed), "farm_id": farm_id, "feed_type": FeedType.LAYER,
+                      "current_stock": 5000.0, "cost_per_kg_afg": 30.0, "cost_per_kg_usd": 30.0 / EXCHANGE_RATE,
+                      "low_stock_alert": 500.0})
+        materials[farm_id] = []
+        for name, unit in MATERIALS:
+            material_id = ids.take(RawMaterial)
+            materials[farm_id].append(material_id)
+            stock = float(rng.randint(100, 2000))
+            materials.setdefault("rows", []).append({
+                "id": material_id, "farm_id": farm_id, "name": name, "unit": unit,
+                "current_stock": stock, "total_quantity_purchased": stock,
+                "total_cost_purchased_afg": stock * 25.0, "total_cost_purchased_usd": stock * 25.0 / EXCHANGE_RATE,
+                "low_stock_alert": 150.0,
+            })
+        for s in range(params["sheds_per_farm"]):
+            shed_id = ids.take(Shed)
+            capacity = rng.choice([1500, 2000, 2500, 3000])
+            sheds.append({"id": shed_id, "farm_id": farm_id, "name": f"Shed {f + 1}-{s + 1}",
+                          "capacity": capacity, "_feed_id": feeds[-1]["id"]})
+            for k in range(params["flocks_per_shed"]):
+                flocks.append({"id": ids.take(Flock), "shed_id": shed_id, "name": f"Flock {f + 1}-{s + 1}-{k + 1}",
+                               "start_date": start - timedelta(weeks=20),
+                               "initial_count": capacity // params["flocks_per_shed"]})
+
+    _bulk_insert(session, Farm, farms)
+    _bulk_insert(session, FinishedFeed, feeds)
+    _bulk_insert(session, RawMaterial, materials.pop("rows"))
+    _bulk_insert(session, Shed, [{k: v for k, v in shed.items() if not k.startswith("_")} for shed in sheds])
+    _bulk_insert(session, Flock, flocks)
+    counts.update(farms=len(farms), sheds=len(sheds), flocks=len(flocks))
+
+    production, feed_issues, mortalities = [], [], []
+    for day in days:
+        for shed in sheds:
+            layers = int(shed["capacity"] * rng.uniform(0.82, 0.94))
+            broken = int(layers * 0.03)
+            usable = layers - broken
+            small, medium = int(usable * 0.25), int(usable * 0.45)
+            production.append({"id": ids.take(EggProduction), "shed_id": shed["id"], "date": day,
+                               "small_count": small, "medium_count": medium, "large_count": usable - small - medium,
+                               "broken_count": broken, "cartons_used": 0, "trays_used": 0})
+            quantity = round(shed["capacity"] * 0.115, 1)
+            feed_issues.append({"id": ids.take(FeedIssue), "shed_id": shed["id"], "feed_id": shed["_feed_id"],
+                                "date": day, "quantity_kg": quantity, "cost_afg": quantity * 30.0,
+                                "cost_usd": quantity * 30.0 / EXCHANGE_RATE})
+        for flock in flocks:
+            if rng.random() < 0.3:
+                mortalities.append({"id": ids.take(Mortality), "flock_id": flock["id"], "date": day,
+                                    "count": rng.randint(1, 3)})
+    _bulk_insert(session, EggProduction, production)
+    _bulk_insert(session, FeedIssue, feed_issues)
+    _bulk_insert(session, Mortality, mortalities)
+    Flock.rebuild_mortality_totals(session)
+    counts.update(egg_productions=len(production), feed_issues=len(feed_issues), mortalities=len(mortalities))
+    del production, feed_issues, mortalities
+
+    parties = []
+    supplier_count = max(1, params["parties"] // 5)
+    for p in range(params["parties"]):
+        kind = "Supplier" if p < supplier_count else "Customer"
+        parties.append({"id": ids.take(Party), "name": f"{kind} {tag}-{p + 1:05d}",
+                        "phone": f"07{rng.randint(0, 99999999):08d}", "address": f"District {rng.randint(1, 22)}"})
+    _bulk_insert(session, Party, parties)
+    suppliers = [p["id"] for p in parties[:supplier_count]]
+    customers = [p["id"] for p in parties[supplier_count:]] or suppliers
+    counts["parties"] = len(parties)
+
+    farm_ids = [farm["id"] for farm in farms]
+    sales, purchases, payments, expenses, ledger = [], [], [], [], []
+    for day in days:
+        for _ in range(params["sales_per_day"]):
+            sale_id = ids.take(Sale)
+            party_id, farm_id = rng.choice(customers), rng.choice(farm_ids)
+            quantity = rng.randint(90, 3600)
+            rate = round(rng.uniform(4.5, 7.0), 2)
+            total = quantity * rate
+            cash = rng.random() < 0.4
+            sales.append({"id": sale_id, "party_id": party_id, "farm_id": farm_id, "date": day,
+                          "quantity": quantity, "rate_afg": rate, "rate_usd": rate / EXCHANGE_RATE,
+                          "total_afg": total, "total_usd": total / EXCHANGE_RATE,
+                          "exchange_rate_used": EXCHANGE_RATE, "payment_method": "Cash" if cash else "Credit"})
+            ledger.append(_ledger(ids, party_id, farm_id, day, f"Egg sale: {quantity} units", "Sale", sale_id,
+                                  debit_afg=total))
+            if cash:
+                payment_id = ids.take(Payment)
+                payments.append({"id": payment_id, "party_id": party_id, "date": day, "amount_afg": total,
+                                 "amount_usd": total / EXCHANGE_RATE, "payment_type": "Received",
+                                 "payment_method": "Cash", "reference": f"Sale #{sale_id}",
+                                 "exchange_rate_used": EXCHANGE_RATE})
+                ledger.append(_ledger(ids, party_id, farm_id, day, f"Payment received: Sale #{sale_id}",
+                                      "Payment", payment_id, credit_afg=total))
+
+        for _ in range(params["payments_per_day"]):
+            payment_id = ids.take(Payment)
+            party_id = rng.choice(customers)
+            amount = round(rng.uniform(500, 15000), 2)
+            payments.append({"id": payment_id, "party_id": party_id, "date": day, "amount_afg": amount,
+                             "amount_usd": amount / EXCHANGE_RATE, "payment_type": "Received",
+                             "payment_method": rng.choice(["Cash", "Bank"]), "exchange_rate_used": EXCHANGE_RATE})
+            ledger.append(_ledger(ids, party_id, rng.choice(farm_ids), day, "Payment received", "Payment",
+                                  payment_id, credit_afg=amount))
+
+        for _ in range(params["purchases_per_day"]):
+            purchase_id = ids.take(Purchase)
+            party_id, farm_id = rng.choice(suppliers), rng.choice(farm_ids)
+            quantity = round(rng.uniform(50, 1000), 1)
+            rate = round(rng.uniform(18, 60), 2)
+            total = quantity * rate
+            purchases.append({"id": purchase_id, "party_id": party_id, "farm_id": farm_id,
+                              "material_id": rng.choice(materials[farm_id]), "date": day, "quantity": quantity,
+                              "rate_afg": rate, "rate_usd": rate / EXCHANGE_RATE, "total_afg": total,
+                              "total_usd": total / EXCHANGE_RATE, "exchange_rate_used": EXCHANGE_RATE,
+                              "payment_method": "Credit"})
+            ledger.append(_ledger(ids, party_id, farm_id, day, f"Purchase #{purchase_id}", "Purchase",
+                                  purchase_id, credit_afg=total))
+
+        for _ in range(params["expenses_per_day"]):
+            amount = round(rng.uniform(200, 8000), 2)
+            expenses.append({"id": ids.take(Expense), "farm_id": rng.choice(farm_ids), "date": day,
+                             "category": rng.choice(EXPENSE_CATEGORIES), "description": "Synthetic expense",
+                             "amount_afg": amount, "amount_usd": amount / EXCHANGE_RATE,
+                             "exchange_rate_used": EXCHANGE_RATE, "payment_method": "Cash"})
+
+    _bulk_insert(session, Sale, sales)
+    _bulk_insert(session, Purchase, purchases)
+    _bulk_insert(session, Payment, payments)
+    _bulk_insert(session, Expense, expenses)
+    _bulk_insert(session, Ledger, ledger)
+    counts.update(sales=len(sales), purchases=len(purchases), payments=len(payments),
+                  expenses=len(expenses), ledgers=len(ledger))
+    session.commit()
+
+    logger.info(f"Generated synthetic '{scale}' dataset: {counts}")
+    return {
+        "scale": scale,
+        "params": params,
+        "counts": counts,
+        "start_date": start,
+        "end_date": end,
+        "farm_ids": farm_ids,
+        "customer_ids": customers,
+        "supplier_ids": suppliers,
+    }
+
+
+__all__ = ['SCALES', 'generate_dataset', 'scale_parameters']
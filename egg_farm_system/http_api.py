@@ -0,0 +1,343 @@
+"""
+Read-only JSON API for dashboards on other office machines
+
+A small stdlib HTTP server (``python -m egg_farm_system.cli serve``) that
+answers GET requests from the shared read connection pool:
+
+    /api/health
+    /api/dashboard?farm_id=1&day=2024-05-20
+    /api/parties?farm_id=1
+    /api/production?farm_id=1&start=2024-05-01&end=2024-05-31&group_by=day
+    /api/pnl?farm_id=1&start=2024-05-01&end=2024-05-31
+
+Responses are cached per path and query for all clients and reused until a
+commit from any process changes ``PRAGMA data_version``. Every response has
+an ETag; a poll sending it back in If-None-Match gets an empty 304 without
+running a query.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from datetime import date, datetime
+from enum import Enum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from egg_farm_system.config import APP_VERSION, HTTP_API_HOST, HTTP_API_PORT
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.utils.performance_monitoring import measure_time
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_RESPONSES = 64
+PRODUCTION_GROUPS = ("day", "month", "year", "shed")
+
+
+class ApiError(Exception):
+    """Request the API cannot answer; sent to the client as a JSON error"""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class CachedResponse(NamedTuple):
+    version: tuple
+    etag: str
+    body: bytes
+
+
+def _jsonable(value):
+    """``value`` with named tuples as objects and dates as ISO strings"""
+    if hasattr(value, "_asdict"):
+        return {name: _jsonable(item) for name, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {
+            (key.isoformat() if isinstance(key, date) else str(key)): _jsonable(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _int_param(query, name, required=False):
+    value = query.get(name)
+    if value is None:
+        if required:
+            raise ApiError(f"{name} is required")
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(f"{name} must be an integer")
+
+
+def _date_param(query, name, default=None):
+    value = query.get(name)
+    if value is None:
+        if default is None:
+            raise ApiError(f"{name} is required")
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f"{name} must be a YYYY-MM-DD date")
+
+
+# Endpoints: parse the query into the parameters that make up the cache key,
+# then compute the JSON data from those parameters on a read session
+
+def _dashboard_params(query):
+    return {"farm_id": _int_param(query, "farm_id", required=True),
+            "day": _date_param(query, "day", date.today())}
+
+
+def _dashboard(session, farm_id, day):
+    from egg_farm_system.modules.dashboard import compute_snapshot
+
+    snapshot = compute_snapshot(session, farm_id, day)
+    data = {field.name: getattr(snapshot, field.name) for field in fields(snapshot)
+            if field.name not in ("created", "data_version")}
+    data["total_production"] = snapshot.total_production
+    data["average_production"] = snapshot.average_production
+    return data
+
+
+def _parties_params(query):
+    return {"farm_id": _int_param(query, "farm_id")}
+
+
+def _parties(session, farm_id):
+    from egg_farm_system.modules.parties import PartyManager
+
+    return PartyManager(session).get_party_list(farm_id)
+
+
+def _production_params(query):
+    group_by = query.get("group_by")
+    if group_by is not None and group_by not in PRODUCTION_GROUPS:
+        raise ApiError(f"group_by must be one of {', '.join(PRODUCTION_GROUPS)}")
+    return {"farm_id": _int_param(query, "farm_id"), "shed_id": _int_param(query, "shed_id"),
+            "start": _date_param(query, "start"), "end": _date_param(query, "end"), "group_by": group_by}
+
+
+def _production(session, farm_id, shed_id, start, end, group_by):
+    from egg_farm_system.modules.egg_production import EggProductionManager
+
+    summary = EggProductionManager(session).get_production_summary(shed_id, start, end, farm_id=farm_id,
+                                                                   group_by=group_by)
+    if summary is None:
+        raise ApiError("Production summary failed", HTTPStatus.INTERNAL_SERVER_ERROR)
+    return summary
+
+
+def _pnl_params(query):
+    return {"farm_id": _int_param(query, "farm_id"), "start": _date_param(query, "start"),
+            "end": _date_param(query, "end")}
+
+
+def _pnl(session, farm_id, start, end):
+    from egg_farm_system.modules.financial_reports import FinancialReportGenerator
+    from egg_farm_system.utils.advanced_caching import report_cache
+
+    # The report cache is only invalidated by writes in this process; this
+    # runs only after the data version moved, so drop what it may hold
+    report_cache.invalidate_report_type("pnl")
+    return FinancialReportGenerator(session).generate_pnl_statement(
+        datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time()), farm_id)
+
+
+ENDPOINTS = {
+    "/api/dashboard": (_dashboard_params, _dashboard),
+    "/api/parties": (_parties_params, _parties),
+    "/api/production": (_production_params, _production),
+    "/api/pnl": (_pnl_params, _pnl),
+}
+
+
+class DataVersion:
+    """Token that changes whenever any process commits to the database
+
+    ``PRAGMA data_version`` on a connection that never writes moves with
+    every commit made through other connections, including other programs.
+    In-memory databases fall back to ``DatabaseManager.data_version()``.
+    """
+
+    def __init__(self, path=None):
+        self._connection = None
+        self._lock = threading.Lock()
+        if path and path != ":memory:":
+            self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    def current(self):
+        if self._connection is None:
+            return (0, DatabaseManager.data_version())
+        with self._lock:
+            external = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        return (external, DatabaseManager.data_version())
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class ResponseCache:
+    """LRU of encoded responses shared by all clients
+
+    Concurrent misses for one key wait for a single computation instead of
+    each running the queries.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key, version):
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self._entries.move_to_end(key)
+            return entry
+        return None
+
+    def get(self, key, version, compute):
+        """The cached response for ``key``, calling ``compute()`` for the body if stale"""
+        with self._lock:
+            entry = self._fresh(key, version)
+            if entry is not None:
+                return entry
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._fresh(key, version)
+            if entry is not None:
+                return entry
+            body = compute()
+            entry = CachedResponse(version, f'"{hashlib.sha1(body).hexdigest()}"', body)
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _encode(data):
+    return json.dumps(_jsonable(data), separators=(",", ":")).encode("utf-8")
+
+
+class DashboardApi:
+    """Resolves API requests against the shared cache and read pool"""
+
+    def __init__(self, max_cached=MAX_CACHED_RESPONSES):
+        if DatabaseManager._engine is None:
+            DatabaseManager.initialize()
+        self.cache = ResponseCache(max_cached)
+        self.data_version = DataVersion(DatabaseManager.database_path())
+
+    def respond(self, target, if_none_match=None):
+        """Return ``(status, headers, body)`` for a GET of ``target``"""
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        try:
+            if path == "/api/health":
+                return self._json(HTTPStatus.OK, {"status": "ok", "version": APP_VERSION})
+            if path not in ENDPOINTS:
+                raise ApiError(f"Unknown endpoint {path or '/'}", HTTPStatus.NOT_FOUND)
+            parse, compute = ENDPOINTS[path]
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            params = parse(query)
+            key = (path, tuple(sorted(params.items())))
+            entry = self.cache.get(key, self.data_version.current(),
+                                   lambda: self._compute(path, compute, params))
+        except ApiError as e:
+            return self._json(e.status, {"error": str(e)})
+        except Exception as e:
+            logger.error(f"API request {target} failed: {e}")
+            return self._json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error"})
+
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, entry.etag):
+            return HTTPStatus.NOT_MODIFIED, headers, b""
+        headers["Content-Type"] = "application/json"
+        return HTTPStatus.OK, headers, entry.body
+
+    def _compute(self, path, compute, params):
+        with measure_time("http_api", endpoint=path):
+            with DatabaseManager.read_transaction() as session:
+                return _encode(compute(session, **params))
+
+    @staticmethod
+    def _json(status, data):
+        return status, {"Content-Type": "application/json", "Cache-Control": "no-store"}, _encode(data)
+
+    def close(self):
+        self.data_version.close()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = f"EggFarmAPI/{APP_VERSION}"
+
+    def do_GET(self):
+        status, headers, body = self.server.api.respond(self.path, self.headers.get("If-None-Match"))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server for ``DashboardApi``; port 0 picks a free port"""
+
+    daemon_threads = True
+
+    def __init__(self, host=HTTP_API_HOST, port=HTTP_API_PORT, api=None):
+        self.api = api or DashboardApi()
+        super().__init__((host, port), _RequestHandler)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        """Serve on a background thread and return it"""
+        thread = threading.Thread(target=self.serve_forever, name="http-api", daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        super().server_close()
+        self.api.close()
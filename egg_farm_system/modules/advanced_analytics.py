@@ -14,6 +14,7 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import (
     Farm, Shed, EggProduction, Sale, Purchase, Expense, FeedIssue, 
@@ -68,11 +69,12 @@ class AdvancedAnalytics:
                 return {"error": "No sheds found for farm"}
             
             # Get production data
-            productions = self.session.query(EggProduction).filter(
-                EggProduction.shed_id.in_(shed_ids),
-                EggProduction.date >= start_date,
-                EggProduction.date <= end_date
-            ).order_by(EggProduction.date).all()
+            production = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
+            productions = self.session.query(production).filter(
+                production.shed_id.in_(shed_ids),
+                production.date >= start_date,
+                production.date <= end_date
+            ).order_by(production.date).all()
             
             if len(productions) < 10:
                 return {"error": "Insufficient historical data for forecasting"}
@@ -441,9 +443,10 @@ class AdvancedAnalytics:
         try:
             # This would be implemented based on actual sales structure
             # For now, return sample data structure
-            sales = self.session.query(Sale).filter(
-                Sale.date >= start_date,
-                Sale.date <= end_date
+            rows = ArchiveManager.entity(self.session, Sale, start_date, end_date)
+            sales = self.session.query(rows).filter(
+                rows.date >= start_date,
+                rows.date <= end_date
             ).all()
             
             monthly_data = {}
@@ -468,9 +471,10 @@ class AdvancedAnalytics:
     def _get_monthly_expense_data(self, farm_id: int, start_date: datetime.date, end_date: datetime.date) -> List[Dict]:
         """Get monthly expense data for forecasting"""
         try:
-            expenses = self.session.query(Expense).filter(
-                Expense.date >= start_date,
-                Expense.date <= end_date
+            rows = ArchiveManager.entity(self.session, Expense, start_date, end_date)
+            expenses = self.session.query(rows).filter(
+                rows.date >= start_date,
+                rows.date <= end_date
             ).all()
             
             monthly_data = {}
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import func
 import logging
 
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import (
     Farm, Shed, EggProduction, Mortality, Flock,
@@ -97,12 +98,13 @@ class ProductionDropAlert(AlertRule):
         end_date = datetime.now().date() - timedelta(days=offset)
         start_date = end_date - timedelta(days=days - 1)
         
+        production = ArchiveManager.entity(session, EggProduction, start_date, end_date)
         total = session.query(func.sum(
-            EggProduction.small_count + EggProduction.medium_count + EggProduction.large_count
-        )).join(Shed).filter(
+            production.small_count + production.medium_count + production.large_count
+        )).join(production.shed).filter(
             Shed.farm_id == farm_id,
-            EggProduction.date >= start_date,
-            EggProduction.date <= end_date
+            production.date >= start_date,
+            production.date <= end_date
         ).scalar() or 0
         
         return total / days if days > 0 else 0
@@ -277,16 +279,18 @@ class OverduePaymentAlert(AlertRule):
             
             # Get parties with positive balance (they owe us)
             parties = session.query(Party).all()
+            # Credit sales of closed years may be archived
+            sales = ArchiveManager.entity(session, Sale, end_date=cutoff_date)
             
             for party in parties:
                 balance_afg = party.get_balance("AFG")
                 
                 if balance_afg > 0:
                     # Check if there are old unpaid sales
-                    old_sales = session.query(Sale).filter(
-                        Sale.party_id == party.id,
-                        Sale.date <= cutoff_date,
-                        Sale.payment_method == 'Credit'
+                    old_sales = session.query(sales).filter(
+                        sales.party_id == party.id,
+                        sales.date <= cutoff_date,
+                        sales.payment_method == 'Credit'
                     ).count()
                     
                     if old_sales > 0:
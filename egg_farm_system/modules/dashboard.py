@@ -0,0 +1,220 @@
+"""
+Dashboard data service
+
+Computes every dashboard metric for a farm in one read transaction with
+aggregate SQL and returns an immutable DashboardSnapshot. Snapshots are cached
+per farm and day and reused while ``DatabaseManager.data_version()`` is
+unchanged, so switching back to a farm costs no queries.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, func, select
+
+from egg_farm_system.database.archive import ArchiveManager
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import EggProduction, FeedIssue, FinishedFeed, RawMaterial, Sale, Shed
+from egg_farm_system.utils.audit_trail import AuditLog
+from egg_farm_system.utils.performance_monitoring import measure_time
+
+logger = logging.getLogger(__name__)
+
+PRODUCTION_DAYS = 30
+SALES_SUMMARY_DAYS = 30
+ACTIVITY_LIMIT = 5
+# Snapshots older than this are recomputed even if the data version has not
+# moved, so writes from other processes show up eventually
+SNAPSHOT_MAX_AGE = 300
+MAX_CACHED_SNAPSHOTS = 8
+
+
+class LowStockAlert(NamedTuple):
+    type: str
+    name: str
+    stock: float
+    unit: str
+    alert_level: float
+
+
+class ActivityItem(NamedTuple):
+    action: str
+    entity_type: str
+    description: Optional[str]
+    timestamp: datetime
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """All dashboard figures for one farm and day, read in one transaction"""
+
+    farm_id: int
+    day: date
+    data_version: int
+    created: float  # time.monotonic() when computed
+    today_eggs: int
+    today_feed_kg: float
+    today_sales_afg: float
+    today_sales_usd: float
+    sales_summary_afg: float  # last SALES_SUMMARY_DAYS days including today
+    production_dates: Tuple[date, ...]
+    production_counts: Tuple[int, ...]
+    low_stock_alerts: Tuple[LowStockAlert, ...]
+    recent_activity: Tuple[ActivityItem, ...]
+
+    @property
+    def total_production(self) -> int:
+        return sum(self.production_counts)
+
+    @property
+    def average_production(self) -> float:
+        return self.total_production / len(self.production_counts) if self.production_counts else 0.0
+
+
+def _day_start(day):
+    return datetime.combine(day, datetime.min.time())
+
+
+def compute_snapshot(session, farm_id: int, day: date, data_version: int = 0) -> DashboardSnapshot:
+    """Run the dashboard queries for ``farm_id`` on ``session``"""
+    tomorrow = _day_start(day + timedelta(days=1))
+    today = _day_start(day)
+    production_start = _day_start(day - timedelta(days=PRODUCTION_DAYS - 1))
+    sales_start = _day_start(day - timedelta(days=SALES_SUMMARY_DAYS - 1))
+    farm_sheds = select(Shed.id).where(Shed.farm_id == farm_id).scalar_subquery()
+
+    # Daily egg totals for the chart; today's total is the last day. Early in
+    # January the chart and sales summary reach into the archived last year.
+    production = ArchiveManager.entity(session, EggProduction, production_start, tomorrow)
+    production_day = func.date(production.date)
+    daily = dict(session.execute(
+        select(
+            production_day,
+            func.sum(production.small_count + production.medium_count
+                     + production.large_count + production.broken_count),
+        ).where(
+            production.shed_id.in_(farm_sheds),
+            production.date >= production_start,
+            production.date < tomorrow,
+        ).group_by(production_day)
+    ).all())
+    dates = tuple(day - timedelta(days=offset) for offset in range(PRODUCTION_DAYS - 1, -1, -1))
+    counts = tuple(int(daily.get(d.isoformat()) or 0) for d in dates)
+
+    today_feed = session.execute(
+        select(func.coalesce(func.sum(FeedIssue.quantity_kg), 0.0)).where(
+            FeedIssue.shed_id.in_(farm_sheds),
+            FeedIssue.date >= today,
+            FeedIssue.date < tomorrow,
+        )
+    ).scalar_one()
+
+    sales = ArchiveManager.entity(session, Sale, sales_start, tomorrow)
+    is_today = sales.date >= today
+    sales_today_afg, sales_today_usd, sales_summary_afg = session.execute(
+        select(
+            func.coalesce(func.sum(case((is_today, sales.total_afg), else_=0.0)), 0.0),
+            func.coalesce(func.sum(case((is_today, sales.total_usd), else_=0.0)), 0.0),
+            func.coalesce(func.sum(sales.total_afg), 0.0),
+        ).where(sales.farm_id == farm_id, sales.date >= sales_start, sales.date < tomorrow)
+    ).one()
+
+    alerts = [
+        LowStockAlert('Raw Material', name, stock, unit, level)
+        for name, stock, unit, level in session.execute(
+            select(RawMaterial.name, RawMaterial.current_stock, RawMaterial.unit, RawMaterial.low_stock_alert)
+            .where(RawMaterial.farm_id == farm_id, RawMaterial.current_stock <= RawMaterial.low_stock_alert)
+        )
+    ]
+    alerts.extend(
+        LowStockAlert('Finished Feed', feed_type.value, stock, 'kg', level)
+        for feed_type, stock, level in session.execute(
+            select(FinishedFeed.feed_type, FinishedFeed.current_stock, FinishedFeed.low_stock_alert)
+            .where(FinishedFeed.farm_id == farm_id, FinishedFeed.current_stock <= FinishedFeed.low_stock_alert)
+        )
+    )
+
+    activity = tuple(
+        ActivityItem(action_type.value, entity_type, description, timestamp)
+        for action_type, entity_type, description, timestamp in session.execute(
+            select(AuditLog.action_type, AuditLog.entity_type, AuditLog.description, AuditLog.timestamp)
+            .order_by(AuditLog.timestamp.desc()).limit(ACTIVITY_LIMIT)
+        )
+    )
+
+    return DashboardSnapshot(
+        farm_id=farm_id,
+        day=day,
+        data_version=data_version,
+        created=time.monotonic(),
+        today_eggs=counts[-1],
+        today_feed_kg=float(today_feed),
+        today_sales_afg=float(sales_today_afg),
+        today_sales_usd=float(sales_today_usd),
+        sales_summary_afg=float(sales_summary_afg),
+        production_dates=dates,
+        production_counts=counts,
+        low_stock_alerts=tuple(alerts),
+        recent_activity=activity,
+    )
+
+
+class DashboardDataService:
+    """Thread-safe cache of dashboard snapshots keyed by farm, day and data version"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_SNAPSHOTS, max_age: float = SNAPSHOT_MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, farm_id: int, day: Optional[date] = None) -> Optional[DashboardSnapshot]:
+        """Return the cached snapshot if it is still current, without querying"""
+        day = day or date.today()
+        with self._lock:
+            snapshot = self._snapshots.get((farm_id, day))
+        if snapshot is None:
+            return None
+        if snapshot.data_version != DatabaseManager.data_version():
+            return None
+        if time.monotonic() - snapshot.created > self.max_age:
+            return None
+        return snapshot
+
+    def get_snapshot(self, farm_id: int, day: Optional[date] = None, force: bool = False) -> DashboardSnapshot:
+        """Return a current snapshot, computing it in one read transaction if needed"""
+        day = day or date.today()
+        if not force:
+            snapshot = self.cached(farm_id, day)
+            if snapshot is not None:
+                return snapshot
+
+        # Read the version first: a commit during the queries leaves the
+        # snapshot stale and it is recomputed on the next request
+        version = DatabaseManager.data_version()
+        with measure_time("dashboard_snapshot", farm_id=farm_id):
+            with DatabaseManager.read_transaction() as session:
+                snapshot = compute_snapshot(session, farm_id, day, version)
+
+        with self._lock:
+            self._snapshots[(farm_id, day)] = snapshot
+            self._snapshots.move_to_end((farm_id, day))
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, farm_id: Optional[int] = None):
+        with self._lock:
+            if farm_id is None:
+                self._snapshots.clear()
+            else:
+                for key in [key for key in self._snapshots if key[0] == farm_id]:
+                    del self._snapshots[key]
+
+
+# Global service shared by dashboard widgets
+dashboard_service = DashboardDataService()
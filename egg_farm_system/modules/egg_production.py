@@ -2,9 +2,12 @@
 Egg production tracking module
 """
 from datetime import datetime
+from sqlalchemy import func, select
 from egg_farm_system.database.models import EggProduction
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import Shed
+from egg_farm_system.utils.query_optimizer import AggregationHelper
 import logging
 
 logger = logging.getLogger(__name__)
@@ -85,12 +88,13 @@ class EggProductionManager:
             return None
     
     def get_daily_production(self, shed_id, start_date, end_date):
-        """Get production records for a date range"""
+        """Get production records for a date range, including archived years"""
         try:
-            return self.session.query(EggProduction).filter(
-                EggProduction.shed_id == shed_id,
-                EggProduction.date >= start_date,
-                EggProduction.date <= end_date
+            production = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
+            return self.session.query(production).filter(
+                production.shed_id == shed_id,
+                production.date >= start_date,
+                production.date <= end_date
             ).all()
         except Exception as e:
             logger.error(f"Error getting production records: {e}")
@@ -102,13 +106,14 @@ class EggProductionManager:
             from egg_farm_system.database.models import Shed
             
             sheds = self.session.query(Shed).filter(Shed.farm_id == farm_id).all()
+            production = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
             productions = []
             
             for shed in sheds:
-                prods = self.session.query(EggProduction).filter(
-                    EggProduction.shed_id == shed.id,
-                    EggProduction.date >= start_date,
-                    EggProduction.date <= end_date
+                prods = self.session.query(production).filter(
+                    production.shed_id == shed.id,
+                    production.date >= start_date,
+                    production.date <= end_date
                 ).all()
                 productions.extend(prods)
             
@@ -117,32 +122,54 @@ class EggProductionManager:
             logger.error(f"Error getting farm production: {e}")
             return []
     
-    def get_production_summary(self, shed_id, start_date, end_date):
-        """Get production summary for date range"""
+    def get_production_summary(self, shed_id, start_date, end_date, farm_id=None, group_by=None):
+        """
+        Get production summary for date range, computed in SQL
+        
+        Pass ``shed_id=None`` with ``farm_id`` to summarize all sheds of a farm.
+        ``group_by`` may be 'day', 'month', 'year' or 'shed'; the result then
+        has a ``groups`` dict with the counts of each group.
+        """
+        production = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
+        group_expr = AggregationHelper.group_expression(group_by, production.date, shed=production.shed_id)
         try:
-            productions = self.get_daily_production(shed_id, start_date, end_date)
+            filters = AggregationHelper.date_range_filters(production.date, start_date, end_date)
+            if shed_id is not None:
+                filters.append(production.shed_id == shed_id)
+            if farm_id is not None:
+                filters.append(production.shed_id.in_(
+                    select(Shed.id).where(Shed.farm_id == farm_id).scalar_subquery()
+                ))
             
-            total_small = sum(p.small_count for p in productions)
-            total_medium = sum(p.medium_count for p in productions)
-            total_large = sum(p.large_count for p in productions)
-            total_broken = sum(p.broken_count for p in productions)
-            total_eggs = sum(p.total_eggs for p in productions)
-            usable_eggs = sum(p.usable_eggs for p in productions)
+            summary = AggregationHelper.summarize(
+                self.session,
+                {
+                    'days_count': func.count(production.id),
+                    'small': func.sum(production.small_count),
+                    'medium': func.sum(production.medium_count),
+                    'large': func.sum(production.large_count),
+                    'broken': func.sum(production.broken_count),
+                },
+                filters,
+                group_by=group_expr,
+            )
+            for counts in [summary['totals'], *summary.get('groups', {}).values()]:
+                counts['usable_eggs'] = counts['small'] + counts['medium'] + counts['large']
+                counts['total_eggs'] = counts['usable_eggs'] + counts['broken']
             
-            return {
+            totals = summary['totals']
+            total_eggs = totals['total_eggs']
+            result = {
                 'shed_id': shed_id,
                 'start_date': start_date,
                 'end_date': end_date,
-                'days_count': len(productions),
-                'small': total_small,
-                'medium': total_medium,
-                'large': total_large,
-                'broken': total_broken,
-                'total_eggs': total_eggs,
-                'usable_eggs': usable_eggs,
-                'broken_percentage': (total_broken / total_eggs * 100) if total_eggs > 0 else 0,
-                'daily_average': total_eggs / len(productions) if productions else 0
+                **totals,
+                'broken_percentage': (totals['broken'] / total_eggs * 100) if total_eggs > 0 else 0,
+                'daily_average': total_eggs / totals['days_count'] if totals['days_count'] else 0
             }
+            if group_by:
+                result['groups'] = summary['groups']
+            return result
         except Exception as e:
             logger.error(f"Error getting production summary: {e}")
             return None
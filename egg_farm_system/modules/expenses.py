@@ -2,16 +2,30 @@
 Expenses and payments module with performance optimizations
 """
 from datetime import UTC, datetime
-from egg_farm_system.database.models import Expense, Payment
+from typing import NamedTuple, Optional
+from sqlalchemy import func
+from egg_farm_system.database.models import Expense, Party, Payment
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.modules.ledger import LedgerManager
 from egg_farm_system.utils.advanced_caching import CacheInvalidationManager
 from egg_farm_system.utils.performance_monitoring import measure_time
+from egg_farm_system.utils.query_optimizer import AggregationHelper
 import logging
 from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
+
+class ExpenseListRow(NamedTuple):
+    id: int
+    date: datetime
+    category: str
+    party_id: Optional[int]
+    party_name: Optional[str]
+    amount_afg: float
+
+
 class ExpenseManager:
     """
     Manage farm expenses
@@ -43,7 +57,7 @@ class ExpenseManager:
                       party_id=None, exchange_rate_used=78.0, date=None, description=None, payment_method="Cash"):
         """Record farm expense"""
         try:
-            with measure_time(f"record_expense_farm_{farm_id}"):
+            with measure_time("record_expense", farm_id=farm_id):
                 # Input validation
                 if amount_afg < 0:
                     raise ValueError("Amount (AFG) cannot be negative")
@@ -117,59 +131,110 @@ class ExpenseManager:
             logger.error(f"Error recording expense: {e}")
             raise
     
-    def get_expenses(self, farm_id=None, start_date=None, end_date=None, category=None):
-        """Get expense records"""
+    @staticmethod
+    def _filter_expenses(query, expenses, farm_id=None, start_date=None, end_date=None, category=None):
+        if farm_id is not None:
+            query = query.filter(expenses.farm_id == farm_id)
+        
+        if start_date:
+            query = query.filter(expenses.date >= start_date)
+        
+        if end_date:
+            query = query.filter(expenses.date <= end_date)
+        
+        if category:
+            query = query.filter(expenses.category == category)
+        
+        return query.order_by(expenses.date.desc())
+    
+    def get_expenses(self, farm_id=None, start_date=None, end_date=None, category=None, include_archived=False):
+        """Get expense records, including archived years the range reaches
+        
+        Without dates only open years are read unless ``include_archived``.
+        """
         try:
-            query = self.session.query(Expense)
-            
-            if farm_id is not None:
-                query = query.filter(Expense.farm_id == farm_id)
-            
-            if start_date:
-                query = query.filter(Expense.date >= start_date)
-            
-            if end_date:
-                query = query.filter(Expense.date <= end_date)
-            
-            if category:
-                query = query.filter(Expense.category == category)
-            
-            return query.order_by(Expense.date.desc()).all()
+            expenses = ArchiveManager.entity(self.session, Expense, start_date, end_date, include_archived)
+            query = self.session.query(expenses)
+            return self._filter_expenses(query, expenses, farm_id, start_date, end_date, category).all()
         except Exception as e:
             logger.error(f"Error getting expenses: {e}")
             return []
     
-    def get_expenses_summary(self, farm_id=None, start_date=None, end_date=None):
-        """Get expenses summary"""
+    def get_expense_list(self, farm_id=None, start_date=None, end_date=None, category=None, include_archived=False):
+        """
+        Get the columns the expenses list shows, newest first, as ExpenseListRow tuples
+        
+        The party name is joined in the same query; load the full record with
+        ``get_expense`` to edit it. Without dates only open years are listed
+        unless ``include_archived``.
+        """
         try:
-            expenses = self.get_expenses(farm_id, start_date, end_date)
-            
-            total_afg = sum(e.amount_afg for e in expenses)
-            total_usd = sum(e.amount_usd for e in expenses)
-            
-            by_category = {}
-            for expense in expenses:
-                if expense.category not in by_category:
-                    by_category[expense.category] = {'count': 0, 'afg': 0, 'usd': 0}
-                
-                by_category[expense.category]['count'] += 1
-                by_category[expense.category]['afg'] += expense.amount_afg
-                by_category[expense.category]['usd'] += expense.amount_usd
+            expenses = ArchiveManager.entity(self.session, Expense, start_date, end_date, include_archived)
+            query = self.session.query(
+                expenses.id, expenses.date, expenses.category, expenses.party_id, Party.name, expenses.amount_afg,
+            ).outerjoin(Party, Party.id == expenses.party_id)
+            query = self._filter_expenses(query, expenses, farm_id, start_date, end_date, category)
+            return [ExpenseListRow(*row) for row in query]
+        except Exception as e:
+            logger.error(f"Error getting expense list: {e}")
+            return []
+    
+    def get_expense(self, expense_id):
+        """Get an expense by ID"""
+        try:
+            return self.session.get(Expense, expense_id)
+        except Exception as e:
+            logger.error(f"Error getting expense: {e}")
+            return None
+    
+    def get_expenses_summary(self, farm_id=None, start_date=None, end_date=None, group_by=None):
+        """
+        Get expenses summary computed in SQL
+        
+        ``by_category`` is always included. ``group_by`` may additionally be
+        'day', 'month', 'year' or 'category', adding a ``groups`` dict with
+        the totals of each group.
+        """
+        expenses = ArchiveManager.entity(self.session, Expense, start_date, end_date)
+        group_expr = AggregationHelper.group_expression(group_by, expenses.date, category=expenses.category)
+        measures = {
+            'count': func.count(expenses.id),
+            'afg': func.sum(expenses.amount_afg),
+            'usd': func.sum(expenses.amount_usd),
+        }
+        try:
+            filters = AggregationHelper.date_range_filters(expenses.date, start_date, end_date)
+            if farm_id is not None:
+                filters.append(expenses.farm_id == farm_id)
             
-            return {
-                'total_expenses': len(expenses),
-                'total_afg': total_afg,
-                'total_usd': total_usd,
-                'by_category': by_category
+            by_category = AggregationHelper.summarize(
+                self.session, measures, filters, group_by=expenses.category
+            )
+            totals = by_category['totals']
+            result = {
+                'total_expenses': totals['count'],
+                'total_afg': totals['afg'],
+                'total_usd': totals['usd'],
+                'by_category': by_category['groups']
             }
+            if group_by == 'category':
+                result['groups'] = by_category['groups']
+            elif group_by:
+                result['groups'] = AggregationHelper.summarize(
+                    self.session, measures, filters, group_by=group_expr
+                )['groups']
+            return result
         except Exception as e:
             logger.error(f"Error getting expenses summary: {e}")
-            return {
+            result = {
                 'total_expenses': 0,
                 'total_afg': 0,
                 'total_usd': 0,
                 'by_category': {}
             }
+            if group_by:
+                result['groups'] = {}
+            return result
 
 
 class PaymentManager:
@@ -270,21 +335,25 @@ class PaymentManager:
             logger.error(f"Error recording payment: {e}")
             raise
     
-    def get_payments(self, party_id=None, start_date=None, end_date=None):
-        """Get payment records"""
+    def get_payments(self, party_id=None, start_date=None, end_date=None, include_archived=False):
+        """Get payment records, including archived years the range reaches
+        
+        Without dates only open years are read unless ``include_archived``.
+        """
         try:
-            query = self.session.query(Payment)
+            payments = ArchiveManager.entity(self.session, Payment, start_date, end_date, include_archived)
+            query = self.session.query(payments)
             
             if party_id:
-                query = query.filter(Payment.party_id == party_id)
+                query = query.filter(payments.party_id == party_id)
             
             if start_date:
-                query = query.filter(Payment.date >= start_date)
+                query = query.filter(payments.date >= start_date)
             
             if end_date:
-                query = query.filter(Payment.date <= end_date)
+                query = query.filter(payments.date <= end_date)
             
-            return query.order_by(Payment.date.desc()).all()
+            return query.order_by(payments.date.desc()).all()
         except Exception as e:
             logger.error(f"Error getting payments: {e}")
             return []
@@ -1,7 +1,8 @@
 """
 Farm management module
 """
-from egg_farm_system.database.models import Farm
+from sqlalchemy import func
+from egg_farm_system.database.models import Expense, Farm, Shed
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.utils.cache_manager import cached, get_cache_manager
 import logging
@@ -42,6 +43,13 @@ class FarmManager:
         try:
             farm = Farm(name=name, location=location)
             self.session.add(farm)
+            self.session.flush()
+            # Migrations only run once per database, so seed the shared
+            # feed material list for new farms here
+            from egg_farm_system.database.migrate_feed_material_template_backfill import (
+                backfill_farm_feed_materials,
+            )
+            backfill_farm_feed_materials(self.session, farm.id)
             self.session.commit()
             
             # Invalidate cache
@@ -139,23 +147,25 @@ class FarmManager:
             raise
     
     def get_farm_summary(self, farm_id):
-        """Get farm summary with stats"""
+        """Get farm summary with shed and expense totals computed in SQL"""
         try:
             farm = self.get_farm_by_id(farm_id)
             if not farm:
                 return None
             
-            total_sheds = len(farm.sheds)
-            total_capacity = sum(shed.capacity for shed in farm.sheds)
-            total_expenses = sum(exp.amount_afg for exp in farm.expenses)
+            total_sheds, total_capacity = self.session.query(
+                func.count(Shed.id), func.coalesce(func.sum(Shed.capacity), 0)
+            ).filter(Shed.farm_id == farm_id).one()
+            expense_count, total_expenses = self.session.query(
+                func.count(Expense.id), func.coalesce(func.sum(Expense.amount_afg), 0)
+            ).filter(Expense.farm_id == farm_id).one()
             
             return {
                 'farm': farm,
                 'total_sheds': total_sheds,
                 'total_capacity': total_capacity,
                 'total_expenses': total_expenses,
-                'sheds': farm.sheds,
-                'expenses': farm.expenses
+                'expense_count': expense_count
             }
         except Exception as e:
             logger.error(f"Error getting farm summary: {e}")
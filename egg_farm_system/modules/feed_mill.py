@@ -7,6 +7,7 @@ from datetime import UTC, datetime
 from egg_farm_system.database.models import (
     RawMaterial, FeedFormula, FeedFormulation, FeedBatch, FinishedFeed, FeedIssue
 )
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.utils.currency import CurrencyConverter
 import logging
@@ -450,12 +451,13 @@ class FeedIssueManager:
             raise
     
     def get_shed_feed_issues(self, shed_id, start_date, end_date):
-        """Get feed issues for a shed in date range"""
+        """Get feed issues for a shed in date range, including archived years"""
         try:
-            return self.session.query(FeedIssue).filter(
-                FeedIssue.shed_id == shed_id,
-                FeedIssue.date >= start_date,
-                FeedIssue.date <= end_date
+            issues = ArchiveManager.entity(self.session, FeedIssue, start_date, end_date)
+            return self.session.query(issues).filter(
+                issues.shed_id == shed_id,
+                issues.date >= start_date,
+                issues.date <= end_date
             ).all()
         except Exception as e:
             logger.error(f"Error getting feed issues: {e}")
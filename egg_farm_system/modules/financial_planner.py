@@ -10,6 +10,7 @@ from decimal import Decimal, ROUND_HALF_UP
 import math
 import logging
 
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import (
     Farm, Sale, Purchase, Expense, Ledger, Party, Payment
@@ -98,29 +99,34 @@ class FinancialPlanner:
     def _get_historical_financial_data(self, farm_id, start_year, end_year):
         """Get historical financial data for budgeting baseline"""
         try:
+            period_start, period_end = datetime(start_year, 1, 1), datetime(end_year, 12, 31)
+            sales = ArchiveManager.entity(self.session, Sale, period_start, period_end)
+            expenses = ArchiveManager.entity(self.session, Expense, period_start, period_end)
+            purchases = ArchiveManager.entity(self.session, Purchase, period_start, period_end)
+
             # Get sales data
-            sales_query = self.session.query(Sale).join(
-                Party, Sale.party_id == Party.id
+            sales_query = self.session.query(sales).join(
+                Party, sales.party_id == Party.id
             ).filter(
-                Sale.date >= datetime(start_year, 1, 1),
-                Sale.date <= datetime(end_year, 12, 31)
+                sales.date >= period_start,
+                sales.date <= period_end
             )
             
             # Add farm filter if needed (assuming all sales are for this farm)
             sales_data = sales_query.all()
             
             # Get expense data
-            expenses_query = self.session.query(Expense).filter(
-                Expense.date >= datetime(start_year, 1, 1),
-                Expense.date <= datetime(end_year, 12, 31)
+            expenses_query = self.session.query(expenses).filter(
+                expenses.date >= period_start,
+                expenses.date <= period_end
             )
             
             expense_data = expenses_query.all()
             
             # Get purchase data
-            purchases_query = self.session.query(Purchase).filter(
-                Purchase.date >= datetime(start_year, 1, 1),
-                Purchase.date <= datetime(end_year, 12, 31)
+            purchases_query = self.session.query(purchases).filter(
+                purchases.date >= period_start,
+                purchases.date <= period_end
             )
             
             purchase_data = purchases_query.all()
@@ -874,6 +880,9 @@ class FinancialPlanner:
             end_date = utcnow_naive().replace(day=1)
             start_date = (end_date - timedelta(days=months*30)).replace(day=1)
             
+            sale_rows = ArchiveManager.entity(self.session, Sale, start_date, end_date)
+            expense_rows = ArchiveManager.entity(self.session, Expense, start_date, end_date)
+
             # Get monthly aggregated data
             monthly_data = []
             current_date = start_date
@@ -882,15 +891,15 @@ class FinancialPlanner:
                 next_month = (current_date + timedelta(days=32)).replace(day=1)
                 
                 # Get sales for the month
-                sales = self.session.query(Sale).filter(
-                    Sale.date >= current_date,
-                    Sale.date < next_month
+                sales = self.session.query(sale_rows).filter(
+                    sale_rows.date >= current_date,
+                    sale_rows.date < next_month
                 ).all()
                 
                 # Get expenses for the month
-                expenses = self.session.query(Expense).filter(
-                    Expense.date >= current_date,
-                    Expense.date < next_month
+                expenses = self.session.query(expense_rows).filter(
+                    expense_rows.date >= current_date,
+                    expense_rows.date < next_month
                 ).all()
                 
                 # Calculate monthly totals
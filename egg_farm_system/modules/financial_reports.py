@@ -6,6 +6,7 @@ from sqlalchemy import func
 from egg_farm_system.database.models import (
     Sale, Expense, FeedIssue, Payment, Purchase, Shed, RawMaterial, FinishedFeed, FeedFormula
 )
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.utils.advanced_caching import report_cache, CacheInvalidationManager
 from egg_farm_system.utils.query_optimizer import AggregationHelper
 from egg_farm_system.utils.performance_monitoring import measure_time
@@ -55,34 +56,39 @@ class FinancialReportGenerator:
             return False
 
         try:
+            # The source record is never dated after its payment but may be archived
             if reference.startswith("Sale #"):
                 sale_id = int(reference.split("#", 1)[1])
-                return self.session.query(Sale.id).filter(
-                    Sale.id == sale_id,
-                    Sale.farm_id == farm_id,
+                sales = ArchiveManager.entity(self.session, Sale, end_date=payment.date)
+                return self.session.query(sales.id).filter(
+                    sales.id == sale_id,
+                    sales.farm_id == farm_id,
                 ).first() is not None
 
             if reference.startswith("Purchase #"):
                 purchase_id = int(reference.split("#", 1)[1])
-                return self.session.query(Purchase.id).filter(
-                    Purchase.id == purchase_id,
-                    Purchase.farm_id == farm_id,
+                purchases = ArchiveManager.entity(self.session, Purchase, end_date=payment.date)
+                return self.session.query(purchases.id).filter(
+                    purchases.id == purchase_id,
+                    purchases.farm_id == farm_id,
                 ).first() is not None
 
             if reference.startswith("Expense #"):
                 expense_id = int(reference.split("#", 1)[1])
-                return self.session.query(Expense.id).filter(
-                    Expense.id == expense_id,
-                    Expense.farm_id == farm_id,
+                expenses = ArchiveManager.entity(self.session, Expense, end_date=payment.date)
+                return self.session.query(expenses.id).filter(
+                    expenses.id == expense_id,
+                    expenses.farm_id == farm_id,
                 ).first() is not None
 
             if reference.startswith("Expense:"):
                 category = reference.split(":", 1)[1].strip()
-                return self.session.query(Expense.id).filter(
-                    Expense.category == category,
-                    Expense.date == payment.date,
-                    Expense.party_id == payment.party_id,
-                    Expense.farm_id == farm_id,
+                expenses = ArchiveManager.entity(self.session, Expense, payment.date, payment.date)
+                return self.session.query(expenses.id).filter(
+                    expenses.category == category,
+                    expenses.date == payment.date,
+                    expenses.party_id == payment.party_id,
+                    expenses.farm_id == farm_id,
                 ).first() is not None
 
         except Exception:
@@ -98,27 +104,32 @@ class FinancialReportGenerator:
         # Ensure end_date includes the full day
         query_end_date = self._ensure_end_of_day(end_date)
         
-        with measure_time(f"pnl_statement_{farm_id}_{start_date}_{end_date}"):
+        with measure_time("pnl_statement", farm_id=farm_id):
             # Check cache first
             cache_key = f"pnl_{farm_id}_{start_date}_{end_date}"
             cached = report_cache.get_report("pnl", {'farm_id': farm_id, 'start': start_date, 'end': end_date})
             if cached is not None:
-                logger.info(f"PnL report cache hit for farm {farm_id}")
+                logger.debug(f"PnL report cache hit for farm {farm_id}")
                 return cached
             
+            # Closed years are read from their archives
+            sales = ArchiveManager.entity(self.session, Sale, start_date, query_end_date)
+            feed_issues = ArchiveManager.entity(self.session, FeedIssue, start_date, query_end_date)
+            expenses = ArchiveManager.entity(self.session, Expense, start_date, query_end_date)
+
             # 1. Calculate Total Revenue from Sales
-            revenue_query = self.session.query(func.sum(Sale.total_afg)).filter(
-                Sale.date >= start_date,
-                Sale.date <= query_end_date
+            revenue_query = self.session.query(func.sum(sales.total_afg)).filter(
+                sales.date >= start_date,
+                sales.date <= query_end_date
             )
             if farm_id:
-                revenue_query = revenue_query.filter(Sale.farm_id == farm_id)
+                revenue_query = revenue_query.filter(sales.farm_id == farm_id)
             total_revenue = revenue_query.scalar() or 0
 
             # 2. Calculate Cost of Goods Sold (COGS) - primarily feed cost for now
-            cogs_query = self.session.query(func.sum(FeedIssue.cost_afg)).join(FeedIssue.shed).filter(
-                FeedIssue.date >= start_date,
-                FeedIssue.date <= query_end_date
+            cogs_query = self.session.query(func.sum(feed_issues.cost_afg)).join(feed_issues.shed).filter(
+                feed_issues.date >= start_date,
+                feed_issues.date <= query_end_date
             )
             if farm_id:
                 cogs_query = cogs_query.filter(Shed.farm_id == farm_id)
@@ -128,12 +139,12 @@ class FinancialReportGenerator:
             gross_profit = total_revenue - total_cogs
 
             # 4. Calculate Operating Expenses
-            expenses_query = self.session.query(func.sum(Expense.amount_afg)).filter(
-                Expense.date >= start_date,
-                Expense.date <= query_end_date
+            expenses_query = self.session.query(func.sum(expenses.amount_afg)).filter(
+                expenses.date >= start_date,
+                expenses.date <= query_end_date
             )
             if farm_id:
-                expenses_query = expenses_query.filter(Expense.farm_id == farm_id)
+                expenses_query = expenses_query.filter(expenses.farm_id == farm_id)
             total_expenses = expenses_query.scalar() or 0
 
             # 5. Calculate Net Profit
@@ -163,14 +174,16 @@ class FinancialReportGenerator:
         """
         # Ensure end_date includes the full day
         query_end_date = self._ensure_end_of_day(end_date)
+        payments = ArchiveManager.entity(self.session, Payment, start_date, query_end_date)
+        expenses = ArchiveManager.entity(self.session, Expense, start_date, query_end_date)
 
         # --- Cash Inflows ---
         # Only Payments Received (Cash Sales should have a corresponding Payment record)
         # Sales records themselves are Accrual (AR).
-        payments_received_query = self.session.query(Payment).filter(
-            Payment.date >= start_date,
-            Payment.date <= query_end_date,
-            Payment.payment_type == 'Received'
+        payments_received_query = self.session.query(payments).filter(
+            payments.date >= start_date,
+            payments.date <= query_end_date,
+            payments.payment_type == 'Received'
         )
         payments_received_rows = payments_received_query.all()
         if farm_id:
@@ -181,10 +194,10 @@ class FinancialReportGenerator:
 
         # --- Cash Outflows ---
         # 1. Payments Paid (for Credit Purchases/Expenses)
-        payments_paid_query = self.session.query(Payment).filter(
-            Payment.date >= start_date,
-            Payment.date <= query_end_date,
-            Payment.payment_type == 'Paid'
+        payments_paid_query = self.session.query(payments).filter(
+            payments.date >= start_date,
+            payments.date <= query_end_date,
+            payments.payment_type == 'Paid'
         )
         payments_paid_rows = payments_paid_query.all()
         if farm_id:
@@ -194,13 +207,13 @@ class FinancialReportGenerator:
         # 2. Direct Cash Expenses (Expenses without a Party linked)
         # If an Expense has a Party, it's a Credit Expense (Liability) -> Paid via Payment later.
         # If an Expense has NO Party, it's assumed to be paid Cash immediately.
-        direct_cash_expenses_query = self.session.query(func.sum(Expense.amount_afg)).filter(
-            Expense.date >= start_date, 
-            Expense.date <= query_end_date,
-            Expense.party_id == None 
+        direct_cash_expenses_query = self.session.query(func.sum(expenses.amount_afg)).filter(
+            expenses.date >= start_date, 
+            expenses.date <= query_end_date,
+            expenses.party_id == None 
         )
         if farm_id:
-            direct_cash_expenses_query = direct_cash_expenses_query.filter(Expense.farm_id == farm_id)
+            direct_cash_expenses_query = direct_cash_expenses_query.filter(expenses.farm_id == farm_id)
         direct_cash_expenses = direct_cash_expenses_query.scalar() or 0
         
         total_outflows = payments_paid + direct_cash_expenses
@@ -22,6 +22,7 @@ class FlockManager:
                 start_date=start_date,
                 initial_count=initial_count
             )
+            flock.set_mortality_totals(())
             session.add(flock)
             session.commit()
             logger.info(f"Flock created: {name} in shed {shed_id}")
@@ -56,9 +57,12 @@ class FlockManager:
             session.close()
     
     def add_mortality(self, flock_id, date, count, notes=None):
-        """Record mortality for a flock"""
+        """Record mortality for a flock and update its cumulative totals"""
         session = DatabaseManager.get_session()
         try:
+            flock = session.query(Flock).filter(Flock.id == flock_id).first()
+            if not flock:
+                raise ValueError(f"Flock {flock_id} not found")
             mortality = Mortality(
                 flock_id=flock_id,
                 date=date,
@@ -66,6 +70,7 @@ class FlockManager:
                 notes=notes
             )
             session.add(mortality)
+            self._update_mortality_totals(session, flock, date, count)
             session.commit()
             logger.info(f"Mortality recorded: {count} birds in flock {flock_id}")
             return mortality
@@ -76,6 +81,34 @@ class FlockManager:
         finally:
             session.close()
     
+    def delete_mortality(self, mortality_id):
+        """Delete a mortality record and take it out of the flock's totals"""
+        session = DatabaseManager.get_session()
+        try:
+            mortality = session.query(Mortality).filter(Mortality.id == mortality_id).first()
+            if not mortality:
+                raise ValueError(f"Mortality record {mortality_id} not found")
+            flock = session.query(Flock).filter(Flock.id == mortality.flock_id).first()
+            session.delete(mortality)
+            self._update_mortality_totals(session, flock, mortality.date, -mortality.count)
+            session.commit()
+            logger.info(f"Mortality record deleted: {mortality_id}")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error deleting mortality: {e}")
+            raise
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _update_mortality_totals(session, flock, date, count):
+        if flock.mortality_series is None:
+            # Totals never built for this flock (e.g. bulk-imported rows)
+            session.flush()
+            Flock.rebuild_mortality_totals(session, [flock.id])
+        else:
+            flock.record_mortality(date, count)
+    
     def get_mortalities(self, flock_id):
         """Get mortality records for a flock"""
         session = DatabaseManager.get_session()
@@ -10,6 +10,7 @@ from scipy import optimize
 import math
 import logging
 
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import (
     Farm, RawMaterial, FinishedFeed, Purchase, Sale, FeedIssue, EggProduction
@@ -108,9 +109,10 @@ class InventoryOptimizer:
             
             if item_type == 'raw_material':
                 # Get consumption from purchases (negative inventory movements)
-                purchases = self.session.query(Purchase).filter(
-                    Purchase.date >= start_date,
-                    Purchase.date <= end_date
+                rows = ArchiveManager.entity(self.session, Purchase, start_date, end_date)
+                purchases = self.session.query(rows).filter(
+                    rows.date >= start_date,
+                    rows.date <= end_date
                 ).all()
                 
                 # Group by date and sum consumption
@@ -130,9 +132,10 @@ class InventoryOptimizer:
             
             elif item_type == 'finished_feed':
                 # Get consumption from feed issues
-                feed_issues = self.session.query(FeedIssue).filter(
-                    FeedIssue.date >= start_date,
-                    FeedIssue.date <= end_date
+                rows = ArchiveManager.entity(self.session, FeedIssue, start_date, end_date)
+                feed_issues = self.session.query(rows).filter(
+                    rows.date >= start_date,
+                    rows.date <= end_date
                 ).all()
                 
                 daily_consumption = {}
@@ -150,9 +153,10 @@ class InventoryOptimizer:
             
             elif item_type == 'egg_inventory':
                 # Get egg production data
-                productions = self.session.query(EggProduction).filter(
-                    EggProduction.date >= start_date,
-                    EggProduction.date <= end_date
+                rows = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
+                productions = self.session.query(rows).filter(
+                    rows.date >= start_date,
+                    rows.date <= end_date
                 ).all()
                 
                 daily_consumption = {}
@@ -2,6 +2,7 @@
 Ledger and accounting module
 """
 from datetime import datetime
+from sqlalchemy import func, or_
 from egg_farm_system.database.models import Ledger, Party
 from egg_farm_system.database.db import DatabaseManager
 import logging
@@ -38,7 +39,7 @@ class LedgerManager:
             reference_id=reference_id
         )
         session.add(entry)
-        logger.info(f"Ledger entry posted for party {party_id}")
+        logger.debug(f"Ledger entry posted for party {party_id}")
         return entry
     
     def get_party_ledger(self, party_id, farm_id=None):
@@ -57,21 +58,46 @@ class LedgerManager:
     
     def get_party_balance(self, party_id, currency="AFG", farm_id=None):
         """Calculate party balance"""
-        # This method uses get_party_ledger, which manages its own session.
+        balances = self.get_party_balances([party_id], farm_id=farm_id).get(party_id)
+        if balances is None:
+            return 0
+        return balances['balance_afg'] if currency == "AFG" else balances['balance_usd']
+    
+    def get_party_balances(self, party_ids=None, farm_id=None):
+        """
+        Get AFG/USD balances and last activity of parties in one grouped query
+        
+        Returns ``{party_id: {'balance_afg', 'balance_usd', 'last_activity'}}``
+        for the parties in ``party_ids`` (all parties if None) that have
+        ledger entries.
+        """
+        session = DatabaseManager.get_session()
         try:
-            entries = self.get_party_ledger(party_id, farm_id=farm_id)
-            balance = 0
-            
-            for entry in entries:
-                if currency == "AFG":
-                    balance += (entry.debit_afg - entry.credit_afg)
-                else:  # USD
-                    balance += (entry.debit_usd - entry.credit_usd)
-            
-            return balance
+            query = self.balances_query(session, farm_id)
+            if party_ids is not None:
+                query = query.filter(Ledger.party_id.in_(party_ids))
+            return {
+                party_id: {'balance_afg': afg, 'balance_usd': usd, 'last_activity': last_activity}
+                for party_id, afg, usd, last_activity in query
+            }
         except Exception as e:
-            logger.error(f"Error calculating balance: {e}")
-            return 0
+            logger.error(f"Error calculating balances: {e}")
+            return {}
+        finally:
+            session.close()
+    
+    @staticmethod
+    def balances_query(session, farm_id=None):
+        """Query of (party_id, balance_afg, balance_usd, last_activity) grouped by party"""
+        query = session.query(
+            Ledger.party_id.label('party_id'),
+            func.coalesce(func.sum(Ledger.debit_afg - Ledger.credit_afg), 0).label('balance_afg'),
+            func.coalesce(func.sum(Ledger.debit_usd - Ledger.credit_usd), 0).label('balance_usd'),
+            func.max(Ledger.date).label('last_activity'),
+        )
+        if farm_id is not None:
+            query = query.filter(Ledger.farm_id == farm_id)
+        return query.group_by(Ledger.party_id)
     
     def get_balance_with_running(self, party_id, currency="AFG", farm_id=None):
         """Get ledger with running balance"""
@@ -109,55 +135,60 @@ class LedgerManager:
     
     def get_ledger_summary(self, party_id, farm_id=None):
         """Get summary of party ledger"""
-        # This method uses get_party_ledger, which manages its own session.
+        session = DatabaseManager.get_session()
         try:
-            entries = self.get_party_ledger(party_id, farm_id=farm_id)
-            
-            total_debit_afg = sum(e.debit_afg for e in entries)
-            total_credit_afg = sum(e.credit_afg for e in entries)
-            total_debit_usd = sum(e.debit_usd for e in entries)
-            total_credit_usd = sum(e.credit_usd for e in entries)
-            
-            balance_afg = total_debit_afg - total_credit_afg
-            balance_usd = total_debit_usd - total_credit_usd
+            query = session.query(
+                func.coalesce(func.sum(Ledger.debit_afg), 0),
+                func.coalesce(func.sum(Ledger.credit_afg), 0),
+                func.coalesce(func.sum(Ledger.debit_usd), 0),
+                func.coalesce(func.sum(Ledger.credit_usd), 0),
+                func.count(Ledger.id),
+                func.max(Ledger.date),
+            ).filter(Ledger.party_id == party_id)
+            if farm_id is not None:
+                query = query.filter(Ledger.farm_id == farm_id)
+            (total_debit_afg, total_credit_afg, total_debit_usd, total_credit_usd,
+             entry_count, last_entry_date) = query.one()
             
             return {
                 'party_id': party_id,
                 'total_debit_afg': total_debit_afg,
                 'total_credit_afg': total_credit_afg,
-                'balance_afg': balance_afg,
+                'balance_afg': total_debit_afg - total_credit_afg,
                 'total_debit_usd': total_debit_usd,
                 'total_credit_usd': total_credit_usd,
-                'balance_usd': balance_usd,
-                'entry_count': len(entries),
-                'last_entry_date': entries[-1].date if entries else None
+                'balance_usd': total_debit_usd - total_credit_usd,
+                'entry_count': entry_count,
+                'last_entry_date': last_entry_date
             }
         except Exception as e:
             logger.error(f"Error getting ledger summary: {e}")
             return None
+        finally:
+            session.close()
     
     def get_all_parties_outstanding(self, farm_id=None):
         """Get outstanding balances for all parties"""
         session = DatabaseManager.get_session()
         try:
-            parties = session.query(Party).all()
-            outstanding = []
+            balances = self.balances_query(session, farm_id).subquery()
+            rows = session.query(Party, balances.c.balance_afg, balances.c.balance_usd).join(
+                balances, balances.c.party_id == Party.id
+            ).filter(
+                or_(balances.c.balance_afg != 0, balances.c.balance_usd != 0)
+            ).all()
             
-            for party in parties:
-                balance_afg = self.get_party_balance(party.id, "AFG", farm_id=farm_id)
-                balance_usd = self.get_party_balance(party.id, "USD", farm_id=farm_id)
-                
-                if balance_afg != 0 or balance_usd != 0:
-                    outstanding.append({
-                        'party': party,
-                        'balance_afg': balance_afg,
-                        'balance_usd': balance_usd,
-                        'status': 'Owes us' if balance_afg > 0 else 'We owe'
-                    })
-            
-            return outstanding
+            return [
+                {
+                    'party': party,
+                    'balance_afg': balance_afg,
+                    'balance_usd': balance_usd,
+                    'status': 'Owes us' if balance_afg > 0 else 'We owe'
+                }
+                for party, balance_afg, balance_usd in rows
+            ]
         except Exception as e:
             logger.error(f"Error getting outstanding balances: {e}")
             return []
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
@@ -1,22 +1,44 @@
 """
 Party management module (unified customer/supplier)
 """
+from typing import NamedTuple, Optional
+from datetime import datetime
+from sqlalchemy import func
 from egg_farm_system.database.models import Party
 from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.modules.ledger import LedgerManager
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class PartyListRow(NamedTuple):
+    id: int
+    name: str
+    phone: Optional[str]
+    balance_afg: float
+    balance_usd: float
+    last_activity: Optional[datetime]
+
+
+class PartyOption(NamedTuple):
+    id: int
+    name: str
+
+
 class PartyManager:
     """Manage parties (customers and suppliers)"""
     
-    def __init__(self):
-        self.session = DatabaseManager.get_session()
+    def __init__(self, session=None):
+        self._owned_session = session is None
+        self.session = DatabaseManager.get_session() if session is None else session
     
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self._owned_session:
+            return
         if exc_type: # An exception occurred
             self.session.rollback()
             logger.error(f"Transaction rolled back due to exception: {exc_val}")
@@ -48,6 +70,37 @@ class PartyManager:
             logger.error(f"Error getting parties: {e}")
             return []
     
+    def get_party_options(self):
+        """Get (id, name) PartyOption tuples of all parties for pickers, ordered by name"""
+        try:
+            return [PartyOption(*row) for row in self.session.query(Party.id, Party.name).order_by(Party.name)]
+        except Exception as e:
+            logger.error(f"Error getting party options: {e}")
+            return []
+    
+    def get_party_list(self, farm_id=None):
+        """
+        Get every party with its balances in one query, ordered by name
+        
+        Returns PartyListRow tuples; balances and last activity are limited to
+        ``farm_id``'s ledger entries when given. Parties without entries have
+        zero balances and no last activity.
+        """
+        try:
+            balances = LedgerManager.balances_query(self.session, farm_id).subquery()
+            rows = self.session.query(
+                Party.id,
+                Party.name,
+                Party.phone,
+                func.coalesce(balances.c.balance_afg, 0),
+                func.coalesce(balances.c.balance_usd, 0),
+                balances.c.last_activity,
+            ).outerjoin(balances, balances.c.party_id == Party.id).order_by(Party.name)
+            return [PartyListRow(*row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error getting party list: {e}")
+            return []
+    
     def get_party_by_id(self, party_id):
         """Get party by ID"""
         try:
@@ -2,17 +2,34 @@
 Purchase module with auto ledger posting and performance optimizations
 """
 from datetime import UTC, datetime, timedelta
-from egg_farm_system.database.models import Purchase, RawMaterial
+from typing import NamedTuple, Optional
+from sqlalchemy import func
+from egg_farm_system.database.models import Party, Purchase, RawMaterial
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.modules.ledger import LedgerManager
 from egg_farm_system.utils.currency import CurrencyConverter
 from egg_farm_system.utils.advanced_caching import CacheInvalidationManager
 from egg_farm_system.utils.performance_monitoring import measure_time
+from egg_farm_system.utils.query_optimizer import AggregationHelper
 import logging
 from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
+
+class PurchaseListRow(NamedTuple):
+    id: int
+    date: datetime
+    party_id: int
+    party_name: Optional[str]
+    material_id: Optional[int]
+    material_name: Optional[str]
+    quantity: float
+    rate_afg: float
+    total_afg: float
+
+
 class PurchaseManager:
     """
     Manage material purchases
@@ -37,7 +54,7 @@ class PurchaseManager:
                        exchange_rate_used=78.0, date=None, notes=None, payment_method="Cash", farm_id=None):
         """Record material purchase and post to ledger"""
         try:
-            with measure_time(f"record_purchase_party_{party_id}"):
+            with measure_time("record_purchase", farm_id=farm_id):
                 # Enhanced input validation
                 if not party_id or party_id <= 0:
                     raise ValueError("Invalid party ID")
@@ -193,51 +210,111 @@ class PurchaseManager:
             logger.error(f"Error recording packaging purchase: {e}")
             raise
     
-    def get_purchases(self, party_id=None, material_id=None, start_date=None, end_date=None, farm_id=None):
-        """Get purchase records"""
+    @staticmethod
+    def _filter_purchases(query, purchases, party_id=None, material_id=None, start_date=None, end_date=None, farm_id=None):
+        if party_id:
+            query = query.filter(purchases.party_id == party_id)
+        
+        if material_id:
+            query = query.filter(purchases.material_id == material_id)
+        
+        if start_date:
+            query = query.filter(purchases.date >= start_date)
+        
+        if end_date:
+            query = query.filter(purchases.date <= end_date)
+        
+        if farm_id is not None:
+            query = query.filter(purchases.farm_id == farm_id)
+        
+        return query.order_by(purchases.date.desc())
+    
+    def get_purchases(self, party_id=None, material_id=None, start_date=None, end_date=None, farm_id=None,
+                      include_archived=False):
+        """Get purchase records, including archived years the range reaches
+        
+        Without dates only open years are read unless ``include_archived``.
+        """
         try:
-            query = self.session.query(Purchase)
-            
-            if party_id:
-                query = query.filter(Purchase.party_id == party_id)
-            
-            if material_id:
-                query = query.filter(Purchase.material_id == material_id)
-            
-            if start_date:
-                query = query.filter(Purchase.date >= start_date)
-            
-            if end_date:
-                query = query.filter(Purchase.date <= end_date)
-            
-            if farm_id is not None:
-                query = query.filter(Purchase.farm_id == farm_id)
-            
-            return query.order_by(Purchase.date.desc()).all()
+            purchases = ArchiveManager.entity(self.session, Purchase, start_date, end_date, include_archived)
+            return self._filter_purchases(self.session.query(purchases), purchases, party_id, material_id,
+                                          start_date, end_date, farm_id).all()
         except Exception as e:
             logger.error(f"Error getting purchases: {e}")
             return []
     
-    def get_purchases_summary(self, party_id=None, material_id=None, start_date=None, end_date=None):
-        """Get purchases summary"""
+    def get_purchase_list(self, party_id=None, material_id=None, start_date=None, end_date=None, farm_id=None,
+                          include_archived=False):
+        """
+        Get the columns the purchases list shows, newest first, as PurchaseListRow tuples
+        
+        Party and material names are joined in the same query; load the full
+        record with ``get_purchase`` to edit it. Without dates only open years
+        are listed unless ``include_archived``.
+        """
         try:
-            purchases = self.get_purchases(party_id, material_id, start_date, end_date)
-            
-            total_quantity = sum(p.quantity for p in purchases)
-            total_afg = sum(p.total_afg for p in purchases)
-            total_usd = sum(p.total_usd for p in purchases)
+            purchases = ArchiveManager.entity(self.session, Purchase, start_date, end_date, include_archived)
+            query = self.session.query(
+                purchases.id, purchases.date, purchases.party_id, Party.name, purchases.material_id,
+                RawMaterial.name, purchases.quantity, purchases.rate_afg, purchases.total_afg,
+            ).outerjoin(Party, Party.id == purchases.party_id).outerjoin(
+                RawMaterial, RawMaterial.id == purchases.material_id)
+            query = self._filter_purchases(query, purchases, party_id, material_id, start_date, end_date, farm_id)
+            return [PurchaseListRow(*row) for row in query]
+        except Exception as e:
+            logger.error(f"Error getting purchase list: {e}")
+            return []
+    
+    def get_purchase(self, purchase_id):
+        """Get a purchase by ID"""
+        try:
+            return self.session.get(Purchase, purchase_id)
+        except Exception as e:
+            logger.error(f"Error getting purchase: {e}")
+            return None
+    
+    def get_purchases_summary(self, party_id=None, material_id=None, start_date=None, end_date=None,
+                              farm_id=None, group_by=None):
+        """
+        Get purchases summary computed in SQL
+        
+        ``group_by`` may be 'day', 'month', 'year', 'party' or 'material'; the
+        result then has a ``groups`` dict with the totals of each group.
+        """
+        purchases = ArchiveManager.entity(self.session, Purchase, start_date, end_date)
+        group_expr = AggregationHelper.group_expression(
+            group_by, purchases.date, party=purchases.party_id, material=purchases.material_id
+        )
+        try:
+            filters = AggregationHelper.date_range_filters(purchases.date, start_date, end_date)
+            if party_id:
+                filters.append(purchases.party_id == party_id)
+            if material_id:
+                filters.append(purchases.material_id == material_id)
+            if farm_id is not None:
+                filters.append(purchases.farm_id == farm_id)
             
-            return {
-                'total_purchases': len(purchases),
-                'total_quantity': total_quantity,
-                'total_afg': total_afg,
-                'total_usd': total_usd,
-                'average_rate_afg': total_afg / total_quantity if total_quantity > 0 else 0,
-                'average_rate_usd': total_usd / total_quantity if total_quantity > 0 else 0
-            }
+            summary = AggregationHelper.summarize(
+                self.session,
+                {
+                    'total_purchases': func.count(purchases.id),
+                    'total_quantity': func.sum(purchases.quantity),
+                    'total_afg': func.sum(purchases.total_afg),
+                    'total_usd': func.sum(purchases.total_usd),
+                },
+                filters,
+                group_by=group_expr,
+            )
+            result = summary['totals']
+            total_quantity = result['total_quantity']
+            result['average_rate_afg'] = result['total_afg'] / total_quantity if total_quantity > 0 else 0
+            result['average_rate_usd'] = result['total_usd'] / total_quantity if total_quantity > 0 else 0
+            if group_by:
+                result['groups'] = summary['groups']
+            return result
         except Exception as e:
             logger.error(f"Error getting purchases summary: {e}")
-            return {
+            result = {
                 'total_purchases': 0,
                 'total_quantity': 0,
                 'total_afg': 0,
@@ -245,6 +322,9 @@ class PurchaseManager:
                 'average_rate_afg': 0,
                 'average_rate_usd': 0
             }
+            if group_by:
+                result['groups'] = {}
+            return result
     
     def close_session(self):
         """Close database session"""
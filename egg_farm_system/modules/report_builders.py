@@ -0,0 +1,195 @@
+"""
+Report builders shared by the GUI report jobs and the command line
+
+``build_report`` runs the ReportGenerator queries for a ReportRequest and
+returns plain data (headers, rows, info text and chart series) without
+touching Qt.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from egg_farm_system.modules.reports import ReportGenerator
+from egg_farm_system.utils.jalali import format_value_for_ui
+
+
+@dataclass(frozen=True)
+class ReportRequest:
+    """Parameters of one report; equal requests are de-duplicated"""
+
+    report_type: str
+    farm_id: Optional[int] = None
+    report_date: Optional[date] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    party_id: Optional[int] = None
+
+
+def _daily_production(rg, request):
+    # ensure a datetime is passed
+    date_dt = request.report_date
+    if not isinstance(date_dt, datetime):
+        date_dt = datetime.combine(date_dt, datetime.min.time())
+    data = rg.daily_egg_production_report(request.farm_id, date_dt)
+    if not data:
+        return None
+    rows = [
+        [
+            shed['name'],
+            str(shed.get('small', 0)),
+            str(shed.get('medium', 0)),
+            str(shed.get('large', 0)),
+            str(shed.get('broken', 0)),
+            str(shed.get('total_eggs', 0)),
+            str(shed.get('usable_eggs', 0))
+        ]
+        for shed in data['sheds']
+    ]
+    # Add totals row
+    totals = data.get('totals', {})
+    rows.append([
+        "<b>TOTAL</b>",
+        str(totals.get('small', 0)),
+        str(totals.get('medium', 0)),
+        str(totals.get('large', 0)),
+        str(totals.get('broken', 0)),
+        f"<b>{totals.get('total', 0)}</b>",
+        f"<b>{totals.get('usable', 0)}</b>"
+    ])
+    return {
+        'data': data,
+        'info': f"<b>Farm:</b> {data['farm']}<br><b>Date:</b> {format_value_for_ui(data.get('date'))}",
+        'headers': ["Shed", "Small", "Medium", "Large", "Broken", "Total", "Usable"],
+        'rows': rows,
+    }
+
+
+def _monthly_production(rg, request):
+    year, month = request.report_date.year, request.report_date.month
+    data = rg.monthly_egg_production_report(request.farm_id, year, month)
+    if not data:
+        return None
+    rows = []
+    chart_dates = []
+    chart_totals = []
+    for d, vals in sorted(data['daily_summary'].items()):
+        rows.append([
+            str(d),
+            str(vals.get('total', 0)),
+            str(vals.get('usable', 0)),
+            str(vals.get('small', 0)),
+            str(vals.get('medium', 0)),
+            str(vals.get('large', 0)),
+            str(vals.get('broken', 0))
+        ])
+        try:
+            chart_dates.append(date(year, month, int(d)))
+            chart_totals.append(vals.get('total', 0))
+        except ValueError:
+            pass
+    result = {
+        'data': data,
+        'info': f"<b>Farm:</b> {data['farm']}<br><b>Month:</b> {data['month']}/{data['year']}",
+        'headers': ["Date", "Total", "Usable", "Small", "Medium", "Large", "Broken"],
+        'rows': rows,
+    }
+    if chart_dates:
+        result['chart'] = {'dates': chart_dates, 'values': chart_totals,
+                           'left_label': "Total Eggs", 'name': "Total Production"}
+    return result
+
+
+def _feed_usage(rg, request):
+    data = rg.feed_usage_report(request.farm_id, request.start_date, request.end_date)
+    if not data:
+        return None
+    rows = [
+        [
+            shed_name,
+            shed_data.get('feed_type', 'N/A'),
+            f"{shed_data.get('total_kg', 0):.2f}",
+            str(shed_data.get('issue_count', 0)),
+            f"{shed_data.get('avg_per_issue', 0):.2f}",
+            f"{shed_data.get('total_cost_afg', 0):.2f}",
+            f"{shed_data.get('total_cost_usd', 0):.2f}"
+        ]
+        for shed_name, shed_data in data['sheds'].items()
+    ]
+    start_str = format_value_for_ui(data.get('start_date'))
+    end_str = format_value_for_ui(data.get('end_date'))
+    return {
+        'data': data,
+        'info': f"<b>Farm:</b> {data['farm']}<br><b>Period:</b> {start_str} to {end_str}",
+        'headers': ["Shed", "Feed Type", "Total (kg)", "Issues", "Avg per Issue (kg)", "Cost (AFG)", "Cost (USD)"],
+        'rows': rows,
+    }
+
+
+def _party_statement(rg, request):
+    data = rg.party_statement(request.party_id)
+    if not data:
+        return None
+    rows = []
+    chart_dates = []
+    chart_balances = []
+    chart_data_issue = False
+    for e in data['entries']:
+        rows.append([
+            format_value_for_ui(e.get('date', '')),
+            e.get('description', ''),
+            f"{e.get('debit_afg', 0):,.2f}",
+            f"{e.get('credit_afg', 0):,.2f}",
+            f"{e.get('balance_afg', 0):,.2f}",
+            f"{e.get('debit_usd', 0):,.2f}",
+            f"{e.get('credit_usd', 0):,.2f}",
+            f"{e.get('balance_usd', 0):,.2f}"
+        ])
+        # Extract chart data if date is valid
+        if e.get('date'):
+            if isinstance(e['date'], (datetime, date)):
+                chart_dates.append(e['date'])
+            else:
+                chart_data_issue = True
+            chart_balances.append(e.get('balance_afg', 0))
+    result = {
+        'data': data,
+        'info': (
+            f"<b>Party:</b> {data['party']}<br>"
+            f"<b>Final Balance (AFG):</b> {data.get('final_balance_afg', 0):,.2f}<br>"
+            f"<b>Final Balance (USD):</b> {data.get('final_balance_usd', 0):,.2f}"
+        ),
+        'headers': ["Date", "Description", "Debit (AFG)", "Credit (AFG)", "Balance (AFG)",
+                    "Debit (USD)", "Credit (USD)", "Balance (USD)"],
+        'rows': rows,
+    }
+    if chart_dates and len(chart_dates) == len(chart_balances):
+        result['chart'] = {'dates': chart_dates, 'values': chart_balances,
+                           'left_label': "Balance (AFG)", 'name': "Balance (AFG)", 'pen': 'g'}
+    elif chart_data_issue:
+        result['chart_issue'] = True
+    return result
+
+
+_BUILDERS = {
+    'daily_production': _daily_production,
+    'monthly_production': _monthly_production,
+    'feed_usage': _feed_usage,
+    'party_statement': _party_statement,
+}
+
+REPORT_TYPES = tuple(_BUILDERS)
+
+
+def build_report(request: ReportRequest, session) -> Optional[Dict[str, Any]]:
+    """
+    Run the report queries for ``request`` and return plain data
+
+    Returns None when the report has no data; otherwise a dict with ``data``
+    (the generator's report dict), ``info`` (HTML), ``headers``, ``rows`` and
+    optionally ``chart`` (dates, values and labels) or ``chart_issue``.
+    """
+    builder = _BUILDERS.get(request.report_type)
+    if builder is None:
+        raise ValueError(f"Report generation for {request.report_type} is not supported yet")
+    with ReportGenerator(session) as rg:
+        return builder(rg, request)
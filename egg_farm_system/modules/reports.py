@@ -4,11 +4,12 @@ Reports generation and export module with performance optimizations
 import csv
 from datetime import UTC, datetime, timedelta
 from io import StringIO
-from sqlalchemy import func
+from sqlalchemy import func, select
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import (
     Farm, Shed, EggProduction, FeedIssue, Sale, Purchase, 
-    Expense, Payment, Party
+    Expense, Payment, Party, Ledger
 )
 from egg_farm_system.utils.calculations import EggCalculations, FeedCalculations, FinancialCalculations
 from egg_farm_system.utils.advanced_caching import report_cache, CacheInvalidationManager
@@ -54,7 +55,7 @@ class ReportGenerator:
             return cached
         
         try:
-            with measure_time(f"production_summary_farm_{farm_id}"):
+            with measure_time("production_summary", farm_id=farm_id):
                 end_date = utcnow_naive().date()
                 start_date = end_date - timedelta(days=days - 1)
 
@@ -100,10 +101,11 @@ class ReportGenerator:
             start_date = datetime.combine(date.date(), datetime.min.time())
             end_date = start_date + timedelta(days=1)
             
-            productions = self.session.query(EggProduction).filter(
-                EggProduction.shed_id.in_([s.id for s in farm.sheds]),
-                EggProduction.date >= start_date,
-                EggProduction.date < end_date
+            production = ArchiveManager.entity(self.session, EggProduction, start_date, start_date)
+            productions = self.session.query(production).filter(
+                production.shed_id.in_([s.id for s in farm.sheds]),
+                production.date >= start_date,
+                production.date < end_date
             ).all()
             
             report_data = {
@@ -162,16 +164,16 @@ class ReportGenerator:
             if not farm:
                 return None
             
-            start_date = datetime(year, month, 1)
+            start_date = date(year, month, 1)
             if month == 12:
-                end_date = datetime(year + 1, 1, 1)
+                end_date = date(year + 1, 1, 1) - timedelta(days=1)
             else:
-                end_date = datetime(year, month + 1, 1)
+                end_date = date(year, month + 1, 1) - timedelta(days=1)
             
-            productions = self.session.query(EggProduction).filter(
-                EggProduction.shed_id.in_([s.id for s in farm.sheds]),
-                EggProduction.date >= start_date,
-                EggProduction.date < end_date
+            # Months of archived years are read from their archive
+            rows = ArchiveManager.subquery(self.session, EggProduction, start_date, end_date)
+            productions = self.session.execute(
+                select(rows).where(rows.c.shed_id.in_([s.id for s in farm.sheds]))
             ).all()
             
             daily_summary = {}
@@ -183,8 +185,9 @@ class ReportGenerator:
                         'medium': 0, 'large': 0, 'broken': 0
                     }
                 
-                daily_summary[prod_date]['total'] += prod.total_eggs
-                daily_summary[prod_date]['usable'] += prod.usable_eggs
+                usable = prod.small_count + prod.medium_count + prod.large_count
+                daily_summary[prod_date]['total'] += usable + prod.broken_count
+                daily_summary[prod_date]['usable'] += usable
                 daily_summary[prod_date]['small'] += prod.small_count
                 daily_summary[prod_date]['medium'] += prod.medium_count
                 daily_summary[prod_date]['large'] += prod.large_count
@@ -209,10 +212,11 @@ class ReportGenerator:
             if not farm:
                 return None
             
-            feed_issues = self.session.query(FeedIssue).filter(
-                FeedIssue.shed_id.in_([s.id for s in farm.sheds]),
-                FeedIssue.date >= start_date,
-                FeedIssue.date <= end_date
+            issues = ArchiveManager.entity(self.session, FeedIssue, start_date, end_date)
+            feed_issues = self.session.query(issues).filter(
+                issues.shed_id.in_([s.id for s in farm.sheds]),
+                issues.date >= start_date,
+                issues.date <= end_date
             ).all()
             
             report_data = {
@@ -257,13 +261,11 @@ class ReportGenerator:
             if not party:
                 return None
             
-            ledger_entries = party.ledger_entries
-            if start_date:
-                ledger_entries = [e for e in ledger_entries if e.date >= start_date]
-            if end_date:
-                ledger_entries = [e for e in ledger_entries if e.date <= end_date]
-            
-            ledger_entries = sorted(ledger_entries, key=lambda x: x.date)
+            # Ranges reaching into archived years include their archives
+            rows = ArchiveManager.subquery(self.session, Ledger, start_date, end_date)
+            ledger_entries = self.session.execute(
+                select(rows).where(rows.c.party_id == party_id).order_by(rows.c.date, rows.c.id)
+            ).all()
             
             running_balance_afg = 0
             running_balance_usd = 0
@@ -2,12 +2,16 @@
 Sales module with auto ledger posting and performance optimizations
 """
 from datetime import UTC, datetime, timedelta
-from egg_farm_system.database.models import Sale, EggProduction
+from typing import NamedTuple, Optional
+from sqlalchemy import func
+from egg_farm_system.database.models import Sale, EggProduction, Party
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.modules.ledger import LedgerManager
 from egg_farm_system.utils.currency import CurrencyConverter
 from egg_farm_system.utils.advanced_caching import CacheInvalidationManager
 from egg_farm_system.utils.performance_monitoring import measure_time
+from egg_farm_system.utils.query_optimizer import AggregationHelper
 from egg_farm_system.utils.audit_trail import get_audit_trail, ActionType
 import logging
 from egg_farm_system.modules.inventory import InventoryManager
@@ -15,6 +19,18 @@ from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
+
+class SaleListRow(NamedTuple):
+    id: int
+    date: datetime
+    party_id: int
+    party_name: Optional[str]
+    quantity: int
+    cartons: Optional[float]
+    rate_afg: float
+    total_afg: float
+
+
 class RawMaterialSaleManager:
     """
     Manage raw material sales
@@ -39,7 +55,7 @@ class RawMaterialSaleManager:
                                  exchange_rate_used=78.0, date=None, notes=None, payment_method="Cash", farm_id=None):
         """Record raw material sale and post to ledger"""
         try:
-            with measure_time(f"record_raw_material_sale_party_{party_id}"):
+            with measure_time("record_raw_material_sale", farm_id=farm_id):
                 from egg_farm_system.database.models import RawMaterial, RawMaterialSale
                 
                 # Input validation
@@ -188,7 +204,7 @@ class SalesManager:
                     exchange_rate_used=78.0, date=None, notes=None, payment_method="Cash", farm_id=None):
         """Record egg sale and post to ledger"""
         try:
-            with measure_time(f"record_sale_party_{party_id}"):
+            with measure_time("record_sale", farm_id=farm_id):
                 # Enhanced input validation
                 if not party_id or party_id <= 0:
                     raise ValueError("Invalid party ID")
@@ -428,48 +444,100 @@ class SalesManager:
             logger.error(f"Error recording advanced sale: {e}")
             raise
     
-    def get_sales(self, party_id=None, start_date=None, end_date=None, farm_id=None):
-        """Get sales records"""
-        try:
-            query = self.session.query(Sale)
-            
-            if party_id:
-                query = query.filter(Sale.party_id == party_id)
-            
-            if start_date:
-                query = query.filter(Sale.date >= start_date)
-            
-            if end_date:
-                query = query.filter(Sale.date <= end_date)
+    @staticmethod
+    def _filter_sales(query, sales, party_id=None, start_date=None, end_date=None, farm_id=None):
+        if party_id:
+            query = query.filter(sales.party_id == party_id)
+        
+        if start_date:
+            query = query.filter(sales.date >= start_date)
+        
+        if end_date:
+            query = query.filter(sales.date <= end_date)
 
-            if farm_id is not None:
-                query = query.filter(Sale.farm_id == farm_id)
-            
-            return query.order_by(Sale.date.desc()).all()
+        if farm_id is not None:
+            query = query.filter(sales.farm_id == farm_id)
+        
+        return query.order_by(sales.date.desc())
+    
+    def get_sales(self, party_id=None, start_date=None, end_date=None, farm_id=None, include_archived=False):
+        """Get sales records, including archived years the range reaches
+        
+        Without dates only open years are read unless ``include_archived``.
+        """
+        try:
+            sales = ArchiveManager.entity(self.session, Sale, start_date, end_date, include_archived)
+            return self._filter_sales(self.session.query(sales), sales, party_id, start_date, end_date, farm_id).all()
         except Exception as e:
             logger.error(f"Error getting sales: {e}")
             return []
     
-    def get_sales_summary(self, party_id=None, start_date=None, end_date=None, farm_id=None):
-        """Get sales summary"""
+    def get_sale_list(self, party_id=None, start_date=None, end_date=None, farm_id=None, include_archived=False):
+        """
+        Get the columns the sales list shows, newest first, as SaleListRow tuples
+        
+        The party name is joined in the same query. The rows stay usable after
+        the session closes; load the full record with ``get_sale`` to edit it.
+        Without dates only open years are listed unless ``include_archived``.
+        """
         try:
-            sales = self.get_sales(party_id, start_date, end_date, farm_id=farm_id)
-            
-            total_quantity = sum(s.quantity for s in sales)
-            total_afg = sum(s.total_afg for s in sales)
-            total_usd = sum(s.total_usd for s in sales)
+            sales = ArchiveManager.entity(self.session, Sale, start_date, end_date, include_archived)
+            query = self.session.query(
+                sales.id, sales.date, sales.party_id, Party.name, sales.quantity, sales.cartons,
+                sales.rate_afg, sales.total_afg,
+            ).outerjoin(Party, Party.id == sales.party_id)
+            query = self._filter_sales(query, sales, party_id, start_date, end_date, farm_id)
+            return [SaleListRow(*row) for row in query]
+        except Exception as e:
+            logger.error(f"Error getting sale list: {e}")
+            return []
+    
+    def get_sale(self, sale_id):
+        """Get a sale by ID"""
+        try:
+            return self.session.get(Sale, sale_id)
+        except Exception as e:
+            logger.error(f"Error getting sale: {e}")
+            return None
+    
+    def get_sales_summary(self, party_id=None, start_date=None, end_date=None, farm_id=None, group_by=None):
+        """
+        Get sales summary computed in SQL
+        
+        ``group_by`` may be 'day', 'month', 'year' or 'party'; the result then
+        has a ``groups`` dict mapping each period string or party id to its
+        own totals.
+        """
+        sales = ArchiveManager.entity(self.session, Sale, start_date, end_date)
+        group_expr = AggregationHelper.group_expression(group_by, sales.date, party=sales.party_id)
+        try:
+            filters = AggregationHelper.date_range_filters(sales.date, start_date, end_date)
+            if party_id:
+                filters.append(sales.party_id == party_id)
+            if farm_id is not None:
+                filters.append(sales.farm_id == farm_id)
             
-            return {
-                'total_sales': len(sales),
-                'total_quantity': total_quantity,
-                'total_afg': total_afg,
-                'total_usd': total_usd,
-                'average_rate_afg': total_afg / total_quantity if total_quantity > 0 else 0,
-                'average_rate_usd': total_usd / total_quantity if total_quantity > 0 else 0
-            }
+            summary = AggregationHelper.summarize(
+                self.session,
+                {
+                    'total_sales': func.count(sales.id),
+                    'total_quantity': func.sum(sales.quantity),
+                    'total_afg': func.sum(sales.total_afg),
+                    'total_usd': func.sum(sales.total_usd),
+                },
+                filters,
+                group_by=group_expr,
+            )
+            result = summary['totals']
+            total_quantity = result['total_quantity']
+            result['average_rate_afg'] = result['total_afg'] / total_quantity if total_quantity > 0 else 0
+            result['average_rate_usd'] = result['total_usd'] / total_quantity if total_quantity > 0 else 0
+            if group_by:
+                result['groups'] = summary['groups']
+            return result
         except Exception as e:
             logger.error(f"Error getting sales summary: {e}")
-            return {
+            result = {
                 'total_sales': 0,
                 'total_quantity': 0,
                 'total_afg': 0,
@@ -477,6 +545,9 @@ class SalesManager:
                 'average_rate_afg': 0,
                 'average_rate_usd': 0
             }
+            if group_by:
+                result['groups'] = {}
+            return result
     
     def close_session(self):
         """Close database session"""
@@ -1,18 +1,106 @@
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import Setting
 
+# How often (seconds) a cached read re-checks the shared version counter for
+# changes made by other processes
+VERSION_CHECK_INTERVAL = 2.0
 
-class SettingsManager:
-    """Manage application settings stored in the database."""
+
+class _SettingsCache:
+    """All settings rows held in memory, reloaded when ``settings_version`` moves.
+
+    The version counter is maintained by triggers (see
+    ``migrate_settings_version``), so writes from other processes or raw SQL
+    invalidate the cache too. Without the table, only writes made through
+    ``SettingsManager`` in this process are seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._values = None
+        self._version = None
+        self._engine = None
+        self._checked_at = 0.0
 
     @staticmethod
-    def get_setting(key: str, default=None):
+    def read_version(session):
+        try:
+            return session.execute(text("SELECT version FROM settings_version WHERE id = 1")).scalar()
+        except OperationalError:
+            session.rollback()
+            return None
+
+    def _load(self):
         session = DatabaseManager.get_session()
         try:
-            s = session.query(Setting).filter(Setting.key == key).first()
-            return s.value if s else default
+            version = self.read_version(session)
+            values = dict(session.query(Setting.key, Setting.value).all())
         finally:
             session.close()
+        self._values = values
+        self._version = version
+        self._engine = DatabaseManager._engine
+        self._checked_at = time.monotonic()
+
+    def _is_stale(self):
+        if self._values is None or self._engine is not DatabaseManager._engine:
+            return True
+        if time.monotonic() - self._checked_at < VERSION_CHECK_INTERVAL:
+            return False
+        session = DatabaseManager.get_session()
+        try:
+            version = self.read_version(session)
+        finally:
+            session.close()
+        self._checked_at = time.monotonic()
+        return version != self._version
+
+    def values(self) -> dict:
+        with self._lock:
+            if self._is_stale():
+                self._load()
+            return self._values
+
+    def store(self, key, value, version, deleted=False):
+        """Record a write made by this process without reloading every row."""
+        with self._lock:
+            if self._values is None or self._engine is not DatabaseManager._engine:
+                return
+            expected = None if self._version is None else self._version + 1
+            if version != expected:
+                # Another process wrote in between; reload on next read
+                self._values = None
+                return
+            if deleted:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = value
+            self._version = version
+
+    def invalidate(self):
+        with self._lock:
+            self._values = None
+
+
+_cache = _SettingsCache()
+
+
+class SettingsManager:
+    """Manage application settings stored in the database.
+
+    Reads are served from an in-process cache of every setting row.
+    """
+
+    @staticmethod
+    def get_setting(key: str, default=None):
+        values = _cache.values()
+        return values[key] if key in values else default
 
     @staticmethod
     def set_setting(key: str, value: str, description: str = None):
@@ -27,10 +115,26 @@ class SettingsManager:
                 s = Setting(key=key, value=value, description=description)
                 session.add(s)
             session.commit()
+            _cache.store(key, value, _cache.read_version(session))
             return s
         finally:
             session.close()
 
+    @staticmethod
+    def delete_setting(key: str) -> bool:
+        """Delete a setting; return False when it did not exist."""
+        session = DatabaseManager.get_session()
+        try:
+            s = session.query(Setting).filter(Setting.key == key).first()
+            if not s:
+                return False
+            session.delete(s)
+            session.commit()
+            _cache.store(key, None, _cache.read_version(session), deleted=True)
+            return True
+        finally:
+            session.close()
+
     @staticmethod
     def get_all_settings():
         session = DatabaseManager.get_session()
@@ -38,3 +142,8 @@ class SettingsManager:
             return session.query(Setting).order_by(Setting.key).all()
         finally:
             session.close()
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop cached settings so the next read reloads them from the database."""
+        _cache.invalidate()
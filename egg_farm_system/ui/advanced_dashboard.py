@@ -20,6 +20,7 @@ import logging
 from egg_farm_system.modules.advanced_analytics import AdvancedAnalytics
 from egg_farm_system.modules.inventory_optimizer import InventoryOptimizer
 from egg_farm_system.modules.financial_planner import FinancialPlanner
+from egg_farm_system.database.snapshot import read_snapshot
 from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
@@ -79,6 +80,13 @@ class KPIWidget(QWidget):
         """Update trend indicator color"""
         self.trend_label.setStyleSheet(f"font-size: 12px; color: {color};")
 
+def snapshot_label():
+    """Label telling how current the analytics snapshot is"""
+    label = QLabel(read_snapshot.describe())
+    label.setStyleSheet("color: gray;")
+    return label
+
+
 class ProductionForecastWidget(QWidget):
     """Production forecasting visualization widget"""
     
@@ -111,10 +119,12 @@ class ProductionForecastWidget(QWidget):
         header_layout.addWidget(self.days_spinbox)
         
         self.refresh_button = QPushButton("Refresh Forecast")
-        self.refresh_button.clicked.connect(self.update_forecast)
+        self.refresh_button.clicked.connect(lambda: self.update_forecast(refresh_snapshot=True))
         header_layout.addWidget(self.refresh_button)
         
         header_layout.addStretch()
+        self.snapshot_label = snapshot_label()
+        header_layout.addWidget(self.snapshot_label)
         layout.addLayout(header_layout)
         
         # Chart area
@@ -152,13 +162,13 @@ class ProductionForecastWidget(QWidget):
         self.timer.timeout.connect(self.update_forecast)
         self.timer.start(300000)  # Refresh every 5 minutes
     
-    def update_forecast(self):
+    def update_forecast(self, refresh_snapshot=False):
         """Update production forecast"""
         try:
             days_ahead = self.days_spinbox.value()
             
             # Run forecast in background thread
-            self.forecast_thread = ForecastThread(self.farm_id, days_ahead)
+            self.forecast_thread = ForecastThread(self.farm_id, days_ahead, refresh_snapshot)
             self.forecast_thread.result_ready.connect(self.update_forecast_display)
             self.forecast_thread.error_occurred.connect(self.handle_forecast_error)
             self.forecast_thread.start()
@@ -169,6 +179,7 @@ class ProductionForecastWidget(QWidget):
     
     def update_forecast_display(self, forecast_data):
         """Update the display with forecast data"""
+        self.snapshot_label.setText(read_snapshot.describe())
         try:
             if isinstance(forecast_data, list):
                 forecast_data = {"forecasts": forecast_data}
@@ -308,8 +319,11 @@ class InventoryOptimizationWidget(QWidget):
         
         header_layout.addStretch()
         
+        self.snapshot_label = snapshot_label()
+        header_layout.addWidget(self.snapshot_label)
+        
         self.refresh_button = QPushButton("Refresh Analysis")
-        self.refresh_button.clicked.connect(self.load_analysis)
+        self.refresh_button.clicked.connect(lambda: self.load_analysis(refresh_snapshot=True))
         header_layout.addWidget(self.refresh_button)
         
         layout.addLayout(header_layout)
@@ -478,11 +492,11 @@ class InventoryOptimizationWidget(QWidget):
         layout.addWidget(QLabel("Implementation Plan:"))
         layout.addWidget(self.implementation_table)
     
-    def load_analysis(self):
+    def load_analysis(self, refresh_snapshot=False):
         """Load inventory optimization analysis"""
         try:
             # Run analysis in background thread
-            self.analysis_thread = InventoryAnalysisThread(self.farm_id)
+            self.analysis_thread = InventoryAnalysisThread(self.farm_id, refresh_snapshot)
             self.analysis_thread.result_ready.connect(self.update_analysis_display)
             self.analysis_thread.error_occurred.connect(self.handle_analysis_error)
             self.analysis_thread.start()
@@ -493,6 +507,7 @@ class InventoryOptimizationWidget(QWidget):
     
     def update_analysis_display(self, analysis_data):
         """Update display with analysis results"""
+        self.snapshot_label.setText(read_snapshot.describe())
         try:
             if 'error' in analysis_data:
                 self.recommendations_text.setPlainText(f"Analysis Error: {analysis_data['error']}")
@@ -710,15 +725,17 @@ class FinancialDashboardWidget(QWidget):
         current_year = utcnow_naive().year
         self.year_combo.addItems([str(year) for year in range(current_year - 2, current_year + 3)])
         self.year_combo.setCurrentText(str(current_year))
-        self.year_combo.currentTextChanged.connect(self.load_financial_data)
+        self.year_combo.currentTextChanged.connect(lambda _year: self.load_financial_data())
         header_layout.addWidget(QLabel("Budget Year:"))
         header_layout.addWidget(self.year_combo)
         
         self.refresh_button = QPushButton("Refresh")
-        self.refresh_button.clicked.connect(self.load_financial_data)
+        self.refresh_button.clicked.connect(lambda: self.load_financial_data(refresh_snapshot=True))
         header_layout.addWidget(self.refresh_button)
         
         header_layout.addStretch()
+        self.snapshot_label = snapshot_label()
+        header_layout.addWidget(self.snapshot_label)
         layout.addLayout(header_layout)
         
         # KPI Cards
@@ -782,13 +799,13 @@ class FinancialDashboardWidget(QWidget):
         
         layout.addWidget(scenario_frame)
     
-    def load_financial_data(self):
+    def load_financial_data(self, refresh_snapshot=False):
         """Load financial data and budgets"""
         try:
             year = int(self.year_combo.currentText())
             
             # Load budget data
-            self.budget_thread = BudgetThread(self.farm_id, year)
+            self.budget_thread = BudgetThread(self.farm_id, year, refresh_snapshot)
             self.budget_thread.result_ready.connect(self.update_budget_display)
             self.budget_thread.error_occurred.connect(self.handle_budget_error)
             self.budget_thread.start()
@@ -799,6 +816,7 @@ class FinancialDashboardWidget(QWidget):
     
     def update_budget_display(self, budget_data):
         """Update budget display"""
+        self.snapshot_label.setText(read_snapshot.describe())
         try:
             if 'error' in budget_data:
                 self.handle_budget_error(budget_data['error'])
@@ -937,20 +955,23 @@ class FinancialDashboardWidget(QWidget):
         """Handle budget/forecast errors"""
         logger.error(f"Financial dashboard error: {error_message}")
 
-# Background thread classes for async operations
+# Background thread classes for async operations; each reads the analytics
+# snapshot, refreshed first when asked to, so it never reads the live database
 class ForecastThread(QThread):
     result_ready = Signal(dict)
     error_occurred = Signal(str)
     
-    def __init__(self, farm_id, days_ahead):
+    def __init__(self, farm_id, days_ahead, refresh_snapshot=False):
         super().__init__()
         self.farm_id = farm_id
         self.days_ahead = days_ahead
+        self.refresh_snapshot = refresh_snapshot
     
     def run(self):
         try:
-            analytics = AdvancedAnalytics()
-            result = analytics.forecast_egg_production(self.farm_id, self.days_ahead)
+            with read_snapshot.session(refresh=self.refresh_snapshot) as session:
+                analytics = AdvancedAnalytics(session=session)
+                result = analytics.forecast_egg_production(self.farm_id, self.days_ahead)
             self.result_ready.emit(result)
         except Exception as e:
             self.error_occurred.emit(str(e))
@@ -959,14 +980,16 @@ class InventoryAnalysisThread(QThread):
     result_ready = Signal(dict)
     error_occurred = Signal(str)
     
-    def __init__(self, farm_id):
+    def __init__(self, farm_id, refresh_snapshot=False):
         super().__init__()
         self.farm_id = farm_id
+        self.refresh_snapshot = refresh_snapshot
     
     def run(self):
         try:
-            optimizer = InventoryOptimizer()
-            result = optimizer.analyze_inventory_optimization(self.farm_id)
+            with read_snapshot.session(refresh=self.refresh_snapshot) as session:
+                optimizer = InventoryOptimizer(session=session)
+                result = optimizer.analyze_inventory_optimization(self.farm_id)
             self.result_ready.emit(result)
         except Exception as e:
             self.error_occurred.emit(str(e))
@@ -975,15 +998,17 @@ class BudgetThread(QThread):
     result_ready = Signal(dict)
     error_occurred = Signal(str)
     
-    def __init__(self, farm_id, year):
+    def __init__(self, farm_id, year, refresh_snapshot=False):
         super().__init__()
         self.farm_id = farm_id
         self.year = year
+        self.refresh_snapshot = refresh_snapshot
     
     def run(self):
         try:
-            planner = FinancialPlanner()
-            result = planner.create_budget(self.farm_id, self.year)
+            with read_snapshot.session(refresh=self.refresh_snapshot) as session:
+                planner = FinancialPlanner(session=session)
+                result = planner.create_budget(self.farm_id, self.year)
             self.result_ready.emit(result)
         except Exception as e:
             self.error_occurred.emit(str(e))
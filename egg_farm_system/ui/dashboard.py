@@ -6,31 +6,42 @@ from PySide6.QtWidgets import (
     QPushButton, QFrame, QScrollArea, QSizePolicy
 )
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor
-from PySide6.QtCore import Qt, QSize
-from datetime import UTC, datetime, timedelta
+from PySide6.QtCore import Qt, QSize, QThread, Signal
 from pathlib import Path
 
-from egg_farm_system.modules.reports import ReportGenerator
-from egg_farm_system.modules.sales import SalesManager
-from egg_farm_system.modules.inventory import InventoryManager
+from egg_farm_system.modules.dashboard import dashboard_service
 from egg_farm_system.ui.widgets.charts import TimeSeriesChart
 from egg_farm_system.ui.widgets.forecasting import ForecastingWidget
-from egg_farm_system.ui.advanced_dashboard import (
-    ProductionForecastWidget, 
-    InventoryOptimizationWidget,
-    FinancialDashboardWidget
-)
-from egg_farm_system.utils.advanced_caching import dashboard_cache, CacheInvalidationManager
-from egg_farm_system.utils.performance_monitoring import measure_time
-from egg_farm_system.utils.i18n import tr, get_i18n
+from egg_farm_system.utils.i18n import tr
+from egg_farm_system.ui.i18n_signals import language_notifier
 from egg_farm_system.ui.animation_helper import AnimationHelper
 from egg_farm_system.config import get_asset_path
-from egg_farm_system.utils.audit_trail import get_audit_trail
 import logging
 from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
+# Snapshot threads, kept referenced until they finish even if the dashboard goes away
+_running_snapshots = set()
+
+
+class DashboardSnapshotThread(QThread):
+    """Computes a dashboard snapshot in the background"""
+    snapshot_ready = Signal(object)
+    error_occurred = Signal(str)
+    
+    def __init__(self, farm_id, force=False):
+        super().__init__()
+        self.farm_id = farm_id
+        self.force = force
+    
+    def run(self):
+        try:
+            self.snapshot_ready.emit(dashboard_service.get_snapshot(self.farm_id, force=self.force))
+        except Exception as e:
+            logger.exception(f"Error computing dashboard snapshot: {e}")
+            self.error_occurred.emit(str(e))
+
 
 class DashboardWidget(QWidget):
     """Dashboard displaying key metrics and charts."""
@@ -38,12 +49,13 @@ class DashboardWidget(QWidget):
     def __init__(self, farm_id):
         super().__init__()
         self.farm_id = farm_id
-        self.report_generator = ReportGenerator()
+        self._snapshot_thread = None
+        self._refresh_pending = False
         
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
         # Connect to language change signal
-        get_i18n().language_changed.connect(self._update_texts)
+        language_notifier().language_changed.connect(self._update_texts)
         
         self.init_ui()
         self.refresh_data()
@@ -455,159 +467,119 @@ class DashboardWidget(QWidget):
         
         return widget
 
-    def refresh_data(self):
-        """Refresh all dashboard data with caching."""
+    def refresh_data(self, force=False):
+        """Refresh dashboard data from a snapshot computed off the UI thread."""
         logger.info(f"Refreshing dashboard for farm_id: {self.farm_id}")
         
-        # 1. Update Forecasting
+        # Update Forecasting
         if hasattr(self, 'forecasting_widget'):
             self.forecasting_widget.load_data()
-        
+        self._request_snapshot(force)
+    
+    def _request_snapshot(self, force=False):
+        if self.farm_id is None:
+            return
+        # Nothing has been written since the last snapshot: apply it directly
+        snapshot = None if force else dashboard_service.cached(self.farm_id)
+        if snapshot is not None:
+            self.apply_snapshot(snapshot)
+            return
+        
+        if self._snapshot_thread is not None and self._snapshot_thread.isRunning():
+            # Picked up by _on_snapshot_ready once the running refresh ends
+            self._refresh_pending = True
+            return
+        self._refresh_pending = False
+        thread = DashboardSnapshotThread(self.farm_id, force=force)
+        thread.snapshot_ready.connect(self._on_snapshot_ready)
+        thread.error_occurred.connect(self._on_snapshot_error)
+        thread.finished.connect(self._on_snapshot_thread_finished)
+        _running_snapshots.difference_update([t for t in _running_snapshots if t.isFinished()])
+        _running_snapshots.add(thread)
+        self._snapshot_thread = thread
+        thread.start()
+    
+    def _on_snapshot_ready(self, snapshot):
+        # Ignore snapshots of a farm switched away from meanwhile
+        if snapshot.farm_id == self.farm_id:
+            self.apply_snapshot(snapshot)
+    
+    def _on_snapshot_error(self, message):
+        logger.error(f"Error refreshing dashboard data: {message}")
+    
+    def _on_snapshot_thread_finished(self):
+        thread = self._snapshot_thread
+        if thread is None or not thread.isFinished():
+            return
+        self._snapshot_thread = None
+        if self._refresh_pending or thread.farm_id != self.farm_id:
+            self._request_snapshot()
+    
+    def apply_snapshot(self, snapshot):
+        """Show ``snapshot`` in the cards, chart, summaries, alerts and feed"""
         try:
-            today = datetime.now().date()
-            
-            # 2. Update Metrics
-            self._update_today_metrics(today)
-            
-            # 3. Update Chart
-            self._update_chart(today)
-            
-            # 4. Update Summaries
-            self._update_sales_summary()
-            
-            # 5. Update Low Stock
-            self._update_low_stock_alerts()
-            
-            # 6. Update Activity Feed
-            self._update_activity_feed()
-            
+            self._update_today_metrics(snapshot)
+            self._update_chart(snapshot)
+            self._update_sales_summary(snapshot)
+            self._update_low_stock_alerts(snapshot)
+            self._update_activity_feed(snapshot)
         except Exception as e:
             logger.exception(f"Error refreshing dashboard data: {e}")
     
-    def _update_today_metrics(self, today):
+    def _update_today_metrics(self, snapshot):
         """Update today's metrics"""
-        try:
-            # Today's eggs
-            from egg_farm_system.database.models import EggProduction, Shed
-            from egg_farm_system.database.db import DatabaseManager
-            session = DatabaseManager.get_session()
-            
-            sheds = session.query(Shed).filter(Shed.farm_id == self.farm_id).all()
-            shed_ids = [s.id for s in sheds]
-            
-            today_eggs = 0
-            if shed_ids:
-                productions = session.query(EggProduction).filter(
-                    EggProduction.shed_id.in_(shed_ids),
-                    EggProduction.date >= datetime.combine(today, datetime.min.time()),
-                    EggProduction.date < datetime.combine(today + timedelta(days=1), datetime.min.time())
-                ).all()
-                
-                for prod in productions:
-                    today_eggs += prod.small_count + prod.medium_count + prod.large_count + prod.broken_count
-            
-            # Update eggs card (find value label)
-            labels = self.today_eggs_card.findChildren(QLabel)
+        cards = (
+            (self.today_eggs_card, snapshot.today_eggs, True),
+            (self.today_feed_card, snapshot.today_feed_kg, False),
+            (self.today_sales_card, snapshot.today_sales_afg, True),
+            (self.today_revenue_card, snapshot.today_sales_usd, False),
+        )
+        for card, value, is_int in cards:
+            # Value label follows the title label
+            labels = card.findChildren(QLabel)
             if len(labels) > 1:
-                AnimationHelper.count_up(labels[1], 0, today_eggs, is_int=True)
-            
-            # Today's feed
-            from egg_farm_system.database.models import FeedIssue
-            today_feed = 0
-            feed_issues = session.query(FeedIssue).filter(
-                FeedIssue.shed_id.in_(shed_ids),
-                FeedIssue.date >= datetime.combine(today, datetime.min.time()),
-                FeedIssue.date < datetime.combine(today + timedelta(days=1), datetime.min.time())
-            ).all()
-            
-            for issue in feed_issues:
-                today_feed += issue.quantity_kg
-            
-            feed_labels = self.today_feed_card.findChildren(QLabel)
-            if len(feed_labels) > 1:
-                AnimationHelper.count_up(feed_labels[1], 0, today_feed, is_int=False)
-            
-            # Today's sales
-            sales_manager = SalesManager()
-            today_sales = sales_manager.get_sales_summary(None, today, today, farm_id=self.farm_id)
-            
-            sales_labels = self.today_sales_card.findChildren(QLabel)
-            if len(sales_labels) > 1:
-                AnimationHelper.count_up(sales_labels[1], 0, today_sales.get('total_afg', 0), is_int=True)
-            
-            rev_labels = self.today_revenue_card.findChildren(QLabel)
-            if len(rev_labels) > 1:
-                AnimationHelper.count_up(rev_labels[1], 0, today_sales.get('total_usd', 0), is_int=False)
-            
-            session.close()
-            
-        except Exception as e:
-            logger.error(f"Error updating metrics: {e}")
+                AnimationHelper.count_up(labels[1], 0, value, is_int=is_int)
 
-    def _update_chart(self, today):
+    def _update_chart(self, snapshot):
         """Update production chart"""
         try:
-            today_str = today.isoformat()
-            # Try cache
-            data = dashboard_cache.get_production_summary(self.farm_id, today_str)
-            if data is None:
-                data = self.report_generator.get_daily_production_summary(self.farm_id, days=30)
-                dashboard_cache.set_production_summary(self.farm_id, today_str, data)
-            
-            dates = data.get('dates', [])
-            egg_counts = data.get('egg_counts', [])
+            dates = list(snapshot.production_dates)
+            egg_counts = list(snapshot.production_counts)
             
             if dates:
                 self.production_chart.plot(dates, egg_counts, pen='b', name="Total Eggs")
-                total_prod = sum(egg_counts)
-                avg_prod = total_prod / len(egg_counts)
                 
                 # Update labels in summary section
-                # Note: labels[2] is value due to layout
                 lbls = self.total_eggs_label.findChildren(QLabel)
-                if len(lbls) > 1: lbls[1].setText(f"{total_prod:,}")
+                if len(lbls) > 1: lbls[1].setText(f"{snapshot.total_production:,}")
                 
                 lbls = self.avg_eggs_label.findChildren(QLabel)
-                if len(lbls) > 1: lbls[1].setText(f"{avg_prod:,.1f}")
+                if len(lbls) > 1: lbls[1].setText(f"{snapshot.average_production:,.1f}")
             else:
                 self.production_chart.plot([], [])
         except Exception as e:
             logger.error(f"Error updating chart: {e}")
 
-    def _update_sales_summary(self):
+    def _update_sales_summary(self, snapshot):
         """Update sales summary labels"""
-        try:
-            end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=30)
-            sales_manager = SalesManager()
-            summary = sales_manager.get_sales_summary(None, start_date, end_date, farm_id=self.farm_id)
-            total = summary.get('total_afg', 0)
-            
-            lbls = self.total_sales_label.findChildren(QLabel)
-            if len(lbls) > 1: lbls[1].setText(f"{total:,.0f} AFG")
-        except Exception as e:
-            logger.error(f"Error updating sales summary: {e}")
+        lbls = self.total_sales_label.findChildren(QLabel)
+        if len(lbls) > 1: lbls[1].setText(f"{snapshot.sales_summary_afg:,.0f} AFG")
 
-    def _update_low_stock_alerts(self):
+    def _update_low_stock_alerts(self, snapshot):
         """Update alerts section"""
-        try:
-            inventory_manager = InventoryManager()
-            alerts = inventory_manager.get_low_stock_alerts(farm_id=self.farm_id)
-            
-            if alerts:
-                self.alerts_frame.setVisible(True)
-                count = len(alerts)
-                first = alerts[0]
-                text = f"âš ï¸ <b>{count} Low Stock Alert(s):</b> {first['name']} ({first['stock']} {first['unit']})"
-                if count > 1:
-                    text += " ..."
-                self.alerts_label.setText(text)
-            else:
-                self.alerts_frame.setVisible(False)
-        except Exception as e:
-            logger.error(f"Error updating alerts: {e}")
+        alerts = snapshot.low_stock_alerts
+        if alerts:
+            self.alerts_frame.setVisible(True)
+            count = len(alerts)
+            first = alerts[0]
+            text = f"âš ï¸ <b>{count} Low Stock Alert(s):</b> {first.name} ({first.stock} {first.unit})"
+            if count > 1:
+                text += " ..."
+            self.alerts_label.setText(text)
+        else:
+            self.alerts_frame.setVisible(False)
 
-    def _update_activity_feed(self):
+    def _update_activity_feed(self, snapshot):
         """Populate recent activity feed"""
         try:
             # Clear existing items
@@ -616,8 +588,7 @@ class DashboardWidget(QWidget):
                 if child.widget():
                     child.widget().deleteLater()
             
-            # Fetch logs
-            logs = get_audit_trail().get_logs(limit=5)
+            logs = snapshot.recent_activity
             
             if not logs:
                 lbl = QLabel("No recent activity.")
@@ -643,15 +614,15 @@ class DashboardWidget(QWidget):
                 dot.setFixedSize(8, 8)
                 # Determine color based on action
                 color = "#3498db" # Default blue
-                if "delete" in log.action_type.value: color = "#e74c3c"
-                elif "create" in log.action_type.value: color = "#2ecc71"
-                elif "update" in log.action_type.value: color = "#f39c12"
+                if "delete" in log.action: color = "#e74c3c"
+                elif "create" in log.action: color = "#2ecc71"
+                elif "update" in log.action: color = "#f39c12"
                 
                 dot.setStyleSheet(f"background-color: {color}; border-radius: 4px;")
                 item_layout.addWidget(dot)
                 
                 # Description
-                desc_text = log.description or f"{log.action_type.value} {log.entity_type}"
+                desc_text = log.description or f"{log.action} {log.entity_type}"
                 desc = QLabel(desc_text)
                 desc.setStyleSheet("font-weight: 500; color: #333;")
                 item_layout.addWidget(desc, 1)
@@ -74,7 +74,7 @@ class AddTransactionDialog(QDialog):
             form.addRow(tr("Party:"), self.party_combo)
             # load parties
             try:
-                for p in self.party_manager.get_all_parties():
+                for p in self.party_manager.get_party_options():
                     self.party_combo.addItem(p.name, p.id)
             except Exception:
                 pass
@@ -7,14 +7,15 @@ from PySide6.QtWidgets import (
     QSpinBox, QToolButton
 )
 from PySide6.QtCore import Qt, Signal, QSize, QTimer
-from PySide6.QtGui import QFont, QIcon, QStandardItem
+from PySide6.QtGui import QFont, QIcon
 from pathlib import Path
 from egg_farm_system.ui.widgets.datatable import DataTableWidget
 from egg_farm_system.ui.widgets.loading_overlay import LoadingOverlay
 from egg_farm_system.ui.widgets.success_message import SuccessMessage
 from egg_farm_system.ui.widgets.keyboard_shortcuts import KeyboardShortcuts
 from egg_farm_system.utils.error_handler import ErrorHandler
-from egg_farm_system.utils.i18n import tr, get_i18n
+from egg_farm_system.utils.i18n import tr
+from egg_farm_system.ui.i18n_signals import language_notifier
 
 from egg_farm_system.modules.farms import FarmManager
 from egg_farm_system.modules.sheds import ShedManager
@@ -183,7 +184,7 @@ class FarmFormWidget(QWidget):
         self.selected_farm_id = None
         self.loading_overlay = LoadingOverlay(self)
         
-        get_i18n().language_changed.connect(self._update_texts)
+        language_notifier().language_changed.connect(self._update_texts)
         
         self.init_ui()
         self.refresh_farms()
@@ -273,14 +274,14 @@ class FarmFormWidget(QWidget):
         selected_indexes = self.farms_table.view.selectionModel().selectedRows()
         if not selected_indexes:
             self.selected_farm_id = None
-            self.sheds_table.model.setRowCount(0)
+            self.sheds_table.set_rows([])
             self.sheds_title.setText(tr("Sheds"))
             self.add_shed_btn.setEnabled(False)
             return
         
         source_index = self.farms_table.proxy.mapToSource(selected_indexes[0])
-        farm_id = int(self.farms_table.model.item(source_index.row(), 0).text())
-        farm_name = self.farms_table.model.item(source_index.row(), 1).text()
+        farm_id = int(self.farms_table.cell_text(source_index.row(), 0))
+        farm_name = self.farms_table.cell_text(source_index.row(), 1)
 
         self.selected_farm_id = farm_id
         # Simple concatenation for title
@@ -297,28 +298,17 @@ class FarmFormWidget(QWidget):
     def _do_refresh_farms(self):
         """Perform the actual refresh"""
         try:
-            self.farms_table.model.setRowCount(0)
-            
             with FarmManager() as fm:
                 farms = fm.get_all_farms()
                 rows = []
                 for farm in farms:
-                    row = self.farms_table.model.rowCount()
-                    self.farms_table.model.insertRow(row)
-                    self.farms_table.model.setItem(row, 0, QStandardItem(str(farm.id)))
-                    self.farms_table.model.setItem(row, 1, QStandardItem(farm.name))
-                    self.farms_table.model.setItem(row, 2, QStandardItem(farm.location or ""))
                     # Pre-fetch shed count before session closes
                     shed_count = len(farm.sheds)
-                    self.farms_table.model.setItem(row, 3, QStandardItem(str(shed_count)))
-                    self.add_action_buttons(self.farms_table, row, farm, self.edit_farm, self.delete_farm)
                     rows.append([str(farm.id), farm.name, farm.location or "", str(shed_count), ""])
             
-            # Update empty state
-            if len(rows) == 0:
-                self.farms_table.stacked.setCurrentIndex(1)
-            else:
-                self.farms_table.stacked.setCurrentIndex(0)
+            self.farms_table.set_rows(rows)
+            for row, farm in enumerate(farms):
+                self.add_action_buttons(self.farms_table, row, farm, self.edit_farm, self.delete_farm)
         except Exception as e:
             QMessageBox.critical(self, tr("Error"), f"{tr('Error')}: {str(e)}")
         finally:
@@ -327,24 +317,14 @@ class FarmFormWidget(QWidget):
     def refresh_sheds(self):
         """Refresh sheds table"""
         try:
-            self.sheds_table.model.setRowCount(0)
-            rows = []
+            sheds = []
             if self.selected_farm_id:
                 with ShedManager() as sm:
-                    for shed in sm.get_sheds_by_farm(self.selected_farm_id):
-                        row = self.sheds_table.model.rowCount()
-                        self.sheds_table.model.insertRow(row)
-                        self.sheds_table.model.setItem(row, 0, QStandardItem(str(shed.id)))
-                        self.sheds_table.model.setItem(row, 1, QStandardItem(shed.name))
-                        self.sheds_table.model.setItem(row, 2, QStandardItem(str(shed.capacity)))
-                        self.add_action_buttons(self.sheds_table, row, shed, self.edit_shed, self.delete_shed)
-                        rows.append([str(shed.id), shed.name, str(shed.capacity), ""])
+                    sheds = sm.get_sheds_by_farm(self.selected_farm_id)
             
-            # Update empty state
-            if len(rows) == 0:
-                self.sheds_table.stacked.setCurrentIndex(1)
-            else:
-                self.sheds_table.stacked.setCurrentIndex(0)
+            self.sheds_table.set_rows([[str(shed.id), shed.name, str(shed.capacity), ""] for shed in sheds])
+            for row, shed in enumerate(sheds):
+                self.add_action_buttons(self.sheds_table, row, shed, self.edit_shed, self.delete_shed)
         except Exception as e:
             QMessageBox.critical(self, tr("Error"), f"{tr('Error')}: {str(e)}")
 
@@ -363,10 +343,8 @@ class FarmFormWidget(QWidget):
         layout.addWidget(edit_btn)
         layout.addWidget(delete_btn)
         layout.addStretch()
-        # Last column is assumed to be actions - use proxy index for correct mapping
-        source_idx = table.model.index(row, table.model.columnCount() - 1)
-        proxy_idx = table.proxy.mapFromSource(source_idx)
-        table.view.setIndexWidget(proxy_idx, container)
+        # Last column is assumed to be actions
+        table.set_cell_widget(row, table.model.columnCount() - 1, container)
 
     def add_farm(self):
         dialog = FarmDialog(self, None)
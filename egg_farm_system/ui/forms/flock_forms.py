@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (
     QTabWidget
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QIcon, QStandardItem
+from PySide6.QtGui import QFont, QIcon
 
 from egg_farm_system.ui.widgets.jalali_date_edit import JalaliDateEdit
 from datetime import date
@@ -146,7 +146,7 @@ class FlockManagementWidget(QWidget):
         self.refresh_flocks()
 
     def refresh_flocks(self):
-        self.table.model.setRowCount(0)
+        self.table.set_rows([])
         shed_id = self.shed_combo.currentData()
         if not shed_id:
             self.add_btn.setEnabled(False)
@@ -156,20 +156,15 @@ class FlockManagementWidget(QWidget):
         fm = FlockManager()
         try:
             flocks = fm.get_flocks_by_shed(shed_id)
-            
-            for row, flock in enumerate(flocks):
+            rows = []
+            for flock in flocks:
                 stats = fm.get_flock_stats(flock.id)
                 live = stats['live_count'] if stats else flock.initial_count
                 age = stats['age_days'] if stats else 0
-                
-                self.table.model.insertRow(row)
-                self.table.model.setItem(row, 0, QStandardItem(str(flock.id)))
-                self.table.model.setItem(row, 1, QStandardItem(flock.name))
-                self.table.model.setItem(row, 2, QStandardItem(str(flock.start_date.date())))
-                self.table.model.setItem(row, 3, QStandardItem(str(flock.initial_count)))
-                self.table.model.setItem(row, 4, QStandardItem(str(live)))
-                self.table.model.setItem(row, 5, QStandardItem(str(age)))
-                
+                rows.append([flock.id, flock.name, flock.start_date.date(), flock.initial_count, live, age, ""])
+            self.table.set_rows(rows)
+            
+            for row, flock in enumerate(flocks):
                 # Actions
                 edit_btn = QToolButton(); edit_btn.setIcon(QIcon(get_asset_path('icon_edit.svg')))
                 edit_btn.clicked.connect(lambda checked=False, f=flock: self.edit_flock(f))
@@ -192,8 +187,7 @@ class FlockManagementWidget(QWidget):
                 h.addWidget(med_btn)
                 h.addStretch()
                 
-                proxy_idx = self.table.proxy.mapFromSource(self.table.model.index(row, 6))
-                self.table.view.setIndexWidget(proxy_idx, container)
+                self.table.set_cell_widget(row, 6, container)
         except Exception as e:
             QMessageBox.critical(self, tr("Error"), f"Failed to load flocks: {e}")
 
@@ -201,13 +195,12 @@ class FlockManagementWidget(QWidget):
         """Load medications and mortalities for selected flock row (source model index)."""
         try:
             # flock id is stored in column 0 as string
-            item = self.table.model.item(source_row_index, 0)
-            if not item:
+            if not 0 <= source_row_index < self.table.model.rowCount():
                 # clear tables
                 self.meds_table.clear()
                 self.morts_table.clear()
                 return
-            flock_id = int(item.text())
+            flock_id = int(self.table.cell_text(source_row_index, 0))
             fm = FlockManager()
             meds = fm.get_medications(flock_id)
             morts = fm.get_mortalities(flock_id)
@@ -97,7 +97,7 @@ class PackagingPurchaseDialog(QDialog):
     def _load_data(self):
         self.party_combo.clear()
         with PartyManager() as pm:
-            for p in pm.get_all_parties():
+            for p in pm.get_party_options():
                 self.party_combo.addItem(p.name, p.id)
         # Pre-select first supplier if available
         if self.party_combo.count() > 0:
@@ -18,6 +18,7 @@ from egg_farm_system.ui.widgets.success_message import SuccessMessage
 from egg_farm_system.ui.widgets.keyboard_shortcuts import KeyboardShortcuts
 from egg_farm_system.utils.error_handler import ErrorHandler
 from egg_farm_system.ui.widgets.jalali_date_edit import JalaliDateTimeEdit
+from egg_farm_system.utils.jalali import format_value_for_ui
 from datetime import datetime
 
 from egg_farm_system.modules.parties import PartyManager
@@ -73,7 +74,7 @@ class PartyFormWidget(QWidget):
         # Parties table
         self.table = DataTableWidget()
         self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.table.set_headers(["Name", "Phone", "Balance AFG", "Balance USD", "Actions"])
+        self.table.set_headers(["Name", "Phone", "Balance AFG", "Balance USD", "Last Activity", "Actions"])
         layout.addWidget(self.table)
         
         self.setLayout(layout)
@@ -88,94 +89,88 @@ class PartyFormWidget(QWidget):
         """Perform the actual refresh"""
         try:
             with PartyManager() as pm:
-                parties = pm.get_all_parties()
-                rows = []
-                action_widgets = []
-                for row, party in enumerate(parties):
-                    balance_afg = self.ledger_manager.get_party_balance(party.id, "AFG", farm_id=self.farm_id)
-                    balance_usd = self.ledger_manager.get_party_balance(party.id, "USD", farm_id=self.farm_id)
-                    rows.append([party.name, party.phone or "", f"{balance_afg:,.2f}", f"{balance_usd:,.2f}", ""])
-                    action_widgets.append((row, party.id, party.name, balance_afg, balance_usd)) # Store minimal data
-                
+                parties = pm.get_party_list(farm_id=self.farm_id)
+            rows = [
+                [
+                    party.name,
+                    party.phone or "",
+                    f"{party.balance_afg:,.2f}",
+                    f"{party.balance_usd:,.2f}",
+                    format_value_for_ui(party.last_activity) if party.last_activity else "",
+                    "",
+                ]
+                for party in parties
+            ]
+            
             self.loading_overlay.hide()
             self.table.set_rows(rows)
             
-            # Apply color formatting to balance columns
-            from PySide6.QtGui import QColor
-            for row_idx, party_id, party_name, balance_afg, balance_usd in action_widgets:
-                # Balance AFG column (column 2)
-                afg_item = self.table.model.item(row_idx, 2)
-                if afg_item:
-                    if balance_afg < 0:
-                        afg_item.setForeground(QColor("#C62828"))  # Red for negative
-                    elif balance_afg > 0:
-                        afg_item.setForeground(QColor("#2E7D32"))  # Green for positive
-                    else:
-                        afg_item.setForeground(QColor("#000000"))  # Black for zero
-                
-                # Balance USD column (column 3)
-                usd_item = self.table.model.item(row_idx, 3)
-                if usd_item:
-                    if balance_usd < 0:
-                        usd_item.setForeground(QColor("#C62828"))  # Red for negative
-                    elif balance_usd > 0:
-                        usd_item.setForeground(QColor("#2E7D32"))  # Green for positive
+            # Apply color formatting to balance columns (2 = AFG, 3 = USD)
+            for row_idx, party in enumerate(parties):
+                for col, balance in ((2, party.balance_afg), (3, party.balance_usd)):
+                    if balance < 0:
+                        self.table.set_cell_foreground(row_idx, col, "#C62828")  # Red for negative
+                    elif balance > 0:
+                        self.table.set_cell_foreground(row_idx, col, "#2E7D32")  # Green for positive
                     else:
-                        usd_item.setForeground(QColor("#000000"))  # Black for zero
-            from egg_farm_system.config import get_asset_path
-            view_icon = Path(get_asset_path('icon_view.svg'))
-            edit_icon = Path(get_asset_path('icon_edit.svg'))
-            delete_icon = Path(get_asset_path('icon_delete.svg'))
+                        self.table.set_cell_foreground(row_idx, col, "#000000")  # Black for zero
             
-            # Re-fetch party for actions if needed, or pass data struct.
-            # Lambda capture needs to be careful.
-            # Using Party object from closed session is risky. We should fetch fresh in action or pass ID.
-            # Here I'll just pass IDs to helper methods which will fetch fresh.
-            
-            for row_idx, party_id, party_name, balance_afg, balance_usd in action_widgets:
-                view_btn = QToolButton()
-                view_btn.setAutoRaise(True)
-                view_btn.setFixedSize(28, 28)
-                if view_icon.exists():
-                    view_btn.setIcon(QIcon(str(view_icon)))
-                    view_btn.setIconSize(QSize(20, 20))
-                view_btn.setToolTip(tr('View'))
-                view_btn.clicked.connect(lambda checked, pid=party_id: self.view_party(pid))
-
-                edit_btn = QToolButton()
-                edit_btn.setAutoRaise(True)
-                edit_btn.setFixedSize(28, 28)
-                if edit_icon.exists():
-                    edit_btn.setIcon(QIcon(str(edit_icon)))
-                    edit_btn.setIconSize(QSize(20, 20))
-                edit_btn.setToolTip(tr('Edit'))
-                edit_btn.clicked.connect(lambda checked, pid=party_id: self.edit_party(pid))
-
-                delete_btn = QToolButton()
-                delete_btn.setAutoRaise(True)
-                delete_btn.setFixedSize(28, 28)
-                if delete_icon.exists():
-                    delete_btn.setIcon(QIcon(str(delete_icon)))
-                    delete_btn.setIconSize(QSize(20, 20))
-                delete_btn.setToolTip(tr('Delete'))
-                delete_btn.clicked.connect(lambda checked, pid=party_id, pname=party_name: self.delete_party(pid, pname))
-
-                container = QWidget()
-                container.setMinimumHeight(36)
-                container.setMaximumHeight(36)
-                l = QHBoxLayout(container)
-                l.setContentsMargins(4, 2, 4, 2)
-                l.setSpacing(4)
-                l.addWidget(view_btn)
-                l.addWidget(edit_btn)
-                l.addWidget(delete_btn)
-                l.addStretch()
-                self.table.set_cell_widget(row_idx, 4, container)
+            # Action buttons are built only for rows on the visible page.
+            # Pass IDs to helper methods which will fetch fresh.
+            self.table.set_cell_widget_factory(
+                5, lambda row: self._create_party_actions(parties[row].id, parties[row].name)
+            )
             
         except Exception as e:
             self.loading_overlay.hide()
             QMessageBox.critical(self, tr("Error"), f"Failed to load parties: {str(e)}")
     
+    def _create_party_actions(self, party_id, party_name):
+        """View/edit/delete buttons for one party row"""
+        from egg_farm_system.config import get_asset_path
+        view_icon = Path(get_asset_path('icon_view.svg'))
+        edit_icon = Path(get_asset_path('icon_edit.svg'))
+        delete_icon = Path(get_asset_path('icon_delete.svg'))
+
+        view_btn = QToolButton()
+        view_btn.setAutoRaise(True)
+        view_btn.setFixedSize(28, 28)
+        if view_icon.exists():
+            view_btn.setIcon(QIcon(str(view_icon)))
+            view_btn.setIconSize(QSize(20, 20))
+        view_btn.setToolTip(tr('View'))
+        view_btn.clicked.connect(lambda checked, pid=party_id: self.view_party(pid))
+
+        edit_btn = QToolButton()
+        edit_btn.setAutoRaise(True)
+        edit_btn.setFixedSize(28, 28)
+        if edit_icon.exists():
+            edit_btn.setIcon(QIcon(str(edit_icon)))
+            edit_btn.setIconSize(QSize(20, 20))
+        edit_btn.setToolTip(tr('Edit'))
+        edit_btn.clicked.connect(lambda checked, pid=party_id: self.edit_party(pid))
+
+        delete_btn = QToolButton()
+        delete_btn.setAutoRaise(True)
+        delete_btn.setFixedSize(28, 28)
+        if delete_icon.exists():
+            delete_btn.setIcon(QIcon(str(delete_icon)))
+            delete_btn.setIconSize(QSize(20, 20))
+        delete_btn.setToolTip(tr('Delete'))
+        delete_btn.clicked.connect(lambda checked, pid=party_id, pname=party_name: self.delete_party(pid, pname))
+
+        container = QWidget()
+        container.setMinimumHeight(36)
+        container.setMaximumHeight(36)
+        l = QHBoxLayout(container)
+        l.setContentsMargins(4, 2, 4, 2)
+        l.setSpacing(4)
+        l.addWidget(view_btn)
+        l.addWidget(edit_btn)
+        l.addWidget(delete_btn)
+        l.addStretch()
+        return container
+    
     def add_transaction(self):
         """Add credit/debit transaction dialog"""
         from egg_farm_system.ui.forms.add_transaction_dialog import AddTransactionDialog
@@ -226,8 +221,7 @@ class PartyFormWidget(QWidget):
     def delete_party(self, party_id, party_name):
         """Delete party with detailed confirmation"""
         # Get party balance info
-        balance_afg = self.ledger_manager.get_party_balance(party_id, "AFG", farm_id=self.farm_id)
-        balance_usd = self.ledger_manager.get_party_balance(party_id, "USD", farm_id=self.farm_id)
+        balance_afg, balance_usd = self._party_balances(party_id)
         
         msg = QMessageBox(self)
         msg.setIcon(QMessageBox.Warning)
@@ -281,6 +275,11 @@ class PartyFormWidget(QWidget):
                         f"Failed to delete party.\n\nError: {str(e)}\n\nPlease try again."
                     )
 
+    def _party_balances(self, party_id):
+        """(AFG, USD) balance of one party from a single query"""
+        balances = self.ledger_manager.get_party_balances([party_id], farm_id=self.farm_id).get(party_id)
+        return (balances['balance_afg'], balances['balance_usd']) if balances else (0, 0)
+
     def set_farm_id(self, farm_id):
         """Update selected farm context and reload party balances."""
         self.farm_id = farm_id
@@ -591,7 +590,7 @@ class PartyTransactionDialog(QDialog):
     
     def load_parties(self):
         """Load parties into combo box"""
-        parties = self.party_manager.get_all_parties()
+        parties = self.party_manager.get_party_options()
         for party in parties:
             self.party_combo.addItem(party.name, party.id)
         if parties:
@@ -610,8 +609,7 @@ class PartyTransactionDialog(QDialog):
         """Update current balance display"""
         party_id = self.party_combo.currentData()
         if party_id:
-            balance_afg = self.ledger_manager.get_party_balance(party_id, "AFG", farm_id=self.farm_id)
-            balance_usd = self.ledger_manager.get_party_balance(party_id, "USD", farm_id=self.farm_id)
+            balance_afg, balance_usd = self._current_balances(party_id, refresh=True)
             
             balance_text = f"AFG: {balance_afg:,.2f} | USD: {balance_usd:,.2f}"
             if balance_afg > 0:
@@ -630,6 +628,15 @@ class PartyTransactionDialog(QDialog):
             self.balance_label.setText(tr("Current Balance: N/A"))
             self.balance_label.setStyleSheet("color: #7f8c8d;")
     
+    def _current_balances(self, party_id, refresh=False):
+        """(AFG, USD) balance of the selected party, queried once per selection"""
+        cached = getattr(self, '_balances', None)
+        if refresh or cached is None or cached[0] != party_id:
+            balances = self.ledger_manager.get_party_balances([party_id], farm_id=self.farm_id).get(party_id)
+            cached = (party_id, *((balances['balance_afg'], balances['balance_usd']) if balances else (0, 0)))
+            self._balances = cached
+        return cached[1], cached[2]
+    
     def on_amount_afg_changed(self):
         """Auto-calculate USD from AFG"""
         if self.amount_afg_spin.value() > 0 and self.exchange_rate > 0:
@@ -654,8 +661,7 @@ class PartyTransactionDialog(QDialog):
             self.new_balance_usd_label.setText(tr("0.00 USD"))
             return
         
-        current_balance_afg = self.ledger_manager.get_party_balance(party_id, "AFG", farm_id=self.farm_id)
-        current_balance_usd = self.ledger_manager.get_party_balance(party_id, "USD", farm_id=self.farm_id)
+        current_balance_afg, current_balance_usd = self._current_balances(party_id)
         
         amount_afg = self.amount_afg_spin.value()
         amount_usd = self.amount_usd_spin.value()
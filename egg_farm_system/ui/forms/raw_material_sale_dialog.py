@@ -145,7 +145,7 @@ class RawMaterialSaleDialog(QDialog):
         # Parties
         self.party_combo.clear()
         with PartyManager() as pm:
-            for p in pm.get_all_parties():
+            for p in pm.get_party_options():
                 self.party_combo.addItem(p.name, p.id)
 
         # Raw materials
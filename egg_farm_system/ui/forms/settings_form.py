@@ -375,24 +375,14 @@ class SettingsForm(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                from egg_farm_system.database.db import DatabaseManager
-                from egg_farm_system.database.models import Setting
-                
-                session = DatabaseManager.get_session()
-                try:
-                    setting = session.query(Setting).filter(Setting.key == key).first()
-                    if setting:
-                        session.delete(setting)
-                        session.commit()
-                        QMessageBox.information(self, tr('Deleted'), 'Setting deleted successfully')
-                        self.load_advanced_settings()
-                        self.key_edit.clear()
-                        self.value_edit.clear()
-                        self.description_edit.clear()
-                    else:
-                        QMessageBox.warning(self, tr('Not Found'), f'Setting "{key}" not found')
-                finally:
-                    session.close()
+                if SettingsManager.delete_setting(key):
+                    QMessageBox.information(self, tr('Deleted'), 'Setting deleted successfully')
+                    self.load_advanced_settings()
+                    self.key_edit.clear()
+                    self.value_edit.clear()
+                    self.description_edit.clear()
+                else:
+                    QMessageBox.warning(self, tr('Not Found'), f'Setting "{key}" not found')
             except Exception as e:
                 QMessageBox.critical(self, tr('Error'), f'Failed to delete setting: {e}')
     
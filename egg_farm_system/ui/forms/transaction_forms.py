@@ -34,6 +34,7 @@ from egg_farm_system.config import EXPENSE_CATEGORIES
 from egg_farm_system.ui.widgets.advanced_sales_dialog_new import AdvancedSalesDialogNew as AdvancedSalesDialog
 from egg_farm_system.ui.forms.raw_material_sale_dialog import RawMaterialSaleDialog
 from egg_farm_system.utils.jalali import format_value_for_ui
+from egg_farm_system.utils.performance_monitoring import measure_time
 from egg_farm_system.ui.widgets.jalali_date_edit import JalaliDateEdit, JalaliDateTimeEdit
 
 class TransactionFormWidget(QWidget):
@@ -181,6 +182,11 @@ class TransactionFormWidget(QWidget):
     
     def _do_refresh_data(self):
         """Perform the actual refresh"""
+        with measure_time("transactions_refresh", type=self.transaction_type):
+            self._load_transactions()
+
+    def _load_transactions(self):
+        """Query the selected transaction type and populate its table"""
         try:
             rows = []
             action_items = []
@@ -191,21 +197,20 @@ class TransactionFormWidget(QWidget):
                 if self.sales_tabs.currentIndex() == 0:
                     table_widget = self.egg_sales_table
                     with SalesManager(current_user=self.current_user) as sm:
-                        transactions = sm.get_sales(farm_id=filter_farm_id)
+                        transactions = sm.get_sale_list(farm_id=filter_farm_id)
 
-                        for row, trans in enumerate(transactions):
-                            party = self.party_manager.get_party_by_id(trans.party_id)
-                            # Show cartons if available, otherwise show quantity
-                            qty_display = f"{trans.cartons:.2f} cartons" if trans.cartons else f"{trans.quantity} eggs"
-                            rows.append([
-                                format_value_for_ui(trans.date),
-                                party.name if party else "",
-                                qty_display,
-                                f"{trans.rate_afg:.2f}",
-                                f"{trans.total_afg:.2f}",
-                                ""
-                            ])
-                            action_items.append((row, trans, 'sale'))
+                    for row, trans in enumerate(transactions):
+                        # Show cartons if available, otherwise show quantity
+                        qty_display = f"{trans.cartons:.2f} cartons" if trans.cartons else f"{trans.quantity} eggs"
+                        rows.append([
+                            format_value_for_ui(trans.date),
+                            trans.party_name or "",
+                            qty_display,
+                            f"{trans.rate_afg:.2f}",
+                            f"{trans.total_afg:.2f}",
+                            ""
+                        ])
+                        action_items.append((row, trans, 'sale'))
                 else:
                     table_widget = self.raw_sales_table
                     session = DatabaseManager.get_session()
@@ -234,57 +239,33 @@ class TransactionFormWidget(QWidget):
             elif self.transaction_type == 'purchases':
                 with PurchaseManager() as pm:
                     filter_farm_id = self.selected_farm_filter if self.selected_farm_filter is not None else self.farm_id
-                    transactions = pm.get_purchases(farm_id=filter_farm_id)
-                    
-                    # Extract all data while session is still open to avoid detached instance errors
-                    purchase_data = []
-                    for trans in transactions:
-                        party = self.party_manager.get_party_by_id(trans.party_id)
-                        # Get material using PurchaseManager's session
-                        try:
-                            material = pm.session.query(RawMaterial).filter(RawMaterial.id == trans.material_id).first()
-                            material_name = material.name if material else "Unknown"
-                        except Exception as e:
-                            logger.error(f"Error getting material {trans.material_id}: {e}")
-                            material_name = "Unknown"
-
-                        # Extract all needed data while objects are still attached to session
-                        purchase_data.append({
-                            'transaction': trans,
-                            'party_name': party.name if party else "",
-                            'material_name': material_name,
-                            'date': format_value_for_ui(trans.date),
-                            'quantity': f"{trans.quantity:.2f}",
-                            'total_afg': f"{trans.total_afg:.2f}"
-                        })
+                    transactions = pm.get_purchase_list(farm_id=filter_farm_id)
 
-                # Build rows after session is closed (data already extracted)
-                for row, data in enumerate(purchase_data):
+                for row, trans in enumerate(transactions):
                     rows.append([
-                        data['date'],
-                        data['party_name'],
-                        data['material_name'],
-                        data['quantity'],
-                        data['total_afg'],
+                        format_value_for_ui(trans.date),
+                        trans.party_name or "",
+                        trans.material_name or "Unknown",
+                        f"{trans.quantity:.2f}",
+                        f"{trans.total_afg:.2f}",
                         ""
                     ])
-                    action_items.append((row, data['transaction'], 'purchase'))
+                    action_items.append((row, trans, 'purchase'))
 
             else:  # expenses
                 with ExpenseManager() as em:
                     # Use selected_farm_filter if available, otherwise fall back to self.farm_id
                     filter_farm_id = self.selected_farm_filter if self.selected_farm_filter is not None else self.farm_id
-                    transactions = em.get_expenses(farm_id=filter_farm_id)
-                    for row, trans in enumerate(transactions):
-                        party = self.party_manager.get_party_by_id(trans.party_id) if trans.party_id else None
-                        rows.append([
-                            format_value_for_ui(trans.date),
-                            trans.category,
-                            f"{trans.amount_afg:.2f}",
-                            party.name if party else "",
-                            ""
-                        ])
-                        action_items.append((row, trans, 'expense'))
+                    transactions = em.get_expense_list(farm_id=filter_farm_id)
+                for row, trans in enumerate(transactions):
+                    rows.append([
+                        format_value_for_ui(trans.date),
+                        trans.category,
+                        f"{trans.amount_afg:.2f}",
+                        trans.party_name or "",
+                        ""
+                    ])
+                    action_items.append((row, trans, 'expense'))
 
             # populate rows and attach action widgets
             if rows:
@@ -292,50 +273,58 @@ class TransactionFormWidget(QWidget):
             else:
                 table_widget.set_rows([])
 
-            # attach action widgets into last column
-            from egg_farm_system.config import get_asset_path
-            edit_icon = Path(get_asset_path('icon_edit.svg'))
-            delete_icon = Path(get_asset_path('icon_delete.svg'))
-            for row_idx, trans, ttype in action_items:
-                edit_btn = QToolButton()
-                edit_btn.setAutoRaise(True)
-                edit_btn.setFixedSize(28, 28)
-                if edit_icon.exists():
-                    edit_btn.setIcon(QIcon(str(edit_icon)))
-                    edit_btn.setIconSize(QSize(20, 20))
-                edit_btn.setToolTip(tr('Edit'))
-                if ttype == 'sale':
-                    edit_btn.clicked.connect(lambda checked, t=trans: self.edit_sale(t))
-                elif ttype == 'purchase':
-                    edit_btn.clicked.connect(lambda checked, t=trans: self.edit_purchase(t))
-                else:  # expense
-                    edit_btn.clicked.connect(lambda checked, t=trans: self.edit_expense(t))
-
-                delete_btn = QToolButton()
-                delete_btn.setAutoRaise(True)
-                delete_btn.setFixedSize(28, 28)
-                if delete_icon.exists():
-                    delete_btn.setIcon(QIcon(str(delete_icon)))
-                    delete_btn.setIconSize(QSize(20, 20))
-                delete_btn.setToolTip(tr('Delete'))
-                delete_btn.clicked.connect(lambda checked, t=trans, tt=ttype: self.delete_transaction(t, tt))
-
-                container = QWidget()
-                container.setMinimumHeight(36)
-                container.setMaximumHeight(36)
-                l = QHBoxLayout(container)
-                l.setContentsMargins(4, 2, 4, 2)
-                l.setSpacing(4)
-                l.addWidget(edit_btn)
-                l.addWidget(delete_btn)
-                l.addStretch()
-                table_widget.set_cell_widget(row_idx, table_widget.model.columnCount()-1, container)
+            # Action widgets in the last column are built only for rows on the visible page
+            if action_items:
+                actions = {row_idx: (trans, ttype) for row_idx, trans, ttype in action_items}
+                table_widget.set_cell_widget_factory(
+                    table_widget.model.columnCount() - 1,
+                    lambda row: self._create_row_actions(*actions[row]) if row in actions else None,
+                )
             
             self.loading_overlay.hide()
         except Exception as e:
             self.loading_overlay.hide()
             QMessageBox.critical(self, tr("Error"), f"Failed to load transactions: {str(e)}")
     
+    def _create_row_actions(self, trans, ttype):
+        """Edit/delete buttons for one transaction row"""
+        from egg_farm_system.config import get_asset_path
+        edit_icon = Path(get_asset_path('icon_edit.svg'))
+        delete_icon = Path(get_asset_path('icon_delete.svg'))
+        edit_btn = QToolButton()
+        edit_btn.setAutoRaise(True)
+        edit_btn.setFixedSize(28, 28)
+        if edit_icon.exists():
+            edit_btn.setIcon(QIcon(str(edit_icon)))
+            edit_btn.setIconSize(QSize(20, 20))
+        edit_btn.setToolTip(tr('Edit'))
+        if ttype == 'sale':
+            edit_btn.clicked.connect(lambda checked, t=trans: self.edit_sale(t))
+        elif ttype == 'purchase':
+            edit_btn.clicked.connect(lambda checked, t=trans: self.edit_purchase(t))
+        else:  # expense
+            edit_btn.clicked.connect(lambda checked, t=trans: self.edit_expense(t))
+
+        delete_btn = QToolButton()
+        delete_btn.setAutoRaise(True)
+        delete_btn.setFixedSize(28, 28)
+        if delete_icon.exists():
+            delete_btn.setIcon(QIcon(str(delete_icon)))
+            delete_btn.setIconSize(QSize(20, 20))
+        delete_btn.setToolTip(tr('Delete'))
+        delete_btn.clicked.connect(lambda checked, t=trans, tt=ttype: self.delete_transaction(t, tt))
+
+        container = QWidget()
+        container.setMinimumHeight(36)
+        container.setMaximumHeight(36)
+        l = QHBoxLayout(container)
+        l.setContentsMargins(4, 2, 4, 2)
+        l.setSpacing(4)
+        l.addWidget(edit_btn)
+        l.addWidget(delete_btn)
+        l.addStretch()
+        return container
+
     def create_action_buttons(self, transaction, trans_type):
         """Create action buttons for transaction"""
         action_layout = QHBoxLayout()
@@ -404,37 +393,30 @@ class TransactionFormWidget(QWidget):
     def delete_transaction(self, transaction, trans_type):
         """Delete transaction with detailed confirmation"""
         # Get transaction details for confirmation
+        # ``transaction`` is a list row, which already carries the party and material names
         if trans_type == 'sale':
-            party = self.party_manager.get_party_by_id(transaction.party_id)
             qty_display = f"{transaction.cartons:.2f} cartons" if transaction.cartons else f"{transaction.quantity} eggs"
             details = (
                 f"Date: {format_value_for_ui(transaction.date)}\n"
-                f"Party: {party.name if party else 'N/A'}\n"
+                f"Party: {transaction.party_name or 'N/A'}\n"
                 f"Quantity: {qty_display}\n"
                 f"Total: {transaction.total_afg:,.2f} AFG"
             )
             title = "Delete Sale"
         elif trans_type == 'purchase':
-            party = self.party_manager.get_party_by_id(transaction.party_id)
-            session = DatabaseManager.get_session()
-            try:
-                material = session.query(RawMaterial).filter(RawMaterial.id == transaction.material_id).first()
-            finally:
-                session.close()
             details = (
                 f"Date: {format_value_for_ui(transaction.date)}\n"
-                f"Party: {party.name if party else 'N/A'}\n"
-                f"Material: {material.name if material else 'N/A'}\n"
+                f"Party: {transaction.party_name or 'N/A'}\n"
+                f"Material: {transaction.material_name or 'N/A'}\n"
                 f"Quantity: {transaction.quantity:.2f}\n"
                 f"Total: {transaction.total_afg:,.2f} AFG"
             )
             title = "Delete Purchase"
         else:  # expense
-            party = self.party_manager.get_party_by_id(transaction.party_id) if transaction.party_id else None
             details = (
                 f"Date: {format_value_for_ui(transaction.date)}\n"
                 f"Category: {transaction.category}\n"
-                f"Party: {party.name if party else 'N/A'}\n"
+                f"Party: {transaction.party_name or 'N/A'}\n"
                 f"Amount: {transaction.amount_afg:,.2f} AFG"
             )
             title = "Delete Expense"
@@ -501,8 +483,26 @@ class TransactionFormWidget(QWidget):
             self.loading_overlay.hide()
             QMessageBox.critical(self, tr("Error"), f"Failed to delete transaction: {str(e)}")
 
+    def _load_for_edit(self, row, trans_type):
+        """Full record for a list row, or None after warning that it no longer exists"""
+        if trans_type == 'sale':
+            with SalesManager(current_user=self.current_user) as sm:
+                record = sm.get_sale(row.id)
+        elif trans_type == 'purchase':
+            with PurchaseManager() as pm:
+                record = pm.get_purchase(row.id)
+        else:  # expense
+            with ExpenseManager() as em:
+                record = em.get_expense(row.id)
+        if record is None:
+            QMessageBox.warning(self, tr("Not Found"), "Transaction not found")
+        return record
+
     def edit_sale(self, sale):
         """Edit sale using advanced dialog"""
+        sale = self._load_for_edit(sale, 'sale')
+        if sale is None:
+            return
         active_farm_id = self.selected_farm_filter if self.selected_farm_filter is not None else self.farm_id
         dialog = AdvancedSalesDialog(self.window(), sale, farm_id=active_farm_id)
         dialog.sale_saved.connect(self.refresh_data)
@@ -510,6 +510,9 @@ class TransactionFormWidget(QWidget):
     
     def edit_purchase(self, purchase):
         """Edit purchase"""
+        purchase = self._load_for_edit(purchase, 'purchase')
+        if purchase is None:
+            return
         active_farm_id = self.selected_farm_filter if self.selected_farm_filter is not None else self.farm_id
         dialog = PurchaseDialog(self, purchase, self.party_manager, self.inventory_manager, farm_id=active_farm_id)
         if dialog.exec():
@@ -517,6 +520,9 @@ class TransactionFormWidget(QWidget):
     
     def edit_expense(self, expense):
         """Edit expense"""
+        expense = self._load_for_edit(expense, 'expense')
+        if expense is None:
+            return
         active_farm_id = self.selected_farm_filter if self.selected_farm_filter is not None else self.farm_id
         dialog = ExpenseDialog(self, expense, self.party_manager, farm_id=active_farm_id)
         if dialog.exec():
@@ -524,6 +530,9 @@ class TransactionFormWidget(QWidget):
     
     def edit_transaction(self, transaction, trans_type):
         """Edit transaction"""
+        transaction = self._load_for_edit(transaction, trans_type)
+        if transaction is None:
+            return
         active_farm_id = self.selected_farm_filter if self.selected_farm_filter is not None else self.farm_id
         if trans_type == 'sale':
             # Use advanced sales dialog for editing
@@ -581,7 +590,7 @@ class SalesDialog(QDialog):
         self.date_edit.setToolTip(tr("Select date and time (Jalali)"))
         
         self.party_combo = QComboBox()
-        for party in party_manager.get_all_parties():
+        for party in party_manager.get_party_options():
             self.party_combo.addItem(party.name, party.id)
         
         self.quantity_spin = QSpinBox()
@@ -664,7 +673,7 @@ class PurchaseDialog(QDialog):
         self.date_edit.setToolTip(tr("Select date and time (Jalali)"))
         
         self.party_combo = QComboBox()
-        for party in party_manager.get_all_parties():
+        for party in party_manager.get_party_options():
             self.party_combo.addItem(party.name, party.id)
         
         self.material_combo = QComboBox()
@@ -913,7 +922,7 @@ class ExpenseDialog(QDialog):
         
         self.party_combo = QComboBox()
         self.party_combo.addItem("No Party", None)
-        for party in party_manager.get_all_parties():
+        for party in party_manager.get_party_options():
             self.party_combo.addItem(party.name, party.id)
         
         self.payment_method_combo = QComboBox()
@@ -0,0 +1,36 @@
+"""
+Qt side of the language switch.
+
+``TranslationManager`` is Qt-free; ``language_notifier()`` listens to it,
+applies the layout direction of the new language and re-emits the change as
+``language_changed`` for widgets to connect to.
+"""
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWidgets import QApplication
+
+from egg_farm_system.utils.i18n import get_i18n
+
+
+class LanguageNotifier(QObject):
+    language_changed = Signal(str)
+
+    def __init__(self, translations):
+        super().__init__()
+        translations.add_listener(self._on_language_changed)
+
+    def _on_language_changed(self, lang_code):
+        app = QApplication.instance()
+        if app:
+            app.setLayoutDirection(Qt.RightToLeft if lang_code == "ps" else Qt.LeftToRight)
+        self.language_changed.emit(lang_code)
+
+
+_notifier = None
+
+
+def language_notifier():
+    """The notifier bound to the global TranslationManager"""
+    global _notifier
+    if _notifier is None:
+        _notifier = LanguageNotifier(get_i18n())
+    return _notifier
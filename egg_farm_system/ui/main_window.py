@@ -35,31 +35,36 @@ from PySide6.QtGui import QAction, QFont, QIcon, QKeySequence, QShortcut
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.modules.farms import FarmManager
 from egg_farm_system.config import WINDOW_WIDTH, WINDOW_HEIGHT, SIDEBAR_WIDTH, DEFAULT_THEME
-from egg_farm_system.ui.dashboard import DashboardWidget
-from egg_farm_system.ui.forms.farm_forms import FarmFormWidget
-from egg_farm_system.ui.forms.production_forms import ProductionFormWidget
-from egg_farm_system.ui.forms.inventory_forms import InventoryFormWidget
-from egg_farm_system.ui.forms.party_forms import PartyFormWidget
-from egg_farm_system.ui.forms.transaction_forms import TransactionFormWidget
-from egg_farm_system.ui.reports.report_viewer import ReportViewerWidget
-from egg_farm_system.ui.forms.settings_form import SettingsForm
-from egg_farm_system.ui.forms.user_forms import UserManagementForm
-from egg_farm_system.ui.forms.employee_forms import EmployeeManagementWidget
-from egg_farm_system.ui.forms.equipment_forms import EquipmentFormWidget
 from egg_farm_system.database.models import User
 from egg_farm_system.ui.themes import ThemeManager
 from egg_farm_system.utils.keyboard_shortcuts import ShortcutManager
 from egg_farm_system.utils.notification_manager import get_notification_manager, NotificationSeverity
-from egg_farm_system.ui.widgets.notification_center import NotificationCenterWidget
-from egg_farm_system.ui.widgets.backup_restore_widget import BackupRestoreWidget
-from egg_farm_system.ui.widgets.global_search_widget import GlobalSearchWidget
 from egg_farm_system.utils.i18n import tr, get_i18n
+from egg_farm_system.ui.i18n_signals import language_notifier
+from egg_farm_system.utils.lazy_import import lazy_import
 from egg_farm_system.ui.animation_helper import AnimationHelper
-from egg_farm_system.ui.widgets.command_palette import CommandPalette
-from egg_farm_system.ui.widgets.import_wizard import ImportWizard
 from egg_farm_system.utils.alert_scheduler import AlertScheduler
 from sqlalchemy.orm import load_only
 
+# Pages and dialogs are imported on first navigation so startup only pays
+# for the screens (and heavy dependencies) the user actually opens.
+DashboardWidget = lazy_import("egg_farm_system.ui.dashboard", "DashboardWidget")
+FarmFormWidget = lazy_import("egg_farm_system.ui.forms.farm_forms", "FarmFormWidget")
+ProductionFormWidget = lazy_import("egg_farm_system.ui.forms.production_forms", "ProductionFormWidget")
+InventoryFormWidget = lazy_import("egg_farm_system.ui.forms.inventory_forms", "InventoryFormWidget")
+PartyFormWidget = lazy_import("egg_farm_system.ui.forms.party_forms", "PartyFormWidget")
+TransactionFormWidget = lazy_import("egg_farm_system.ui.forms.transaction_forms", "TransactionFormWidget")
+ReportViewerWidget = lazy_import("egg_farm_system.ui.reports.report_viewer", "ReportViewerWidget")
+SettingsForm = lazy_import("egg_farm_system.ui.forms.settings_form", "SettingsForm")
+UserManagementForm = lazy_import("egg_farm_system.ui.forms.user_forms", "UserManagementForm")
+EmployeeManagementWidget = lazy_import("egg_farm_system.ui.forms.employee_forms", "EmployeeManagementWidget")
+EquipmentFormWidget = lazy_import("egg_farm_system.ui.forms.equipment_forms", "EquipmentFormWidget")
+NotificationCenterWidget = lazy_import("egg_farm_system.ui.widgets.notification_center", "NotificationCenterWidget")
+BackupRestoreWidget = lazy_import("egg_farm_system.ui.widgets.backup_restore_widget", "BackupRestoreWidget")
+GlobalSearchWidget = lazy_import("egg_farm_system.ui.widgets.global_search_widget", "GlobalSearchWidget")
+CommandPalette = lazy_import("egg_farm_system.ui.widgets.command_palette", "CommandPalette")
+ImportWizard = lazy_import("egg_farm_system.ui.widgets.import_wizard", "ImportWizard")
+
 logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
@@ -83,7 +88,7 @@ class MainWindow(QMainWindow):
         ThemeManager.apply_theme(sys.modules['__main__'].app if hasattr(sys.modules['__main__'], 'app') else self, self.current_theme)
 
         # Initialize I18n
-        get_i18n().language_changed.connect(self._update_texts)
+        language_notifier().language_changed.connect(self._update_texts)
 
         DatabaseManager.initialize()
         # Re-fetch the user to bind it to a new session for MainWindow's lifetime
@@ -383,6 +388,7 @@ class MainWindow(QMainWindow):
         add_btn_with_i18n(system_group, "Workflow Automation", lambda: self._safe_load(self.load_workflow_automation), 'icon_reports.svg')
         add_btn_with_i18n(system_group, "Audit Trail", lambda: self._safe_load(self.load_audit_trail), 'icon_reports.svg')
         add_btn_with_i18n(system_group, "Email Config", lambda: self._safe_load(self.load_email_config), 'icon_reports.svg')
+        add_btn_with_i18n(system_group, "Diagnostics", lambda: self._safe_load(self.load_diagnostics), 'icon_reports.svg')
         layout.addWidget(system_group)
 
         # Admin Group (only for admins)
@@ -767,6 +773,14 @@ class MainWindow(QMainWindow):
         self._update_breadcrumbs("Email Configuration", "email_config")
         self._add_to_history("Email Configuration", "email_config", self.load_email_config)
     
+    def load_diagnostics(self):
+        """Load diagnostics page with latency metrics"""
+        from egg_farm_system.ui.widgets.diagnostics_widget import DiagnosticsWidget
+        diagnostics_widget = DiagnosticsWidget()
+        self.replace_content(diagnostics_widget)
+        self._update_breadcrumbs("Diagnostics", "diagnostics")
+        self._add_to_history("Diagnostics", "diagnostics", self.load_diagnostics)
+    
     def show_notifications(self):
         """Show notification center"""
         dialog = QDialog(self)
@@ -0,0 +1,177 @@
+"""
+Background report generation
+
+Reports are built on a small QThreadPool from a hashable ReportRequest into
+plain data (``modules.report_builders``), so the GUI thread only fills the
+table, which receives rows in chunks. Identical requests
+already in flight share one job, and cancelling a job interrupts the SQLite
+query it is running.
+"""
+import logging
+import threading
+from typing import Dict
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.modules.report_builders import ReportRequest, build_report
+
+logger = logging.getLogger(__name__)
+
+# Rows delivered to the view per signal
+REPORT_ROW_CHUNK = 500
+# Report queries share one SQLite file; more threads only contend
+REPORT_WORKERS = 2
+
+
+class _JobSignals(QObject):
+    rows_ready = Signal(object, object, bool)  # job, rows, first chunk
+    finished = Signal(object, object)  # job, result or None
+    failed = Signal(object, str)
+    cancelled = Signal(object)
+
+
+class ReportJob(QRunnable):
+    """Builds one report on a pool thread; ``cancel()`` is safe from any thread"""
+
+    def __init__(self, request: ReportRequest, chunk_size: int = REPORT_ROW_CHUNK):
+        super().__init__()
+        # Lifetime is managed by ReportJobManager, not the pool
+        self.setAutoDelete(False)
+        self.request = request
+        self.chunk_size = chunk_size
+        self.signals = _JobSignals()
+        self.headers = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._dbapi_connection = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            connection = self._dbapi_connection
+            if connection is not None and hasattr(connection, 'interrupt'):
+                # Aborts the statement running on this job's connection
+                connection.interrupt()
+
+    def run(self):
+        if self.is_cancelled:
+            self.signals.cancelled.emit(self)
+            return
+        try:
+            with DatabaseManager.session_scope(read_only=True) as session:
+                with self._lock:
+                    self._dbapi_connection = session.connection().connection.dbapi_connection
+                try:
+                    result = build_report(self.request, session)
+                finally:
+                    with self._lock:
+                        self._dbapi_connection = None
+            if self.is_cancelled:
+                self.signals.cancelled.emit(self)
+                return
+            if result:
+                self.headers = result['headers']
+                rows = result.pop('rows')
+                # An empty report still sends one (empty) first chunk with the headers
+                for start in range(0, len(rows), self.chunk_size) or [0]:
+                    if self.is_cancelled:
+                        self.signals.cancelled.emit(self)
+                        return
+                    self.signals.rows_ready.emit(self, rows[start:start + self.chunk_size], start == 0)
+                result['row_count'] = len(rows)
+            self.signals.finished.emit(self, result)
+        except Exception as e:
+            if self.is_cancelled:
+                self.signals.cancelled.emit(self)
+            else:
+                logger.exception(f"Error generating {self.request.report_type} report: {e}")
+                self.signals.failed.emit(self, str(e))
+
+
+class ReportJobManager(QObject):
+    """Submits ReportJobs to a thread pool and re-emits their results on the GUI thread
+
+    Signals carry the ReportRequest, so a view can ignore results of requests
+    it no longer shows. Results of cancelled jobs are never delivered.
+    """
+
+    rows_ready = Signal(object, object, object, bool)  # request, headers, rows, first chunk
+    report_ready = Signal(object, object)  # request, result or None
+    report_failed = Signal(object, str)
+    report_cancelled = Signal(object)
+
+    def __init__(self, parent=None, max_workers: int = REPORT_WORKERS, chunk_size: int = REPORT_ROW_CHUNK):
+        super().__init__(parent)
+        self.chunk_size = chunk_size
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._jobs: Dict[ReportRequest, ReportJob] = {}
+        # Every submitted job until it has sent its final signal
+        self._running = set()
+
+    def submit(self, request: ReportRequest) -> ReportJob:
+        """Start ``request``, or return the job already running for it"""
+        job = self._jobs.get(request)
+        if job is not None and not job.is_cancelled:
+            return job
+        job = ReportJob(request, self.chunk_size)
+        job.signals.rows_ready.connect(self._on_rows_ready)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+        self._jobs[request] = job
+        self._running.add(job)
+        self.pool.start(job)
+        return job
+
+    def in_flight(self, request: ReportRequest) -> bool:
+        return request in self._jobs
+
+    def cancel(self, request: ReportRequest):
+        job = self._jobs.pop(request, None)
+        if job is None:
+            return
+        if self.pool.tryTake(job):
+            # Never started; no signal will come from the pool
+            self._running.discard(job)
+            self.report_cancelled.emit(request)
+        else:
+            job.cancel()
+
+    def cancel_all(self):
+        for request in list(self._jobs):
+            self.cancel(request)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until all jobs have finished (mainly for tests and shutdown)"""
+        return self.pool.waitForDone(msecs)
+
+    def _current(self, job) -> bool:
+        return self._jobs.get(job.request) is job
+
+    def _on_rows_ready(self, job, rows, first):
+        if self._current(job):
+            self.rows_ready.emit(job.request, job.headers, rows, first)
+
+    def _on_finished(self, job, result):
+        self._running.discard(job)
+        if self._current(job):
+            del self._jobs[job.request]
+            self.report_ready.emit(job.request, result)
+
+    def _on_failed(self, job, message):
+        self._running.discard(job)
+        if self._current(job):
+            del self._jobs[job.request]
+            self.report_failed.emit(job.request, message)
+
+    def _on_cancelled(self, job):
+        self._running.discard(job)
+        if self._current(job):
+            del self._jobs[job.request]
+        self.report_cancelled.emit(job.request)
@@ -16,14 +16,18 @@ from egg_farm_system.modules.reports import ReportGenerator
 from egg_farm_system.modules.parties import PartyManager
 from egg_farm_system.modules.farms import FarmManager
 from egg_farm_system.ui.reports.production_analytics_widget import ProductionAnalyticsWidget
+from egg_farm_system.ui.reports.report_jobs import ReportJobManager, ReportRequest
 from egg_farm_system.database.db import DatabaseManager
-from egg_farm_system.utils.excel_export import ExcelExporter
+from egg_farm_system.utils.lazy_import import lazy_import
 from egg_farm_system.utils.print_manager import PrintManager
 from egg_farm_system.ui.widgets.datatable import DataTableWidget
 from egg_farm_system.utils.jalali import format_value_for_ui
 from egg_farm_system.ui.widgets.charts import TimeSeriesChart
 from egg_farm_system.ui.widgets.jalali_date_edit import JalaliDateEdit
-from datetime import datetime, date
+from datetime import date
+
+# openpyxl is only needed when the user actually exports
+ExcelExporter = lazy_import("egg_farm_system.utils.excel_export", "ExcelExporter")
 
 logger = logging.getLogger(__name__)
 
@@ -107,7 +111,7 @@ class ReportViewerWidget(QWidget):
         self.party_combo = QComboBox()
         try:
             pm = PartyManager()
-            for party in pm.get_all_parties():
+            for party in pm.get_party_options():
                 self.party_combo.addItem(party.name, party.id)
         except Exception as e:
             logger.exception("Error loading parties for reports: %s", e)
@@ -153,6 +157,14 @@ class ReportViewerWidget(QWidget):
         self.current_report_data = None
         self.current_report_type = None
         
+        # Reports are generated off the GUI thread; results of superseded
+        # requests are ignored
+        self._pending_request = None
+        self.report_jobs = ReportJobManager(self)
+        self.report_jobs.rows_ready.connect(self._on_report_rows)
+        self.report_jobs.report_ready.connect(self._on_report_ready)
+        self.report_jobs.report_failed.connect(self._on_report_failed)
+        
         # Report info header
         self.info_group = QGroupBox("Report Information")
         info_layout = QVBoxLayout()
@@ -193,6 +205,7 @@ class ReportViewerWidget(QWidget):
     
     def on_report_changed(self):
         """Handle report type change"""
+        self.cancel_report()
         self.report_table.clear()
         self.chart.setVisible(False)
         self.info_label.setText(tr("No report generated yet. Select a report type and click 'Generate Report'."))
@@ -225,6 +238,7 @@ class ReportViewerWidget(QWidget):
 
     def set_farm_id(self, farm_id):
         self.farm_id = farm_id
+        self.cancel_report()
         try:
             self.report_table.clear()
             self.chart.setVisible(False)
@@ -237,207 +251,92 @@ class ReportViewerWidget(QWidget):
                 tr("Failed to refresh report view. Please regenerate the report.")
             )
     
-    def generate_report(self):
-        """Generate selected report"""
+    def _build_request(self):
+        """ReportRequest for the current selections, or None if incomplete"""
         report_type = self.report_combo.currentData()
-        self.chart.setVisible(False) # Hide previous chart
         
         # Get selected farm ID from combo box (None means "All Farms")
         selected_farm_id = self.farm_combo.currentData()
         # If a specific farm is selected, use it; otherwise use self.farm_id or 1 as fallback
         farm_id_to_use = selected_farm_id if selected_farm_id is not None else (self.farm_id or 1)
         
-        try:
-            date_val = self.date_edit.date()
-            
-            with ReportGenerator() as rg:
-                if report_type == "daily_production":
-                    # ... existing logic ...
-                    # For daily, a chart isn't very useful unless it's comparative (Shed vs Shed)
-                    # We can bar chart sheds?
-                    # Let's keep it simple for now or implement Bar Chart in future
-                    from datetime import datetime as _dt
-                    # ensure a datetime is passed
-                    if hasattr(date_val, 'year') and not hasattr(date_val, 'hour'):
-                        date_dt = _dt.combine(date_val, _dt.min.time())
-                    else:
-                        date_dt = date_val
-                    data = rg.daily_egg_production_report(farm_id_to_use, date_dt)
-                    if data:
-                        # Update info
-                        date_str = format_value_for_ui(data.get('date'))
-                        self.info_label.setText(f"<b>Farm:</b> {data['farm']}<br><b>Date:</b> {date_str}")
-                        
-                        # Create table data
-                        headers = ["Shed", "Small", "Medium", "Large", "Broken", "Total", "Usable"]
-                        rows = []
-                        for shed in data['sheds']:
-                            rows.append([
-                                shed['name'],
-                                str(shed.get('small', 0)),
-                                str(shed.get('medium', 0)),
-                                str(shed.get('large', 0)),
-                                str(shed.get('broken', 0)),
-                                str(shed.get('total', 0)),
-                                str(shed.get('usable', 0))
-                            ])
-                        # Add totals row
-                        totals = data.get('totals', {})
-                        rows.append([
-                            "<b>TOTAL</b>",
-                            str(totals.get('small', 0)),
-                            str(totals.get('medium', 0)),
-                            str(totals.get('large', 0)),
-                            str(totals.get('broken', 0)),
-                            f"<b>{totals.get('total', 0)}</b>",
-                            f"<b>{totals.get('usable', 0)}</b>"
-                        ])
-                        
-                        self.report_table.set_headers(headers)
-                        self.report_table.set_rows(rows)
-                        self.current_report_data = data
-                        self.current_report_type = report_type
+        if report_type in ('daily_production', 'monthly_production'):
+            return ReportRequest(report_type, farm_id=farm_id_to_use, report_date=self.date_edit.date())
+        if report_type == 'feed_usage':
+            return ReportRequest(report_type, farm_id=farm_id_to_use,
+                                 start_date=self.start_date_edit.date(), end_date=self.end_date_edit.date())
+        if report_type == 'party_statement':
+            party_id = self.party_combo.currentData()
+            if not party_id:
+                QMessageBox.warning(self, tr('Warning'), 'Select a party')
+                return None
+            return ReportRequest(report_type, party_id=party_id)
+        QMessageBox.information(self, tr("Info"), f"Report generation for {report_type} is not supported yet")
+        return None
 
-                elif report_type == 'monthly_production':
-                    year = self.date_edit.date().year()
-                    month = self.date_edit.date().month()
-                    data = rg.monthly_egg_production_report(farm_id_to_use, year, month)
-                    if data:
-                        # Update info
-                        self.info_label.setText(f"<b>Farm:</b> {data['farm']}<br><b>Month:</b> {data['month']}/{data['year']}")
-                        
-                        # Create table data
-                        headers = ["Date", "Total", "Usable", "Small", "Medium", "Large", "Broken"]
-                        rows = []
-                        chart_dates = []
-                        chart_totals = []
-                        
-                        for d, vals in sorted(data['daily_summary'].items()):
-                            rows.append([
-                                str(d),
-                                str(vals.get('total', 0)),
-                                str(vals.get('usable', 0)),
-                                str(vals.get('small', 0)),
-                                str(vals.get('medium', 0)),
-                                str(vals.get('large', 0)),
-                                str(vals.get('broken', 0))
-                            ])
-                            # Prepare chart data
-                            try:
-                                dt = date(year, month, int(d))
-                                chart_dates.append(dt)
-                                chart_totals.append(vals.get('total', 0))
-                            except ValueError:
-                                pass
-                        
-                        self.report_table.set_headers(headers)
-                        self.report_table.set_rows(rows)
-                        
-                        # Show chart
-                        if chart_dates:
-                            self.chart.setVisible(True)
-                            self.chart.set_labels(left_label="Total Eggs", bottom_label="Date")
-                            self.chart.plot(chart_dates, chart_totals, name="Total Production")
-                        
-                        self.current_report_data = data
-                        self.current_report_type = report_type
+    def generate_report(self):
+        """Generate selected report on a background worker"""
+        request = self._build_request()
+        if request is None:
+            return
+        if request == self._pending_request and self.report_jobs.in_flight(request):
+            # Same report is already being generated
+            return
+        self.cancel_report()
+        
+        self._pending_request = request
+        self.chart.setVisible(False) # Hide previous chart
+        self.info_label.setText(tr("Generating report..."))
+        self.report_jobs.submit(request)
 
-                elif report_type == 'feed_usage':
-                    start = self.start_date_edit.date()
-                    end = self.end_date_edit.date()
-                    data = rg.feed_usage_report(farm_id_to_use, start, end)
-                    if data:
-                        # Update info
-                        start_str = format_value_for_ui(data.get('start_date'))
-                        end_str = format_value_for_ui(data.get('end_date'))
-                        self.info_label.setText(f"<b>Farm:</b> {data['farm']}<br><b>Period:</b> {start_str} to {end_str}")
-                        
-                        # Create table data
-                        headers = ["Shed", "Feed Type", "Total (kg)", "Issues", "Avg per Issue (kg)", "Cost (AFG)", "Cost (USD)"]
-                        rows = []
-                        for shed_name, shed_data in data['sheds'].items():
-                            rows.append([
-                                shed_name,
-                                shed_data.get('feed_type', 'N/A'),
-                                f"{shed_data.get('total_kg', 0):.2f}",
-                                str(shed_data.get('issue_count', 0)),
-                                f"{shed_data.get('avg_per_issue', 0):.2f}",
-                                f"{shed_data.get('total_cost_afg', 0):.2f}",
-                                f"{shed_data.get('total_cost_usd', 0):.2f}"
-                            ])
-                        
-                        self.report_table.set_headers(headers)
-                        self.report_table.set_rows(rows)
-                        self.current_report_data = data
-                        self.current_report_type = report_type
+    def cancel_report(self):
+        """Stop waiting for the report being generated, if any"""
+        if self._pending_request is not None:
+            self.report_jobs.cancel(self._pending_request)
+            self._pending_request = None
 
-                elif report_type == 'party_statement':
-                    party_id = self.party_combo.currentData()
-                    if not party_id:
-                        QMessageBox.warning(self, tr('Warning'), 'Select a party')
-                        return
-                    data = rg.party_statement(party_id)
-                    if data:
-                        # Update info
-                        self.info_label.setText(
-                            f"<b>Party:</b> {data['party']}<br>"
-                            f"<b>Final Balance (AFG):</b> {data.get('final_balance_afg', 0):,.2f}<br>"
-                            f"<b>Final Balance (USD):</b> {data.get('final_balance_usd', 0):,.2f}"
-                        )
-                        
-                        # Create table data
-                        headers = ["Date", "Description", "Debit (AFG)", "Credit (AFG)", "Balance (AFG)", 
-                                  "Debit (USD)", "Credit (USD)", "Balance (USD)"]
-                        rows = []
-                        chart_dates = []
-                        chart_balances = []
-                        chart_data_issue = False
-                        
-                        for e in data['entries']:
-                            rows.append([
-                                format_value_for_ui(e.get('date', '')),
-                                e.get('description', ''),
-                                f"{e.get('debit_afg', 0):,.2f}",
-                                f"{e.get('credit_afg', 0):,.2f}",
-                                f"{e.get('balance_afg', 0):,.2f}",
-                                f"{e.get('debit_usd', 0):,.2f}",
-                                f"{e.get('credit_usd', 0):,.2f}",
-                                f"{e.get('balance_usd', 0):,.2f}"
-                            ])
-                            # Extract chart data if date is valid
-                            if e.get('date'):
-                                try:
-                                    if isinstance(e['date'], (datetime, date)):
-                                        chart_dates.append(e['date'])
-                                    else:
-                                        chart_data_issue = True
-                                    chart_balances.append(e.get('balance_afg', 0))
-                                except Exception as parse_err:
-                                    chart_data_issue = True
-                                    logger.warning("Skipping invalid chart data row in party statement: %s", parse_err)
-                        
-                        self.report_table.set_headers(headers)
-                        self.report_table.set_rows(rows)
-                        
-                        # Show balance trend chart if data exists
-                        if chart_dates and len(chart_dates) == len(chart_balances):
-                            self.chart.setVisible(True)
-                            self.chart.set_labels(left_label="Balance (AFG)", bottom_label="Date")
-                            self.chart.plot(chart_dates, chart_balances, name="Balance (AFG)", pen='g')
-                        elif chart_data_issue:
-                            QMessageBox.information(
-                                self,
-                                tr("Info"),
-                                tr("Statement table is shown, but trend chart could not be rendered for some rows.")
-                            )
+    def _on_report_rows(self, request, headers, rows, first):
+        if request != self._pending_request:
+            return
+        if first:
+            self.report_table.set_headers(headers)
+            self.report_table.set_rows(rows)
+        else:
+            self.report_table.append_rows(rows)
 
-                        self.current_report_data = data
-                        self.current_report_type = report_type
+    def _on_report_ready(self, request, result):
+        if request != self._pending_request:
+            return
+        self._pending_request = None
+        if not result:
+            self.info_label.setText(tr("No data available for the selected report."))
+            return
+        
+        self.info_label.setText(result['info'])
+        chart = result.get('chart')
+        if chart:
+            self.chart.setVisible(True)
+            self.chart.set_labels(left_label=chart['left_label'], bottom_label="Date")
+            if 'pen' in chart:
+                self.chart.plot(chart['dates'], chart['values'], name=chart['name'], pen=chart['pen'])
+            else:
+                self.chart.plot(chart['dates'], chart['values'], name=chart['name'])
+        elif result.get('chart_issue'):
+            QMessageBox.information(
+                self,
+                tr("Info"),
+                tr("Statement table is shown, but trend chart could not be rendered for some rows.")
+            )
+        
+        self.current_report_data = result['data']
+        self.current_report_type = request.report_type
 
-                else:
-                    QMessageBox.information(self, tr("Info"), f"Report generation for {report_type} is not supported yet")
-        except Exception as e:
-            QMessageBox.critical(self, tr("Error"), f"Failed to generate report: {e}")
+    def _on_report_failed(self, request, message):
+        if request != self._pending_request:
+            return
+        self._pending_request = None
+        self.info_label.setText(tr("No report generated yet. Select a report type and click 'Generate Report'."))
+        QMessageBox.critical(self, tr("Error"), f"Failed to generate report: {message}")
     
     def export_report_csv(self):
         """Export report to CSV"""
@@ -529,8 +428,8 @@ class ReportViewerWidget(QWidget):
                         elif 'month' in self.current_report_data and 'year' in self.current_report_data:
                             subtitle = f"Month: {self.current_report_data.get('month', '')}/{self.current_report_data.get('year', '')}"
                     
+                    # The table reports success itself once the export completes
                     self.report_table.export_pdf(path, title=report_title, subtitle=subtitle)
-                    QMessageBox.information(self, tr('Success'), f'Exported to {path}')
             else:
                 # Fallback to HTML-based PDF
                 html = PrintManager.format_report_html(data, report_type, title)
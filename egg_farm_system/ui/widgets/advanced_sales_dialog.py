@@ -93,7 +93,7 @@ class AdvancedSalesDialog(QDialog):
         self.party_combo = QComboBox()
         self.party_combo.setEditable(False)
         self.party_combo.setMinimumWidth(200)
-        parties = self.party_manager.get_all_parties()
+        parties = self.party_manager.get_party_options()
         for party in parties:
             self.party_combo.addItem(party.name, party.id)
         
@@ -123,7 +123,7 @@ class AdvancedSalesDialogNew(QDialog):
         # Party field
         basic_layout.addWidget(QLabel(tr("Customer:")), 1, 0)
         self.party_combo = QComboBox()
-        parties = self.party_manager.get_all_parties()
+        parties = self.party_manager.get_party_options()
         for party in parties:
             self.party_combo.addItem(party.name, party.id)
         basic_layout.addWidget(self.party_combo, 1, 1)
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont, QColor
 from datetime import datetime, timedelta
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import Ledger, Sale, Purchase, Expense, Payment
 from egg_farm_system.utils.currency import CurrencyConverter
@@ -201,11 +202,12 @@ class CashFlowWidget(QWidget):
                 transactions = []
                 
                 # Direct Expenses (cash outflow) - Direct expenses with no party linked and cash payment method
-                direct_expenses = session.query(Expense).filter(
-                    Expense.date >= start_date,
-                    Expense.date <= end_date,
-                    Expense.party_id == None,
-                    Expense.payment_method == "Cash"
+                expense_rows = ArchiveManager.entity(session, Expense, start_date, end_date)
+                direct_expenses = session.query(expense_rows).filter(
+                    expense_rows.date >= start_date,
+                    expense_rows.date <= end_date,
+                    expense_rows.party_id == None,
+                    expense_rows.payment_method == "Cash"
                 ).all()
                 if self.farm_id is not None:
                     direct_expenses = [e for e in direct_expenses if e.farm_id == self.farm_id]
@@ -223,9 +225,10 @@ class CashFlowWidget(QWidget):
                 
                 # Payments (can be inflow or outflow) - All payments represent cash movement
                 # This includes: Sales (Received), Purchases (Paid), and Expenses with cash payment method
-                payments = session.query(Payment).filter(
-                    Payment.date >= start_date,
-                    Payment.date <= end_date
+                payment_rows = ArchiveManager.entity(session, Payment, start_date, end_date)
+                payments = session.query(payment_rows).filter(
+                    payment_rows.date >= start_date,
+                    payment_rows.date <= end_date
                 ).all()
                 if self.farm_id is not None:
                     payments = [p for p in payments if self._payment_belongs_to_farm(p, session)]
@@ -319,18 +322,20 @@ class CashFlowWidget(QWidget):
             total_inflow = 0
             total_outflow = 0
             
-            # Expenses - Direct only (no party)
-            expenses = session.query(Expense).filter(
-                Expense.date < start_date,
-                Expense.party_id == None
+            # Expenses - Direct only (no party), including archived years
+            expense_rows = ArchiveManager.entity(session, Expense, end_date=start_date)
+            expenses = session.query(expense_rows).filter(
+                expense_rows.date < start_date,
+                expense_rows.party_id == None
             ).all()
             if self.farm_id is not None:
                 expenses = [e for e in expenses if e.farm_id == self.farm_id]
             total_outflow += sum(e.amount_afg for e in expenses)
             
             # Payments - All
-            payments = session.query(Payment).filter(
-                Payment.date < start_date
+            payment_rows = ArchiveManager.entity(session, Payment, end_date=start_date)
+            payments = session.query(payment_rows).filter(
+                payment_rows.date < start_date
             ).all()
             if self.farm_id is not None:
                 payments = [p for p in payments if self._payment_belongs_to_farm(p, session)]
@@ -355,34 +360,39 @@ class CashFlowWidget(QWidget):
             return False
 
         try:
+            # The source record is never dated after its payment but may be archived
             if reference.startswith("Sale #"):
                 sale_id = int(reference.split("#", 1)[1])
-                return session.query(Sale.id).filter(
-                    Sale.id == sale_id,
-                    Sale.farm_id == self.farm_id,
+                sales = ArchiveManager.entity(session, Sale, end_date=payment.date)
+                return session.query(sales.id).filter(
+                    sales.id == sale_id,
+                    sales.farm_id == self.farm_id,
                 ).first() is not None
 
             if reference.startswith("Purchase #"):
                 purchase_id = int(reference.split("#", 1)[1])
-                return session.query(Purchase.id).filter(
-                    Purchase.id == purchase_id,
-                    Purchase.farm_id == self.farm_id,
+                purchases = ArchiveManager.entity(session, Purchase, end_date=payment.date)
+                return session.query(purchases.id).filter(
+                    purchases.id == purchase_id,
+                    purchases.farm_id == self.farm_id,
                 ).first() is not None
 
             if reference.startswith("Expense #"):
                 expense_id = int(reference.split("#", 1)[1])
-                return session.query(Expense.id).filter(
-                    Expense.id == expense_id,
-                    Expense.farm_id == self.farm_id,
+                expenses = ArchiveManager.entity(session, Expense, end_date=payment.date)
+                return session.query(expenses.id).filter(
+                    expenses.id == expense_id,
+                    expenses.farm_id == self.farm_id,
                 ).first() is not None
 
             if reference.startswith("Expense:"):
                 category = reference.split(":", 1)[1].strip()
-                return session.query(Expense.id).filter(
-                    Expense.category == category,
-                    Expense.date == payment.date,
-                    Expense.party_id == payment.party_id,
-                    Expense.farm_id == self.farm_id,
+                expenses = ArchiveManager.entity(session, Expense, payment.date, payment.date)
+                return session.query(expenses.id).filter(
+                    expenses.category == category,
+                    expenses.date == payment.date,
+                    expenses.party_id == payment.party_id,
+                    expenses.farm_id == self.farm_id,
                 ).first() is not None
 
             # Unknown reference format: avoid cross-farm leakage.
@@ -7,31 +7,364 @@ from PySide6.QtWidgets import (
     QTableView, QFileDialog, QAbstractItemView, QLabel, QSpinBox,
     QCheckBox, QMenu, QHeaderView, QMessageBox, QStackedWidget
 )
-from PySide6.QtCore import Qt, QSortFilterProxyModel, Signal
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QIcon, QPainter, QAction, QColor, QFont
+from PySide6.QtCore import Qt, QAbstractProxyModel, QAbstractTableModel, QModelIndex, QStandardPaths, Signal
+from PySide6.QtGui import QStandardItem, QIcon, QPainter, QAction, QColor, QFont
 from PySide6.QtPrintSupport import QPrinter
 
 logger = logging.getLogger(__name__)
 
+# Background export workers, kept referenced until their thread has finished
+_running_exports = set()
+
+
+def _sort_key(text):
+    """Numbers (including "1,234.50") sort numerically and before text"""
+    try:
+        return (0, float(text.replace(',', '')), '')
+    except ValueError:
+        return (1, 0.0, text.casefold())
+
+
+class TableRowsModel(QAbstractTableModel):
+    """Read-only table model storing display strings column by column.
+
+    Holds one list of strings per column instead of one item object per
+    cell. Sort keys and lower-cased search text are computed once per column
+    on first use and dropped when the data changes.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._columns = []
+        self._row_count = 0
+        self._foregrounds = {}
+        self._sort_keys = {}
+        self._search_text = {}
+
+    # Qt model interface
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._columns[index.column()][index.row()]
+        if role == Qt.ForegroundRole:
+            return self._foregrounds.get((index.row(), index.column()))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else str(section + 1)
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # Bulk loading
+    def set_headers(self, headers):
+        self.beginResetModel()
+        self._headers = [str(h) for h in headers]
+        self._columns = [[] for _ in self._headers]
+        self._row_count = 0
+        self._invalidate()
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        """Replace all rows; values are stored as display strings"""
+        rows = list(rows) if rows else []
+        width = max([len(self._headers)] + [len(row) for row in rows])
+        self.beginResetModel()
+        self._columns = [
+            ['' if value is None else str(value) for value in column]
+            for column in zip(*(list(row) + [''] * (width - len(row)) for row in rows))
+        ] if rows else [[] for _ in range(width)]
+        self._row_count = len(rows)
+        self._invalidate()
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Append rows after the existing ones; values are stored as display strings"""
+        rows = [list(row) for row in rows]
+        if not rows:
+            return
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for col, column in enumerate(self._columns):
+            column.extend('' if col >= len(row) or row[col] is None else str(row[col]) for row in rows)
+        self._row_count += len(rows)
+        self._sort_keys.clear()
+        self._search_text.clear()
+        self.endInsertRows()
+
+    def _invalidate(self):
+        self._foregrounds.clear()
+        self._sort_keys.clear()
+        self._search_text.clear()
+
+    # Fast accessors
+    def text(self, row, col):
+        return self._columns[col][row]
+
+    def row_values(self, row):
+        return [column[row] for column in self._columns]
+
+    def iter_rows(self, rows, cols):
+        """Yield the texts of ``cols`` for each of ``rows`` from a copy of the data.
+
+        The copy is shallow (the strings are shared), so the generator can be
+        consumed on another thread while the model is reloaded.
+        """
+        columns = [list(self._columns[col]) for col in cols]
+        return ([column[row] for column in columns] for row in list(rows))
+
+    def sort_keys(self, col):
+        keys = self._sort_keys.get(col)
+        if keys is None:
+            keys = self._sort_keys[col] = [_sort_key(text) for text in self._columns[col]]
+        return keys
+
+    def search_text(self, col):
+        texts = self._search_text.get(col)
+        if texts is None:
+            texts = self._search_text[col] = [text.casefold() for text in self._columns[col]]
+        return texts
+
+    def set_foreground(self, row, col, color):
+        self._foregrounds[(row, col)] = color
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.ForegroundRole])
+
+    # QStandardItemModel-style compatibility for older callers
+    def item(self, row, col):
+        """Return a detached QStandardItem copy of the cell, or None"""
+        if 0 <= row < self._row_count and 0 <= col < len(self._columns):
+            return QStandardItem(self._columns[col][row])
+        return None
+
+    def setItem(self, row, col, item):
+        text = item.text() if hasattr(item, 'text') else ('' if item is None else str(item))
+        if col >= len(self._columns):
+            self.setColumnCount(col + 1)
+        if row >= self._row_count:
+            self.setRowCount(row + 1)
+        self._columns[col][row] = text
+        self._sort_keys.pop(col, None)
+        self._search_text.pop(col, None)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def insertRow(self, row, parent=QModelIndex()):
+        row = min(max(row, 0), self._row_count)
+        self.beginInsertRows(QModelIndex(), row, row)
+        for column in self._columns:
+            column.insert(row, '')
+        self._row_count += 1
+        self._invalidate()
+        self.endInsertRows()
+        return True
+
+    def setRowCount(self, count):
+        self.beginResetModel()
+        for column in self._columns:
+            del column[count:]
+            column.extend([''] * (count - len(column)))
+        self._row_count = count
+        self._invalidate()
+        self.endResetModel()
+
+    def setColumnCount(self, count):
+        self.beginResetModel()
+        del self._columns[count:]
+        self._columns.extend([[''] * self._row_count for _ in range(count - len(self._columns))])
+        self._invalidate()
+        self.endResetModel()
+
+    def setHorizontalHeaderLabels(self, headers):
+        self.set_headers(headers)
+
+    def clear(self):
+        self.set_headers([])
+
+
+class PagedProxyModel(QAbstractProxyModel):
+    """Filters, sorts and pages a TableRowsModel by slicing a row order list.
+
+    The filtered and sorted source rows are kept in ``_order``; the view only
+    sees the ``[start, end)`` window of the current page, so changing page
+    costs O(page size) regardless of how many rows are loaded.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._order = []
+        self._positions = None
+        self._start = 0
+        self._end = 0
+        self._page_rows = None
+        self._filter_text = ''
+        self._filter_column = -1
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self.invalidate)
+        model.rowsInserted.connect(self.invalidate)
+        model.dataChanged.connect(self._on_source_data_changed)
+        self.invalidate()
+
+    # Filtering / sorting / paging
+    def setFilterFixedString(self, text):
+        self._filter_text = (text or '').casefold()
+        self.invalidate()
+
+    def setFilterKeyColumn(self, column):
+        self._filter_column = column
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.invalidate()
+
+    def set_page(self, page, page_size):
+        """Show rows of ``page`` (1-based); ``page_size`` <= 0 shows every row"""
+        self._page_rows = None if page_size <= 0 else (page, page_size)
+        self.beginResetModel()
+        self._apply_window()
+        self.endResetModel()
+
+    def filtered_count(self):
+        return len(self._order)
+
+    def source_rows(self):
+        """Source rows passing the filter, in sort order (all pages)"""
+        return list(self._order)
+
+    def invalidate(self):
+        source = self.sourceModel()
+        self.beginResetModel()
+        rows = range(source.rowCount()) if source is not None else range(0)
+        if self._filter_text and source is not None:
+            needle = self._filter_text
+            if 0 <= self._filter_column < source.columnCount():
+                texts = source.search_text(self._filter_column)
+                rows = [r for r in rows if needle in texts[r]]
+            else:
+                columns = [source.search_text(c) for c in range(source.columnCount())]
+                rows = [r for r in rows if any(needle in texts[r] for texts in columns)]
+        rows = list(rows)
+        if source is not None and 0 <= self._sort_column < source.columnCount():
+            keys = source.sort_keys(self._sort_column)
+            rows.sort(key=keys.__getitem__, reverse=self._sort_order == Qt.DescendingOrder)
+        self._order = rows
+        self._positions = None
+        self._apply_window()
+        self.endResetModel()
+
+    def _apply_window(self):
+        total = len(self._order)
+        if self._page_rows is None:
+            self._start, self._end = 0, total
+        else:
+            page, page_size = self._page_rows
+            self._start = min((page - 1) * page_size, total)
+            self._end = min(self._start + page_size, total)
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if roles and Qt.DisplayRole not in roles:
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                proxy_index = self.mapFromSource(self.sourceModel().index(row, top_left.column()))
+                if proxy_index.isValid():
+                    self.dataChanged.emit(proxy_index, proxy_index, roles)
+            return
+        self.invalidate()
+
+    # Qt proxy interface
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._end - self._start
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        return 0 if parent.isValid() or source is None else source.columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self._order[self._start + proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._positions is None:
+            self._positions = {row: position for position, row in enumerate(self._order)}
+        position = self._positions.get(source_index.row())
+        if position is None or not (self._start <= position < self._end):
+            return QModelIndex()
+        return self.createIndex(position - self._start, source_index.column())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.sourceModel().data(self.mapToSource(index), role)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return str(self._start + section + 1) if role == Qt.DisplayRole else None
+
+    def flags(self, index):
+        return self.sourceModel().flags(self.mapToSource(index))
+
 
 class DataTableWidget(QWidget):
-    """Enhanced datatable with search, filtering, pagination, column management, and export."""
+    """Enhanced datatable with search, filtering, pagination, column management, and export.
+
+    Rows live in a column-store ``TableRowsModel``; ``PagedProxyModel`` hands
+    the view only the current page. Row numbers in signals and in
+    ``set_cell_widget`` are source rows, i.e. positions in ``set_rows``.
+    """
 
     # Signals
     row_selected = Signal(int)  # Emitted when a row is selected
     row_double_clicked = Signal(int)  # Emitted when a row is double-clicked
 
+    # Exports of more rows than this run on a background thread with progress
+    BACKGROUND_EXPORT_ROWS = 2000
+
     def __init__(self, parent=None, enable_pagination=True):
         super().__init__(parent)
         self.enable_pagination = enable_pagination
         self.current_page = 1
         self.page_size = 25
         self.column_visibility = {}  # Track column visibility
+        # Cell widgets keyed by (source row, column); placed only while on the visible page
+        self._cell_widgets = {}
+        self._cell_widget_factories = {}
+        self._cell_containers = []
         
-        self.model = QStandardItemModel()
-        self.proxy = QSortFilterProxyModel()
+        self.model = TableRowsModel()
+        self.proxy = PagedProxyModel()
         self.proxy.setSourceModel(self.model)
-        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
 
         self.view = QTableView()
         self.view.setModel(self.proxy)
@@ -49,6 +382,9 @@ class DataTableWidget(QWidget):
         self.view.verticalHeader().setMinimumSectionSize(45)
         self.view.verticalHeader().setDefaultSectionSize(45)
         self.view.setMinimumHeight(200)
+        # Connected after setModel so the view has dropped old index widgets first
+        self.proxy.modelAboutToBeReset.connect(self._detach_cell_widgets)
+        self.proxy.modelReset.connect(self._attach_cell_widgets)
 
         # Controls
         self.search = QLineEdit()
@@ -175,16 +511,18 @@ class DataTableWidget(QWidget):
         """Calculate total number of pages"""
         if self.page_size == -1:
             return 1
-        total_rows = self.proxy.rowCount()
+        total_rows = self.proxy.filtered_count()
         return max(1, (total_rows + self.page_size - 1) // self.page_size)
     
     def _update_pagination(self):
-        """Update pagination display and filter"""
+        """Update pagination display and show the current page"""
         if not self.enable_pagination:
+            self.proxy.set_page(1, -1)
             return
         
-        total_rows = self.proxy.rowCount()
+        total_rows = self.proxy.filtered_count()
         total_pages = self._get_total_pages()
+        self.current_page = min(max(self.current_page, 1), total_pages)
         
         # Update labels
         self.page_label.setText(f"Page {self.current_page} of {total_pages}")
@@ -194,28 +532,8 @@ class DataTableWidget(QWidget):
         self.prev_btn.setEnabled(self.current_page > 1)
         self.next_btn.setEnabled(self.current_page < total_pages)
         
-        # Apply pagination filter
-        if self.page_size == -1:
-            # Show all rows
-            for row in range(total_rows):
-                index = self.proxy.index(row, 0)
-                if index.isValid():
-                    self.view.setRowHidden(row, False)
-        else:
-            start_row = (self.current_page - 1) * self.page_size
-            end_row = min(start_row + self.page_size, total_rows)
-            
-            # Hide all rows first
-            for row in range(total_rows):
-                index = self.proxy.index(row, 0)
-                if index.isValid():
-                    self.view.setRowHidden(row, True)
-            
-            # Show rows for current page
-            for row in range(start_row, end_row):
-                index = self.proxy.index(row, 0)
-                if index.isValid():
-                    self.view.setRowHidden(row, False)
+        # Only the current page's rows are exposed to the view
+        self.proxy.set_page(self.current_page, self.page_size)
     
     def _show_column_menu(self, position):
         """Show context menu for column management"""
@@ -264,8 +582,9 @@ class DataTableWidget(QWidget):
                 self.row_selected.emit(source_index.row())
 
     def set_headers(self, headers):
-        self.model.clear()
-        self.model.setHorizontalHeaderLabels(headers)
+        self._cell_widgets.clear()
+        self._cell_widget_factories.clear()
+        self.model.set_headers(headers)
         # rebuild filter column combo
         self.filter_col.clear()
         self.filter_col.addItem('All columns', -1)
@@ -275,14 +594,10 @@ class DataTableWidget(QWidget):
     def set_rows(self, rows):
         """Rows is an iterable of iterables matching headers length."""
         try:
-            self.model.setRowCount(0)
             row_list = list(rows) if rows else []
-            for row in row_list:
-                # coerce values to str to avoid non-string model issues
-                items = [QStandardItem(str(c) if c is not None else '') for c in row]
-                for it in items:
-                    it.setEditable(False)
-                self.model.appendRow(items)
+            self._cell_widgets.clear()
+            self._cell_widget_factories.clear()
+            self.model.set_rows(row_list)
             
             # Show empty state if no rows
             if len(row_list) == 0:
@@ -295,43 +610,104 @@ class DataTableWidget(QWidget):
             logger.exception("Failed to set rows in DataTableWidget: %s", e)
             traceback.print_exc()
 
+    def append_rows(self, rows):
+        """Add rows after the loaded ones, e.g. while a report streams in"""
+        self.model.append_rows(rows)
+        if self.model.rowCount():
+            self.stacked.setCurrentIndex(0)
+        self._update_pagination()
+
     def clear(self):
+        self._cell_widgets.clear()
+        self._cell_widget_factories.clear()
         self.model.clear()
         self.stacked.setCurrentIndex(1)  # Show empty state
 
+    def cell_text(self, row, col):
+        """Display text of a source-model cell"""
+        return self.model.text(row, col)
+
+    def row_values(self, row):
+        """Display texts of a source-model row"""
+        return self.model.row_values(row)
+
+    def set_cell_foreground(self, row, col, color):
+        """Set the text color of a source-model cell"""
+        self.model.set_foreground(row, col, QColor(color))
+
     def set_cell_widget(self, row, col, widget):
-        # set a widget in the view at given source-model row/col
+        """Show ``widget`` in a source-model cell whenever that row is on the visible page."""
         try:
-            idx = self.model.index(row, col)
-            if idx.isValid():
-                # map source to proxy index
-                pidx = self.proxy.mapFromSource(idx)
-                if pidx.isValid():
-                    # Ensure widget has proper size (larger for better UX)
-                    if hasattr(widget, 'setMinimumHeight'):
-                        widget.setMinimumHeight(40)
-                    if hasattr(widget, 'setMaximumHeight'):
-                        widget.setMaximumHeight(40)
-                    self.view.setIndexWidget(pidx, widget)
-                    # Set row height to accommodate widget
-                    self.view.setRowHeight(pidx.row(), 45)
+            # Ensure widget has proper size (larger for better UX)
+            if hasattr(widget, 'setMinimumHeight'):
+                widget.setMinimumHeight(40)
+            if hasattr(widget, 'setMaximumHeight'):
+                widget.setMaximumHeight(40)
+            self._cell_widgets[(row, col)] = widget
+            pidx = self.proxy.mapFromSource(self.model.index(row, col))
+            if pidx.isValid():
+                self._place_cell_widget(pidx, widget)
         except Exception as e:
             logger.exception("Failed to set cell widget at %s,%s: %s", row, col, e)
             traceback.print_exc()
 
+    def set_cell_widget_factory(self, col, factory):
+        """Build column ``col`` widgets on demand with ``factory(source_row)``.
+
+        Only rows on the visible page get a widget, so large lists do not
+        create one widget per row up front. Pass ``None`` to remove.
+        """
+        if factory is None:
+            self._cell_widget_factories.pop(col, None)
+        else:
+            self._cell_widget_factories[col] = factory
+        self._attach_cell_widgets()
+
+    def _place_cell_widget(self, proxy_index, widget):
+        # The view deletes index widgets when the page changes; wrap stored
+        # widgets in a throwaway container so they survive for later pages
+        container = QWidget()
+        layout = QHBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(widget)
+        widget.show()
+        self._cell_containers.append((container, widget))
+        self.view.setIndexWidget(proxy_index, container)
+
+    def _detach_cell_widgets(self):
+        for container, widget in self._cell_containers:
+            try:
+                layout = container.layout()
+                if layout is not None:
+                    layout.removeWidget(widget)
+                widget.setParent(None)
+            except RuntimeError:
+                # Widget already deleted with a previous data set
+                pass
+        self._cell_containers = []
+
+    def _attach_cell_widgets(self):
+        if not self._cell_widgets and not self._cell_widget_factories:
+            return
+        self._detach_cell_widgets()
+        for proxy_row in range(self.proxy.rowCount()):
+            source_row = self.proxy.mapToSource(self.proxy.index(proxy_row, 0)).row()
+            for col, factory in self._cell_widget_factories.items():
+                pidx = self.proxy.index(proxy_row, col)
+                if pidx.isValid():
+                    widget = factory(source_row)
+                    if widget is not None:
+                        self.view.setIndexWidget(pidx, widget)
+            for col in range(self.model.columnCount()):
+                widget = self._cell_widgets.get((source_row, col))
+                if widget is not None:
+                    self._place_cell_widget(self.proxy.index(proxy_row, col), widget)
+
     # Backwards compatibility shims for code that used QTableWidget APIs
     def setItem(self, row, col, item):
         """Compatibility: accept a QTableWidgetItem and put its text into the model."""
         try:
-            text = item.text() if hasattr(item, 'text') else str(item)
-            qitem = QStandardItem(str(text))
-            qitem.setEditable(False)
-            # ensure model has enough rows/cols
-            if self.model.rowCount() <= row:
-                self.model.setRowCount(row + 1)
-            if self.model.columnCount() <= col:
-                self.model.setColumnCount(col + 1)
-            self.model.setItem(row, col, qitem)
+            self.model.setItem(row, col, item)
         except Exception as e:
             logger.exception("Failed to setItem at %s,%s: %s", row, col, e)
             traceback.print_exc()
@@ -382,188 +758,134 @@ class DataTableWidget(QWidget):
                   company_name=None, company_address=None, company_phone=None):
         """Export table to professional PDF with headers and footers"""
         try:
-            from egg_farm_system.utils.pdf_exporter import ProfessionalPDFExporter
+            from egg_farm_system.utils.pdf_exporter import FAST_PDF_ROWS
             from egg_farm_system.config import COMPANY_NAME, COMPANY_ADDRESS, COMPANY_PHONE
-            
-            # Get headers and rows from model
-            cols = self.model.columnCount()
-            headers = [self.model.headerData(i, Qt.Horizontal) or "" for i in range(cols)]
-            
-            # Get visible columns only
-            visible_cols = [i for i in range(cols) if not self.view.isColumnHidden(i)]
-            visible_headers = [headers[i] for i in visible_cols]
-            
-            # Get rows (only visible columns)
+        except ImportError:
+            logger.error("PDF export requires reportlab")
+            QMessageBox.critical(self, tr("Missing Dependency"), "PDF export requires reportlab. Please install it with: pip install reportlab")
+            return None
+        
+        # Use defaults if not provided
+        if title is None:
+            # Try to detect title from parent widget
+            title = self._detect_title_from_parent() or "Data Report"
+        if company_name is None:
+            company_name = COMPANY_NAME or "Egg Farm Management System"
+        if company_address is None:
+            company_address = COMPANY_ADDRESS
+        if company_phone is None:
+            company_phone = COMPANY_PHONE
+        
+        # Defensive check for invalid path types (e.g. boolean from Qt signals)
+        if isinstance(path, bool) or (isinstance(path, str) and not path.strip()):
+            path = None
+        if path is None:
+            default_name = f"{title.lower().replace(' ', '_')}.pdf"
+            documents_path = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
+            path = self._ask_export_path("Export PDF", str(Path(documents_path) / default_name), "PDF Files (*.pdf)")
+            if not path:
+                return None
+        if not path.lower().endswith('.pdf'):
+            path += '.pdf'
+        
+        source_rows = self._export_source_rows()
+        return self._start_export(
+            'pdf', path, source_rows,
+            title=title, subtitle=subtitle, company_name=company_name,
+            company_address=company_address, company_phone=company_phone,
+            fast=len(source_rows) > FAST_PDF_ROWS,
+        )
+
+    def _export_source_rows(self, export_selected=False):
+        """Source rows to export: the selection, or every row passing the filter on all pages"""
+        if export_selected:
             rows = []
-            for r in range(self.model.rowCount()):
-                row = []
-                for c in visible_cols:
-                    item = self.model.item(r, c)
-                    row.append(item.text() if item is not None else '')
-                rows.append(row)
-            
-            # Use defaults if not provided
-            if title is None:
-                # Try to detect title from parent widget
-                title = self._detect_title_from_parent() or "Data Report"
-            if company_name is None:
-                company_name = COMPANY_NAME or "Egg Farm Management System"
-            if company_address is None:
-                company_address = COMPANY_ADDRESS
-            if company_phone is None:
-                company_phone = COMPANY_PHONE
-            
-            # Export using professional exporter
-            exporter = ProfessionalPDFExporter()
-            exporter.export_table(
-                headers=visible_headers,
-                rows=rows,
-                path=path,
-                title=title,
-                subtitle=subtitle,
-                company_name=company_name,
-                company_address=company_address,
-                company_phone=company_phone,
-                parent=self
-            )
-        except Exception as e:
-            logger.exception(f"Error exporting PDF: {e}")
-            QMessageBox.critical(self, tr("Export Error"), f"Failed to export PDF: {e}")
+            for index in self.view.selectionModel().selectedRows():
+                source_index = self.proxy.mapToSource(index)
+                if source_index.isValid():
+                    rows.append(source_index.row())
+            return rows
+        return self.proxy.source_rows()
+
+    def _ask_export_path(self, caption, default_path, file_filter):
+        result = QFileDialog.getSaveFileName(self, caption, default_path, file_filter)
+        path = result[0] if isinstance(result, tuple) else result
+        # Check if user cancelled or path is invalid
+        if not path or not isinstance(path, str):
+            return None
+        return path
+
+    def _start_export(self, fmt, path, source_rows, **options):
+        """Stream ``source_rows`` (visible columns) to ``path``.
+
+        Small exports run inline; larger ones run on an ExportWorker thread
+        behind a cancellable progress dialog. Returns the running worker, or
+        None when the export ran inline.
+        """
+        from egg_farm_system.ui.widgets.export_worker import ExportWorker
+        from egg_farm_system.ui.widgets.progress_dialog import ProgressDialog
+
+        visible_cols = [i for i in range(self.model.columnCount()) if not self.view.isColumnHidden(i)]
+        if not visible_cols:
+            QMessageBox.warning(self, tr("No Columns"), "No visible columns to export.")
+            return None
+        headers = [self.model.headerData(i, Qt.Horizontal) or f"Column {i+1}" for i in visible_cols]
+        rows = self.model.iter_rows(source_rows, visible_cols)
+
+        worker = ExportWorker(fmt, headers, rows, path, **options)
+        worker.export_finished.connect(self._on_export_finished)
+        worker.error_occurred.connect(
+            lambda message: QMessageBox.critical(self, tr("Export Error"), f"Failed to export {fmt.upper()}: {message}"))
+        if len(source_rows) <= self.BACKGROUND_EXPORT_ROWS:
+            worker.run()
+            return None
+
+        dialog = ProgressDialog(self, tr("Exporting..."), 0, len(source_rows))
+        dialog.set_cancellable(True, worker.cancel)
+        worker.progress.connect(dialog.setValue)
+        worker.finished.connect(dialog.close)
+        # Keep a reference until the thread ends, even if this widget goes away
+        _running_exports.difference_update([w for w in _running_exports if w.isFinished()])
+        _running_exports.add(worker)
+        dialog.show()
+        worker.start()
+        return worker
+
+    def _on_export_finished(self, path, count):
+        QMessageBox.information(self, tr("Success"), f"Data exported to {path}")
+
+    def _has_export_data(self):
+        if self.model.rowCount() == 0:
+            logger.warning("No data to export")
+            QMessageBox.warning(self, tr("No Data"), "There is no data to export.")
+            return False
+        return True
 
     def export_csv(self, path=None, export_filtered=True, export_selected=False):
         """Export to CSV with options for filtered/selected data"""
-        import csv
-        try:
-            logger.info("CSV export button clicked")
-            # Check if there's any data to export
-            if self.model.rowCount() == 0:
-                logger.warning("No data to export")
-                QMessageBox.warning(self, tr("No Data"), "There is no data to export.")
-                return
-            
-            if path is None:
-                result = QFileDialog.getSaveFileName(self, "Export CSV", str(Path.cwd() / 'table.csv'), "CSV Files (*.csv)")
-                if isinstance(result, tuple):
-                    path, _ = result
-                else:
-                    path = result
-                # Check if user cancelled or path is invalid
-                if not path or not isinstance(path, str) or path == '':
-                    return
-            # Ensure path is a string (user may have cancelled)
-            if not isinstance(path, str) or path == '':
-                logger.debug(f"CSV export cancelled or invalid path")
-                return
-            
-            # Get visible columns only
-            visible_cols = [i for i in range(self.model.columnCount()) if not self.view.isColumnHidden(i)]
-            if not visible_cols:
-                QMessageBox.warning(self, tr("No Columns"), "No visible columns to export.")
-                return
-            
-            headers = [self.model.headerData(i, Qt.Horizontal) or f"Column {i+1}" for i in visible_cols]
-            
-            with open(path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-                
-                if export_selected:
-                    # Export only selected rows
-                    selected = self.view.selectionModel().selectedRows()
-                    for index in selected:
-                        source_index = self.proxy.mapToSource(index)
-                        if source_index.isValid():
-                            row = [self.model.item(source_index.row(), c).text() 
-                                   if self.model.item(source_index.row(), c) is not None else '' 
-                                   for c in visible_cols]
-                            writer.writerow(row)
-                else:
-                    # Export all visible rows (respecting filter)
-                    for r in range(self.proxy.rowCount()):
-                        proxy_index = self.proxy.index(r, 0)
-                        if not proxy_index.isValid():
-                            continue
-                        source_index = self.proxy.mapToSource(proxy_index)
-                        if source_index.isValid():
-                            row = [self.model.item(source_index.row(), c).text() 
-                                   if self.model.item(source_index.row(), c) is not None else '' 
-                                   for c in visible_cols]
-                            writer.writerow(row)
-            
-            QMessageBox.information(self, tr("Success"), f"Data exported to {path}")
-        except Exception as e:
-            logger.exception(f"Error exporting CSV: {e}")
-            QMessageBox.critical(self, tr("Export Error"), f"Failed to export CSV: {e}")
+        logger.info("CSV export button clicked")
+        if not self._has_export_data():
+            return None
+        if not isinstance(path, str) or path == '':
+            path = self._ask_export_path("Export CSV", str(Path.cwd() / 'table.csv'), "CSV Files (*.csv)")
+            if not path:
+                return None
+        return self._start_export('csv', path, self._export_source_rows(export_selected))
     
     def export_excel(self, path=None, export_filtered=True, export_selected=False):
         """Export to Excel with options for filtered/selected data"""
+        logger.info("Excel export button clicked")
+        if not self._has_export_data():
+            return None
         try:
-            logger.info("Excel export button clicked")
-            # Check if there's any data to export
-            if self.model.rowCount() == 0:
-                logger.warning("No data to export")
-                QMessageBox.warning(self, tr("No Data"), "There is no data to export.")
-                return
-            
-            from egg_farm_system.utils.excel_export import ExcelExporter
+            import openpyxl  # noqa: F401
         except ImportError:
             logger.error("Excel export requires openpyxl")
             QMessageBox.critical(self, tr("Missing Dependency"), "Excel export requires openpyxl. Please install it with: pip install openpyxl")
-            return
-        
-        if path is None:
-            result = QFileDialog.getSaveFileName(
-                self, "Export Excel", str(Path.cwd() / 'table.xlsx'), 
-                "Excel Files (*.xlsx);;All Files (*.*)"
-            )
-            if isinstance(result, tuple):
-                path, _ = result
-            else:
-                path = result
-            # Check if user cancelled or path is invalid
-            if not path or not isinstance(path, str) or path == '':
-                return
-        # Ensure path is a string (user may have cancelled)
+            return None
         if not isinstance(path, str) or path == '':
-            logger.debug(f"Excel export cancelled or invalid path")
-            return
-        
-        # Get visible columns only
-        visible_cols = [i for i in range(self.model.columnCount()) if not self.view.isColumnHidden(i)]
-        if not visible_cols:
-            QMessageBox.warning(self, tr("No Columns"), "No visible columns to export.")
-            return
-        
-        headers = [self.model.headerData(i, Qt.Horizontal) or f"Column {i+1}" for i in visible_cols]
-        
-        rows = []
-        if export_selected:
-            # Export only selected rows
-            selected = self.view.selectionModel().selectedRows()
-            for index in selected:
-                source_index = self.proxy.mapToSource(index)
-                if source_index.isValid():
-                    row = [self.model.item(source_index.row(), c).text() 
-                           if self.model.item(source_index.row(), c) is not None else '' 
-                           for c in visible_cols]
-                    rows.append(row)
-        else:
-            # Export all visible rows (respecting filter)
-            for r in range(self.proxy.rowCount()):
-                proxy_index = self.proxy.index(r, 0)
-                if not proxy_index.isValid():
-                    continue
-                source_index = self.proxy.mapToSource(proxy_index)
-                if source_index.isValid():
-                    row = [self.model.item(source_index.row(), c).text() 
-                           if self.model.item(source_index.row(), c) is not None else '' 
-                           for c in visible_cols]
-                    rows.append(row)
-        
-        try:
-            exporter = ExcelExporter()
-            exporter.export_table_data(headers, rows, Path(path), "Data")
-            QMessageBox.information(self, tr("Success"), f"Data exported to {path}")
-        except Exception as e:
-            logger.exception(f"Error exporting Excel: {e}")
-            QMessageBox.critical(self, tr("Export Error"), f"Failed to export Excel: {e}")
+            path = self._ask_export_path("Export Excel", str(Path.cwd() / 'table.xlsx'),
+                                         "Excel Files (*.xlsx);;All Files (*.*)")
+            if not path:
+                return None
+        return self._start_export('xlsx', path, self._export_source_rows(export_selected), sheet_name="Data")
@@ -0,0 +1,108 @@
+"""
+Diagnostics Widget - live latency metrics and database session state
+"""
+from egg_farm_system.utils.i18n import tr
+
+import logging
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFont
+
+from egg_farm_system.config import METRICS_SNAPSHOT_PATH
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_MS = 5000
+
+
+class DiagnosticsWidget(QWidget):
+    """Diagnostics page showing hot-path latency percentiles"""
+
+    COLUMNS = ["Metric", "Labels", "Count", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+        self.refresh()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_INTERVAL_MS)
+
+    def init_ui(self):
+        """Initialize UI"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+
+        title = QLabel(tr("Diagnostics"))
+        title_font = QFont()
+        title_font.setPointSize(16)
+        title_font.setBold(True)
+        title.setFont(title_font)
+        layout.addWidget(title)
+
+        actions = QHBoxLayout()
+        self.sessions_label = QLabel()
+        actions.addWidget(self.sessions_label)
+        actions.addStretch()
+
+        refresh_btn = QPushButton(tr("Refresh"))
+        refresh_btn.clicked.connect(self.refresh)
+        actions.addWidget(refresh_btn)
+
+        snapshot_btn = QPushButton(tr("Save Snapshot"))
+        snapshot_btn.clicked.connect(self.save_snapshot)
+        actions.addWidget(snapshot_btn)
+
+        reset_btn = QPushButton(tr("Reset"))
+        reset_btn.clicked.connect(self.reset_metrics)
+        actions.addWidget(reset_btn)
+        layout.addLayout(actions)
+
+        self.metrics_table = QTableWidget()
+        self.metrics_table.setColumnCount(len(self.COLUMNS))
+        self.metrics_table.setHorizontalHeaderLabels([tr(c) for c in self.COLUMNS])
+        self.metrics_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.metrics_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.metrics_table.setSortingEnabled(True)
+        layout.addWidget(self.metrics_table)
+
+    def refresh(self):
+        """Reload metrics and session diagnostics"""
+        sessions = DatabaseManager.open_sessions()
+        oldest = f", {tr('oldest')} {sessions[0]['age_seconds']:.0f}s ({sessions[0]['origin']})" if sessions else ""
+        self.sessions_label.setText(f"{tr('Open database sessions')}: {len(sessions)}{oldest}")
+
+        series = [item for item in metrics.series() if item['type'] == 'histogram' and item.get('count')]
+        self.metrics_table.setSortingEnabled(False)
+        self.metrics_table.setRowCount(len(series))
+        for row, item in enumerate(series):
+            labels = ", ".join(f"{k}={v}" for k, v in item['labels'].items())
+            values = [item['count']] + [item[key] * 1000 for key in ('p50', 'p95', 'p99', 'max')]
+            self.metrics_table.setItem(row, 0, QTableWidgetItem(item['name']))
+            self.metrics_table.setItem(row, 1, QTableWidgetItem(labels))
+            for col, value in enumerate(values, start=2):
+                cell = QTableWidgetItem()
+                cell.setData(Qt.DisplayRole, value if col == 2 else round(value, 1))
+                self.metrics_table.setItem(row, col, cell)
+        self.metrics_table.setSortingEnabled(True)
+        self.metrics_table.resizeColumnsToContents()
+
+    def save_snapshot(self):
+        """Write the current metrics to the snapshot file"""
+        try:
+            metrics.write_snapshot(METRICS_SNAPSHOT_PATH)
+            QMessageBox.information(self, tr("Diagnostics"), f"{tr('Snapshot saved to')} {METRICS_SNAPSHOT_PATH}")
+        except Exception as e:
+            logger.error(f"Error saving metrics snapshot: {e}")
+            QMessageBox.critical(self, tr("Error"), f"{tr('Failed to save snapshot')}: {e}")
+
+    def reset_metrics(self):
+        """Clear all recorded metrics"""
+        metrics.reset()
+        self.refresh()
@@ -0,0 +1,55 @@
+"""
+Background export worker with progress and cancellation
+"""
+import logging
+
+from PySide6.QtCore import QThread, Signal
+
+from egg_farm_system.utils.streaming_export import ExportCancelled, export_rows
+
+logger = logging.getLogger(__name__)
+
+
+class ExportWorker(QThread):
+    """Runs ``export_rows`` off the UI thread.
+
+    ``rows`` must not touch Qt objects or a session owned by another thread;
+    pass a snapshot of the data or a generator that opens its own read session.
+    Calling ``run()`` directly performs the export synchronously with the
+    same signals, which is how small exports avoid the thread start-up.
+    """
+
+    progress = Signal(int)
+    export_finished = Signal(str, int)
+    export_cancelled = Signal(str)
+    error_occurred = Signal(str)
+
+    def __init__(self, fmt, headers, rows, path, parent=None, **options):
+        super().__init__(parent)
+        self.fmt = fmt
+        self.headers = headers
+        self.rows = rows
+        self.path = str(path)
+        self.options = options
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            count = export_rows(
+                self.fmt, self.headers, self.rows, self.path,
+                progress=self.progress.emit,
+                cancelled=self.isInterruptionRequested,
+                **self.options
+            )
+            self.export_finished.emit(self.path, count)
+        except ExportCancelled:
+            logger.info(f"Export to {self.path} cancelled")
+            self.export_cancelled.emit(self.path)
+        except Exception as e:
+            logger.exception(f"Error exporting {self.fmt}: {e}")
+            self.error_occurred.emit(str(e))
+        finally:
+            # Drop the row source (and any session it holds) once done
+            self.rows = None
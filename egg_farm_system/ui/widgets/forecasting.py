@@ -8,6 +8,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
 from PySide6.QtCore import Qt
 import pyqtgraph as pg
 
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.database.models import EggProduction
 from egg_farm_system.utils.calculations import EggCalculations
@@ -65,10 +66,11 @@ class ForecastingWidget(QWidget):
             if not shed_ids:
                 return
 
-            productions = session.query(EggProduction).filter(
-                EggProduction.shed_id.in_(shed_ids),
-                EggProduction.date >= start_date,
-                EggProduction.date <= end_date
+            production = ArchiveManager.entity(session, EggProduction, start_date, end_date)
+            productions = session.query(production).filter(
+                production.shed_id.in_(shed_ids),
+                production.date >= start_date,
+                production.date <= end_date
             ).all()
             
             # Group by date
@@ -25,7 +25,7 @@ class GlobalSearchWidget(QDialog):
         super().__init__(parent)
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
-        self.search_timer.timeout.connect(self._perform_search)
+        self.search_timer.timeout.connect(self._perform_live_search)
         
         self.setWindowTitle(tr("Global Search"))
         self.setMinimumSize(600, 500)
@@ -84,8 +84,16 @@ class GlobalSearchWidget(QDialog):
             self.results_list.clear()
             self.status_label.setText(tr("Enter at least 2 characters to search..."))
     
+    def _perform_live_search(self):
+        """Search while typing without recording partial queries in history"""
+        self._run_search(save_history=False)
+    
     def _perform_search(self):
         """Perform the search"""
+        self._run_search(save_history=True)
+    
+    def _run_search(self, save_history: bool):
+        """Run the search and populate the results list"""
         query = self.search_input.text().strip()
         
         if len(query) < 2:
@@ -97,7 +105,7 @@ class GlobalSearchWidget(QDialog):
         
         try:
             with GlobalSearchManager() as sm:
-                results = sm.search(query)
+                results = sm.search(query, save_history=save_history)
             
             total_results = sum(len(r) for r in results.values())
             
@@ -256,9 +256,6 @@ class PartyViewDialog(QDialog):
     def load_data(self):
         """Load party ledger data"""
         try:
-            # Get ledger entries with running balance
-            entries_afg = self.ledger_manager.get_balance_with_running(self.party.id, "AFG", farm_id=self.farm_id)
-            entries_usd = self.ledger_manager.get_balance_with_running(self.party.id, "USD", farm_id=self.farm_id)
             summary = self.ledger_manager.get_ledger_summary(self.party.id, farm_id=self.farm_id)
             
             # Update balance cards with direct label references
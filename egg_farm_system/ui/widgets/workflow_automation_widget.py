@@ -161,13 +161,16 @@ class WorkflowAutomationWidget(QWidget):
             
             # Map task name to callback
             from egg_farm_system.utils.workflow_automation import (
-                create_daily_backup, generate_daily_report, check_low_stock_alerts
+                create_daily_backup, generate_daily_report, check_low_stock_alerts,
+                run_database_maintenance, refresh_analytics_snapshot
             )
             
             task_callbacks = {
                 'Daily Backup': create_daily_backup,
                 'Daily Report': generate_daily_report,
-                'Low Stock Check': check_low_stock_alerts
+                'Low Stock Check': check_low_stock_alerts,
+                'Database Maintenance': run_database_maintenance,
+                'Analytics Snapshot': refresh_analytics_snapshot
             }
             
             callback = task_callbacks.get(data['name'], lambda **kwargs: None)
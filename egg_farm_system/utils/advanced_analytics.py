@@ -9,6 +9,7 @@ from datetime import UTC, datetime, timedelta
 from collections import defaultdict
 import statistics
 
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.db import DatabaseManager
 from egg_farm_system.utils.time_utils import utcnow_naive
 from egg_farm_system.database.models import (
@@ -42,11 +43,12 @@ class ProductionAnalytics:
                 return []
             
             # Get daily production data
-            productions = self.session.query(EggProduction).filter(
-                EggProduction.shed_id.in_(shed_ids),
-                EggProduction.date >= datetime.combine(start_date, datetime.min.time()),
-                EggProduction.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
-            ).order_by(EggProduction.date).all()
+            production = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
+            productions = self.session.query(production).filter(
+                production.shed_id.in_(shed_ids),
+                production.date >= datetime.combine(start_date, datetime.min.time()),
+                production.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            ).order_by(production.date).all()
             
             # Group by date
             daily_totals = defaultdict(int)
@@ -103,9 +105,10 @@ class ProductionAnalytics:
             if not shed_ids:
                 return {}
             
-            productions = self.session.query(EggProduction).filter(
-                EggProduction.shed_id.in_(shed_ids),
-                EggProduction.date >= datetime.combine(start_date, datetime.min.time())
+            production = ArchiveManager.entity(self.session, EggProduction, start_date)
+            productions = self.session.query(production).filter(
+                production.shed_id.in_(shed_ids),
+                production.date >= datetime.combine(start_date, datetime.min.time())
             ).all()
             
             # Group by month
@@ -148,12 +151,13 @@ class ProductionAnalytics:
             
             sheds = self.session.query(Shed).filter(Shed.farm_id == farm_id).all()
             
+            production = ArchiveManager.entity(self.session, EggProduction, start_date, end_date)
             comparison = []
             for shed in sheds:
-                productions = self.session.query(EggProduction).filter(
-                    EggProduction.shed_id == shed.id,
-                    EggProduction.date >= datetime.combine(start_date, datetime.min.time()),
-                    EggProduction.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                productions = self.session.query(production).filter(
+                    production.shed_id == shed.id,
+                    production.date >= datetime.combine(start_date, datetime.min.time()),
+                    production.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
                 ).all()
                 
                 total_eggs = sum(
@@ -208,9 +212,10 @@ class FinancialAnalytics:
         """
         try:
             # Revenue from sales
-            sales = self.session.query(Sale).filter(
-                Sale.date >= datetime.combine(start_date, datetime.min.time()),
-                Sale.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            sale_rows = ArchiveManager.entity(self.session, Sale, start_date, end_date)
+            sales = self.session.query(sale_rows).filter(
+                sale_rows.date >= datetime.combine(start_date, datetime.min.time()),
+                sale_rows.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
             ).all()
             
             total_revenue_afg = sum(s.total_afg for s in sales)
@@ -224,10 +229,11 @@ class FinancialAnalytics:
             feed_costs_afg = 0
             feed_costs_usd = 0
             if shed_ids:
-                feed_issues = self.session.query(FeedIssue).filter(
-                    FeedIssue.shed_id.in_(shed_ids),
-                    FeedIssue.date >= datetime.combine(start_date, datetime.min.time()),
-                    FeedIssue.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                issues = ArchiveManager.entity(self.session, FeedIssue, start_date, end_date)
+                feed_issues = self.session.query(issues).filter(
+                    issues.shed_id.in_(shed_ids),
+                    issues.date >= datetime.combine(start_date, datetime.min.time()),
+                    issues.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
                 ).all()
                 
                 for issue in feed_issues:
@@ -241,10 +247,11 @@ class FinancialAnalytics:
                             feed_costs_usd += issue.quantity_kg * (feed.cost_per_kg_afg / 78.0)  # Approximate
             
             # Expenses
-            expenses = self.session.query(Expense).filter(
-                Expense.farm_id == farm_id,
-                Expense.date >= datetime.combine(start_date, datetime.min.time()),
-                Expense.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            expense_rows = ArchiveManager.entity(self.session, Expense, start_date, end_date)
+            expenses = self.session.query(expense_rows).filter(
+                expense_rows.farm_id == farm_id,
+                expense_rows.date >= datetime.combine(start_date, datetime.min.time()),
+                expense_rows.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
             ).all()
             
             total_expenses_afg = sum(e.amount_afg for e in expenses)
@@ -283,10 +290,11 @@ class FinancialAnalytics:
     def cost_breakdown(self, farm_id: int, start_date: datetime.date, end_date: datetime.date) -> Dict[str, Any]:
         """Break down costs by category"""
         try:
-            expenses = self.session.query(Expense).filter(
-                Expense.farm_id == farm_id,
-                Expense.date >= datetime.combine(start_date, datetime.min.time()),
-                Expense.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            expense_rows = ArchiveManager.entity(self.session, Expense, start_date, end_date)
+            expenses = self.session.query(expense_rows).filter(
+                expense_rows.farm_id == farm_id,
+                expense_rows.date >= datetime.combine(start_date, datetime.min.time()),
+                expense_rows.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
             ).all()
             
             breakdown = defaultdict(lambda: {'afg': 0, 'usd': 0, 'count': 0})
@@ -393,9 +401,10 @@ class InventoryAnalytics:
             start_date = end_date - timedelta(days=days)
             
             # Get purchases in period
-            purchases = self.session.query(Purchase).filter(
-                Purchase.date >= datetime.combine(start_date, datetime.min.time()),
-                Purchase.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            purchase_rows = ArchiveManager.entity(self.session, Purchase, start_date, end_date)
+            purchases = self.session.query(purchase_rows).filter(
+                purchase_rows.date >= datetime.combine(start_date, datetime.min.time()),
+                purchase_rows.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
             ).all()
             
             total_purchases_afg = sum(p.total_afg for p in purchases)
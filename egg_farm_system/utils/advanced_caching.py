@@ -152,10 +152,10 @@ class ReportCache:
         cache_key = self._generate_key(report_type, params)
         return self.cache.get(cache_key)
     
-    def set_report(self, report_type: str, params: Dict, data: Any):
+    def set_report(self, report_type: str, params: Dict, data: Any, ttl: Optional[int] = None):
         """Cache report"""
         cache_key = self._generate_key(report_type, params)
-        self.cache.set(cache_key, data)
+        self.cache.set(cache_key, data, ttl=ttl)
     
     def _generate_key(self, report_type: str, params: Dict) -> str:
         """Generate deterministic cache key from parameters"""
@@ -137,24 +137,29 @@ class AuditTrail:
         """Get audit logs with filters"""
         session = self._get_session()
         try:
-            query = session.query(AuditLog)
+            logs = AuditLog
+            if start_date or end_date:
+                # Archive imports this module
+                from egg_farm_system.database.archive import ArchiveManager
+                logs = ArchiveManager.entity(session, AuditLog, start_date, end_date)
+            query = session.query(logs)
             
             if entity_type:
-                query = query.filter(AuditLog.entity_type == entity_type)
+                query = query.filter(logs.entity_type == entity_type)
             
             if action_type:
-                query = query.filter(AuditLog.action_type == action_type)
+                query = query.filter(logs.action_type == action_type)
             
             if user_id:
-                query = query.filter(AuditLog.user_id == user_id)
+                query = query.filter(logs.user_id == user_id)
             
             if start_date:
-                query = query.filter(AuditLog.timestamp >= start_date)
+                query = query.filter(logs.timestamp >= start_date)
             
             if end_date:
-                query = query.filter(AuditLog.timestamp <= end_date)
+                query = query.filter(logs.timestamp <= end_date)
             
-            return query.order_by(AuditLog.timestamp.desc()).limit(limit).all()
+            return query.order_by(logs.timestamp.desc()).limit(limit).all()
         
         except Exception as e:
             logger.error(f"Error getting audit logs: {e}")
@@ -180,11 +185,13 @@ class AuditTrail:
         """Get activity for a user"""
         session = self._get_session()
         try:
+            from egg_farm_system.database.archive import ArchiveManager
             start_date = utcnow_naive() - timedelta(days=days)
-            return session.query(AuditLog).filter(
-                AuditLog.user_id == user_id,
-                AuditLog.timestamp >= start_date
-            ).order_by(AuditLog.timestamp.desc()).all()
+            logs = ArchiveManager.entity(session, AuditLog, start_date)
+            return session.query(logs).filter(
+                logs.user_id == user_id,
+                logs.timestamp >= start_date
+            ).order_by(logs.timestamp.desc()).all()
         except Exception as e:
             logger.error(f"Error getting user activity: {e}")
             return []
@@ -4,6 +4,7 @@ Backup and Restore Manager for Egg Farm Management System
 from egg_farm_system.utils.i18n import tr
 
 import shutil
+import sqlite3
 import zipfile
 from pathlib import Path
 from datetime import datetime
@@ -32,20 +33,29 @@ class BackupManager:
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
     
-    def create_backup(self, include_logs: bool = False, comment: str = "") -> Path:
+    def create_backup(self, include_logs: bool = False, comment: str = "", online: bool = False) -> Path:
         """
         Create a backup of the database and optionally logs
         
         Args:
             include_logs: Whether to include log files in backup
             comment: Optional comment/description for the backup
+            online: Copy the open database with SQLite's backup API instead of
+                closing it first, so other connections keep working and
+                committed WAL content is included
             
         Returns:
             Path to the created backup file
         """
+        snapshot = None
         try:
-            # Ensure database is closed before backup
-            DatabaseManager.close()
+            if online:
+                snapshot = self._snapshot_database()
+                db_file = snapshot
+            else:
+                # Ensure database is closed before backup
+                DatabaseManager.close()
+                db_file = DB_PATH
             
             # Create backup filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -55,9 +65,9 @@ class BackupManager:
             # Create zip file
             with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
                 # Add database file
-                if DB_PATH.exists():
-                    zipf.write(DB_PATH, arcname="egg_farm.db")
-                    logger.info(f"Added database to backup: {DB_PATH}")
+                if db_file.exists():
+                    zipf.write(db_file, arcname="egg_farm.db")
+                    logger.info(f"Added database to backup: {db_file}")
                 
                 # Add logs if requested
                 if include_logs and LOGS_DIR.exists():
@@ -70,8 +80,9 @@ class BackupManager:
                     "timestamp": timestamp,
                     "datetime": datetime.now().isoformat(),
                     "comment": comment,
-                    "database_size": DB_PATH.stat().st_size if DB_PATH.exists() else 0,
-                    "includes_logs": include_logs
+                    "database_size": db_file.stat().st_size if db_file.exists() else 0,
+                    "includes_logs": include_logs,
+                    "online": online
                 }
                 zipf.writestr("backup_metadata.json", json.dumps(metadata, indent=2))
             
@@ -81,6 +92,24 @@ class BackupManager:
         except Exception as e:
             logger.error(f"Failed to create backup: {e}", exc_info=True)
             raise
+        finally:
+            if snapshot is not None:
+                snapshot.unlink(missing_ok=True)
+    
+    def _snapshot_database(self) -> Path:
+        """Copy the live database page by page into a temporary file in the backup directory"""
+        source_path = DatabaseManager.database_path()
+        snapshot = self.backup_dir / f".snapshot_{datetime.now():%Y%m%d_%H%M%S_%f}.db"
+        source = sqlite3.connect(source_path)
+        try:
+            target = sqlite3.connect(snapshot)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+        return snapshot
     
     def restore_backup(self, backup_path: Path, restore_logs: bool = False) -> bool:
         """
@@ -3,6 +3,7 @@ Calculation utilities for egg farm system
 """
 from datetime import UTC, datetime, timedelta
 from sqlalchemy import func
+from egg_farm_system.database.archive import ArchiveManager
 from egg_farm_system.database.models import Flock, FeedIssue, EggProduction, Mortality
 from egg_farm_system.utils.time_utils import utcnow_naive
 
@@ -84,12 +85,13 @@ class EggCalculations:
         shed_id = flock.shed_id
         
         # Get total eggs produced
+        production = ArchiveManager.entity(session, EggProduction, start_date, end_date)
         total_eggs = session.query(func.sum(
-            EggProduction.small_count + EggProduction.medium_count + EggProduction.large_count + EggProduction.broken_count
+            production.small_count + production.medium_count + production.large_count + production.broken_count
         )).filter(
-            EggProduction.shed_id == shed_id,
-            EggProduction.date >= start_date,
-            EggProduction.date <= end_date
+            production.shed_id == shed_id,
+            production.date >= start_date,
+            production.date <= end_date
         ).scalar() or 0
 
         # Calculate average live bird count for the period
@@ -151,19 +153,21 @@ class FeedCalculations:
         shed_id = flock.shed_id
 
         # Get total feed issued
-        total_feed_kg = session.query(func.sum(FeedIssue.quantity_kg)).filter(
-            FeedIssue.shed_id == shed_id,
-            FeedIssue.date >= start_date,
-            FeedIssue.date <= end_date
+        issues = ArchiveManager.entity(session, FeedIssue, start_date, end_date)
+        total_feed_kg = session.query(func.sum(issues.quantity_kg)).filter(
+            issues.shed_id == shed_id,
+            issues.date >= start_date,
+            issues.date <= end_date
         ).scalar() or 0
 
         # Get total eggs produced
+        production = ArchiveManager.entity(session, EggProduction, start_date, end_date)
         total_eggs_query = session.query(
-            func.sum(EggProduction.small_count + EggProduction.medium_count + EggProduction.large_count + EggProduction.broken_count)
+            func.sum(production.small_count + production.medium_count + production.large_count + production.broken_count)
         ).filter(
-            EggProduction.shed_id == shed_id,
-            EggProduction.date >= start_date,
-            EggProduction.date <= end_date
+            production.shed_id == shed_id,
+            production.date >= start_date,
+            production.date <= end_date
         )
         total_eggs = total_eggs_query.scalar() or 0
         
@@ -4,15 +4,28 @@ Excel Export/Import utilities for Egg Farm Management System
 from egg_farm_system.utils.i18n import tr
 
 import logging
+from itertools import chain, islice
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
+# Shared style objects; openpyxl stores each distinct style once per workbook
+_THIN_SIDE = Side(style='thin')
+THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+
+# Column widths of streamed sheets are estimated from the first rows only
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 50
+
 
 class ExcelExporter:
     """Export data to Excel format"""
@@ -43,53 +56,76 @@ class ExcelExporter:
         # Add headers if provided
         if headers:
             ws.append(headers)
-            # Style header row
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            header_alignment = Alignment(horizontal="center", vertical="center")
-            border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
             for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = border
+                cell.fill = HEADER_FILL
+                cell.font = HEADER_FONT
+                cell.alignment = HEADER_ALIGNMENT
+                cell.border = THIN_BORDER
         
         # Add data rows
         for row_data in data:
             ws.append(row_data)
-            # Add borders to data rows
             for cell in ws[ws.max_row]:
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
+                cell.border = THIN_BORDER
         
         # Auto-adjust column widths
         self._auto_adjust_columns(ws)
     
     def _auto_adjust_columns(self, ws):
         """Auto-adjust column widths"""
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        for index, values in enumerate(ws.iter_cols(values_only=True), start=1):
+            max_length = max((len(str(value)) for value in values if value), default=0)
+            ws.column_dimensions[get_column_letter(index)].width = min(max_length + 2, MAX_COLUMN_WIDTH)
+
+    @staticmethod
+    def _column_widths(headers: List[str], rows: List[Any]) -> List[int]:
+        widths = [len(str(header)) for header in headers]
+        for row in rows:
+            for index, value in enumerate(row[:len(widths)]):
+                if value is not None:
+                    widths[index] = max(widths[index], len(str(value)))
+        return [min(width + 2, MAX_COLUMN_WIDTH) for width in widths]
+
+    def write_table(self, headers: List[str], rows: Iterable[Iterable[Any]], file_path: Path,
+                    sheet_name: str = "Data") -> int:
+        """
+        Stream table rows into a new workbook using openpyxl write-only mode
+        
+        Rows are written as they are read from ``rows`` (any iterable, e.g. a
+        query result generator), so memory stays flat for large exports. Only
+        the header row is styled; column widths come from the first
+        ``WIDTH_SAMPLE_ROWS`` rows.
+        
+        Returns:
+            Number of data rows written
+        """
+        workbook = Workbook(write_only=True)
+        ws = workbook.create_sheet(title=sheet_name)
+        
+        rows = iter(rows)
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        for index, width in enumerate(self._column_widths(headers, sample), start=1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+        ws.freeze_panes = 'A2'
+        
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGNMENT
+            cell.border = THIN_BORDER
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        count = 0
+        for row in chain(sample, rows):
+            ws.append(list(row))
+            count += 1
+        
+        workbook.save(file_path)
+        logger.info(f"Excel file saved: {file_path} ({count} rows)")
+        return count
     
     def save(self, file_path: Path):
         """
@@ -406,13 +442,11 @@ class ExcelExporter:
         
         Args:
             headers: Column headers
-            rows: Data rows
+            rows: Data rows (any iterable; streamed in write-only mode)
             file_path: Path to save Excel file
             sheet_name: Name of the sheet
         """
-        self.create_workbook()
-        self.add_sheet(sheet_name, rows, headers)
-        self.save(file_path)
+        return self.write_table(headers, rows, file_path, sheet_name)
 
 
 class ExcelImporter:
@@ -4,11 +4,15 @@ Global Search Manager for Egg Farm Management System
 import logging
 import json
 import os
+import weakref
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from sqlalchemy import text
+
 from egg_farm_system.config import DATA_DIR
 from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.search_index import SEARCH_TABLE, build_match_query, ensure_search_index
 from egg_farm_system.database.models import (
     Farm, Shed, Flock, EggProduction, Party, Sale, Purchase, Expense,
     RawMaterial, FinishedFeed
@@ -16,10 +20,32 @@ from egg_farm_system.database.models import (
 
 logger = logging.getLogger(__name__)
 
+# Search module name -> entity type stored in the search index
+MODULE_TYPES = {
+    'farms': 'farm',
+    'sheds': 'shed',
+    'flocks': 'flock',
+    'parties': 'party',
+    'sales': 'sale',
+    'purchases': 'purchase',
+    'expenses': 'expense',
+    'productions': 'production',
+    'materials': 'material',
+    'feeds': 'feed',
+}
+TYPE_MODULES = {v: k for k, v in MODULE_TYPES.items()}
+RESULTS_PER_MODULE = 20
+HISTORY_LIMIT = 50
+
 
 class GlobalSearchManager:
     """Manages global search across all modules"""
     
+    # FTS5 availability per engine, so the index check runs once per process
+    _index_state = weakref.WeakKeyDictionary()
+    # Search history shared across instances; loaded from disk on first use
+    _history: Optional[List[str]] = None
+    
     def __init__(self, session=None):
         self._owned_session = False
         if session:
@@ -41,13 +67,16 @@ class GlobalSearchManager:
             self.session.close()
             self.session = None
     
-    def search(self, query: str, modules: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    def search(self, query: str, modules: Optional[List[str]] = None,
+               save_history: bool = True) -> Dict[str, List[Dict[str, Any]]]:
         """
         Search across all or specified modules
         
         Args:
             query: Search query string
             modules: List of module names to search (None = all modules)
+            save_history: Record the query in search history (pass False for
+                as-you-type searches so only submitted queries are kept)
             
         Returns:
             Dictionary mapping module names to search results
@@ -55,17 +84,72 @@ class GlobalSearchManager:
         if not query or len(query.strip()) < 2:
             return {}
         
-        # Save search query to history
-        self.save_search(query)
+        if save_history:
+            self.save_search(query)
         
         query_lower = query.lower().strip()
-        results = {}
         
         # Define which modules to search
-        search_modules = modules if modules else [
-            'farms', 'sheds', 'flocks', 'parties', 'sales', 'purchases',
-            'expenses', 'productions', 'materials', 'feeds'
-        ]
+        search_modules = modules if modules else list(MODULE_TYPES)
+        
+        try:
+            if self._index_available():
+                return self._search_index(query_lower, search_modules)
+        except Exception as e:
+            logger.error(f"Error in indexed search, falling back to LIKE queries: {e}")
+        
+        return self._search_like(query_lower, search_modules)
+    
+    def _index_available(self) -> bool:
+        """Ensure the FTS5 index exists for the current database (checked once per engine)."""
+        bind = self.session.get_bind()
+        if bind not in GlobalSearchManager._index_state:
+            available = ensure_search_index(self.session.connection())
+            self.session.commit()
+            GlobalSearchManager._index_state[bind] = available
+        return GlobalSearchManager._index_state[bind]
+    
+    def _search_index(self, query: str, search_modules: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Search every requested module with a single ranked FTS5 query"""
+        match = build_match_query(query)
+        results = {module: [] for module in search_modules if module in MODULE_TYPES}
+        if not match or not results:
+            return results
+        
+        entity_types = [MODULE_TYPES[module] for module in results]
+        type_params = {f"type_{i}": t for i, t in enumerate(entity_types)}
+        type_list = ", ".join(f":{name}" for name in type_params)
+        
+        # bm25 cannot be used inside a window function, so score in the inner
+        # query and rank per entity type in the outer one.
+        sql = text(
+            "SELECT entity_type, entity_id, title, subtitle FROM ("
+            "  SELECT *, row_number() OVER ("
+            "    PARTITION BY entity_type ORDER BY score, sort_key DESC) AS rn"
+            "  FROM ("
+            "    SELECT entity_type, entity_id, title, subtitle, sort_key,"
+            f"      bm25({SEARCH_TABLE}, 10.0, 1.0) AS score"
+            f"    FROM {SEARCH_TABLE}"
+            f"    WHERE {SEARCH_TABLE} MATCH :match AND entity_type IN ({type_list})"
+            "  )"
+            ") WHERE rn <= :limit ORDER BY entity_type, rn"
+        )
+        rows = self.session.execute(
+            sql, {"match": match, "limit": RESULTS_PER_MODULE, **type_params}
+        ).fetchall()
+        
+        for entity_type, entity_id, title, subtitle in rows:
+            results[TYPE_MODULES[entity_type]].append({
+                'id': entity_id,
+                'type': entity_type,
+                'title': title,
+                'subtitle': subtitle or '',
+            })
+        return results
+    
+    def _search_like(self, query_lower: str, search_modules: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fallback search using LIKE queries when FTS5 is unavailable"""
+        results = {}
         
         try:
             if 'farms' in search_modules:
@@ -196,7 +280,7 @@ class GlobalSearchManager:
         """Search expenses"""
         expenses = self.session.query(Expense).filter(
             Expense.category.ilike(f"%{query}%") |
-            Expense.notes.ilike(f"%{query}%")
+            Expense.description.ilike(f"%{query}%")
         ).order_by(Expense.date.desc()).limit(20).all()
         
         return [{
@@ -253,35 +337,37 @@ class GlobalSearchManager:
     
     def get_search_history(self, limit: int = 10) -> List[str]:
         """Get recent search history"""
-        try:
-            if not self.history_file.exists():
-                return []
-            
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-                return history[:limit]
-        except Exception as e:
-            logger.error(f"Error reading search history: {e}")
-            return []
+        return self._load_history()[:limit]
+    
+    def _load_history(self) -> List[str]:
+        """Load search history from disk once and keep it in memory"""
+        if GlobalSearchManager._history is None:
+            history = []
+            try:
+                if self.history_file.exists():
+                    with open(self.history_file, 'r', encoding='utf-8') as f:
+                        history = json.load(f)[:HISTORY_LIMIT]
+            except Exception as e:
+                logger.error(f"Error reading search history: {e}")
+            GlobalSearchManager._history = history
+        return GlobalSearchManager._history
     
     def save_search(self, query: str):
-        """Save search to history"""
+        """Save search to history (written to disk only when it changes)"""
         if not query or len(query.strip()) < 2:
             return
             
         try:
             query = query.strip()
-            history = self.get_search_history(limit=50) # Get more to filter
+            history = self._load_history()
+            if history and history[0] == query:
+                return
             
-            # Remove if exists (to move to top)
+            # Move to top if it exists, keeping at most HISTORY_LIMIT entries
             if query in history:
                 history.remove(query)
-            
-            # Add to top
             history.insert(0, query)
-            
-            # Keep max 50
-            history = history[:50]
+            del history[HISTORY_LIMIT:]
             
             with open(self.history_file, 'w', encoding='utf-8') as f:
                 json.dump(history, f, ensure_ascii=False)
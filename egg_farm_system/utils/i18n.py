@@ -1,9 +1,9 @@
 """
 Internationalization (i18n) and Translation Manager for Pashto Support
-"""
 
-from PySide6.QtCore import QObject, Signal, Qt
-from PySide6.QtWidgets import QApplication
+Qt-free so the domain layer can call ``tr``; the UI re-emits language
+changes as a Qt signal (see ``egg_farm_system.ui.i18n_signals``).
+"""
 
 # Comprehensive Pashto Translations
 TRANSLATIONS = {
@@ -402,27 +402,25 @@ try:
 except Exception:
     pass
 
-class TranslationManager(QObject):
-    language_changed = Signal(str)
-    
+class TranslationManager:
     def __init__(self):
-        super().__init__()
         self.current_lang = "en"
         self._translations = TRANSLATIONS
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call ``callback(lang_code)`` after every language change"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
 
     def set_language(self, lang_code):
         if lang_code in self._translations or lang_code == "en":
             self.current_lang = lang_code
-            
-            # Update Application Layout Direction
-            app = QApplication.instance()
-            if app:
-                if lang_code == "ps":
-                    app.setLayoutDirection(Qt.RightToLeft)
-                else:
-                    app.setLayoutDirection(Qt.LeftToRight)
-            
-            self.language_changed.emit(lang_code)
+            for listener in list(self._listeners):
+                listener(lang_code)
 
     def get(self, text):
         if self.current_lang == "en":
@@ -0,0 +1,68 @@
+"""
+Deferred imports for heavy modules and UI pages.
+
+``lazy_import("package.module", "Name")`` returns a proxy that imports the
+module the first time the object is called or an attribute is read, so
+module-level references cost nothing until the feature is actually used.
+"""
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LazyImport:
+    """Proxy for a module or module attribute that is imported on first use"""
+
+    __slots__ = ("_module_name", "_attr", "_target", "_lock")
+
+    def __init__(self, module_name: str, attr: str = None):
+        object.__setattr__(self, "_module_name", module_name)
+        object.__setattr__(self, "_attr", attr)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def resolve(self):
+        """Import (once) and return the real module or attribute"""
+        target = object.__getattribute__(self, "_target")
+        if target is not None:
+            return target
+        with object.__getattribute__(self, "_lock"):
+            target = object.__getattribute__(self, "_target")
+            if target is None:
+                module_name = object.__getattribute__(self, "_module_name")
+                attr = object.__getattribute__(self, "_attr")
+                start = time.perf_counter()
+                target = importlib.import_module(module_name)
+                if attr:
+                    target = getattr(target, attr)
+                logger.debug(f"Lazy import of {module_name}{'.' + attr if attr else ''} "
+                             f"took {time.perf_counter() - start:.3f}s")
+                object.__setattr__(self, "_target", target)
+        return target
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, "_target") is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.resolve(), name, value)
+
+    def __repr__(self):
+        module_name = object.__getattribute__(self, "_module_name")
+        attr = object.__getattribute__(self, "_attr")
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyImport {module_name}{':' + attr if attr else ''} ({state})>"
+
+
+def lazy_import(module_name: str, attr: str = None) -> LazyImport:
+    """Return a proxy for ``module_name`` (or ``module_name.attr``) imported on first use"""
+    return LazyImport(module_name, attr)
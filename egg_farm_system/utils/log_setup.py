@@ -0,0 +1,152 @@
+"""
+Logging pipeline
+
+``configure_logging()`` puts a single ``QueueHandler`` on the root logger. A
+``QueueListener`` thread formats the records and writes them to a
+size-rotated log file (and the console), so a log call in a sale or purchase
+only costs putting the record on a queue; ``DeferredQueueHandler`` leaves
+even the formatting, tracebacks included, to the listener. Records go out as text or, with
+``LOG_JSON``, as one JSON object per line.
+
+``RateLimitFilter`` runs before the queue. It caps INFO and DEBUG records per
+call site for the loggers in ``LOG_RATE_LIMITS``. After each window it adds
+the number it dropped to the next record it lets through. Warnings and
+errors always pass.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from datetime import datetime
+
+from egg_farm_system import config
+
+_state = {"handler": None, "listener": None}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues records unformatted, for the listener's formatter
+
+    The stock ``prepare()`` formats each record in the logging thread and
+    drops ``exc_info``. This one only merges the arguments into the message,
+    so they cannot change before the listener runs, and keeps the exception.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets at most ``limit`` INFO/DEBUG records per call site through per window
+
+    ``limits`` maps logger names to a limit; a name also covers its child
+    loggers, and the longest matching name wins.
+    """
+
+    def __init__(self, limits, window=60.0):
+        super().__init__()
+        self.limits = dict(limits)
+        self.window = window
+        self._sites = {}  # (logger, file, line) -> [window start, passed, dropped]
+        self._lock = threading.Lock()
+
+    def _limit(self, name):
+        while True:
+            if name in self.limits:
+                return self.limits[name]
+            if "." not in name:
+                return None
+            name = name.rsplit(".", 1)[0]
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        limit = self._limit(record.name)
+        if limit is None:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                dropped = site[2] if site else 0
+                self._sites[key] = [now, 1, 0]
+                if dropped:
+                    record.msg = f"{record.getMessage()} ({dropped} similar messages suppressed)"
+                    record.args = None
+                return True
+            if site[1] < limit:
+                site[1] += 1
+                return True
+            site[2] += 1
+            return False
+
+
+def configure_logging(level=None, log_file=None, json_format=None, console=True):
+    """Route all logging through a queue to a rotating file and the console
+
+    Calling it again replaces the previous pipeline. Returns the listener.
+    """
+    shutdown_logging()
+    level = level or config.LOG_LEVEL
+    log_file = log_file or config.LOGS_DIR / "app.log"
+    json_format = config.LOG_JSON if json_format is None else json_format
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(config.LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUP_COUNT, encoding="utf-8")
+    handlers = [file_handler]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(config.LOG_RATE_LIMITS, config.LOG_RATE_LIMIT_WINDOW))
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level) if isinstance(level, str) else level)
+    root.addHandler(queue_handler)
+    listener.start()
+    _state.update(handler=queue_handler, listener=listener)
+    return listener
+
+
+def shutdown_logging():
+    """Flush the queued records and remove the pipeline; safe to call twice"""
+    handler, listener = _state["handler"], _state["listener"]
+    if handler is None:
+        return
+    logging.getLogger().removeHandler(handler)
+    listener.stop()  # writes what is still queued
+    for target in listener.handlers:
+        target.close()
+    _state.update(handler=None, listener=None)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,213 @@
+"""
+Fixed-memory metrics registry
+
+Latencies are recorded into log-bucketed histograms, so every series uses
+bounded memory no matter how many observations it receives, and p50/p95/p99
+are read from the buckets (within one bucket width, about 10%). Series are
+identified by a name plus low-cardinality labels (``farm_id``, ``report``),
+never by formatting ids into the name.
+
+    from egg_farm_system.utils.metrics import metrics
+    metrics.observe("record_sale", 0.042, farm_id=1)
+    metrics.snapshot()
+"""
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from egg_farm_system.utils.time_utils import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+# Smallest distinguishable value (seconds) and bucket growth factor
+HISTOGRAM_MIN_VALUE = 1e-5
+HISTOGRAM_GROWTH = 1.1
+HISTOGRAM_BUCKETS = 200  # 1e-5 * 1.1 ** 200 is roughly 30 minutes
+# Series beyond this are folded into one overflow series per name
+MAX_SERIES = 500
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """Log-bucketed histogram with exact count/sum/min/max"""
+
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max', '_lock')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket_index(value: float) -> int:
+        if value <= HISTOGRAM_MIN_VALUE:
+            return 0
+        index = int(math.log(value / HISTOGRAM_MIN_VALUE) / math.log(HISTOGRAM_GROWTH)) + 1
+        return min(index, HISTOGRAM_BUCKETS - 1)
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        return HISTOGRAM_MIN_VALUE * HISTOGRAM_GROWTH ** index
+
+    def observe(self, value: float):
+        index = self.bucket_index(value)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate ``q``-th percentile (0-100), or None when empty"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(self.count * q / 100))
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= rank:
+                    # Clamp the bucket bound to the exact observed range
+                    return min(max(self.bucket_upper_bound(index), self.min), self.max)
+            return self.max
+
+    def stats(self) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        result = {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'avg': self.total / self.count,
+        }
+        for q in PERCENTILES:
+            result[f'p{q}'] = self.percentile(q)
+        return result
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled histograms and counters"""
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        self.max_series = max_series
+        self._histograms: Dict[tuple, Histogram] = {}
+        self._counters: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        self._overflowed = set()
+
+    def _key(self, name: str, labels: Dict[str, Any], store: dict) -> tuple:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        if key in store or len(self._histograms) + len(self._counters) < self.max_series:
+            return key
+        if name not in self._overflowed:
+            self._overflowed.add(name)
+            logger.warning(f"Metrics series limit ({self.max_series}) reached; folding new '{name}' series")
+        return (name, (('overflow', 'true'),))
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        """Return the histogram for ``name`` and ``labels``, creating it if needed"""
+        with self._lock:
+            key = self._key(name, labels, self._histograms)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            return histogram
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation (seconds for latencies)"""
+        self.histogram(name, **labels).observe(value)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            key = self._key(name, labels, self._counters)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def series(self) -> List[Dict[str, Any]]:
+        """Current value of every series, sorted by name"""
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+        result = [
+            dict({'name': name, 'labels': dict(labels), 'type': 'histogram'}, **histogram.stats())
+            for (name, labels), histogram in histograms
+        ]
+        result.extend(
+            {'name': name, 'labels': dict(labels), 'type': 'counter', 'value': value}
+            for (name, labels), value in counters
+        )
+        return sorted(result, key=lambda item: (item['name'], sorted(item['labels'].items())))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'timestamp': utcnow_naive().isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+            'series': self.series(),
+        }
+
+    def write_snapshot(self, path: Path):
+        """Write the snapshot as JSON, replacing ``path`` atomically"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.snapshot(), handle, indent=2)
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._overflowed.clear()
+
+
+class MetricsSnapshotter:
+    """Background thread that writes registry snapshots every ``interval`` seconds"""
+
+    def __init__(self, registry: MetricsRegistry, path: Path, interval: float = 300):
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-snapshot', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            self.registry.write_snapshot(self.path)
+        except Exception as e:
+            logger.error(f"Error writing metrics snapshot: {e}")
+
+    def stop(self):
+        """Stop the thread and write a final snapshot"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.write()
+
+
+# Global registry
+metrics = MetricsRegistry()
+
+__all__ = ['Histogram', 'MetricsRegistry', 'MetricsSnapshotter', 'metrics']
@@ -7,10 +7,7 @@ import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Any, Tuple
-
-from PySide6.QtWidgets import QFileDialog, QMessageBox
-from PySide6.QtCore import QStandardPaths
+from typing import Iterable, List, Optional, Any, Tuple
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape, portrait
@@ -24,6 +21,12 @@ from reportlab.pdfgen import canvas
 
 logger = logging.getLogger(__name__)
 
+# Above this many rows cells are drawn as plain clipped text
+FAST_PDF_ROWS = 1000
+FAST_CELL_FONT_SIZE = 8
+# Rows per Table flowable; kept even so row striping lines up across chunks
+PDF_CHUNK_ROWS = 500
+
 
 class ProfessionalPDFExporter:
     """Professional PDF exporter using ReportLab"""
@@ -88,7 +91,7 @@ class ProfessionalPDFExporter:
             alignment=TA_LEFT
         ))
 
-    def export_table(self, headers: List[str], rows: List[List[Any]], 
+    def export_table(self, headers: List[str], rows: Iterable[Iterable[Any]], 
                     path: Optional[str] = None, title: str = "Report",
                     subtitle: Optional[str] = None,
                     company_name: Optional[str] = None,
@@ -99,7 +102,13 @@ class ProfessionalPDFExporter:
                     parent=None) -> bool:
         """
         Export table data to professional PDF using ReportLab
+
+        Asks for the path with a file dialog when none is given and reports
+        the outcome to ``parent``; headless callers use ``write_table``.
         """
+        from PySide6.QtWidgets import QFileDialog, QMessageBox
+        from PySide6.QtCore import QStandardPaths
+
         # Defensive check for invalid path types (e.g. boolean from Qt signals)
         if isinstance(path, bool) or (isinstance(path, str) and not path.strip()):
             path = None
@@ -128,158 +137,12 @@ class ProfessionalPDFExporter:
             if not path.lower().endswith('.pdf'):
                 path += '.pdf'
 
-            # 2. Prepare Data for Table
-            # Convert all data to Paragraphs for wrapping
-            table_data = []
-            
-            # Header Row
-            header_row = [Paragraph(str(h), self.styles['CellHeader']) for h in headers]
-            table_data.append(header_row)
-            
-            # Data Rows
-            for row in rows:
-                processed_row = []
-                for cell in row:
-                    # Handle None values
-                    text = str(cell) if cell is not None else ""
-                    processed_row.append(Paragraph(text, self.styles['CellText']))
-                table_data.append(processed_row)
-            
-            # Totals Row
-            if show_totals and totals_row:
-                total_processed = []
-                for cell in totals_row:
-                    text = str(cell) if cell is not None else ""
-                    # Use bold for totals
-                    p = Paragraph(f"<b>{text}</b>", self.styles['CellText'])
-                    total_processed.append(p)
-                table_data.append(total_processed)
-
-            # 3. Setup Document
-            # Determine orientation based on column count/width
-            # Simple heuristic: > 6 columns -> Landscape
-            page_size = landscape(A4) if len(headers) > 6 else A4
-            
-            doc = SimpleDocTemplate(
-                path,
-                pagesize=page_size,
-                leftMargin=15*mm,
-                rightMargin=15*mm,
-                topMargin=35*mm,  # Space for header
-                bottomMargin=20*mm
+            self.write_table(
+                headers, rows, path, title=title, subtitle=subtitle,
+                company_name=company_name, company_address=company_address,
+                company_phone=company_phone,
+                totals_row=totals_row if show_totals else None,
             )
-
-            # 4. Create Table
-            # Calculate available width
-            avail_width = doc.width
-            col_widths = [avail_width / len(headers)] * len(headers)
-            
-            table = Table(table_data, colWidths=col_widths, repeatRows=1)
-            
-            # Table Styling
-            style_cmds = [
-                ('BACKGROUND', (0, 0), (-1, 0), self.table_header_color),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]
-            
-            # Alternating row colors
-            for i in range(1, len(table_data)):
-                bg_color = self.row_odd_color if i % 2 == 1 else self.row_even_color
-                style_cmds.append(('BACKGROUND', (0, i), (-1, i), bg_color))
-            
-            # Style for totals row if present
-            if show_totals and totals_row:
-                style_cmds.append(('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey))
-                style_cmds.append(('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'))
-
-            table.setStyle(TableStyle(style_cmds))
-            
-            elements = [table]
-
-            # 5. Define Header and Footer Callback
-            def draw_header_footer(canvas, doc):
-                canvas.saveState()
-                
-                # --- Header ---
-                header_height = 25 * mm
-                page_width, page_height = doc.pagesize
-                
-                # Blue background for header
-                canvas.setFillColor(self.header_color)
-                canvas.rect(0, page_height - header_height, page_width, header_height, fill=1, stroke=0)
-                
-                # Company Info (Left)
-                text_x = 15 * mm
-                text_y = page_height - 10 * mm
-                
-                # We use Paragraphs drawn on canvas for rich text
-                p = Paragraph(company_name or "Company Name", self.styles['CompanyName'])
-                w, h = p.wrap(page_width/2, header_height)
-                p.drawOn(canvas, text_x, text_y - h)
-                
-                current_y = text_y - h - 2*mm
-                if company_address:
-                    p = Paragraph(company_address, self.styles['CompanyDetail'])
-                    w, h = p.wrap(page_width/2, header_height)
-                    p.drawOn(canvas, text_x, current_y - h)
-                    current_y -= (h + 1*mm)
-                    
-                if company_phone:
-                    p = Paragraph(f"Phone: {company_phone}", self.styles['CompanyDetail'])
-                    w, h = p.wrap(page_width/2, header_height)
-                    p.drawOn(canvas, text_x, current_y - h)
-
-                # Report Title (Right)
-                right_margin = 15 * mm
-                title_width = page_width/2
-                
-                p = Paragraph(title, self.styles['HeaderTitle'])
-                w, h = p.wrap(title_width, header_height)
-                p.drawOn(canvas, page_width - right_margin - w, page_height - 12 * mm - h)
-                
-                if subtitle:
-                    p = Paragraph(subtitle, self.styles['HeaderSubtitle'])
-                    w, h = p.wrap(title_width, header_height)
-                    p.drawOn(canvas, page_width - right_margin - w, page_height - 12 * mm - h - 6*mm)
-
-                # Date (Bottom Right of Header)
-                date_str = datetime.now().strftime("%B %d, %Y")
-                canvas.setFont("Helvetica", 9)
-                canvas.setFillColor(colors.white)
-                canvas.drawRightString(page_width - right_margin, page_height - header_height + 3*mm, date_str)
-
-                # --- Footer ---
-                footer_height = 10 * mm
-                canvas.setFillColor(colors.HexColor("#ecf0f1")) # Light gray footer bg
-                canvas.rect(0, 0, page_width, footer_height, fill=1, stroke=0)
-                
-                canvas.setStrokeColor(colors.lightgrey)
-                canvas.line(15*mm, footer_height, page_width - 15*mm, footer_height)
-                
-                canvas.setFont("Helvetica", 8)
-                canvas.setFillColor(colors.grey)
-                
-                # Left Footer
-                if company_name:
-                    canvas.drawString(15*mm, 4*mm, company_name)
-                
-                # Center Footer
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                canvas.drawCentredString(page_width/2, 4*mm, f"Generated: {timestamp}")
-                
-                # Right Footer (Page Number)
-                page_num = f"Page {doc.page}"
-                canvas.drawRightString(page_width - 15*mm, 4*mm, page_num)
-                
-                canvas.restoreState()
-
-            # 6. Build
-            doc.build(elements, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer)
             
             if parent:
                 QMessageBox.information(parent, "Success", f"PDF exported successfully to:\n{path}")
@@ -291,3 +154,177 @@ class ProfessionalPDFExporter:
                 QMessageBox.critical(parent, "Export Error", f"Failed to export PDF:\n{str(e)}")
             return False
 
+    def write_table(self, headers: List[str], rows: Iterable[Iterable[Any]], path: str,
+                    title: str = "Report", subtitle: Optional[str] = None,
+                    company_name: Optional[str] = None,
+                    company_address: Optional[str] = None,
+                    company_phone: Optional[str] = None,
+                    totals_row: Optional[List[Any]] = None,
+                    fast: Optional[bool] = None) -> int:
+        """
+        Write table rows to ``path`` and return the number of data rows.
+        
+        Rows may be any iterable. In fast mode cells are plain strings clipped
+        to the column width instead of wrapping ``Paragraph`` objects; it is
+        used by default for iterables without a length and for more than
+        ``FAST_PDF_ROWS`` rows. Rows are split into tables of
+        ``PDF_CHUNK_ROWS`` so layout cost stays linear. Errors are raised.
+        """
+        if fast is None:
+            fast = not hasattr(rows, '__len__') or len(rows) > FAST_PDF_ROWS
+
+        # Simple heuristic: > 6 columns -> Landscape
+        page_size = landscape(A4) if len(headers) > 6 else A4
+        
+        doc = SimpleDocTemplate(
+            path,
+            pagesize=page_size,
+            leftMargin=15*mm,
+            rightMargin=15*mm,
+            topMargin=35*mm,  # Space for header
+            bottomMargin=20*mm
+        )
+
+        col_width = doc.width / len(headers)
+        col_widths = [col_width] * len(headers)
+        # Helvetica averages about half the font size per character
+        max_chars = max(4, int(col_width / (FAST_CELL_FONT_SIZE * 0.5)))
+
+        def make_cell(value):
+            text = "" if value is None else str(value)
+            return self._clip(text, max_chars) if fast else Paragraph(text, self.styles['CellText'])
+
+        header_row = [Paragraph(str(h), self.styles['CellHeader']) for h in headers]
+
+        base_style = [
+            ('BACKGROUND', (0, 0), (-1, 0), self.table_header_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            # Chunks hold an even number of rows, so striping continues across them
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.row_odd_color, self.row_even_color]),
+        ]
+        if fast:
+            base_style += [
+                ('FONTSIZE', (0, 1), (-1, -1), FAST_CELL_FONT_SIZE),
+                ('TOPPADDING', (0, 1), (-1, -1), 3),
+                ('BOTTOMPADDING', (0, 1), (-1, -1), 3),
+            ]
+        table_style = TableStyle(base_style)
+
+        elements = []
+        chunk = []
+        count = 0
+        for row in rows:
+            chunk.append([make_cell(value) for value in row])
+            count += 1
+            if len(chunk) == PDF_CHUNK_ROWS:
+                elements.append(self._make_table(header_row, chunk, col_widths, table_style))
+                chunk = []
+
+        last_style = table_style
+        if totals_row:
+            if fast:
+                chunk.append([make_cell(value) for value in totals_row])
+            else:
+                chunk.append([Paragraph(f"<b>{'' if value is None else value}</b>", self.styles['CellText'])
+                              for value in totals_row])
+            last_style = TableStyle(base_style + [
+                ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ])
+        if chunk or not elements:
+            elements.append(self._make_table(header_row, chunk, col_widths, last_style))
+
+        def draw_header_footer(canvas, doc):
+            canvas.saveState()
+
+            # --- Header ---
+            header_height = 25 * mm
+            page_width, page_height = doc.pagesize
+
+            # Blue background for header
+            canvas.setFillColor(self.header_color)
+            canvas.rect(0, page_height - header_height, page_width, header_height, fill=1, stroke=0)
+
+            # Company Info (Left)
+            text_x = 15 * mm
+            text_y = page_height - 10 * mm
+
+            # We use Paragraphs drawn on canvas for rich text
+            p = Paragraph(company_name or "Company Name", self.styles['CompanyName'])
+            w, h = p.wrap(page_width/2, header_height)
+            p.drawOn(canvas, text_x, text_y - h)
+
+            current_y = text_y - h - 2*mm
+            if company_address:
+                p = Paragraph(company_address, self.styles['CompanyDetail'])
+                w, h = p.wrap(page_width/2, header_height)
+                p.drawOn(canvas, text_x, current_y - h)
+                current_y -= (h + 1*mm)
+
+            if company_phone:
+                p = Paragraph(f"Phone: {company_phone}", self.styles['CompanyDetail'])
+                w, h = p.wrap(page_width/2, header_height)
+                p.drawOn(canvas, text_x, current_y - h)
+
+            # Report Title (Right)
+            right_margin = 15 * mm
+            title_width = page_width/2
+
+            p = Paragraph(title, self.styles['HeaderTitle'])
+            w, h = p.wrap(title_width, header_height)
+            p.drawOn(canvas, page_width - right_margin - w, page_height - 12 * mm - h)
+
+            if subtitle:
+                p = Paragraph(subtitle, self.styles['HeaderSubtitle'])
+                w, h = p.wrap(title_width, header_height)
+                p.drawOn(canvas, page_width - right_margin - w, page_height - 12 * mm - h - 6*mm)
+
+            # Date (Bottom Right of Header)
+            date_str = datetime.now().strftime("%B %d, %Y")
+            canvas.setFont("Helvetica", 9)
+            canvas.setFillColor(colors.white)
+            canvas.drawRightString(page_width - right_margin, page_height - header_height + 3*mm, date_str)
+
+            # --- Footer ---
+            footer_height = 10 * mm
+            canvas.setFillColor(colors.HexColor("#ecf0f1")) # Light gray footer bg
+            canvas.rect(0, 0, page_width, footer_height, fill=1, stroke=0)
+
+            canvas.setStrokeColor(colors.lightgrey)
+            canvas.line(15*mm, footer_height, page_width - 15*mm, footer_height)
+
+            canvas.setFont("Helvetica", 8)
+            canvas.setFillColor(colors.grey)
+
+            # Left Footer
+            if company_name:
+                canvas.drawString(15*mm, 4*mm, company_name)
+
+            # Center Footer
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            canvas.drawCentredString(page_width/2, 4*mm, f"Generated: {timestamp}")
+
+            # Right Footer (Page Number)
+            page_num = f"Page {doc.page}"
+            canvas.drawRightString(page_width - 15*mm, 4*mm, page_num)
+
+            canvas.restoreState()
+
+        doc.build(elements, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer)
+        return count
+
+    @staticmethod
+    def _make_table(header_row, rows, col_widths, style):
+        table = Table([header_row] + rows, colWidths=col_widths, repeatRows=1)
+        table.setStyle(style)
+        return table
+
+    @staticmethod
+    def _clip(text: str, max_chars: int) -> str:
+        text = text.replace('\n', ' ')
+        return text if len(text) <= max_chars else text[:max_chars - 3] + '...'
@@ -1,22 +1,47 @@
 """
 Performance monitoring and profiling utilities
 """
+import heapq
 import logging
+import re
+import threading
 import time
+from collections import Counter, deque
 from functools import wraps
 from datetime import UTC, datetime
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Optional
 from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from egg_farm_system.utils.metrics import Histogram, metrics
 from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
+# Scope name for statements executed outside any measure_time block
+UNSCOPED = "<unscoped>"
+
+_scope_state = threading.local()
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and IN-lists so identical statements compare equal"""
+    return _PLACEHOLDER_LIST.sub("(?, ...)", _WHITESPACE.sub(" ", statement).strip())
+
 
 class PerformanceMetrics:
-    """Track performance metrics"""
+    """Track performance metrics
+    
+    Durations go into fixed-memory histograms, so long-running timers do not
+    grow without bound.
+    """
     
     def __init__(self):
-        self.metrics: Dict[str, List[float]] = {}
+        self.metrics: Dict[str, Histogram] = {}
         self.start_times: Dict[str, float] = {}
     
     def start(self, operation: str):
@@ -31,26 +56,18 @@ class PerformanceMetrics:
         duration = time.perf_counter() - self.start_times[operation]
         
         if operation not in self.metrics:
-            self.metrics[operation] = []
+            self.metrics[operation] = Histogram()
         
-        self.metrics[operation].append(duration)
+        self.metrics[operation].observe(duration)
         del self.start_times[operation]
         
         return duration
     
     def get_stats(self, operation: str) -> Dict[str, float]:
-        """Get statistics for an operation"""
-        if operation not in self.metrics or not self.metrics[operation]:
+        """Get statistics for an operation (count, total, min, max, avg, p50, p95, p99)"""
+        if operation not in self.metrics:
             return {}
-        
-        times = self.metrics[operation]
-        return {
-            'count': len(times),
-            'total': sum(times),
-            'min': min(times),
-            'max': max(times),
-            'avg': sum(times) / len(times)
-        }
+        return self.metrics[operation].stats()
     
     def get_all_stats(self) -> Dict[str, Dict[str, float]]:
         """Get statistics for all operations"""
@@ -75,29 +92,175 @@ class PerformanceMetrics:
                 print(f"  Average: {stats['avg']:.3f}s")
                 print(f"  Min:     {stats['min']:.3f}s")
                 print(f"  Max:     {stats['max']:.3f}s")
+                print(f"  p95:     {stats['p95']:.3f}s")
         
         print("\\n" + "="*60)
 
 
+class QueryScopeStats:
+    """SQL statistics collected for one profiling scope"""
+    
+    def __init__(self, name: str, top_n: int = 10, max_distinct: int = 500):
+        self.name = name
+        self.count = 0
+        self.total_time = 0.0
+        self.top_n = top_n
+        self.max_distinct = max_distinct
+        self.statements: Counter = Counter()
+        # Most times each statement ran within a single call of the scope
+        self.peak_repeats: Counter = Counter()
+        self._slowest: List[tuple] = []
+        self._seq = 0
+    
+    def add(self, statement: str, duration: float):
+        """Record one executed statement"""
+        self.count += 1
+        self.total_time += duration
+        if statement in self.statements or len(self.statements) < self.max_distinct:
+            self.statements[statement] += 1
+        self._seq += 1
+        entry = (duration, self._seq, statement)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+    
+    def add_call(self, calls: Counter):
+        """Record the statements one call of the scope executed"""
+        for statement, count in calls.items():
+            if count > self.peak_repeats[statement] and (
+                    statement in self.peak_repeats or len(self.peak_repeats) < self.max_distinct):
+                self.peak_repeats[statement] = count
+    
+    def slowest(self) -> List[Dict[str, Any]]:
+        """Slowest statements in this scope, slowest first"""
+        return [
+            {'statement': statement, 'duration': duration}
+            for duration, _, statement in sorted(self._slowest, reverse=True)
+        ]
+    
+    def repeated(self, threshold: int = None) -> List[Dict[str, Any]]:
+        """Identical statements executed at least ``threshold`` times in one call (N+1 candidates)"""
+        return repeated_in(self.peak_repeats, threshold)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'scope': self.name,
+            'count': self.count,
+            'total_time': self.total_time,
+            'slowest': self.slowest(),
+            'repeated': self.repeated(),
+        }
+
+
 class QueryProfiler:
-    """Profile database queries"""
+    """Profile database queries
     
-    def __init__(self):
-        self.queries: List[Dict[str, Any]] = []
+    Opt-in: ``enable()`` hooks SQLAlchemy's cursor events on every engine and
+    attributes each statement to the ``measure_time`` scopes active in the
+    executing thread. Identical statements repeated within one call of a
+    scope are reported as N+1 candidates.
+    
+    Example:
+        with query_profiler.profile("party_list") as stats:
+            load_party_list()
+        assert stats.count <= 3 and not stats.repeated()
+    """
+    
+    # Identical statements executed this many times in one scope are flagged
+    repeat_threshold = 5
+    
+    def __init__(self, max_queries: int = 1000, top_n: int = 10):
+        self.queries: deque = deque(maxlen=max_queries)
         self.slow_query_threshold = 0.1  # 100ms
+        self.top_n = top_n
+        self.scopes: Dict[str, QueryScopeStats] = {}
+        self.enabled = False
+        self._lock = threading.Lock()
+    
+    def enable(self):
+        """Start recording statements executed by any engine"""
+        if self.enabled:
+            return
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        self.enabled = True
+        logger.info("SQL profiling enabled")
+    
+    def disable(self):
+        """Stop recording statements"""
+        if not self.enabled:
+            return
+        event.remove(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", self._after_cursor_execute)
+        self.enabled = False
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+    
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start_time')
+        if starts:
+            self.record_query(statement, time.perf_counter() - starts.pop())
     
     def record_query(self, query: str, duration: float):
         """Record a query execution"""
+        statement = normalize_statement(query)
+        scopes = active_scopes() or [UNSCOPED]
         entry = {
             'timestamp': utcnow_naive(),
-            'query': query,
+            'query': statement,
             'duration': duration,
+            'scope': scopes[-1],
             'is_slow': duration > self.slow_query_threshold
         }
-        self.queries.append(entry)
+        for _, calls in getattr(_scope_state, 'stack', ()):
+            calls[statement] += 1
+        with self._lock:
+            self.queries.append(entry)
+            for name in scopes:
+                stats = self.scopes.get(name)
+                if stats is None:
+                    stats = self.scopes[name] = QueryScopeStats(name, top_n=self.top_n)
+                stats.add(statement, duration)
         
         if entry['is_slow']:
-            logger.warning(f"Slow query detected ({duration:.3f}s): {query[:100]}")
+            logger.warning(f"Slow query detected ({duration:.3f}s): {statement[:100]}")
+    
+    def end_call(self, name: str, calls: Counter):
+        """Record the statements one call of scope ``name`` executed"""
+        with self._lock:
+            stats = self.scopes.get(name)
+            if stats is not None:
+                stats.add_call(calls)
+    
+    def get_scope(self, name: str) -> Optional[QueryScopeStats]:
+        """Statistics for one scope, or None if it issued no statements"""
+        return self.scopes.get(name)
+    
+    @contextmanager
+    def profile(self, scope: str):
+        """Profile the block as a fresh scope and yield its statistics"""
+        was_enabled = self.enabled
+        self.enable()
+        with self._lock:
+            stats = self.scopes[scope] = QueryScopeStats(scope, top_n=self.top_n)
+        try:
+            with query_scope(scope):
+                yield stats
+        finally:
+            if not was_enabled:
+                self.disable()
+    
+    def repeated_statements(self, threshold: int = None) -> List[Dict[str, Any]]:
+        """N+1 candidates across all scopes, counted per call"""
+        with self._lock:
+            scopes = list(self.scopes.values())
+        return [
+            dict(item, scope=stats.name)
+            for stats in scopes if stats.name != UNSCOPED
+            for item in stats.repeated(threshold)
+        ]
     
     def get_slow_queries(self) -> List[Dict[str, Any]]:
         """Get all slow queries"""
@@ -123,9 +286,29 @@ class QueryProfiler:
             'max_time': max(durations)
         }
     
+    def report(self) -> str:
+        """Per-scope report: statement count, SQL time, slowest and repeated statements"""
+        with self._lock:
+            scopes = sorted(self.scopes.values(), key=lambda s: s.total_time, reverse=True)
+        lines = ["SQL PROFILE"]
+        for stats in scopes:
+            lines.append(f"{stats.name}: {stats.count} statements, {stats.total_time * 1000:.1f} ms")
+            for item in stats.slowest()[:3]:
+                lines.append(f"    slow  {item['duration'] * 1000:8.1f} ms  {item['statement'][:120]}")
+            for item in stats.repeated():
+                lines.append(f"    N+1   {item['count']:>8}x     {item['statement'][:120]}")
+        return "\n".join(lines)
+    
+    def log_report(self):
+        """Write the report to the log if anything was recorded"""
+        if self.scopes:
+            logger.info(self.report())
+    
     def reset(self):
         """Clear all records"""
-        self.queries.clear()
+        with self._lock:
+            self.queries.clear()
+            self.scopes.clear()
 
 
 class UIPerformanceMonitor:
@@ -183,12 +366,12 @@ def profile_operation(operation_name: str):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
-            metrics = PerformanceMetrics()
-            metrics.start(operation_name)
+            start = time.perf_counter()
             
             try:
                 result = func(*args, **kwargs)
-                duration = metrics.end(operation_name)
+                duration = time.perf_counter() - start
+                metrics.observe(operation_name, duration)
                 logger.info(f"{operation_name} completed in {duration:.3f}s")
                 return result
             except Exception as e:
@@ -200,23 +383,77 @@ def profile_operation(operation_name: str):
     return decorator
 
 
+def repeated_in(statements: Counter, threshold: int = None) -> List[Dict[str, Any]]:
+    """Statements of ``statements`` counted at least ``threshold`` times, most first"""
+    threshold = threshold or QueryProfiler.repeat_threshold
+    return [
+        {'statement': statement, 'count': count}
+        for statement, count in statements.most_common()
+        if count >= threshold
+    ]
+
+
 @contextmanager
-def measure_time(operation: str):
+def query_scope(name: str):
+    """Attribute SQL statements executed in this thread to ``name`` while active
+    
+    Yields a Counter of the statements executed during this call only.
+    """
+    stack = _scope_state.__dict__.setdefault('stack', [])
+    calls = Counter()
+    stack.append((name, calls))
+    try:
+        yield calls
+    finally:
+        stack.pop()
+        if calls:
+            query_profiler.end_call(name, calls)
+
+
+def active_scopes() -> List[str]:
+    """Scopes active in the current thread, outermost first"""
+    return [name for name, _ in getattr(_scope_state, 'stack', ())]
+
+
+@contextmanager
+def measure_time(operation: str, **labels):
     """
     Context manager to measure operation time
     
+    The duration is recorded in the metrics registry under ``operation`` and
+    ``labels``. Keep labels low-cardinality (farm_id, report type); per-record
+    ids belong in log messages, not in series. When SQL profiling is enabled
+    the statements issued inside the block are counted for ``operation`` and
+    repeated identical statements are logged.
+    
     Example:
-        with measure_time("data_processing"):
+        with measure_time("data_processing", farm_id=farm_id):
             process_data()
     """
     start = time.perf_counter()
-    logger.info(f"Starting: {operation}")
+    label_text = f" {labels}" if labels else ""
+    logger.debug(f"Starting: {operation}{label_text}")
+    stats = query_profiler.get_scope(operation) if query_profiler.enabled else None
+    count_before = stats.count if stats else 0
+    time_before = stats.total_time if stats else 0.0
     
+    calls = Counter()
     try:
-        yield
+        with query_scope(operation) as calls:
+            yield
     finally:
         duration = time.perf_counter() - start
-        logger.info(f"Completed: {operation} ({duration:.3f}s)")
+        metrics.observe(operation, duration, **labels)
+        stats = query_profiler.get_scope(operation) if query_profiler.enabled else None
+        if stats is None:
+            logger.info(f"Completed: {operation}{label_text} ({duration:.3f}s)")
+        else:
+            logger.info(
+                f"Completed: {operation}{label_text} ({duration:.3f}s, {stats.count - count_before} SQL statements, "
+                f"{stats.total_time - time_before:.3f}s in SQL)"
+            )
+            for item in repeated_in(calls):
+                logger.warning(f"Possible N+1 in {operation}: {item['count']}x {item['statement'][:100]}")
 
 
 class BatchOperationOptimizer:
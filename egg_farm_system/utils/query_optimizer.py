@@ -13,6 +13,13 @@ from egg_farm_system.utils.time_utils import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
+# strftime formats of the date groupings accepted by the summary methods
+SUMMARY_PERIODS = {
+    'day': '%Y-%m-%d',
+    'month': '%Y-%m',
+    'year': '%Y',
+}
+
 
 class QueryOptimizer:
     """Utility class for optimized database queries"""
@@ -72,17 +79,19 @@ class QueryOptimizer:
     @staticmethod
     def get_sales_with_parties_optimized(session, start_date=None, end_date=None, limit=None):
         """Get sales with party data eagerly loaded"""
+        from egg_farm_system.database.archive import ArchiveManager
         from egg_farm_system.database.models import Sale
         try:
-            query = session.query(Sale)
+            sales = ArchiveManager.entity(session, Sale, start_date, end_date)
+            query = session.query(sales)
             if start_date:
-                query = query.filter(Sale.date >= start_date)
+                query = query.filter(sales.date >= start_date)
             if end_date:
-                query = query.filter(Sale.date <= end_date)
+                query = query.filter(sales.date <= end_date)
             
             query = query.options(
-                selectinload(Sale.party)
-            ).order_by(Sale.date.desc())
+                selectinload(sales.party)
+            ).order_by(sales.date.desc())
             
             if limit:
                 query = query.limit(limit)
@@ -94,18 +103,20 @@ class QueryOptimizer:
     @staticmethod
     def get_purchases_optimized(session, start_date=None, end_date=None):
         """Get purchases with party and material data eagerly loaded"""
+        from egg_farm_system.database.archive import ArchiveManager
         from egg_farm_system.database.models import Purchase
         try:
-            query = session.query(Purchase)
+            purchases = ArchiveManager.entity(session, Purchase, start_date, end_date)
+            query = session.query(purchases)
             if start_date:
-                query = query.filter(Purchase.date >= start_date)
+                query = query.filter(purchases.date >= start_date)
             if end_date:
-                query = query.filter(Purchase.date <= end_date)
+                query = query.filter(purchases.date <= end_date)
             
             query = query.options(
-                selectinload(Purchase.party),
-                selectinload(Purchase.material) if 'material' in Purchase.__dict__ else None
-            ).order_by(Purchase.date.desc())
+                selectinload(purchases.party),
+                selectinload(purchases.material) if 'material' in Purchase.__dict__ else None
+            ).order_by(purchases.date.desc())
             
             return query.all()
         except Exception as e:
@@ -115,19 +126,21 @@ class QueryOptimizer:
     @staticmethod
     def get_expenses_optimized(session, farm_id=None, start_date=None, end_date=None):
         """Get expenses with party data eagerly loaded"""
+        from egg_farm_system.database.archive import ArchiveManager
         from egg_farm_system.database.models import Expense
         try:
-            query = session.query(Expense)
+            expenses = ArchiveManager.entity(session, Expense, start_date, end_date)
+            query = session.query(expenses)
             if farm_id:
-                query = query.filter(Expense.farm_id == farm_id)
+                query = query.filter(expenses.farm_id == farm_id)
             if start_date:
-                query = query.filter(Expense.date >= start_date)
+                query = query.filter(expenses.date >= start_date)
             if end_date:
-                query = query.filter(Expense.date <= end_date)
+                query = query.filter(expenses.date <= end_date)
             
             query = query.options(
-                selectinload(Expense.party)
-            ).order_by(Expense.date.desc())
+                selectinload(expenses.party)
+            ).order_by(expenses.date.desc())
             
             return query.all()
         except Exception as e:
@@ -281,22 +294,91 @@ class BulkQueryHelper:
 class AggregationHelper:
     """Helper for database aggregation queries"""
     
+    @staticmethod
+    def date_range_filters(column, start_date=None, end_date=None):
+        """
+        Filters for ``start_date <= column <= end_date`` on a DateTime column
+        
+        A plain ``date`` as ``end_date`` includes that whole day, so rows
+        recorded later than midnight on the last day are not dropped.
+        """
+        filters = []
+        if start_date:
+            filters.append(column >= start_date)
+        if end_date:
+            if isinstance(end_date, datetime):
+                filters.append(column <= end_date)
+            else:
+                next_day = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                filters.append(column < next_day)
+        return filters
+    
+    @staticmethod
+    def group_expression(group_by, date_column, **columns):
+        """
+        Resolve a summary ``group_by`` name to a SQL expression
+        
+        'day', 'month' and 'year' group ``date_column`` by period string;
+        any other name must be one of ``columns`` (e.g. party=Sale.party_id).
+        """
+        if group_by is None:
+            return None
+        if group_by in columns:
+            return columns[group_by]
+        if group_by not in SUMMARY_PERIODS:
+            choices = ", ".join(list(SUMMARY_PERIODS) + list(columns))
+            raise ValueError(f"Cannot group summary by {group_by!r}; expected one of {choices}")
+        return func.strftime(SUMMARY_PERIODS[group_by], date_column)
+    
+    @staticmethod
+    def summarize(session, measures: Dict[str, Any], filters, group_by=None, joins=()) -> Dict[str, Any]:
+        """
+        Run aggregate ``measures`` (name -> SUM/COUNT expression) in SQL
+        
+        Returns ``{'totals': {name: value}}``, plus ``'groups': {key: {name:
+        value}}`` when a ``group_by`` expression is given. NULL sums come back
+        as 0, and the totals are added up from the groups, so at most one
+        row per group is ever loaded.
+        """
+        names = list(measures)
+        columns = [func.coalesce(expr, 0) for expr in measures.values()]
+        if group_by is None:
+            query = session.query(*columns)
+        else:
+            query = session.query(group_by, *columns)
+        for target in joins:
+            query = query.join(target)
+        if filters:
+            query = query.filter(*filters)
+        if group_by is None:
+            return {'totals': dict(zip(names, query.one()))}
+        
+        groups = {}
+        totals = dict.fromkeys(names, 0)
+        for key, *values in query.group_by(group_by).order_by(group_by):
+            groups[key] = dict(zip(names, values))
+            for name, value in groups[key].items():
+                totals[name] += value
+        return {'totals': totals, 'groups': groups}
+    
     @staticmethod
     def get_daily_production_aggregate(session, farm_id, start_date, end_date):
         """Get aggregated daily production data"""
+        from egg_farm_system.database.archive import ArchiveManager
         from egg_farm_system.database.models import EggProduction, Shed
         try:
+            production = ArchiveManager.entity(session, EggProduction, start_date, end_date)
             results = session.query(
-                EggProduction.date,
-                func.sum(EggProduction.small_count).label('total_small'),
-                func.sum(EggProduction.medium_count).label('total_medium'),
-                func.sum(EggProduction.large_count).label('total_large'),
-                func.sum(EggProduction.broken_count).label('total_broken')
-            ).join(Shed).filter(
+                production.date,
+                func.sum(production.small_count).label('total_small'),
+                func.sum(production.medium_count).label('total_medium'),
+                func.sum(production.large_count).label('total_large'),
+                func.sum(production.broken_count).label('total_broken')
+            ).join(production.shed).filter(
                 Shed.farm_id == farm_id,
-                EggProduction.date >= start_date,
-                EggProduction.date <= end_date
-            ).group_by(EggProduction.date).all()
+                production.date >= start_date,
+                production.date <= end_date
+            ).group_by(production.date).all()
             
             return results
         except Exception as e:
@@ -306,17 +388,19 @@ class AggregationHelper:
     @staticmethod
     def get_sales_summary(session, start_date, end_date):
         """Get sales summary with aggregations"""
+        from egg_farm_system.database.archive import ArchiveManager
         from egg_farm_system.database.models import Sale
         try:
+            sales = ArchiveManager.entity(session, Sale, start_date, end_date)
             result = session.query(
-                func.count(Sale.id).label('total_sales'),
-                func.sum(Sale.quantity).label('total_eggs'),
-                func.sum(Sale.total_afg).label('total_afg'),
-                func.sum(Sale.total_usd).label('total_usd'),
-                func.avg(Sale.rate_afg).label('avg_rate_afg')
+                func.count(sales.id).label('total_sales'),
+                func.sum(sales.quantity).label('total_eggs'),
+                func.sum(sales.total_afg).label('total_afg'),
+                func.sum(sales.total_usd).label('total_usd'),
+                func.avg(sales.rate_afg).label('avg_rate_afg')
             ).filter(
-                Sale.date >= start_date,
-                Sale.date <= end_date
+                sales.date >= start_date,
+                sales.date <= end_date
             ).first()
             
             return result
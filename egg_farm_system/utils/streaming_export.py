@@ -0,0 +1,110 @@
+"""
+Streaming table exports
+
+Rows are read from any iterable - a generator over a query result or over a
+table model - and written as they arrive, so exporting a year of ledger rows
+keeps memory flat. Progress is reported every ``PROGRESS_EVERY`` rows and a
+``cancelled`` callback is polled at the same points; a cancelled or failed
+export removes the partial file.
+
+    with DatabaseManager.session_scope(read_only=True) as session:
+        rows = query_rows(session, select(Sale.date, Sale.quantity, Sale.total_afg))
+        export_rows("xlsx", ["Date", "Quantity", "Total"], rows, "sales.xlsx")
+"""
+import csv
+import logging
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'xlsx', 'pdf')
+PROGRESS_EVERY = 500
+QUERY_CHUNK_SIZE = 1000
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its ``cancelled`` callback returns True"""
+
+
+def query_rows(session, statement, params=None, chunk_size: int = QUERY_CHUNK_SIZE) -> Iterator[tuple]:
+    """Yield result rows of ``statement`` as tuples, fetching ``chunk_size`` at a time"""
+    result = session.execute(statement, params or {}, execution_options={'yield_per': chunk_size})
+    for row in result:
+        yield tuple(row)
+
+
+class _TrackedRows:
+    """Iterable wrapper that counts rows, reports progress and checks for cancellation"""
+
+    def __init__(self, rows: Iterable, progress: Optional[Callable[[int], None]],
+                 cancelled: Optional[Callable[[], bool]], every: int):
+        self._rows = rows
+        self._progress = progress
+        self._cancelled = cancelled
+        self._every = every
+        self.count = 0
+
+    def __iter__(self):
+        for row in self._rows:
+            if self.count % self._every == 0:
+                if self._cancelled is not None and self._cancelled():
+                    raise ExportCancelled()
+                if self._progress is not None and self.count:
+                    self._progress(self.count)
+            self.count += 1
+            yield row
+
+
+def _write_csv(headers, rows, path, **_options):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _write_xlsx(headers, rows, path, sheet_name="Data", **_options):
+    from egg_farm_system.utils.excel_export import ExcelExporter
+    ExcelExporter().write_table(headers, rows, Path(path), sheet_name)
+
+
+def _write_pdf(headers, rows, path, **options):
+    from egg_farm_system.utils.pdf_exporter import ProfessionalPDFExporter
+    ProfessionalPDFExporter().write_table(headers, rows, str(path), **options)
+
+
+_WRITERS = {'csv': _write_csv, 'xlsx': _write_xlsx, 'pdf': _write_pdf}
+
+
+def export_rows(fmt: str, headers: List[str], rows: Iterable[Iterable[Any]], path,
+                progress: Optional[Callable[[int], None]] = None,
+                cancelled: Optional[Callable[[], bool]] = None,
+                progress_every: int = PROGRESS_EVERY, **options) -> int:
+    """
+    Write ``rows`` to ``path`` in format ``fmt`` and return the row count
+
+    Args:
+        fmt: One of ``EXPORT_FORMATS``
+        headers: Column headers
+        rows: Any iterable of rows; consumed once
+        path: Output file
+        progress: Called with the number of rows written so far
+        cancelled: Polled while writing; returning True aborts with ExportCancelled
+        options: Passed to the writer (``sheet_name`` for xlsx; title, subtitle,
+            company details, ``totals_row`` and ``fast`` for pdf)
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    tracked = _TrackedRows(rows, progress, cancelled, progress_every)
+    try:
+        _WRITERS[fmt](headers, tracked, path, **options)
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
+    if progress is not None:
+        progress(tracked.count)
+    logger.info(f"Exported {tracked.count} rows to {path}")
+    return tracked.count
+
+
+__all__ = ['EXPORT_FORMATS', 'ExportCancelled', 'export_rows', 'query_rows']
@@ -92,6 +92,10 @@ class WorkflowAutomation:
         self.tasks: Dict[str, ScheduledTask] = {}
         self.business_rules: List[Dict[str, Any]] = []
         self._load_tasks()
+        self.register_task('database_maintenance', 'Database Maintenance', TaskFrequency.CUSTOM,
+                           run_database_maintenance, interval_hours=0.25)
+        self.register_task('analytics_snapshot', 'Analytics Snapshot', TaskFrequency.CUSTOM,
+                           refresh_analytics_snapshot, interval_hours=0.25)
     
     def register_task(self, task_id: str, name: str, frequency: TaskFrequency,
                      callback: Callable, enabled: bool = True, **kwargs):
@@ -229,6 +233,26 @@ def generate_daily_report(**kwargs):
         return False
 
 
+def run_database_maintenance(**kwargs):
+    """Start the due database maintenance steps if the database is idle"""
+    try:
+        from egg_farm_system.database.maintenance import database_maintenance
+        return database_maintenance.start_when_idle()
+    except Exception as e:
+        logger.error(f"Error starting database maintenance: {e}")
+        return False
+
+
+def refresh_analytics_snapshot(**kwargs):
+    """Start refreshing the analytics copy of the database if it is due"""
+    try:
+        from egg_farm_system.database.snapshot import read_snapshot
+        return read_snapshot.start_refresh()
+    except Exception as e:
+        logger.error(f"Error refreshing analytics snapshot: {e}")
+        return False
+
+
 def check_low_stock_alerts(**kwargs):
     """Check and send low stock alerts"""
     try:
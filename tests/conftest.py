@@ -1,13 +1,18 @@
 """Shared pytest fixtures for isolated database testing."""
 
+from contextlib import contextmanager
+
 import pytest
 from PySide6.QtWidgets import QApplication
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+import egg_farm_system.database.db as db_module
 from egg_farm_system.database.db import Base, DatabaseManager
 
+_MANAGER_STATE = ("_engine", "_SessionLocal", "_read_engine", "_ReadSessionLocal")
+
 
 @pytest.fixture(scope="session")
 def qapp():
@@ -45,3 +50,35 @@ def isolated_db():
         DatabaseManager._engine = prev_engine
         DatabaseManager._SessionLocal = prev_session_local
         engine.dispose()
+
+
+@pytest.fixture
+def file_database(monkeypatch):
+    """Provide ``file_database(path)``, a context manager running DatabaseManager on an SQLite file.
+
+    It initializes the file (running every migration), yields the main engine
+    and closes the database again on exit. DatabaseManager's previous engines
+    are restored after the test.
+    """
+    for attribute in _MANAGER_STATE:
+        monkeypatch.setattr(DatabaseManager, attribute, None)
+
+    @contextmanager
+    def open_database(path):
+        monkeypatch.setattr(db_module, "DATABASE_URL", f"sqlite:///{path}")
+        DatabaseManager.initialize()
+        try:
+            yield DatabaseManager._engine
+        finally:
+            DatabaseManager.close()
+            for attribute in _MANAGER_STATE:
+                setattr(DatabaseManager, attribute, None)
+
+    return open_database
+
+
+@pytest.fixture
+def file_db(tmp_path, file_database):
+    """Provide a fresh file database ``egg_farm.db`` in ``tmp_path`` and yield its engine."""
+    with file_database(tmp_path / "egg_farm.db") as engine:
+        yield engine
@@ -0,0 +1,162 @@
+"""Tests for per-year archive databases and the queries spanning them."""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from egg_farm_system.database.archive import OPENING_BALANCE, ArchiveManager
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import (
+    EggProduction, Expense, Farm, FeedIssue, FeedType, FinishedFeed, Ledger, Party, Payment, Sale, Shed,
+)
+from egg_farm_system.modules.egg_production import EggProductionManager
+from egg_farm_system.modules.expenses import ExpenseManager, PaymentManager
+from egg_farm_system.modules.financial_reports import FinancialReportGenerator
+from egg_farm_system.modules.ledger import LedgerManager
+from egg_farm_system.modules.reports import ReportGenerator
+from egg_farm_system.modules.sales import SalesManager
+from egg_farm_system.utils.advanced_caching import report_cache
+
+TODAY = date(2025, 3, 1)
+
+
+@pytest.fixture
+def farm(file_db):
+    with DatabaseManager.session_scope() as session:
+        farm, party = Farm(name="Archive Farm"), Party(name="Customer")
+        session.add_all([farm, party])
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed A", capacity=100)
+        session.add(shed)
+        session.flush()
+        for year, debit, credit in [(2022, 500, 0), (2023, 1000, 0), (2023, 0, 300), (2024, 200, 0)]:
+            session.add(Ledger(party_id=party.id, farm_id=farm.id, date=datetime(year, 6, 1 + credit // 100),
+                               description="x", debit_afg=debit, credit_afg=credit, debit_usd=debit / 100,
+                               credit_usd=credit / 100, exchange_rate_used=100))
+        session.add_all([
+            Sale(party_id=party.id, farm_id=farm.id, date=datetime(2023, 6, 1), quantity=10, rate_afg=100,
+                 rate_usd=1, total_afg=1000, total_usd=10, exchange_rate_used=100),
+            EggProduction(shed_id=shed.id, date=datetime(2023, 6, 2, 7), small_count=1, medium_count=2,
+                          large_count=3, broken_count=4),
+        ])
+        session.flush()
+        ids = {"farm": farm.id, "party": party.id}
+    return ids
+
+
+def _ledger_rows(start_date=None, end_date=None):
+    with DatabaseManager.session_scope() as session:
+        rows = ArchiveManager.subquery(session, Ledger, start_date, end_date)
+        return session.execute(select(rows).order_by(rows.c.date)).all()
+
+
+def test_archived_years_leave_balances_and_history_intact(farm):
+    assert ArchiveManager.archive_year(2022, today=TODAY) == 1
+    assert ArchiveManager.archive_year(2023, today=TODAY) == 5  # 2 entries, the 2023 opening, sale, production
+    assert ArchiveManager.archive_path(2023).exists()
+
+    with DatabaseManager.session_scope() as session:
+        assert ArchiveManager.archived_years(session) == [2022, 2023]
+        assert session.scalar(select(func.count()).select_from(Sale)) == 0
+        opening = session.execute(select(Ledger).where(Ledger.reference_type == OPENING_BALANCE)).scalar_one()
+    assert (opening.date, opening.debit_afg, opening.debit_usd) == (datetime(2024, 1, 1), 1200, 12)
+    assert LedgerManager().get_party_balance(farm["party"], "AFG") == 1400
+
+    # Whole history and ranges reaching into archives skip the opening entry they duplicate
+    assert [row.debit_afg - row.credit_afg for row in _ledger_rows()] == [500, 1000, -300, 200]
+    assert [row.date.year for row in _ledger_rows(date(2023, 2, 1), date(2023, 12, 31))] == [2023, 2023]
+    # A range starting on 1 January opens with the balance carried into that year
+    assert [row.reference_type for row in _ledger_rows(date(2023, 1, 1), date(2023, 12, 31))] == [
+        OPENING_BALANCE, None, None]
+    assert [row.reference_type for row in _ledger_rows(date(2024, 1, 1))] == [OPENING_BALANCE, None]
+
+    with ReportGenerator() as reports:
+        statement = reports.party_statement(farm["party"])
+        monthly = reports.monthly_egg_production_report(farm["farm"], 2023, 6)
+    assert statement["final_balance_afg"] == 1400
+    assert len(statement["entries"]) == 4
+    assert monthly["daily_summary"][date(2023, 6, 2)]["total"] == 10
+
+
+def test_only_closed_years_in_order(farm):
+    with pytest.raises(ValueError):
+        ArchiveManager.archive_year(2025, today=TODAY)
+    ArchiveManager.archive_year(2023, today=TODAY)
+    with pytest.raises(ValueError):
+        ArchiveManager.archive_year(2022, today=TODAY)
+
+
+def _year_reports(farm_id, start=date(2023, 1, 1), end=date(2023, 12, 31)):
+    report_cache.clear()
+    with SalesManager() as sales:
+        sale_results = {
+            "sales": sales.get_sales_summary(start, end, farm_id=farm_id, group_by="month"),
+            "sale_list": [row.total_afg for row in sales.get_sale_list(start_date=start, end_date=end)],
+        }
+    # The read-only connections behind the HTTP API attach archives too
+    with DatabaseManager.read_transaction() as session:
+        reports = FinancialReportGenerator(session)
+        expenses = ExpenseManager(session)
+        return {
+            **sale_results,
+            "pnl": reports.generate_pnl_statement(start, end, farm_id),
+            "cash_flow": reports.generate_cash_flow_statement(start, end),
+            "expenses": expenses.get_expenses_summary(farm_id, start, end),
+            "expense_list": [row.category for row in expenses.get_expense_list(farm_id, start, end)],
+            "payments": [p.amount_afg for p in PaymentManager(session).get_payments(start_date=start, end_date=end)],
+            "production": EggProductionManager(session).get_production_summary(None, start, end, farm_id=farm_id),
+        }
+
+
+def test_reports_of_an_archived_year_are_unchanged(farm):
+    with DatabaseManager.session_scope() as session:
+        shed_id = session.scalar(select(Shed.id))
+        feed = FinishedFeed(farm_id=farm["farm"], feed_type=FeedType.LAYER, cost_per_kg_afg=20, cost_per_kg_usd=0.2)
+        session.add(feed)
+        session.flush()
+        session.add_all([
+            FeedIssue(shed_id=shed_id, feed_id=feed.id, date=datetime(2023, 7, 1), quantity_kg=10, cost_afg=200,
+                      cost_usd=2),
+            Expense(farm_id=farm["farm"], date=datetime(2023, 8, 1), category="Labor", amount_afg=150,
+                    amount_usd=1.5, exchange_rate_used=100),
+            Payment(party_id=farm["party"], date=datetime(2023, 9, 1), amount_afg=400, amount_usd=4,
+                    payment_type="Received", payment_method="Cash", exchange_rate_used=100),
+            Sale(party_id=farm["party"], farm_id=farm["farm"], date=datetime(2024, 2, 1), quantity=5, rate_afg=100,
+                 rate_usd=1, total_afg=500, total_usd=5, exchange_rate_used=100),
+        ])
+
+    before = _year_reports(farm["farm"])
+    spanning_before = _year_reports(farm["farm"], date(2023, 6, 1), date(2024, 6, 30))
+    assert (before["pnl"]["total_revenue"], before["pnl"]["total_cogs"], before["pnl"]["total_expenses"]) == (
+        1000, 200, 150)
+
+    ArchiveManager.archive_year(2023, today=TODAY)
+    with DatabaseManager.session_scope() as session:
+        assert session.scalar(select(func.count()).select_from(Sale)) == 1
+
+    assert _year_reports(farm["farm"]) == before
+    assert _year_reports(farm["farm"], date(2023, 6, 1), date(2024, 6, 30)) == spanning_before
+
+
+def test_more_archived_years_than_can_be_attached(farm):
+    with DatabaseManager.session_scope() as session:
+        session.add_all([
+            Sale(party_id=farm["party"], farm_id=farm["farm"], date=datetime(year, 3, 1), quantity=1, rate_afg=year,
+                 rate_usd=1, total_afg=year, total_usd=1, exchange_rate_used=100)
+            for year in range(2010, 2019)
+        ])
+    for year in range(2010, 2019):
+        ArchiveManager.archive_year(year, today=TODAY)
+
+    # Undated lists stay on the open years unless history is asked for
+    with SalesManager() as sales:
+        assert [row.date.year for row in sales.get_sale_list()] == [2023]
+        assert len(sales.get_sales(include_archived=True)) == 10
+        assert [row.date.year for row in sales.get_sale_list(start_date=date(2010, 1, 1))] == [2023] + list(
+            range(2018, 2009, -1))
+    # Read-only connections copy the years past the attach limit too, once
+    for _ in range(2):
+        with DatabaseManager.read_transaction() as session:
+            rows = ArchiveManager.subquery(session, Sale, date(2010, 1, 1), date(2018, 12, 31))
+            assert session.scalar(select(func.sum(rows.c.total_afg))) == sum(range(2010, 2019))
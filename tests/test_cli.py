@@ -0,0 +1,86 @@
+"""Tests for the headless command line runner."""
+
+import csv
+import sqlite3
+import zipfile
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from egg_farm_system.cli import cli
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import EggProduction, Farm, Party, Shed
+
+
+@pytest.fixture
+def database(file_db):
+    with DatabaseManager.session_scope() as session:
+        farm = Farm(name="CLI Farm")
+        session.add(farm)
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed A", capacity=100)
+        session.add(shed)
+        session.flush()
+        session.add(EggProduction(shed_id=shed.id, date=datetime(2024, 5, 20, 7), small_count=1,
+                                  medium_count=2, large_count=3, broken_count=4))
+        farm_id = farm.id
+    return DatabaseManager.database_path(), farm_id
+
+
+def _invoke(path, *args):
+    return CliRunner().invoke(cli, ["--database", str(path), *args], catch_exceptions=False)
+
+
+def test_report_to_csv_and_xlsx(database, tmp_path):
+    path, farm_id = database
+    output = tmp_path / "daily.csv"
+    result = _invoke(path, "report", "daily_production", "--farm-id", str(farm_id), "--date", "2024-05-20",
+                     "-o", str(output))
+    assert result.exit_code == 0, result.output
+    with open(output, newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0][0] == "Shed"
+    assert rows[1][:2] == ["Shed A", "1"]
+    assert rows[-1][0] == "TOTAL"  # markup of the viewer is stripped
+
+    result = _invoke(path, "report", "daily_production", "--farm-id", str(farm_id), "--date", "2024-05-20",
+                     "-o", str(tmp_path / "daily.xlsx"))
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "daily.xlsx").stat().st_size > 0
+
+    result = _invoke(path, "report", "feed_usage", "--farm-id", str(farm_id), "-o", str(output))
+    assert result.exit_code == 2
+    assert "--start, --end" in result.output
+
+
+def test_import_and_online_backup(database, tmp_path):
+    path, _ = database
+    source = tmp_path / "parties.csv"
+    source.write_text("name,phone\nImported Buyer,0700123456\n", encoding="utf-8")
+    result = _invoke(path, "import", "parties", str(source))
+    assert result.exit_code == 0, result.output
+    with DatabaseManager.session_scope() as session:
+        assert session.query(Party).filter(Party.name == "Imported Buyer").count() == 1
+
+    result = _invoke(path, "backup", "--output-dir", str(tmp_path / "backups"))
+    assert result.exit_code == 0, result.output
+    (archive,) = (tmp_path / "backups").glob("*.zip")
+    with zipfile.ZipFile(archive) as bundle:
+        bundle.extract("egg_farm.db", tmp_path / "restored")
+    restored = sqlite3.connect(tmp_path / "restored" / "egg_farm.db")
+    try:
+        assert restored.execute("SELECT name FROM parties").fetchall() == [("Imported Buyer",)]
+    finally:
+        restored.close()
+
+
+def test_alerts_and_maintenance(database):
+    path, _ = database
+    result = _invoke(path, "alerts", "--no-notify")
+    assert result.exit_code == 0, result.output
+    assert "alert(s)" in result.output
+
+    result = _invoke(path, "maintenance", "--step", "checkpoint", "--step", "integrity_check")
+    assert result.exit_code == 0, result.output
+    assert "integrity_check: ok" in result.output
@@ -0,0 +1,91 @@
+"""Tests for the dashboard snapshot service."""
+
+import dataclasses
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import (
+    EggProduction, Farm, FeedIssue, FeedType, FinishedFeed, Party, RawMaterial, Sale, Shed,
+)
+from egg_farm_system.modules.dashboard import DashboardDataService
+
+DAY = date(2024, 5, 20)
+
+
+@pytest.fixture
+def farm_id(isolated_db):
+    session = isolated_db()
+    try:
+        farm, other = Farm(name="Snapshot Farm"), Farm(name="Other Farm")
+        session.add_all([farm, other])
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed A", capacity=500)
+        other_shed = Shed(farm_id=other.id, name="Shed B", capacity=500)
+        session.add_all([shed, other_shed])
+        session.flush()
+        feed = FinishedFeed(farm_id=farm.id, feed_type=FeedType.LAYER, current_stock=10, low_stock_alert=100,
+                            cost_per_kg_afg=20, cost_per_kg_usd=0.3)
+        party = Party(name="Customer")
+        session.add_all([feed, party])
+        session.flush()
+        session.add_all([
+            EggProduction(shed_id=shed.id, date=datetime(2024, 5, 20, 7), small_count=10,
+                          medium_count=20, large_count=30, broken_count=2),
+            EggProduction(shed_id=shed.id, date=datetime(2024, 5, 19, 7), small_count=5,
+                          medium_count=5, large_count=5, broken_count=0),
+            EggProduction(shed_id=other_shed.id, date=datetime(2024, 5, 20, 7), small_count=99,
+                          medium_count=0, large_count=0, broken_count=0),
+            FeedIssue(shed_id=shed.id, feed_id=feed.id, date=datetime(2024, 5, 20, 9),
+                      quantity_kg=12.5, cost_afg=0, cost_usd=0),
+            Sale(party_id=party.id, farm_id=farm.id, date=datetime(2024, 5, 20, 15), quantity=10,
+                 rate_afg=10, rate_usd=0.1, total_afg=100, total_usd=1, exchange_rate_used=100),
+            Sale(party_id=party.id, farm_id=farm.id, date=datetime(2024, 5, 1, 15), quantity=5,
+                 rate_afg=10, rate_usd=0.1, total_afg=50, total_usd=0.5, exchange_rate_used=100),
+            RawMaterial(farm_id=farm.id, name="Corn", unit="kg", current_stock=500, low_stock_alert=50),
+        ])
+        session.commit()
+        return farm.id
+    finally:
+        session.close()
+
+
+def test_snapshot_aggregates_one_farm(farm_id):
+    snapshot = DashboardDataService().get_snapshot(farm_id, DAY)
+
+    assert snapshot.today_eggs == 62
+    assert snapshot.production_dates[-2:] == (DAY - timedelta(days=1), DAY)
+    assert snapshot.production_counts[-2:] == (15, 62)
+    assert snapshot.total_production == 77
+    assert snapshot.today_feed_kg == 12.5
+    assert (snapshot.today_sales_afg, snapshot.today_sales_usd) == (100, 1)
+    assert snapshot.sales_summary_afg == 150
+    assert [alert.name for alert in snapshot.low_stock_alerts] == [FeedType.LAYER.value]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.today_eggs = 0
+
+
+def test_snapshot_cached_until_data_changes(farm_id):
+    service = DashboardDataService()
+    first = service.get_snapshot(farm_id, DAY)
+    assert service.get_snapshot(farm_id, DAY) is first
+    assert service.cached(farm_id, DAY) is first
+
+    with DatabaseManager.session_scope() as session:
+        shed = session.query(Shed).filter(Shed.farm_id == farm_id).one()
+        session.add(EggProduction(shed_id=shed.id, date=datetime(2024, 5, 20, 18), small_count=0,
+                                  medium_count=0, large_count=8, broken_count=0))
+
+    assert service.cached(farm_id, DAY) is None
+    second = service.get_snapshot(farm_id, DAY)
+    assert second.today_eggs == 70
+    assert second.data_version > first.data_version
+
+
+def test_read_only_sessions_keep_cache(farm_id):
+    service = DashboardDataService()
+    first = service.get_snapshot(farm_id, DAY)
+    with DatabaseManager.session_scope() as session:
+        session.query(Farm).all()
+    assert service.get_snapshot(farm_id, DAY) is first
@@ -0,0 +1,114 @@
+"""Tests for the virtualized DataTableWidget model and paging proxy."""
+
+import csv
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QLabel, QTableWidgetItem
+
+from egg_farm_system.ui.widgets import datatable
+from egg_farm_system.ui.widgets.datatable import DataTableWidget
+
+
+@pytest.fixture
+def table(qapp, monkeypatch):
+    # Exports report success through message boxes
+    monkeypatch.setattr(datatable.QMessageBox, "information", lambda *args, **kwargs: None)
+    widget = DataTableWidget()
+    widget.set_headers(["Name", "Qty"])
+    # The view starts sorted on the first column; order rows by quantity
+    widget.view.sortByColumn(1, Qt.AscendingOrder)
+    yield widget
+    widget.deleteLater()
+
+
+def _proxy_column(table, col):
+    return [table.proxy.index(row, col).data() for row in range(table.proxy.rowCount())]
+
+
+def test_rows_are_paged_by_the_proxy(table):
+    table.set_rows([(f"Item {i}", i) for i in range(60)])
+
+    assert table.model.rowCount() == 60
+    assert table.proxy.rowCount() == 25
+    assert table.cell_text(59, 1) == "59"
+
+    table._next_page()
+    table._next_page()
+    assert table.current_page == 3
+    assert _proxy_column(table, 0) == [f"Item {i}" for i in range(50, 60)]
+
+    table._on_page_size_changed("All")
+    assert table.proxy.rowCount() == 60
+
+
+def test_sort_is_numeric_and_filter_spans_pages(table):
+    table.set_rows([("b", "10"), ("a", "9"), ("c", "100"), ("ab", "2")])
+
+    table.proxy.sort(1, Qt.AscendingOrder)
+    assert _proxy_column(table, 1) == ["2", "9", "10", "100"]
+    table.proxy.sort(0, Qt.DescendingOrder)
+    assert _proxy_column(table, 0) == ["c", "b", "ab", "a"]
+
+    table.search.setText("A")
+    assert _proxy_column(table, 0) == ["ab", "a"]
+    assert table.total_label.text() == "Total: 2"
+
+
+def test_export_csv_writes_every_filtered_row(table, tmp_path):
+    table.set_rows([(f"Item {i}", i) for i in range(60)])
+    table.search.setText("Item 1")
+    path = tmp_path / "table.csv"
+
+    table.export_csv(str(path))
+
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ["Name", "Qty"]
+    assert [row[0] for row in rows[1:]] == ["Item 1"] + [f"Item {i}" for i in range(10, 20)]
+
+
+def test_cell_widgets_follow_their_row_across_pages(table):
+    table.page_size_combo.setCurrentText("10")
+    table.set_rows([(f"Item {i}", i) for i in range(30)])
+    label = QLabel("row 12")
+    table.set_cell_widget(12, 1, label)
+
+    def widget_at(proxy_row):
+        container = table.view.indexWidget(table.proxy.index(proxy_row, 1))
+        return container.findChild(QLabel) if container is not None else None
+
+    assert not any(widget_at(row) for row in range(table.proxy.rowCount()))
+    table._next_page()
+    assert widget_at(2) is label
+    table._prev_page()
+    table._next_page()
+    assert widget_at(2) is label
+
+
+def test_factory_builds_widgets_for_visible_rows_only(table):
+    built = []
+
+    def factory(row):
+        built.append(row)
+        return QLabel(str(row))
+
+    table.set_rows([(f"Item {i}", i) for i in range(100)])
+    table.set_cell_widget_factory(1, factory)
+    assert built == list(range(25))
+
+    table._next_page()
+    assert built[25:] == list(range(25, 50))
+
+    table.set_rows([("Only", 1)])
+    assert table.proxy.rowCount() == 1
+    assert len(built) == 50
+
+
+def test_legacy_item_api(table):
+    table.setRowCount(2)
+    table.setItem(1, 0, QTableWidgetItem("legacy"))
+    table.set_cell_foreground(1, 0, "red")
+
+    assert table.model.item(1, 0).text() == "legacy"
+    assert table.model.index(1, 0).data(Qt.ForegroundRole).name() == "#ff0000"
@@ -0,0 +1,124 @@
+"""Tests for the scheduled SQLite maintenance and tuning profiles."""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, text
+
+from egg_farm_system import config
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.maintenance import (
+    MAINTENANCE_STEPS, DatabaseMaintenance, tuning_profile,
+)
+from egg_farm_system.database.models import Expense, Farm
+from egg_farm_system.utils.workflow_automation import WorkflowAutomation
+
+
+@pytest.fixture
+def performance_profile(monkeypatch):
+    monkeypatch.setattr(config, "DB_TUNING_PROFILE", "performance")
+    return tuning_profile()
+
+
+def test_maintenance_reclaims_space_after_deletions(file_db):
+    with file_db.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2  # set by migrate_auto_vacuum
+        assert conn.exec_driver_sql("PRAGMA mmap_size").scalar() == tuning_profile().mmap_size
+
+    with DatabaseManager.session_scope() as session:
+        farm = Farm(name="Maintenance Farm")
+        session.add(farm)
+        session.flush()
+        session.add_all([Expense(farm_id=farm.id, date=datetime(2024, 1, 1), category="Labor", amount_afg=i,
+                                 amount_usd=0, exchange_rate_used=1, description="x" * 500) for i in range(2000)])
+    with DatabaseManager.session_scope() as session:
+        session.execute(delete(Expense))
+
+    maintenance = DatabaseMaintenance(idle_seconds=3600)
+    assert maintenance.run_when_idle() is None  # a write was just committed
+
+    report = DatabaseMaintenance().run(list(MAINTENANCE_STEPS))
+    assert report.ok
+    assert [step.name for step in report.steps] == list(MAINTENANCE_STEPS)
+    assert report.steps[0].detail in ("analyzed", "optimized")
+    assert report.steps[2].detail != "0 pages freed"
+    assert report.reclaimed_bytes > 0
+    assert "reclaimed" in report.summary()
+    with file_db.connect() as conn:
+        assert conn.execute(text("PRAGMA freelist_count")).scalar() == 0
+
+
+def test_only_due_steps_run_when_idle(file_db):
+    maintenance = DatabaseMaintenance(intervals={"statistics": 3600, "checkpoint": 0}, idle_seconds=0)
+    assert [step.name for step in maintenance.run_when_idle().steps] == ["statistics", "checkpoint"]
+    assert [step.name for step in maintenance.run_when_idle().steps] == ["checkpoint"]
+    assert maintenance.run_when_idle().steps[0].detail.endswith("frames")
+
+
+def test_idle_runs_reuse_one_maintenance_thread(file_db):
+    maintenance = DatabaseMaintenance(intervals={"checkpoint": 0}, idle_seconds=0)
+    threads = set()
+    try:
+        for _ in range(3):
+            maintenance.last_report = None
+            assert maintenance.start_when_idle()
+            deadline = time.monotonic() + 10
+            while maintenance.last_report is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert maintenance.last_report.steps[0].name == "checkpoint"
+            threads.add(maintenance._thread)
+        assert len(threads) == 1
+        assert [t.name for t in threading.enumerate()].count("db-maintenance") == 1
+    finally:
+        maintenance.stop()
+    assert not threads.pop().is_alive()
+
+
+def test_tuning_profiles_and_task_registration(file_db):
+    assert tuning_profile("low_memory").mmap_size == 0
+    with pytest.raises(ValueError):
+        tuning_profile("turbo")
+    assert "database_maintenance" in WorkflowAutomation().tasks
+
+
+def _page_size_and_journal(engine):
+    with engine.connect() as conn:
+        return (conn.exec_driver_sql("PRAGMA page_size").scalar(),
+                conn.exec_driver_sql("PRAGMA journal_mode").scalar())
+
+
+def test_new_database_gets_the_profile_page_size(performance_profile, file_db):
+    assert _page_size_and_journal(file_db) == (performance_profile.page_size, "wal")
+
+
+@pytest.fixture
+def existing_wal_db(tmp_path):
+    """A database created before the tuning profiles, with SQLite's default page size"""
+    conn = sqlite3.connect(tmp_path / "egg_farm.db")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE notes (body TEXT)")
+    conn.execute("INSERT INTO notes VALUES ('kept')")
+    conn.commit()
+    assert conn.execute("PRAGMA page_size").fetchone()[0] == 4096
+    conn.close()
+
+
+def test_existing_database_is_vacuumed_to_the_profile_page_size(performance_profile, existing_wal_db, file_db):
+    assert _page_size_and_journal(file_db) == (performance_profile.page_size, "wal")
+    with file_db.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+        assert conn.exec_driver_sql("SELECT body FROM notes").scalar() == "kept"
+
+
+def test_switching_profiles_resizes_the_pages_of_an_existing_database(tmp_path, file_database, monkeypatch):
+    path = tmp_path / "egg_farm.db"
+    monkeypatch.setattr(config, "DB_TUNING_PROFILE", "balanced")
+    with file_database(path) as engine:
+        assert _page_size_and_journal(engine) == (4096, "wal")
+
+    monkeypatch.setattr(config, "DB_TUNING_PROFILE", "performance")
+    with file_database(path) as engine:
+        assert _page_size_and_journal(engine) == (8192, "wal")
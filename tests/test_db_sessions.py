@@ -0,0 +1,145 @@
+"""Tests for DatabaseManager pooling, scoped sessions and open-session diagnostics."""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from egg_farm_system.database import db as db_module
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import Farm
+
+
+def test_session_scope_commits_and_rolls_back(file_db):
+    with DatabaseManager.session_scope() as session:
+        session.add(Farm(name="Committed"))
+
+    with pytest.raises(RuntimeError):
+        with DatabaseManager.session_scope() as session:
+            session.add(Farm(name="Rolled back"))
+            session.flush()
+            raise RuntimeError("boom")
+
+    with DatabaseManager.session_scope(read_only=True) as session:
+        names = {f.name for f in session.query(Farm)}
+    assert "Committed" in names
+    assert "Rolled back" not in names
+
+
+def test_read_sessions_are_read_only(file_db):
+    with DatabaseManager.session_scope(read_only=True) as session:
+        with pytest.raises(OperationalError):
+            session.execute(text("INSERT INTO farms (name) VALUES ('nope')"))
+
+
+def test_reader_thread_runs_while_writer_holds_transaction(file_db):
+    with DatabaseManager.session_scope() as session:
+        session.add(Farm(name="Existing"))
+
+    writer = DatabaseManager.get_session()
+    writer.add(Farm(name="Pending"))
+    writer.flush()  # write transaction left open on the UI thread's connection
+
+    seen = []
+
+    def _read():
+        with DatabaseManager.session_scope(read_only=True) as session:
+            seen.extend(f.name for f in session.query(Farm))
+
+    try:
+        reader = threading.Thread(target=_read)
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+        assert "Existing" in seen
+        assert "Pending" not in seen
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_threads_get_their_own_connections(file_db):
+    connections = {}
+
+    def _grab(name):
+        session = DatabaseManager.get_session()
+        try:
+            connections[name] = session.connection().connection.dbapi_connection
+        finally:
+            session.close()
+
+    _grab("main")
+    worker = threading.Thread(target=_grab, args=("worker",))
+    worker.start()
+    worker.join()
+    assert connections["main"] is not connections["worker"]
+
+
+def test_many_writer_threads_leave_an_open_transaction_intact(file_db):
+    writer = DatabaseManager.get_session()
+    writer.add(Farm(name="Pending"))
+    writer.flush()  # write transaction held open on the main thread
+
+    errors = []
+
+    def _write(number):
+        try:
+            with DatabaseManager.session_scope() as session:
+                session.add(Farm(name=f"Worker {number}"))
+        except Exception as e:  # noqa: BLE001 - surfaced by the assertion below
+            errors.append(e)
+
+    try:
+        # The main thread holds the write lock, so the workers start while it is
+        # held and commit after it is released
+        workers = [threading.Thread(target=_write, args=(n,)) for n in range(db_module.WRITER_POOL_SIZE * 2)]
+        for worker in workers:
+            worker.start()
+        writer.commit()
+    finally:
+        writer.close()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert errors == []
+    with DatabaseManager.session_scope(read_only=True) as session:
+        names = {farm.name for farm in session.query(Farm)}
+    assert "Pending" in names
+    assert {f"Worker {n}" for n in range(db_module.WRITER_POOL_SIZE * 2)} <= names
+
+
+def test_connections_of_finished_threads_are_closed(file_db):
+    main = DatabaseManager.get_session()
+    main.add(Farm(name="Main"))
+    main.flush()
+
+    def _connect():
+        session = DatabaseManager.get_session()
+        try:
+            session.connection()
+        finally:
+            session.close()
+
+    try:
+        for _ in range(db_module.WRITER_POOL_SIZE * 2):
+            worker = threading.Thread(target=_connect)
+            worker.start()
+            worker.join()
+        assert len(DatabaseManager._engine.pool._all_conns) <= db_module.WRITER_POOL_SIZE
+        main.commit()  # the main thread's connection survived the cleanups
+    finally:
+        main.close()
+
+
+def test_open_sessions_are_reported_until_closed(file_db, caplog):
+    session = DatabaseManager.get_session()
+    try:
+        origins = [entry["origin"] for entry in DatabaseManager.open_sessions()]
+        assert any(origin.startswith("test_db_sessions.py:") for origin in origins)
+        assert DatabaseManager.log_open_sessions(min_age_seconds=0) >= 1
+        assert "test_db_sessions.py" in caplog.text
+    finally:
+        session.close()
+    origins = [entry["origin"] for entry in DatabaseManager.open_sessions()]
+    assert not any(origin.startswith("test_db_sessions.py:") for origin in origins)
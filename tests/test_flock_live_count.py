@@ -0,0 +1,82 @@
+"""Tests for the maintained cumulative mortality behind Flock.get_live_count."""
+
+from datetime import date, datetime
+
+from sqlalchemy import inspect
+
+from egg_farm_system.database.migrate_flock_mortality_totals import migrate_flock_mortality_totals
+from egg_farm_system.database.models import Farm, Flock, Mortality, Shed
+from egg_farm_system.modules.flocks import FlockManager
+
+
+def _flock(session_factory, initial_count=100):
+    session = session_factory()
+    try:
+        farm = Farm(name="Flock Farm")
+        session.add(farm)
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed A", capacity=500)
+        session.add(shed)
+        session.commit()
+        shed_id = shed.id
+    finally:
+        session.close()
+    return FlockManager().create_flock(shed_id, "Layers", datetime(2024, 1, 1), initial_count).id
+
+
+def test_live_count_follows_added_and_deleted_mortality(isolated_db):
+    flock_id = _flock(isolated_db)
+    manager = FlockManager()
+    manager.add_mortality(flock_id, datetime(2024, 1, 10, 8), 3)
+    # Recorded out of order, and twice on one day
+    manager.add_mortality(flock_id, datetime(2024, 1, 5), 2)
+    later = manager.add_mortality(flock_id, datetime(2024, 1, 10, 18), 4)
+
+    session = isolated_db()
+    try:
+        flock = session.get(Flock, flock_id)
+        assert flock.total_mortality == 9
+        assert flock.get_live_count(date(2024, 1, 4)) == 100
+        assert flock.get_live_count(date(2024, 1, 5)) == 98
+        assert flock.get_live_count(datetime(2024, 1, 10, 9)) == 91
+        assert flock.get_live_count() == 91
+        assert flock.get_mortality_percentage() == 9
+        assert "mortalities" not in inspect(flock).dict
+    finally:
+        session.close()
+
+    manager.delete_mortality(later.id)
+    manager.delete_mortality(next(m.id for m in manager.get_mortalities(flock_id) if m.count == 2))
+    session = isolated_db()
+    try:
+        flock = session.get(Flock, flock_id)
+        assert flock.total_mortality == 3
+        assert flock.get_live_count(date(2024, 1, 9)) == 100
+        assert flock.get_live_count(date(2024, 1, 10)) == 97
+    finally:
+        session.close()
+
+
+def test_migration_backfills_unmaintained_flocks(isolated_db):
+    flock_id = _flock(isolated_db, initial_count=50)
+    session = isolated_db()
+    try:
+        flock = session.get(Flock, flock_id)
+        flock.mortality_series = None
+        session.add_all([Mortality(flock_id=flock_id, date=datetime(2024, 2, day), count=day) for day in (1, 2, 3)])
+        session.commit()
+        # Falls back to the mortality rows until the totals exist
+        assert flock.get_live_count(date(2024, 2, 2)) == 47
+    finally:
+        session.close()
+
+    migrate_flock_mortality_totals()
+
+    session = isolated_db()
+    try:
+        flock = session.get(Flock, flock_id)
+        assert flock.total_mortality == 6
+        assert flock.get_live_count(date(2024, 2, 2)) == 47
+        assert "mortalities" not in inspect(flock).dict
+    finally:
+        session.close()
@@ -0,0 +1,102 @@
+"""Tests for the FTS5-backed global search."""
+
+from datetime import datetime
+
+import pytest
+
+from egg_farm_system.database.models import (
+    Expense,
+    Farm,
+    FeedType,
+    FinishedFeed,
+    Party,
+    RawMaterial,
+    Sale,
+    Shed,
+)
+from egg_farm_system.utils.global_search import GlobalSearchManager
+
+
+@pytest.fixture
+def search_manager(isolated_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(GlobalSearchManager, "_history", None)
+    session = isolated_db()
+    manager = GlobalSearchManager(session=session)
+    manager.history_file = tmp_path / "search_history.json"
+    assert manager._index_available()
+    try:
+        yield manager, session
+    finally:
+        session.close()
+
+
+def _seed(session):
+    farm = Farm(name="Kabul Farm", location="Kabul")
+    party = Party(name="Karimi Traders", phone="0700123456")
+    session.add_all([farm, party])
+    session.flush()
+    session.add(Shed(farm_id=farm.id, name="North Shed", capacity=500))
+    session.add(RawMaterial(farm_id=farm.id, name="Corn", unit="kg", current_stock=12.5))
+    session.add(FinishedFeed(farm_id=farm.id, feed_type=FeedType.LAYER, current_stock=30,
+                             cost_per_kg_afg=20, cost_per_kg_usd=0.25))
+    session.add(Expense(farm_id=farm.id, date=datetime(2025, 3, 1), category="Electricity",
+                        description="Generator fuel", amount_afg=1500, amount_usd=19,
+                        exchange_rate_used=78.0))
+    session.add(Sale(party_id=party.id, farm_id=farm.id, date=datetime(2025, 3, 2), quantity=120,
+                     rate_afg=5, rate_usd=0.06, total_afg=600, total_usd=7.7,
+                     exchange_rate_used=78.0, notes="weekly order"))
+    session.commit()
+    return farm, party
+
+
+def test_prefix_search_returns_ranked_results_per_module(search_manager):
+    manager, session = search_manager
+    _seed(session)
+
+    results = manager.search("kar", save_history=False)
+
+    assert [r["title"] for r in results["parties"]] == ["Karimi Traders"]
+    assert results["sales"][0]["title"] == "Sale to Karimi Traders"
+    assert results["sales"][0]["subtitle"] == "120 eggs on 2025-03-02"
+    assert results["farms"] == []
+
+    assert results_titles(manager.search("gener", save_history=False), "expenses") == ["Electricity: 1500 AFG"]
+    assert results_titles(manager.search("layer", save_history=False), "feeds") == ["Layer"]
+    corn = manager.search("corn", modules=["materials"], save_history=False)
+    assert list(corn) == ["materials"]
+    assert corn["materials"][0]["subtitle"] == "Stock: 12.50 kg"
+
+
+def results_titles(results, module):
+    return [r["title"] for r in results[module]]
+
+
+def test_index_follows_updates_renames_and_deletes(search_manager):
+    manager, session = search_manager
+    farm, party = _seed(session)
+
+    party.name = "Rahimi Traders"
+    farm.name = "Herat Farm"
+    session.commit()
+
+    assert manager.search("karimi", save_history=False)["sales"] == []
+    assert results_titles(manager.search("rahimi", save_history=False), "sales") == ["Sale to Rahimi Traders"]
+    sheds = manager.search("north", save_history=False)["sheds"]
+    assert sheds[0]["subtitle"] == "Farm: Herat Farm"
+
+    session.query(Sale).delete()
+    session.commit()
+    assert manager.search("rahimi", save_history=False)["sales"] == []
+
+
+def test_history_written_only_for_saved_searches(search_manager):
+    manager, session = search_manager
+    _seed(session)
+
+    manager.search("kabul", save_history=False)
+    assert not manager.history_file.exists()
+
+    manager.search("kabul")
+    manager.search("kabul")
+    manager.search("corn")
+    assert manager.get_search_history() == ["corn", "kabul"]
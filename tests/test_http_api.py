@@ -0,0 +1,92 @@
+"""Tests for the read-only dashboard HTTP API."""
+
+import json
+import sqlite3
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import EggProduction, Farm, Party, Sale, Shed
+from egg_farm_system.http_api import ApiServer
+
+
+@pytest.fixture
+def api(file_db):
+    with DatabaseManager.session_scope() as session:
+        farm, party = Farm(name="API Farm"), Party(name="Buyer")
+        session.add_all([farm, party])
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed A", capacity=100)
+        session.add(shed)
+        session.flush()
+        session.add(EggProduction(shed_id=shed.id, date=datetime(2024, 5, 20, 7), small_count=1,
+                                  medium_count=2, large_count=3, broken_count=4))
+        session.add(Sale(party_id=party.id, farm_id=farm.id, date=datetime(2024, 5, 20), quantity=10,
+                         rate_afg=100, rate_usd=1, total_afg=1000, total_usd=10, exchange_rate_used=100))
+        farm_id, party_id = farm.id, party.id
+    server = ApiServer("127.0.0.1", 0)
+    server.start()
+    try:
+        yield f"http://127.0.0.1:{server.port}", DatabaseManager.database_path(), farm_id, party_id
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _get(url, etag=None):
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_endpoints_return_json(api):
+    base, _, farm_id, _ = api
+    status, _, body = _get(f"{base}/api/dashboard?farm_id={farm_id}&day=2024-05-20")
+    assert status == 200
+    dashboard = json.loads(body)
+    assert (dashboard["today_eggs"], dashboard["today_sales_afg"]) == (10, 1000)
+    assert dashboard["production_dates"][-1] == "2024-05-20"
+
+    status, _, body = _get(f"{base}/api/parties")
+    assert json.loads(body)[0]["name"] == "Buyer"
+
+    status, _, body = _get(f"{base}/api/production?farm_id={farm_id}&start=2024-05-01&end=2024-05-31"
+                           "&group_by=day")
+    summary = json.loads(body)
+    assert (summary["total_eggs"], summary["groups"]["2024-05-20"]["large"]) == (10, 3)
+
+    status, _, body = _get(f"{base}/api/pnl?farm_id={farm_id}&start=2024-05-01&end=2024-05-31")
+    assert json.loads(body)["total_revenue"] == 1000
+
+    assert _get(f"{base}/api/health")[0] == 200
+    assert _get(f"{base}/api/dashboard")[0] == 400
+    assert _get(f"{base}/api/production?start=May&end=2024-05-31")[0] == 400
+    assert _get(f"{base}/api/unknown")[0] == 404
+
+
+def test_etag_revalidation_follows_writes_from_other_processes(api):
+    base, path, farm_id, _ = api
+    url = f"{base}/api/pnl?farm_id={farm_id}&start=2024-05-01&end=2024-05-31"
+    status, headers, _ = _get(url)
+    etag = headers["ETag"]
+    status, headers, body = _get(url, etag)
+    assert (status, body, headers["ETag"]) == (304, b"", etag)
+
+    # A write through another connection, as the GUI on this machine would make
+    writer = sqlite3.connect(path)
+    try:
+        writer.execute("UPDATE sales SET total_afg = 2500")
+        writer.commit()
+    finally:
+        writer.close()
+
+    status, headers, body = _get(url, etag)
+    assert status == 200
+    assert headers["ETag"] != etag
+    assert json.loads(body)["total_revenue"] == 2500
@@ -0,0 +1,90 @@
+"""Tests for the column-only list rows behind the transaction and party views."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from egg_farm_system.database.archive import ArchiveManager
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import Expense, Farm, Party, Purchase, RawMaterial, Sale
+from egg_farm_system.modules.expenses import ExpenseManager
+from egg_farm_system.modules.parties import PartyManager
+from egg_farm_system.modules.purchases import PurchaseManager
+from egg_farm_system.modules.sales import SalesManager
+
+
+@pytest.fixture
+def records(isolated_db):
+    session = isolated_db()
+    try:
+        farm, buyer, supplier = Farm(name="Rows Farm"), Party(name="Buyer"), Party(name="Supplier")
+        session.add_all([farm, buyer, supplier])
+        session.flush()
+        maize = RawMaterial(farm_id=farm.id, name="Maize")
+        session.add(maize)
+        session.flush()
+        session.add_all([
+            Sale(party_id=buyer.id, farm_id=farm.id, date=datetime(2024, 4, day), quantity=180 * day, cartons=day,
+                 rate_afg=10, rate_usd=0.1, total_afg=1800 * day, total_usd=18 * day, exchange_rate_used=100)
+            for day in (1, 2)
+        ])
+        session.add(Purchase(party_id=supplier.id, farm_id=farm.id, material_id=maize.id, date=datetime(2024, 4, 3),
+                             quantity=50, rate_afg=20, rate_usd=0.2, total_afg=1000, total_usd=10,
+                             exchange_rate_used=100))
+        session.add_all([
+            Expense(farm_id=farm.id, party_id=supplier.id, date=datetime(2024, 4, 4), category="Labor",
+                    amount_afg=300, amount_usd=3, exchange_rate_used=100),
+            Expense(farm_id=farm.id, date=datetime(2024, 4, 5), category="Medicine", amount_afg=100,
+                    amount_usd=1, exchange_rate_used=100),
+        ])
+        session.commit()
+        # Looked up once per engine; not part of the list queries
+        ArchiveManager.archived_years(session)
+        return farm.id
+    finally:
+        session.close()
+
+
+def _count_selects(call):
+    statements = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(DatabaseManager._engine, "before_cursor_execute", _capture)
+    try:
+        return call(), len(statements)
+    finally:
+        event.remove(DatabaseManager._engine, "before_cursor_execute", _capture)
+
+
+def test_list_rows_are_one_query_each_with_names_joined(records):
+    with SalesManager() as sm:
+        sales, sale_selects = _count_selects(lambda: sm.get_sale_list(farm_id=records))
+    with PurchaseManager() as pm:
+        purchases, purchase_selects = _count_selects(lambda: pm.get_purchase_list(farm_id=records))
+    with ExpenseManager() as em:
+        expenses, expense_selects = _count_selects(lambda: em.get_expense_list(farm_id=records))
+
+    assert (sale_selects, purchase_selects, expense_selects) == (1, 1, 1)
+    # Plain tuples: nothing left to lazy load once the sessions are closed
+    assert [(row.date.day, row.party_name, row.cartons, row.total_afg) for row in sales] == [
+        (2, "Buyer", 2, 3600), (1, "Buyer", 1, 1800)]
+    assert [(row.party_name, row.material_name, row.quantity) for row in purchases] == [("Supplier", "Maize", 50)]
+    assert [(row.category, row.party_name) for row in expenses] == [("Medicine", None), ("Labor", "Supplier")]
+    assert not hasattr(sales[0], "__dict__")
+
+    with ExpenseManager() as em:
+        assert em.get_expense_list(farm_id=records, category="Labor")[0].amount_afg == 300
+        assert em.get_expense(expenses[1].id).category == "Labor"
+    with SalesManager() as sm:
+        assert sm.get_sale_list(start_date=datetime(2024, 4, 2))[0].quantity == 360
+        assert sm.get_sale(sales[0].id).rate_usd == pytest.approx(0.1)
+
+
+def test_party_options_are_names_only(records):
+    with PartyManager() as pm:
+        options = pm.get_party_options()
+    assert [(option.name, type(option.id)) for option in options] == [("Buyer", int), ("Supplier", int)]
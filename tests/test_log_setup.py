@@ -0,0 +1,72 @@
+"""Tests for the queued, rotating and rate-limited logging setup."""
+
+import json
+import logging
+
+import pytest
+
+from egg_farm_system import config
+from egg_farm_system.utils.log_setup import RateLimitFilter, configure_logging, shutdown_logging
+
+
+@pytest.fixture
+def restore_root_level():
+    level = logging.getLogger().level
+    yield
+    shutdown_logging()
+    logging.getLogger().setLevel(level)
+
+
+def _record(name, lineno, level=logging.INFO, msg="Sale recorded"):
+    return logging.LogRecord(name, level, "sales.py", lineno, msg, None, None)
+
+
+def test_rate_limit_is_per_call_site_and_reports_suppressed(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("egg_farm_system.utils.log_setup.time.monotonic", lambda: clock[0])
+    limiter = RateLimitFilter({"egg_farm_system.modules": 2}, window=60)
+
+    passed = [limiter.filter(_record("egg_farm_system.modules.sales", 10)) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert limiter.filter(_record("egg_farm_system.modules.sales", 11))  # another call site
+    assert limiter.filter(_record("egg_farm_system.modules.sales", 10, level=logging.WARNING))
+    assert all(limiter.filter(_record("egg_farm_system.ui", 10)) for _ in range(5))  # not limited
+
+    clock[0] = 61
+    record = _record("egg_farm_system.modules.sales", 10)
+    assert limiter.filter(record)
+    assert record.getMessage() == "Sale recorded (3 similar messages suppressed)"
+
+
+def test_json_output_and_size_rotation(tmp_path, monkeypatch, restore_root_level):
+    monkeypatch.setattr(config, "LOG_MAX_BYTES", 2000)
+    monkeypatch.setattr(config, "LOG_BACKUP_COUNT", 2)
+    log_file = tmp_path / "app.log"
+    configure_logging("INFO", log_file=log_file, json_format=True, console=False)
+    logger = logging.getLogger("egg_farm_system.test_log_setup")
+    for number in range(100):
+        logger.info(f"Message {number}")
+    logger.debug("Below the level")
+    shutdown_logging()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["app.log", "app.log.1", "app.log.2"]
+    entries = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert entries[-1]["message"] == "Message 99"
+    assert entries[-1]["level"] == "INFO"
+    assert entries[-1]["logger"] == "egg_farm_system.test_log_setup"
+
+
+def test_json_output_keeps_the_exception(tmp_path, restore_root_level):
+    log_file = tmp_path / "app.log"
+    configure_logging("INFO", log_file=log_file, json_format=True, console=False)
+    logger = logging.getLogger("egg_farm_system.test_log_setup")
+    try:
+        raise ValueError("bad rate")
+    except ValueError:
+        logger.exception("Sale %s failed", 7)
+    shutdown_logging()
+
+    [entry] = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert entry["message"] == "Sale 7 failed"
+    assert entry["exception"].startswith("Traceback")
+    assert entry["exception"].endswith("ValueError: bad rate")
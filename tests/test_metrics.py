@@ -0,0 +1,104 @@
+"""Tests for the fixed-memory metrics registry."""
+
+import json
+import random
+
+import pytest
+
+from egg_farm_system.utils import metrics as metrics_module
+from egg_farm_system.utils.metrics import Histogram, MetricsRegistry, MetricsSnapshotter
+from egg_farm_system.utils.performance_monitoring import PerformanceMetrics, measure_time
+
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = random.Random(1)
+    values = sorted(rng.lognormvariate(-4, 1) for _ in range(20000))
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+
+    for q in (50, 95, 99):
+        exact = values[int(len(values) * q / 100) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=metrics_module.HISTOGRAM_GROWTH - 1)
+    stats = histogram.stats()
+    assert stats["count"] == len(values)
+    assert stats["min"] == values[0] and stats["max"] == values[-1]
+
+
+def test_histogram_memory_is_bounded():
+    histogram = Histogram()
+    for i in range(100000):
+        histogram.observe(i * 1e-4)
+    assert len(histogram.buckets) <= metrics_module.HISTOGRAM_BUCKETS
+    assert histogram.percentile(100) == histogram.max
+
+
+def test_labels_select_series_and_overflow_is_folded():
+    registry = MetricsRegistry(max_series=2)
+    registry.observe("record_sale", 0.01, farm_id=1)
+    registry.observe("record_sale", 0.02, farm_id=1)
+    registry.observe("record_sale", 0.03, farm_id=2)
+    registry.observe("record_sale", 0.04, farm_id=3)
+    registry.observe("record_sale", 0.05, farm_id=4)
+
+    series = {tuple(item["labels"].items()): item for item in registry.series()}
+    assert series[(("farm_id", "1"),)]["count"] == 2
+    assert series[(("farm_id", "2"),)]["count"] == 1
+    assert series[(("overflow", "true"),)]["count"] == 2
+    assert len(series) == 3
+
+
+def test_snapshotter_writes_final_snapshot(tmp_path):
+    registry = MetricsRegistry()
+    registry.observe("pnl_statement", 0.2, farm_id=1)
+    registry.increment("exports")
+    path = tmp_path / "metrics.json"
+
+    snapshotter = MetricsSnapshotter(registry, path, interval=3600)
+    snapshotter.start()
+    snapshotter.stop()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    names = {item["name"]: item for item in data["series"]}
+    assert names["pnl_statement"]["labels"] == {"farm_id": "1"}
+    assert names["pnl_statement"]["p95"] == pytest.approx(0.2)
+    assert names["exports"]["value"] == 1
+
+
+def test_measure_time_records_labelled_series(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr("egg_farm_system.utils.performance_monitoring.metrics", registry)
+
+    for _ in range(3):
+        with measure_time("record_purchase", farm_id=2):
+            pass
+
+    [item] = registry.series()
+    assert (item["name"], item["labels"], item["count"]) == ("record_purchase", {"farm_id": "2"}, 3)
+
+
+def test_timer_stats_include_percentiles():
+    perf = PerformanceMetrics()
+    for _ in range(5):
+        perf.start("batch")
+        perf.end("batch")
+    stats = perf.get_stats("batch")
+    assert stats["count"] == 5
+    assert {"p50", "p95", "p99"} <= stats.keys()
+
+
+def test_diagnostics_widget_lists_series(qapp, monkeypatch):
+    from egg_farm_system.ui.widgets import diagnostics_widget
+
+    registry = MetricsRegistry()
+    registry.observe("production_summary", 0.012, farm_id=1)
+    monkeypatch.setattr(diagnostics_widget, "metrics", registry)
+
+    widget = diagnostics_widget.DiagnosticsWidget()
+    try:
+        assert widget.metrics_table.rowCount() == 1
+        assert widget.metrics_table.item(0, 0).text() == "production_summary"
+        assert widget.metrics_table.item(0, 1).text() == "farm_id=1"
+    finally:
+        widget.timer.stop()
+        widget.deleteLater()
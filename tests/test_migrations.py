@@ -0,0 +1,91 @@
+"""Tests for the versioned migration runner."""
+
+import pytest
+from sqlalchemy import text
+
+from egg_farm_system.database import migrations
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import Farm, RawMaterial
+from egg_farm_system.modules.farms import FarmManager
+
+
+def _recorded(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT version, name, duration_ms FROM schema_migrations ORDER BY version")
+        ).fetchall()
+
+
+def test_migrations_run_once_and_are_recorded(file_db):
+    engine = file_db
+
+    rows = _recorded(engine)
+    assert [row.name for row in rows] == migrations.MIGRATIONS
+    assert [row.version for row in rows] == list(range(1, len(migrations.MIGRATIONS) + 1))
+    assert all(row.duration_ms >= 0 for row in rows)
+
+    assert migrations.pending_migrations(engine) == []
+    assert migrations.run_migrations(engine) == []
+
+
+def test_changed_migration_is_rerun(file_db):
+    engine = file_db
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE schema_migrations SET checksum = 'stale' WHERE name = 'migrate_egg_inventory'"))
+
+    assert migrations.run_migrations(engine) == ["migrate_egg_inventory"]
+    assert migrations.run_migrations(engine) == []
+
+
+def test_search_index_ddl_change_reruns_its_migration(file_db, monkeypatch):
+    from egg_farm_system.database import search_index
+
+    engine = file_db
+    monkeypatch.setattr(search_index, "CREATE_TABLE_SQL", search_index.CREATE_TABLE_SQL.replace("'2 3'", "'2 3 4'"))
+    assert [migration.name for migration in migrations.pending_migrations(engine)] == ["migrate_search_index"]
+
+    assert migrations.run_migrations(engine) == ["migrate_search_index"]
+    with engine.connect() as conn:
+        assert "'2 3 4'" in conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'search_index'")).scalar()
+        assert conn.execute(text("SELECT count(*) FROM search_index")).scalar() > 0
+    assert migrations.run_migrations(engine) == []
+
+
+def test_failed_migration_is_not_recorded(file_db, monkeypatch):
+    engine = file_db
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migrations WHERE name = 'migrate_payment_method'"))
+
+    def _boom():
+        raise RuntimeError("boom")
+
+    import egg_farm_system.database.migrate_payment_method as module
+    monkeypatch.setattr(module, "migrate_payment_method", _boom)
+
+    try:
+        migrations.run_migrations(engine)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("migration failure should propagate")
+
+    assert "migrate_payment_method" not in [row.name for row in _recorded(engine)]
+
+
+def test_new_farm_gets_template_feed_materials(isolated_db):
+    session = isolated_db()
+    try:
+        first = Farm(name="First")
+        session.add(first)
+        session.flush()
+        session.add(RawMaterial(farm_id=first.id, name="Corn", unit="kg", current_stock=5))
+        session.commit()
+
+        with FarmManager(session=session) as fm:
+            second = fm.create_farm("Second")
+
+        names = {m.name for m in session.query(RawMaterial).filter(RawMaterial.farm_id == second.id)}
+        assert names == {"Corn"}
+    finally:
+        session.close()
@@ -0,0 +1,91 @@
+"""Tests for the party list and the grouped balance queries behind it."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import Farm, Ledger, Party
+from egg_farm_system.modules.ledger import LedgerManager
+from egg_farm_system.modules.parties import PartyManager
+
+
+@pytest.fixture
+def parties(isolated_db):
+    session = isolated_db()
+    try:
+        farms = [Farm(name="Farm A"), Farm(name="Farm B")]
+        customer, supplier, idle = Party(name="Customer", phone="0700"), Party(name="Supplier"), Party(name="Idle")
+        session.add_all([*farms, customer, supplier, idle])
+        session.flush()
+
+        def entry(party, farm, day, debit=0.0, credit=0.0):
+            return Ledger(party_id=party.id, farm_id=farm.id, date=datetime(2024, 3, day), description="x",
+                          debit_afg=debit, credit_afg=credit, debit_usd=debit / 100, credit_usd=credit / 100,
+                          exchange_rate_used=100)
+
+        session.add_all([
+            entry(customer, farms[0], 1, debit=1000),
+            entry(customer, farms[0], 4, credit=400),
+            entry(customer, farms[1], 9, debit=50),
+            entry(supplier, farms[0], 2, credit=700),
+        ])
+        session.commit()
+        return {"farms": [farm.id for farm in farms], "customer": customer.id, "supplier": supplier.id}
+    finally:
+        session.close()
+
+
+def _count_selects(call):
+    statements = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(DatabaseManager._engine, "before_cursor_execute", _capture)
+    try:
+        return call(), len(statements)
+    finally:
+        event.remove(DatabaseManager._engine, "before_cursor_execute", _capture)
+
+
+def test_party_list_is_one_query(parties):
+    farm_a = parties["farms"][0]
+    with PartyManager() as pm:
+        rows, selects = _count_selects(lambda: pm.get_party_list(farm_id=farm_a))
+        everything = pm.get_party_list()
+
+    assert selects == 1
+    assert [row.name for row in rows] == ["Customer", "Idle", "Supplier"]
+    customer, idle, supplier = rows
+    assert (customer.phone, customer.balance_afg, customer.balance_usd) == ("0700", 600, 6)
+    assert customer.last_activity == datetime(2024, 3, 4)
+    assert (idle.balance_afg, idle.last_activity) == (0, None)
+    assert supplier.balance_afg == -700
+    assert everything[0].balance_afg == 650 and everything[0].last_activity == datetime(2024, 3, 9)
+
+
+def test_ledger_balances_and_outstanding(parties):
+    ledger = LedgerManager()
+    farm_a = parties["farms"][0]
+    assert ledger.get_party_balance(parties["customer"], "AFG", farm_id=farm_a) == 600
+    assert ledger.get_party_balance(parties["customer"], "USD") == pytest.approx(6.5)
+    assert ledger.get_ledger_summary(parties["customer"])["entry_count"] == 3
+
+    outstanding = {row["party"].name: row["status"] for row in ledger.get_all_parties_outstanding(farm_id=farm_a)}
+    assert outstanding == {"Customer": "Owes us", "Supplier": "We owe"}
+
+
+def test_party_form_fills_table_from_list(qapp, parties):
+    from egg_farm_system.ui.forms.party_forms import PartyFormWidget
+
+    widget = PartyFormWidget(farm_id=parties["farms"][0])
+    try:
+        widget._do_refresh_parties()
+        assert widget.table.row_values(0)[:4] == ["Customer", "0700", "600.00", "6.00"]
+        assert widget.table.cell_text(0, 4) != ""  # last activity
+        assert widget.table.row_values(2)[2] == "-700.00"
+    finally:
+        widget.deleteLater()
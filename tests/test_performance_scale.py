@@ -0,0 +1,183 @@
+"""Scale benchmarks for the hot user paths against synthetic datasets.
+
+Each benchmark runs once per scale listed in ``EGG_FARM_BENCH_SCALES``
+(comma separated, default ``small``). Generating ``large`` takes a few
+minutes, so it is opt-in:
+
+    EGG_FARM_BENCH_SCALES=small,medium python -m pytest tests/test_performance_scale.py \\
+        --benchmark-only --benchmark-autosave
+    python -m pytest tests/test_performance_scale.py --benchmark-only --benchmark-compare
+
+Like ``tests/test_performance.py`` these are meant for the benchmark CI job.
+"""
+
+import csv
+import itertools
+import os
+
+import pytest
+from sqlalchemy import text
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.synthetic_data import generate_dataset
+from egg_farm_system.modules.dashboard import compute_snapshot
+from egg_farm_system.modules.financial_reports import FinancialReportGenerator
+from egg_farm_system.modules.ledger import LedgerManager
+from egg_farm_system.modules.parties import PartyManager
+from egg_farm_system.modules.sales import SalesManager
+from egg_farm_system.utils.advanced_caching import report_cache
+from egg_farm_system.utils.data_importer import DataImporter
+from egg_farm_system.utils.global_search import GlobalSearchManager
+from egg_farm_system.utils.streaming_export import export_rows, query_rows
+from egg_farm_system.utils.time_utils import utcnow_naive
+
+SCALES = [scale.strip() for scale in os.environ.get("EGG_FARM_BENCH_SCALES", "small").split(",") if scale.strip()]
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module", params=SCALES)
+def scale_db(request, tmp_path_factory):
+    """File database populated with the synthetic dataset for one scale."""
+    scale = request.param
+    path = tmp_path_factory.mktemp(f"bench_{scale}") / "bench.db"
+    saved = (DatabaseManager._engine, DatabaseManager._SessionLocal,
+             DatabaseManager._read_engine, DatabaseManager._ReadSessionLocal)
+    DatabaseManager._engine = DatabaseManager._SessionLocal = None
+    DatabaseManager._read_engine = DatabaseManager._ReadSessionLocal = None
+    DatabaseManager.initialize(f"sqlite:///{path}")
+    try:
+        with DatabaseManager.session_scope() as session:
+            dataset = generate_dataset(session, scale=scale, end_date=utcnow_naive().date())
+        yield dataset
+    finally:
+        DatabaseManager.close()
+        (DatabaseManager._engine, DatabaseManager._SessionLocal,
+         DatabaseManager._read_engine, DatabaseManager._ReadSessionLocal) = saved
+
+
+def _describe(benchmark, dataset, **extra):
+    benchmark.extra_info.update(scale=dataset["scale"], **dataset["counts"], **extra)
+
+
+def test_party_balances(benchmark, scale_db):
+    farm_id = scale_db["farm_ids"][0]
+    _describe(benchmark, scale_db)
+    result = benchmark(LedgerManager().get_all_parties_outstanding, farm_id)
+    assert result
+
+
+def test_party_list(benchmark, scale_db):
+    """Rows of the Parties page: every party with balances and last activity."""
+    farm_id = scale_db["farm_ids"][0]
+    _describe(benchmark, scale_db)
+
+    def party_list():
+        with PartyManager() as pm:
+            return pm.get_party_list(farm_id=farm_id)
+
+    assert len(benchmark(party_list)) == scale_db["counts"]["parties"]
+
+
+def test_single_party_balance(benchmark, scale_db):
+    party_id = scale_db["customer_ids"][0]
+    _describe(benchmark, scale_db)
+    benchmark(LedgerManager().get_party_balance, party_id)
+
+
+def test_profit_and_loss(benchmark, scale_db):
+    _describe(benchmark, scale_db)
+    with DatabaseManager.session_scope(read_only=True) as session:
+        generator = FinancialReportGenerator(session)
+        # P&L statements are cached; measure the uncached generation
+        result = benchmark.pedantic(generator.generate_pnl_statement,
+                                    args=(scale_db["start_date"], scale_db["end_date"], None),
+                                    setup=report_cache.clear, rounds=5, iterations=1)
+    assert result
+
+
+def test_cash_flow(benchmark, scale_db):
+    _describe(benchmark, scale_db)
+    with DatabaseManager.session_scope(read_only=True) as session:
+        generator = FinancialReportGenerator(session)
+        result = benchmark(generator.generate_cash_flow_statement,
+                           scale_db["start_date"], scale_db["end_date"], scale_db["farm_ids"][0])
+    assert result
+
+
+def test_dashboard_refresh(benchmark, scale_db):
+    """The dashboard snapshot for one farm, computed without the cache."""
+    farm_id = scale_db["farm_ids"][0]
+    _describe(benchmark, scale_db)
+
+    def refresh():
+        with DatabaseManager.read_transaction() as session:
+            compute_snapshot(session, farm_id, scale_db["end_date"])
+
+    benchmark.pedantic(refresh, rounds=10, iterations=1)
+
+
+@pytest.mark.parametrize("group_by", [None, "month", "party"])
+def test_sales_summary(benchmark, scale_db, group_by):
+    """Sales summary over the whole dataset, aggregated in SQL."""
+    _describe(benchmark, scale_db)
+
+    def summary():
+        with SalesManager() as manager:
+            return manager.get_sales_summary(group_by=group_by)
+
+    assert benchmark(summary)["total_sales"] > 0
+
+
+@pytest.mark.parametrize("query", ["Customer", "Synthetic Farm", "Shed 1-1"])
+def test_global_search(benchmark, scale_db, query):
+    _describe(benchmark, scale_db, query=query)
+    with DatabaseManager.session_scope(read_only=True) as session:
+        results = benchmark(GlobalSearchManager(session).search, query, save_history=False)
+    assert results
+
+
+def test_party_import(benchmark, scale_db, tmp_path):
+    rows_per_file = 200
+    counter = itertools.count()
+    _describe(benchmark, scale_db, imported_rows=rows_per_file)
+
+    def make_file():
+        # Party names are unique, so every round imports fresh names
+        batch = next(counter)
+        path = tmp_path / f"parties_{batch}.csv"
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["name", "phone", "address", "notes"])
+            for i in range(rows_per_file):
+                writer.writerow([f"Imported {scale_db['scale']} {batch}-{i}", "0700000000", "Kabul", ""])
+        return (str(path),), {}
+
+    def run(path):
+        session = DatabaseManager.get_session()
+        try:
+            return DataImporter(session).import_parties(path)
+        finally:
+            session.close()
+
+    result = benchmark.pedantic(run, setup=make_file, rounds=5, iterations=1)
+    assert result["imported"] == rows_per_file
+
+
+SALES_EXPORT_HEADERS = ["Date", "Party", "Quantity", "Rate (AFG)", "Total (AFG)", "Payment"]
+SALES_EXPORT_QUERY = text("SELECT date, party_id, quantity, rate_afg, total_afg, payment_method FROM sales")
+
+
+@pytest.mark.parametrize("fmt", ["xlsx", "pdf"])
+def test_streaming_export(benchmark, scale_db, tmp_path, fmt):
+    """Sales rows streamed from the query straight into the export file."""
+    _describe(benchmark, scale_db, format=fmt)
+
+    def run():
+        with DatabaseManager.session_scope(read_only=True) as session:
+            return export_rows(fmt, SALES_EXPORT_HEADERS, query_rows(session, SALES_EXPORT_QUERY),
+                               tmp_path / f"sales.{fmt}")
+
+    count = benchmark.pedantic(run, rounds=3, iterations=1)
+    benchmark.extra_info["exported_rows"] = count
+    assert count == scale_db["counts"]["sales"]
@@ -0,0 +1,122 @@
+"""EXPLAIN QUERY PLAN regression suite for the hot manager queries.
+
+Each test runs a real manager call, captures the SELECTs it issues and fails
+if SQLite plans a full scan of the table or misses the expected index.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.migrate_index_review import migrate_index_review, redundant_indexes
+from egg_farm_system.modules.egg_production import EggProductionManager
+from egg_farm_system.modules.expenses import ExpenseManager
+from egg_farm_system.modules.feed_mill import FeedIssueManager
+from egg_farm_system.modules.ledger import LedgerManager
+from egg_farm_system.modules.purchases import PurchaseManager
+from egg_farm_system.modules.sales import SalesManager
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 1, 31)
+
+
+@pytest.fixture
+def capture_plans(isolated_db):
+    """Return a helper that runs ``call`` and returns the query plan of each SELECT it issued."""
+    engine = DatabaseManager._engine
+
+    def _run(call):
+        statements = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            call()
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        assert statements, "manager call issued no SELECT"
+        plans = []
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                plans.append(" | ".join(row[-1] for row in rows))
+        return plans
+
+    return _run
+
+
+def _assert_uses(plans, table, index):
+    plan = next(p for p in plans if f" {table} " in f" {p} ")
+    # "SCAN <table>" (with or without an index) walks every row
+    assert f"SCAN {table}" not in plan, plan
+    assert f"SEARCH {table} USING INDEX {index}" in plan or \
+        f"SEARCH {table} USING COVERING INDEX {index}" in plan, plan
+
+
+def test_production_by_shed_and_date(capture_plans):
+    manager = EggProductionManager()
+    try:
+        plans = capture_plans(lambda: manager.get_daily_production(1, START, END))
+        _assert_uses(plans, "egg_productions", "idx_egg_prod_shed_date")
+        plans = capture_plans(lambda: manager.get_production_by_date(1, START))
+        _assert_uses(plans, "egg_productions", "idx_egg_prod_shed_date")
+    finally:
+        manager.close_session()
+
+
+def test_feed_issues_by_shed_and_date(capture_plans):
+    manager = FeedIssueManager()
+    try:
+        plans = capture_plans(lambda: manager.get_shed_feed_issues(1, START, END))
+        _assert_uses(plans, "feed_issues", "idx_feed_issue_shed_date")
+    finally:
+        manager.close_session()
+
+
+def test_party_ledger_uses_covering_index(capture_plans):
+    plans = capture_plans(lambda: LedgerManager().get_party_ledger(1, farm_id=1))
+    _assert_uses(plans, "ledgers", "idx_ledger_party_farm_date")
+
+
+@pytest.mark.parametrize(
+    "make_manager, method, table, index",
+    [
+        (SalesManager, "get_sales", "sales", "idx_sale_farm_date"),
+        (ExpenseManager, "get_expenses", "expenses", "idx_expense_farm_date"),
+        (PurchaseManager, "get_purchases", "purchases", "idx_purchase_farm_date"),
+    ],
+)
+def test_farm_scoped_lists_by_date(capture_plans, make_manager, method, table, index):
+    manager = make_manager()
+    try:
+        plans = capture_plans(
+            lambda: getattr(manager, method)(farm_id=1, start_date=START, end_date=END)
+        )
+        _assert_uses(plans, table, index)
+    finally:
+        manager.close_session()
+
+
+def test_index_review_drops_duplicates_and_adds_composites(isolated_db):
+    engine = DatabaseManager._engine
+    with engine.begin() as conn:
+        # Legacy layout: single-column and index=True duplicates, no composites
+        conn.execute(text("DROP INDEX idx_sale_farm_date"))
+        conn.execute(text("CREATE INDEX ix_sales_farm_id ON sales (farm_id)"))
+        conn.execute(text("CREATE INDEX idx_sale_farm_id ON sales (farm_id)"))
+        conn.execute(text("CREATE INDEX ix_sheds_farm_id ON sheds (farm_id)"))
+        conn.execute(text("CREATE INDEX idx_ledger_party_id ON ledgers (party_id)"))
+
+    migrate_index_review()
+
+    with engine.connect() as conn:
+        names = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+        assert list(redundant_indexes(conn)) == []
+    assert {"idx_sale_farm_date", "idx_shed_farm_id", "idx_ledger_party_farm_date"} <= names
+    assert not names & {"ix_sales_farm_id", "idx_sale_farm_id", "ix_sheds_farm_id", "idx_ledger_party_id"}
@@ -0,0 +1,83 @@
+"""Tests for the analytics read snapshot of the database."""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import Farm
+from egg_farm_system.database.snapshot import SNAPSHOT_PREFIX, ReadSnapshot
+from egg_farm_system.modules.financial_planner import FinancialPlanner
+
+
+def _farm_count(session):
+    return session.scalar(select(func.count()).select_from(Farm))
+
+
+def _copies(tmp_path):
+    return sorted((tmp_path / "snapshots").glob(f"{SNAPSHOT_PREFIX}*.db"))
+
+
+def test_snapshot_serves_a_copy_until_refreshed(file_db, tmp_path):
+    with DatabaseManager.session_scope() as session:
+        farms = _farm_count(session)
+    snapshot = ReadSnapshot(max_age=3600)
+    assert snapshot.describe() == "Live data"
+    try:
+        with snapshot.session() as session:
+            assert _farm_count(session) == farms
+            with pytest.raises(OperationalError):
+                session.add(Farm(name="Not here"))
+                session.flush()
+        assert len(_copies(tmp_path)) == 1
+        assert not snapshot.is_stale
+        assert snapshot.describe().endswith("(just now)")
+
+        with DatabaseManager.session_scope() as session:
+            session.add(Farm(name="Snapshot Farm"))
+        assert snapshot.is_stale
+        assert "newer changes not included" in snapshot.describe()
+        with snapshot.session() as session:
+            assert _farm_count(session) == farms  # within max_age the copy is reused
+        with snapshot.session(refresh=True) as session:
+            assert _farm_count(session) == farms + 1
+            budget = FinancialPlanner(session=session).create_budget(1, 2024)
+        assert "error" not in budget
+        assert len(_copies(tmp_path)) == 1  # the replaced copy was not in use
+
+        snapshot.max_age = 0
+        with DatabaseManager.session_scope() as session:
+            session.add(Farm(name="Second Farm"))
+        assert snapshot.refresh_if_needed()
+        assert not snapshot.refresh_if_needed()  # nothing written since
+    finally:
+        snapshot.close()
+
+
+def test_refreshes_never_overwrite_a_copy_still_being_read(file_db, tmp_path):
+    snapshot = ReadSnapshot(max_age=3600)
+    try:
+        with snapshot.session() as long_read:
+            farms = _farm_count(long_read)
+            [first] = _copies(tmp_path)
+            for name in ("Second", "Third"):
+                with DatabaseManager.session_scope() as session:
+                    session.add(Farm(name=f"{name} Farm"))
+                snapshot.refresh()
+            assert first in _copies(tmp_path) and len(_copies(tmp_path)) == 2
+            assert _farm_count(long_read) == farms
+        # Deleted once its last session closed
+        assert first not in _copies(tmp_path)
+        with snapshot.session() as session:
+            assert _farm_count(session) == farms + 2
+    finally:
+        snapshot.close()
+    assert _copies(tmp_path) == []
+
+
+def test_in_memory_database_reads_live(isolated_db):
+    snapshot = ReadSnapshot()
+    assert not snapshot.available()
+    with snapshot.session() as session:
+        assert _farm_count(session) >= 0
+    assert snapshot.describe() == "Live data"
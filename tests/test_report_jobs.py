@@ -0,0 +1,110 @@
+"""Tests for background report generation in the report viewer."""
+
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from egg_farm_system.database.models import EggProduction, Farm, Shed
+from egg_farm_system.ui.reports import report_jobs
+from egg_farm_system.ui.reports.report_jobs import ReportJobManager, ReportRequest
+
+
+def _drain(qapp, manager):
+    assert manager.wait(10000)
+    qapp.processEvents()
+
+
+@pytest.fixture
+def blocking_build(monkeypatch):
+    """Replace the report queries with a build that waits for ``release``."""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def build(request, session):
+        calls.append(request)
+        started.set()
+        release.wait(10)
+        rows = [[str(i)] for i in range(7)]
+        return {'data': {}, 'info': request.report_type, 'headers': ["N"], 'rows': rows}
+
+    monkeypatch.setattr(report_jobs, "build_report", build)
+    return calls, started, release
+
+
+def _record(manager):
+    events = []
+    manager.rows_ready.connect(lambda request, headers, rows, first: events.append(("rows", len(rows), first)))
+    manager.report_ready.connect(lambda request, result: events.append(("ready", result['row_count'])))
+    manager.report_cancelled.connect(lambda request: events.append(("cancelled", request.report_type)))
+    return events
+
+
+def test_identical_requests_share_one_job(qapp, isolated_db, blocking_build):
+    calls, _started, release = blocking_build
+    manager = ReportJobManager(chunk_size=3)
+    events = _record(manager)
+    request = ReportRequest("feed_usage", farm_id=1, start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+
+    first = manager.submit(request)
+    assert manager.submit(ReportRequest("feed_usage", farm_id=1, start_date=date(2024, 1, 1),
+                                        end_date=date(2024, 1, 31))) is first
+    release.set()
+    _drain(qapp, manager)
+
+    assert len(calls) == 1
+    assert events == [("rows", 3, True), ("rows", 3, False), ("rows", 1, False), ("ready", 7)]
+    assert not manager.in_flight(request)
+
+
+def test_cancelled_jobs_deliver_nothing(qapp, isolated_db, blocking_build):
+    calls, started, release = blocking_build
+    manager = ReportJobManager(max_workers=1)
+    events = _record(manager)
+    running = ReportRequest("daily_production", farm_id=1, report_date=date(2024, 1, 1))
+    queued = ReportRequest("daily_production", farm_id=2, report_date=date(2024, 1, 1))
+
+    manager.submit(running)
+    assert started.wait(5)
+    manager.submit(queued)
+    manager.cancel(queued)
+    manager.cancel(running)
+    release.set()
+    _drain(qapp, manager)
+
+    assert calls == [running]
+    assert sorted(events) == [("cancelled", "daily_production")] * 2
+
+
+def test_viewer_fills_table_from_worker(qapp, isolated_db):
+    from egg_farm_system.ui.reports.report_viewer import ReportViewerWidget
+
+    session = isolated_db()
+    try:
+        farm = Farm(name="Report Farm")
+        session.add(farm)
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed A", capacity=100)
+        session.add(shed)
+        session.flush()
+        session.add(EggProduction(shed_id=shed.id, date=datetime(2024, 3, 5, 8), small_count=1,
+                                  medium_count=2, large_count=3, broken_count=1))
+        session.commit()
+        farm_id = farm.id
+    finally:
+        session.close()
+
+    viewer = ReportViewerWidget(farm_id=farm_id)
+    try:
+        viewer.date_edit.setDate(date(2024, 3, 5))
+        viewer.generate_report()
+        assert viewer.current_report_data is None
+        _drain(qapp, viewer.report_jobs)
+
+        assert viewer.current_report_type == "daily_production"
+        assert viewer.report_table.row_values(0) == ["Shed A", "1", "2", "3", "1", "7", "6"]
+        assert viewer.report_table.cell_text(1, 5) == "<b>7</b>"
+        assert "Report Farm" in viewer.info_label.text()
+    finally:
+        viewer.deleteLater()
@@ -0,0 +1,68 @@
+"""Tests for the in-process settings cache."""
+
+import pytest
+from sqlalchemy import event, text
+
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.migrate_settings_version import migrate_settings_version
+from egg_farm_system.modules import settings as settings_module
+from egg_farm_system.modules.settings import SettingsManager
+
+
+@pytest.fixture
+def settings_db(isolated_db):
+    migrate_settings_version()
+    SettingsManager.invalidate_cache()
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(DatabaseManager._engine, "before_cursor_execute", _count)
+    try:
+        yield isolated_db, statements
+    finally:
+        event.remove(DatabaseManager._engine, "before_cursor_execute", _count)
+        SettingsManager.invalidate_cache()
+
+
+def test_reads_are_served_from_memory(settings_db):
+    _, statements = settings_db
+    SettingsManager.set_setting("exchange_rate_afg_usd", "70")
+
+    assert SettingsManager.get_setting("exchange_rate_afg_usd") == "70"
+    statements.clear()
+    for _ in range(50):
+        assert SettingsManager.get_setting("exchange_rate_afg_usd") == "70"
+        assert SettingsManager.get_setting("missing", "fallback") == "fallback"
+    assert statements == []
+
+
+def test_writes_update_cache_in_place(settings_db):
+    SettingsManager.set_setting("language", "en")
+    assert SettingsManager.get_setting("language") == "en"
+
+    SettingsManager.set_setting("language", "ps")
+    assert SettingsManager.get_setting("language") == "ps"
+
+    assert SettingsManager.delete_setting("language") is True
+    assert SettingsManager.get_setting("language", "default") == "default"
+    assert SettingsManager.delete_setting("language") is False
+
+
+def test_external_writes_invalidate_via_version_counter(settings_db, monkeypatch):
+    SessionLocal, _ = settings_db
+    SettingsManager.set_setting("tray_expense_afg", "5")
+    assert SettingsManager.get_setting("tray_expense_afg") == "5"
+
+    # Simulate another process writing directly to the table
+    session = SessionLocal()
+    try:
+        session.execute(text("UPDATE settings SET value = '7' WHERE key = 'tray_expense_afg'"))
+        session.commit()
+    finally:
+        session.close()
+
+    assert SettingsManager.get_setting("tray_expense_afg") == "5"
+    monkeypatch.setattr(settings_module, "VERSION_CHECK_INTERVAL", 0)
+    assert SettingsManager.get_setting("tray_expense_afg") == "7"
@@ -0,0 +1,106 @@
+"""Tests for the opt-in SQL profiler and N+1 detection."""
+
+import logging
+
+import pytest
+
+from egg_farm_system.database.models import Party
+from egg_farm_system.modules.parties import PartyManager
+from egg_farm_system.utils.performance_monitoring import (
+    UNSCOPED,
+    QueryProfiler,
+    measure_time,
+    query_profiler,
+)
+
+
+@pytest.fixture
+def parties(isolated_db):
+    session = isolated_db()
+    try:
+        session.add_all([Party(name=f"Party {i}") for i in range(8)])
+        session.commit()
+        ids = [party.id for party in session.query(Party).all()]
+    finally:
+        session.close()
+    query_profiler.reset()
+    yield ids
+    query_profiler.disable()
+    query_profiler.reset()
+
+
+def test_per_row_lookups_are_flagged(parties):
+    with PartyManager() as pm:
+        with query_profiler.profile("party_names") as stats:
+            names = [pm.get_party_by_id(party_id).name for party_id in parties]
+
+    assert len(names) == len(parties)
+    assert stats.count == len(parties)
+    [repeated] = stats.repeated()
+    assert repeated["count"] == len(parties)
+    assert repeated["statement"].startswith("SELECT")
+    assert "party_names" in query_profiler.report()
+
+
+def test_single_query_is_not_flagged(parties):
+    with PartyManager() as pm:
+        with query_profiler.profile("party_list") as stats:
+            pm.get_all_parties()
+
+    assert stats.count == 1
+    assert stats.repeated() == []
+    assert stats.slowest()[0]["statement"].startswith("SELECT")
+
+
+def test_nested_measure_time_scopes(parties):
+    with PartyManager() as pm:
+        with query_profiler.profile("screen") as stats:
+            with measure_time("load_party"):
+                pm.get_party_by_id(parties[0])
+            pm.get_all_parties()
+
+    assert stats.count == 2
+    assert query_profiler.get_scope("load_party").count == 1
+
+
+def test_repeats_are_counted_per_call(parties, caplog):
+    query_profiler.enable()
+    with PartyManager() as pm, caplog.at_level(logging.WARNING):
+        for _ in range(7):
+            with measure_time("screen_refresh"):
+                pm.get_all_parties()
+
+    assert query_profiler.get_scope("screen_refresh").count == 7
+    assert "N+1" not in caplog.text
+    assert query_profiler.repeated_statements() == []
+
+    with PartyManager() as pm, caplog.at_level(logging.WARNING):
+        with measure_time("party_names"):
+            for party_id in parties:
+                pm.get_party_by_id(party_id)
+    assert f"Possible N+1 in party_names: {len(parties)}x" in caplog.text
+    assert [item["scope"] for item in query_profiler.repeated_statements()] == ["party_names"]
+
+
+def test_disabled_by_default(parties):
+    assert not query_profiler.enabled
+    with PartyManager() as pm:
+        pm.get_all_parties()
+        with query_profiler.profile("once"):
+            pm.get_all_parties()
+        pm.get_all_parties()
+
+    assert not query_profiler.enabled
+    assert query_profiler.get_scope(UNSCOPED) is None
+    assert query_profiler.get_stats()["total_queries"] == 1
+
+
+def test_history_is_bounded():
+    profiler = QueryProfiler(max_queries=3, top_n=2)
+    for i in range(10):
+        profiler.record_query(f"SELECT {i}", duration=i / 1000)
+
+    assert len(profiler.queries) == 3
+    stats = profiler.get_scope(UNSCOPED)
+    assert stats.count == 10
+    assert [item["statement"] for item in stats.slowest()] == ["SELECT 9", "SELECT 8"]
@@ -0,0 +1,107 @@
+"""Startup import budget: the login and main window must not pull in heavy libraries.
+
+Each check runs in a fresh interpreter so modules imported by other tests
+do not leak into ``sys.modules``.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("pandas", "scipy", "sklearn", "reportlab", "openpyxl", "matplotlib")
+
+# Generous wall-clock ceiling; the point is catching an eager heavy import
+# (pandas + scipy + sklearn alone cost several seconds), not micro-timing.
+IMPORT_BUDGET_SECONDS = 3.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _probe_import(module):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "egg_farm_system.app",
+        "egg_farm_system.ui.forms.login_dialog",
+        "egg_farm_system.ui.main_window",
+    ],
+)
+def test_startup_modules_defer_heavy_imports(module):
+    probe = _probe_import(module)
+
+    assert probe["heavy"] == []
+    assert probe["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_import_resolves_on_first_use():
+    from egg_farm_system.utils.lazy_import import lazy_import
+
+    proxy = lazy_import("json", "dumps")
+    assert not proxy.is_loaded
+    assert proxy([1]) == "[1]"
+    assert proxy.is_loaded
+    assert lazy_import("json").loads("2") == 2
+
+
+# Qt helpers that live in utils but belong to the UI layer
+QT_UTILS = ("alert_scheduler", "error_handler", "keyboard_shortcuts", "print_manager")
+
+_HEADLESS_PROBE = """
+import importlib, json, pkgutil, sys
+
+class BlockQt:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] == "PySide6":
+            raise ImportError("PySide6 is blocked")
+
+sys.meta_path.insert(0, BlockQt())
+failed = {{}}
+for package in ("database", "modules", "utils"):
+    path = ["egg_farm_system/" + package]
+    for info in pkgutil.iter_modules(path):
+        if package == "utils" and info.name in {qt_utils!r}:
+            continue
+        name = "egg_farm_system.%s.%s" % (package, info.name)
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            failed[name] = str(e)
+print(json.dumps(failed))
+"""
+
+
+def test_domain_layer_imports_without_qt():
+    result = subprocess.run(
+        [sys.executable, "-c", _HEADLESS_PROBE.format(qt_utils=QT_UTILS)],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {}
@@ -0,0 +1,83 @@
+"""Tests for streaming CSV/Excel/PDF exports and the background export worker."""
+
+import csv
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import select
+
+from egg_farm_system.database.models import Party
+from egg_farm_system.utils.streaming_export import ExportCancelled, export_rows, query_rows
+
+HEADERS = ["Name", "Qty", "Amount"]
+
+
+def _rows(count):
+    return ((f"Row {i}", i, i * 1.5) for i in range(count))
+
+
+def test_csv_and_excel_stream_from_generators(tmp_path):
+    progress = []
+    count = export_rows("csv", HEADERS, _rows(1200), tmp_path / "out.csv",
+                        progress=progress.append, progress_every=500)
+    assert count == 1200
+    assert progress == [500, 1000, 1200]
+    with open(tmp_path / "out.csv", newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == HEADERS and rows[-1] == ["Row 1199", "1199", "1798.5"]
+
+    assert export_rows("xlsx", HEADERS, _rows(300), tmp_path / "out.xlsx", sheet_name="Sales") == 300
+    ws = load_workbook(tmp_path / "out.xlsx")["Sales"]
+    assert ws.max_row == 301
+    assert ws["A1"].font.b and ws["B301"].value == 299
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_pdf_export(tmp_path, fast):
+    path = tmp_path / "out.pdf"
+    count = export_rows("pdf", HEADERS, _rows(1100), path, title="Sales",
+                        totals_row=["Total", 1100, ""], fast=fast)
+    assert count == 1100
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_cancelled_export_removes_partial_file(tmp_path):
+    path = tmp_path / "out.csv"
+    progress = []
+    with pytest.raises(ExportCancelled):
+        export_rows("csv", HEADERS, _rows(5000), path, progress=progress.append,
+                    cancelled=lambda: bool(progress), progress_every=100)
+    assert progress == [100]
+    assert not path.exists()
+
+
+def test_query_rows_streams_tuples(isolated_db, tmp_path):
+    session = isolated_db()
+    try:
+        session.add_all([Party(name=f"Party {i}") for i in range(25)])
+        session.commit()
+        rows = query_rows(session, select(Party.name, Party.phone).order_by(Party.id), chunk_size=10)
+        assert export_rows("csv", ["Name", "Phone"], rows, tmp_path / "parties.csv") == 25
+    finally:
+        session.close()
+
+
+def test_table_large_export_runs_in_background(qapp, monkeypatch, tmp_path):
+    from egg_farm_system.ui.widgets import datatable
+
+    messages = []
+    monkeypatch.setattr(datatable.QMessageBox, "information", lambda *args: messages.append(args[-1]))
+    monkeypatch.setattr(datatable.DataTableWidget, "BACKGROUND_EXPORT_ROWS", 10)
+    table = datatable.DataTableWidget()
+    table.set_headers(HEADERS)
+    table.set_rows(list(_rows(50)))
+    path = tmp_path / "table.xlsx"
+    try:
+        worker = table.export_excel(str(path))
+        assert worker is not None
+        assert worker.wait(10000)
+        qapp.processEvents()
+        assert messages == [f"Data exported to {path}"]
+        assert load_workbook(path).active.max_row == 51
+    finally:
+        table.deleteLater()
@@ -0,0 +1,96 @@
+"""Tests for the SQL-backed summary methods of the managers."""
+
+from datetime import date, datetime
+
+import pytest
+
+from egg_farm_system.database.models import EggProduction, Expense, Farm, Party, Sale, Shed
+from egg_farm_system.modules.egg_production import EggProductionManager
+from egg_farm_system.modules.expenses import ExpenseManager
+from egg_farm_system.modules.farms import FarmManager
+from egg_farm_system.modules.sales import SalesManager
+
+
+@pytest.fixture
+def farm(isolated_db):
+    session = isolated_db()
+    try:
+        farm = Farm(name="Summary Farm")
+        buyer, other_buyer = Party(name="Buyer"), Party(name="Other Buyer")
+        session.add_all([farm, buyer, other_buyer])
+        session.flush()
+        sheds = [Shed(farm_id=farm.id, name=f"Shed {i}", capacity=100 * i) for i in (1, 2)]
+        session.add_all(sheds)
+        session.flush()
+
+        def sale(party, day, quantity):
+            return Sale(party_id=party.id, farm_id=farm.id, date=day, quantity=quantity, rate_afg=10,
+                        rate_usd=0.1, total_afg=quantity * 10, total_usd=quantity * 0.1, exchange_rate_used=100)
+
+        session.add_all([
+            sale(buyer, datetime(2024, 1, 5, 9), 10),
+            sale(buyer, datetime(2024, 2, 1, 9), 20),
+            # Later than midnight on the last day of the range
+            sale(other_buyer, datetime(2024, 2, 29, 17, 30), 30),
+            EggProduction(shed_id=sheds[0].id, date=datetime(2024, 2, 1, 8), small_count=1,
+                          medium_count=2, large_count=3, broken_count=4),
+            EggProduction(shed_id=sheds[1].id, date=datetime(2024, 2, 1, 8), small_count=10,
+                          medium_count=0, large_count=0, broken_count=0),
+            EggProduction(shed_id=sheds[1].id, date=datetime(2024, 2, 2, 8), small_count=5,
+                          medium_count=0, large_count=0, broken_count=0),
+        ])
+        session.add_all([
+            Expense(farm_id=farm.id, date=datetime(2024, 1, day, 12), category=category,
+                    amount_afg=amount, amount_usd=amount / 100, exchange_rate_used=100)
+            for day, category, amount in [(3, "Labor", 500), (4, "Labor", 300), (20, "Medicine", 200)]
+        ])
+        session.commit()
+        return farm.id, buyer.id, other_buyer.id
+    finally:
+        session.close()
+
+
+def test_sales_summary_grouped_by_month_and_party(farm):
+    farm_id, buyer_id, other_buyer_id = farm
+    with SalesManager() as manager:
+        summary = manager.get_sales_summary(None, date(2024, 1, 1), date(2024, 2, 29), farm_id=farm_id,
+                                            group_by='month')
+        assert summary['total_sales'] == 3
+        assert summary['total_quantity'] == 60
+        assert summary['average_rate_afg'] == pytest.approx(10)
+        assert {month: group['total_afg'] for month, group in summary['groups'].items()} == {
+            '2024-01': 100, '2024-02': 500}
+
+        by_party = manager.get_sales_summary(farm_id=farm_id, group_by='party')['groups']
+        assert {party: group['total_sales'] for party, group in by_party.items()} == {
+            buyer_id: 2, other_buyer_id: 1}
+
+        with pytest.raises(ValueError):
+            manager.get_sales_summary(group_by='category')
+
+
+def test_production_summary_for_farm_by_day(farm):
+    farm_id = farm[0]
+    with EggProductionManager() as manager:
+        summary = manager.get_production_summary(None, date(2024, 2, 1), date(2024, 2, 2), farm_id=farm_id,
+                                                 group_by='day')
+    assert summary['total_eggs'] == 25
+    assert summary['usable_eggs'] == 21
+    assert summary['days_count'] == 3
+    assert summary['broken_percentage'] == pytest.approx(16)
+    assert summary['groups']['2024-02-01']['total_eggs'] == 20
+    assert summary['groups']['2024-02-02']['usable_eggs'] == 5
+
+
+def test_expense_and_farm_summaries(farm):
+    farm_id = farm[0]
+    with ExpenseManager() as manager:
+        summary = manager.get_expenses_summary(farm_id, group_by='month')
+    assert summary['total_expenses'] == 3
+    assert summary['by_category']['Labor'] == {'count': 2, 'afg': 800, 'usd': 8}
+    assert summary['groups'] == {'2024-01': {'count': 3, 'afg': 1000, 'usd': 10}}
+
+    with FarmManager() as manager:
+        farm_summary = manager.get_farm_summary(farm_id)
+    assert (farm_summary['total_sheds'], farm_summary['total_capacity']) == (2, 300)
+    assert (farm_summary['total_expenses'], farm_summary['expense_count']) == (1000, 3)
@@ -0,0 +1,142 @@
+"""Tests for the change log and delta sync between office databases."""
+
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import func, select
+
+from egg_farm_system.cli import cli
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.models import ChangeLogEntry, Farm, Flock, Ledger, Party, RawMaterial, Shed
+from egg_farm_system.database.sync import SyncManager
+from egg_farm_system.modules.flocks import FlockManager
+
+
+@pytest.fixture
+def offices(tmp_path, file_database):
+    @contextmanager
+    def office(name):
+        with file_database(tmp_path / f"{name}.db"), DatabaseManager.session_scope() as session:
+            yield session
+
+    return office
+
+
+def _exchange(office, source, target, bundle, peer=None):
+    with office(source):
+        SyncManager.export_bundle(bundle, peer)
+    with office(target):
+        return SyncManager.import_bundle(bundle)
+
+
+def test_changes_are_captured_with_sequence_numbers(offices):
+    with offices("a") as session:
+        farm = Farm(name="Farm A")
+        session.add(farm)
+        session.flush()
+        farm.location = "Kabul"
+        session.flush()
+        session.delete(farm)
+        session.flush()
+        entries = session.execute(select(ChangeLogEntry.operation, ChangeLogEntry.seq).where(
+            ChangeLogEntry.table_name == "farms", ChangeLogEntry.row_id == farm.id)).all()
+    assert [operation for operation, _ in entries] == ["insert", "update", "delete"]
+    assert [seq for _, seq in entries] == sorted(seq for _, seq in entries)
+
+
+def test_delta_sync_merges_stock_and_ledger_history(offices, tmp_path):
+    with offices("a") as session:
+        farm, party = Farm(name="Farm A"), Party(name="Buyer")
+        session.add_all([farm, party])
+        session.flush()
+        session.add_all([
+            RawMaterial(farm_id=farm.id, name="Maize", current_stock=100),
+            Ledger(party_id=party.id, farm_id=farm.id, date=datetime(2024, 5, 1), description="Eggs",
+                   debit_afg=500, credit_afg=0, debit_usd=5, credit_usd=0, exchange_rate_used=100),
+        ])
+        node_a = SyncManager.node_id(session)
+    with offices("b") as session:
+        session.add(Party(name="Buyer", phone="0700"))  # entered at both offices
+        node_b = SyncManager.node_id(session)
+
+    result = _exchange(offices, "a", "b", tmp_path / "a1.json.gz")
+    # The same party entered at both offices is merged; B's later details stay
+    assert result.conflicts == [f"parties {node_a}:1: kept the later edit made here"]
+    with offices("b") as session:
+        assert session.scalar(select(func.count()).select_from(Party)) == 1
+        ledger = session.execute(select(Ledger)).scalar_one()
+        assert (ledger.party.name, ledger.farm.name, ledger.debit_afg) == ("Buyer", "Farm A", 500)
+        session.execute(select(RawMaterial).where(RawMaterial.name == "Maize")).scalar_one().current_stock -= 30
+        session.delete(ledger)  # voided at B ...
+    with offices("a") as session:
+        session.execute(select(RawMaterial).where(RawMaterial.name == "Maize")).scalar_one().current_stock += 20
+        session.execute(select(Ledger)).scalar_one().description = "Eggs, May"  # ... while edited at A
+
+    result = _exchange(offices, "b", "a", tmp_path / "b1.json.gz", peer=node_a)
+    assert result.conflicts == [f"ledgers {node_a}:1: deleted, discarding a later edit made here"]
+    result = _exchange(offices, "a", "b", tmp_path / "a2.json.gz", peer=node_b)
+    assert (result.applied, result.conflicts) == (1, [])  # only A's stock increment
+
+    for name in ("a", "b"):
+        with offices(name) as session:
+            assert session.execute(select(RawMaterial.current_stock).where(RawMaterial.name == "Maize")).scalar_one() == 90
+            assert session.scalar(select(func.count()).select_from(Ledger)) == 0
+            assert session.execute(select(Party.phone)).scalar_one() == "0700"
+
+    # Both sides confirmed everything; the next bundles are empty
+    with offices("b"):
+        assert SyncManager.export_bundle(tmp_path / "b2.json.gz", peer=node_a) == 0
+        assert SyncManager.import_bundle(tmp_path / "a2.json.gz").skipped > 0
+
+
+def test_mortality_recorded_at_both_offices_counts_once_each(offices, tmp_path):
+    with offices("a") as session:
+        farm = Farm(name="Farm A")
+        session.add(farm)
+        session.flush()
+        shed = Shed(farm_id=farm.id, name="Shed 1", capacity=2000)
+        session.add(shed)
+        session.flush()
+        flock = Flock(shed_id=shed.id, name="Layers", start_date=datetime(2024, 1, 1), initial_count=1000)
+        flock.set_mortality_totals(())
+        session.add(flock)
+        node_a = SyncManager.node_id(session)
+    with offices("b") as session:
+        node_b = SyncManager.node_id(session)
+    _exchange(offices, "a", "b", tmp_path / "a1.json.gz")
+
+    # The same flock's deaths recorded at both offices before they sync again
+    with offices("a") as session:
+        FlockManager().add_mortality(session.execute(select(Flock.id)).scalar_one(), datetime(2024, 6, 1), 3)
+    with offices("b") as session:
+        FlockManager().add_mortality(session.execute(select(Flock.id)).scalar_one(), datetime(2024, 6, 2), 5)
+
+    _exchange(offices, "a", "b", tmp_path / "a2.json.gz", peer=node_b)
+    _exchange(offices, "b", "a", tmp_path / "b1.json.gz", peer=node_a)
+    for name in ("a", "b"):
+        with offices(name) as session:
+            flock = session.execute(select(Flock)).scalar_one()
+            assert (flock.get_live_count(), flock.total_mortality) == (992, 8)
+            assert flock.get_live_count(datetime(2024, 6, 1)) == 997
+
+
+def test_cli_round_trip(offices, tmp_path):
+    with offices("a") as session:
+        session.add(Farm(name="CLI Farm"))
+    runner = CliRunner()
+    bundle = tmp_path / "a.json.gz"
+    result = runner.invoke(cli, ["--database", str(tmp_path / "a.db"), "sync", "export", str(bundle)])
+    assert result.exit_code == 0, result.output
+    DatabaseManager.close()
+    for attribute in ("_engine", "_SessionLocal", "_read_engine", "_ReadSessionLocal"):
+        setattr(DatabaseManager, attribute, None)
+    try:
+        result = runner.invoke(cli, ["--database", str(tmp_path / "b.db"), "sync", "import", str(bundle)])
+        assert result.exit_code == 0, result.output
+        assert "applied" in result.output
+        result = runner.invoke(cli, ["--database", str(tmp_path / "b.db"), "sync", "status"])
+        assert "received through" in result.output
+    finally:
+        DatabaseManager.close()
@@ -0,0 +1,53 @@
+"""Generate a synthetic database for load testing and benchmarks.
+
+Writes to a separate file (data/synthetic_<scale>.db by default) so the real
+application database is never touched:
+
+    python tools/generate_synthetic_data.py --scale medium
+    python tools/generate_synthetic_data.py --scale large --database /tmp/large.db --replace
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from egg_farm_system.config import DATA_DIR, DB_PATH
+from egg_farm_system.database.db import DatabaseManager
+from egg_farm_system.database.synthetic_data import SCALES, generate_dataset
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database", type=Path, help="Target SQLite file (default: data/synthetic_<scale>.db)")
+    parser.add_argument("--replace", action="store_true", help="Delete the target file first")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    target = (args.database or DATA_DIR / f"synthetic_{args.scale}.db").resolve()
+    if target == DB_PATH.resolve():
+        sys.exit("Refusing to write synthetic data into the application database")
+    if args.replace and target.exists():
+        target.unlink()
+
+    started = time.perf_counter()
+    DatabaseManager.initialize(f"sqlite:///{target}")
+    try:
+        with DatabaseManager.session_scope() as session:
+            summary = generate_dataset(session, scale=args.scale, seed=args.seed)
+    finally:
+        DatabaseManager.close()
+
+    print(f"Generated '{args.scale}' dataset in {time.perf_counter() - started:.1f}s: {target}")
+    for key, value in summary["counts"].items():
+        print(f"  - {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()